@@ -5,10 +5,11 @@ Shared setup for all E2E tests
 import pytest
 import os
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 from playwright.sync_api import Page, Browser, BrowserContext, Playwright
-from typing import Dict, Generator, Any
+from typing import Dict, Generator, Any, Optional
 
 # Constants
 BASE_URL = os.getenv('BASE_URL', 'http://localhost:8081')
@@ -55,6 +56,18 @@ def page(context: BrowserContext) -> Generator[Page, None, None]:
     page.close()
 
 
+@pytest.fixture(scope="function")
+def cold_page(browser: Browser, browser_context_args) -> Generator[Page, None, None]:
+    """A page in a new context that has not loaded the app yet (empty HTTP cache, no service worker)"""
+    context = browser.new_context(**browser_context_args)
+    page = context.new_page()
+    page.set_default_timeout(30000)
+
+    yield page
+
+    context.close()
+
+
 @pytest.fixture(scope="function")
 def authenticated_page(page: Page) -> Page:
     """Page with authenticated admin user"""
@@ -73,6 +86,22 @@ def authenticated_page(page: Page) -> Page:
     return page
 
 
+@pytest.fixture(scope="session")
+def async_runner(browser_name, browser_type_launch_args, browser_context_args):
+    """
+    Run async page scenarios over a bounded pool of pages in one context
+    Pool size comes from ASYNC_PAGES (default 4); see utils.async_runner
+    """
+    from utils.async_runner import AsyncScenarioRunner
+
+    return AsyncScenarioRunner(
+        browser_name,
+        launch_args=browser_type_launch_args,
+        context_args=browser_context_args,
+        concurrency=int(os.getenv('ASYNC_PAGES', '4')),
+    )
+
+
 # ==================== Data Fixtures ====================
 
 @pytest.fixture
@@ -118,14 +147,285 @@ def hebrew_test_strings() -> Dict[str, str]:
     }
 
 
+@pytest.fixture
+def mini_content_dir(tmp_path: Path) -> Path:
+    """
+    Small, valid copy of the kitzur/content layout for content tool tests
+    Two kitzur chapters, one orach_chaim chapter, one parsha, one special prayer
+    """
+    root = tmp_path / "content"
+
+    def _write(relative: str, data: Any):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    def _chapter(chapter_id: str, texts: list, **extra) -> Dict[str, Any]:
+        sep = "-s" if chapter_id.startswith("kitzur_") else "-"
+        return {
+            "id": chapter_id,
+            "chapterLabel": "סימן א",
+            "title": "שולחן ערוך",
+            **extra,
+            "sections": [
+                {"id": f"{chapter_id}{sep}{i}", "section": i, "text": text}
+                for i, text in enumerate(texts, start=1)
+            ],
+        }
+
+    _write("chapters/kitzur_orach_chaim-001.json", _chapter(
+        "kitzur_orach_chaim-001",
+        ["יִתְגַּבֵּר כַּאֲרִי לַעֲמוֹד בַּבֹּקֶר", "שויתי ה' לנגדי תמיד (טור)", "הלכות שבת וכשרות"],
+        version=1,
+    ))
+    _write("chapters/kitzur_orach_chaim-002.json", _chapter(
+        "kitzur_orach_chaim-002", ["דין נטילת ידיים שחרית", "ברכות השחר"], version=1,
+    ))
+    _write("orach_chaim/orach_chaim-001.json", _chapter(
+        "orach_chaim-001", ["דין השכמת הבוקר", "הלכות ציצית"], partName="אורח חיים",
+    ))
+    _write("parshiot/bo.json", {
+        "name": "Bo",
+        "book": "Exodus",
+        "chapters": [
+            {"chapter": 10, "verses": [
+                {"verseNum": 1, "hebrew": "וַיֹּ֤אמֶר יְהֹוָה֙ אֶל־מֹשֶׁ֔ה", "targum": "וַאֲמַר יְיָ", "english": "And the Lord said"},
+                {"verseNum": 2, "hebrew": "וּלְמַ֡עַן תְּסַפֵּר֩", "targum": "וּבְדִיל", "english": "And that thou mayst tell"},
+            ]},
+            {"chapter": 11, "verses": [
+                {"verseNum": 1, "hebrew": "וַיֹּ֨אמֶר יְהֹוָ֜ה", "targum": "וַאֲמַר", "english": "And the Lord said"},
+            ]},
+        ],
+    })
+    _write("parshiot/manifest.json", {"totalParshiot": 1, "parshiot": ["bo"]})
+    _write("special/borei_nefashot.json", {
+        "name": "בּוֹרֵא נְפָשׁוֹת",
+        "hebrewName": "בּוֹרֵא נְפָשׁוֹת",
+        "paragraphs": [{"paragraph": 1, "text": "בָּרוּךְ אַתָּה"}],
+    })
+
+    chapter_ids = ["kitzur_orach_chaim-001", "kitzur_orach_chaim-002", "orach_chaim-001"]
+    _write("manifest.json", chapter_ids)
+    (root / "chapter-ids.txt").write_text("\n".join(chapter_ids) + "\n", encoding="utf-8")
+    (root / "chapter-ids-only.ts").write_text(
+        "export const chapterIds = [\n" + "".join(f"  '{c}',\n" for c in chapter_ids) + "];\n",
+        encoding="utf-8",
+    )
+    return root
+
+
+@pytest.fixture(scope="session")
+def section_locator():
+    """Section ID -> (chapter, index) resolver for the real content tree"""
+    from utils.content_cache import ContentCache
+    from utils.section_locator import SectionLocator
+
+    cache = ContentCache()
+    locator = SectionLocator.from_content(cache=cache)
+    if cache.changed or cache.removed:
+        cache.save()
+    return locator
+
+
+
+@pytest.fixture(scope="module")
+def search_oracle():
+    """
+    Firestore emulator seeded with a known question set, and the search oracle over it in app order
+    Clears the shared emulator: tests using it must be in xdist_group(EMULATOR_XDIST_GROUP)
+    """
+    from utils.qa_dataset import (
+        QADatasetGenerator, clear_firestore_emulator, emulator_host, emulator_reachable, load_into_firestore_emulator,
+    )
+    from utils.qa_search import QuestionSearchIndex
+
+    if not os.getenv('FIRESTORE_EMULATOR_HOST'):
+        pytest.skip("FIRESTORE_EMULATOR_HOST not set")
+    if not emulator_reachable():
+        pytest.skip(f"Firestore emulator not reachable at {emulator_host()}")
+    records = list(QADatasetGenerator(seed=11).questions(int(os.getenv('QA_ORACLE_SIZE', '1000'))))
+    clear_firestore_emulator()
+    load_into_firestore_emulator(records)
+    # subscribeToQuestions: orderBy('createdAt', 'desc'), ties broken by document id in the same direction
+    records.sort(key=lambda q: (q['createdAt'], q['id']), reverse=True)
+    return QuestionSearchIndex(records)
+
+# ==================== Browser Console ====================
+
+def _env_budget(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return None if value.lower() in ('', 'none', 'off') else int(value)
+
+
+@pytest.fixture(autouse=True)
+def console_collector(request):
+    """
+    Collect console messages, page errors and failed requests of browser tests
+    Events are attached to the report; exceeding the budget fails the test. Budgets default to
+    CONSOLE_MAX_ERRORS (0) / CONSOLE_MAX_WARNINGS (unlimited) and can be set per test with
+    @pytest.mark.console_budget(errors=..., warnings=..., allow=[regex, ...])
+    """
+    if "page" not in request.fixturenames:
+        yield None
+        return
+
+    from utils.console_collector import DEFAULT_ALLOWLIST, ConsoleBudget, ConsoleCollector
+
+    marker = request.node.get_closest_marker("console_budget")
+    options = marker.kwargs if marker else {}
+    budget = ConsoleBudget(
+        max_errors=options.get("errors", _env_budget('CONSOLE_MAX_ERRORS', 0)),
+        max_warnings=options.get("warnings", _env_budget('CONSOLE_MAX_WARNINGS', None)),
+    )
+    collector = ConsoleCollector(
+        capacity=int(os.getenv('CONSOLE_BUFFER', '500')),
+        allowlist=[*DEFAULT_ALLOWLIST, *options.get("allow", ())],
+    )
+    # Attach to the context before the page fixture opens its first page
+    collector.attach(request.getfixturevalue("context"))
+    yield collector
+    collector.detach()
+
+    if collector.events:
+        request.node.add_report_section("call", "browser console", collector.format())
+    violations = collector.violations(budget)
+    rep_call = getattr(request.node, "rep_call", None)
+    # Only fail tests that otherwise passed; a failing test already shows the console section
+    if violations and (rep_call is None or rep_call.passed):
+        details = collector.format(levels=("error", "pageerror", "requestfailed", "warning"))
+        pytest.fail("Browser console over budget: " + "; ".join(violations) + "\n" + details, pytrace=False)
+
+
+# ==================== Network Accounting ====================
+
+_network_rows: list = []
+
+
+@pytest.fixture(autouse=True)
+def network_ledger(request):
+    """
+    Record every request of browser tests after the page fixture's initial load
+    Tests marked content/questions/parsha are held to that route's budget (utils.network_ledger);
+    override with @pytest.mark.network_budget(requests=..., bytes=..., duplicates=...)
+    """
+    if "page" not in request.fixturenames:
+        yield None
+        return
+
+    from utils.network_ledger import DEFAULT_ROUTE_BUDGETS, ROUTE_MARKERS, NetworkLedger, RouteBudget
+
+    page = request.getfixturevalue("page")
+    ledger = NetworkLedger().attach(page)
+    page.context.on("page", ledger.attach)
+    yield ledger
+    page.context.remove_listener("page", ledger.attach)
+    ledger.detach()
+
+    route = next((name for name in ROUTE_MARKERS if request.node.get_closest_marker(name)), None)
+    budget = DEFAULT_ROUTE_BUDGETS.get(route)
+    marker = request.node.get_closest_marker("network_budget")
+    if marker:
+        base = budget or RouteBudget()
+        budget = RouteBudget(
+            max_requests=marker.kwargs.get("requests", base.max_requests),
+            max_bytes=marker.kwargs.get("bytes", base.max_bytes),
+            max_duplicates=marker.kwargs.get("duplicates", base.max_duplicates),
+        )
+    violations = ledger.violations(budget, route or request.node.name) if budget else []
+
+    request.node.add_report_section("call", "network", ledger.format())
+    _network_rows.append({
+        "test": request.node.nodeid,
+        "route": route,
+        "summary": ledger.summary(),
+        "violations": violations,
+    })
+    rep_call = getattr(request.node, "rep_call", None)
+    if violations and (rep_call is None or rep_call.passed):
+        pytest.fail("Network over budget:\n" + "\n".join(violations), pytrace=False)
+
+
+# ==================== JS Coverage & Test Impact ====================
+
+_js_coverage = None
+_impact_rows: list = []
+_impact_lookup = None   # (SourceResolver, chapter id -> content path), built on first use
+
+
+def _record_impact(request, test_store, routes):
+    """Add this test's row to the impact index (utils.test_impact); pure tests touch no app code"""
+    global _impact_lookup
+    from utils.test_impact import SourceResolver, chapter_content_paths, impact_row
+
+    if _impact_lookup is None:
+        _impact_lookup = (SourceResolver(), chapter_content_paths())
+    resolver, chapter_paths = _impact_lookup
+    rep_call = getattr(request.node, "rep_call", None)
+    _impact_rows.append(impact_row(
+        request.node.nodeid,
+        resolver.sources(test_store.scripts) if test_store else (),
+        routes,
+        rep_call.duration if rep_call else 0.0,
+        markers={m.name for m in request.node.iter_markers()},
+        chapter_paths=chapter_paths,
+    ))
+
+
+@pytest.fixture(autouse=True)
+def js_coverage(request):
+    """
+    With JS_COVERAGE=1, record V8 block coverage of every page the test opens (utils.js_coverage)
+    With TEST_IMPACT_RECORD=1, also record which app sources and routes the test touched
+    Attached before the page fixture navigates, so boot code is included
+    """
+    global _js_coverage
+    coverage, impact = os.getenv('JS_COVERAGE'), os.getenv('TEST_IMPACT_RECORD')
+    if not (coverage or impact):
+        yield None
+        return
+    if "page" not in request.fixturenames:
+        yield None
+        if impact:
+            _record_impact(request, None, ())
+        return
+
+    from utils.js_coverage import CoverageStore, JSCoverage
+
+    # One collector per test; a second precise-coverage session on the same page would reset the first
+    test_store = CoverageStore()
+    collector = JSCoverage(test_store, lambda url: url.startswith(BASE_URL))
+    routes: list = []
+
+    def _track(page):
+        collector.attach(page)
+        page.on("framenavigated", lambda frame: routes.append(frame.url) if frame.parent_frame is None else None)
+
+    context = request.getfixturevalue("context")
+    context.on("page", _track)
+    request.getfixturevalue("page")
+    yield collector
+    context.remove_listener("page", _track)
+    collector.collect()
+    if coverage:
+        if _js_coverage is None:
+            _js_coverage = CoverageStore()
+        _js_coverage.merge(test_store)
+    if impact:
+        _record_impact(request, test_store, routes)
+
+
 # ==================== Screenshot Fixtures ====================
 
 @pytest.fixture(autouse=True)
-def screenshot_on_failure(request, page: Page):
+def screenshot_on_failure(request):
     """Automatically capture screenshot on test failure"""
+    # Content tool tests run without a browser page
+    page = request.getfixturevalue("page") if "page" in request.fixturenames else None
     yield
     
-    if request.node.rep_call.failed:
+    if page is not None and request.node.rep_call.failed:
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         test_name = request.node.name
         screenshot_path = SCREENSHOTS_DIR / f"{test_name}-{timestamp}.png"
@@ -177,6 +477,45 @@ def measure_performance(page: Page):
             print(f"  {action}: {duration}ms")
 
 
+@pytest.fixture(scope="session")
+def first_paint_log():
+    """
+    Collect per-route paint timings into reports/first-paint-<label>.json
+    Set PARSHA_LAYOUT to label a run and compare two runs with utils.parsha_shards compare;
+    under xdist each worker writes first-paint-<label>-<worker>.json and the controller merges them
+    """
+    label = os.getenv('PARSHA_LAYOUT', 'current')
+    routes: Dict[str, Any] = {}
+
+    def _record(route: str, metrics: Dict[str, Any]):
+        routes[route] = metrics
+
+    yield _record
+
+    if routes:
+        worker = os.getenv('PYTEST_XDIST_WORKER')
+        name = f"first-paint-{label}" + (f"-{worker}" if worker else "") + ".json"
+        (REPORTS_DIR / name).write_text(
+            json.dumps({'label': label, 'routes': routes}, ensure_ascii=False, indent=2), encoding='utf-8'
+        )
+
+
+@pytest.fixture(scope="session")
+def scroll_recorder():
+    """Collect per-page scroll smoothness into reports/scroll-smoothness.json"""
+    pages: Dict[str, Any] = {}
+
+    def _record(name: str, metrics: Dict[str, Any]):
+        pages[name] = metrics
+
+    yield _record
+
+    if pages:
+        worker = os.getenv('PYTEST_XDIST_WORKER')
+        name = "scroll-smoothness" + (f"-{worker}" if worker else "") + ".json"
+        (REPORTS_DIR / name).write_text(json.dumps(pages, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
 # ==================== Storage Fixtures ====================
 
 @pytest.fixture
@@ -239,8 +578,100 @@ def simulate_offline(page: Page):
     page.context.set_offline(False)
 
 
+# ==================== Flaky Tests ====================
+
+_flaky_gate = None
+_flaky_runs: list = []
+
+
+def _flaky_state():
+    """(RerunGate, quarantined node ids) for this process, from test_data/flaky-history.json"""
+    global _flaky_gate
+    if _flaky_gate is None:
+        from utils.flaky_tracker import RERUN_LEDGER_FILE, FlakyHistory, FlakyPolicy, RerunGate
+        policy = FlakyPolicy.from_env()
+        history = FlakyHistory.load()
+        gate = RerunGate(history, policy, ledger=REPORTS_DIR / RERUN_LEDGER_FILE)
+        _flaky_gate = (gate, history.quarantined(policy))
+    return _flaky_gate
+
+
+def _apply_flaky_lane(config, items):
+    """Mark quarantined tests non-blocking, or split them into their own lane"""
+    _, quarantined = _flaky_state()
+    lane = config.getoption("--flaky-lane")
+    if lane == "all":
+        for item in items:
+            if item.nodeid in quarantined:
+                item.add_marker(pytest.mark.xfail(
+                    reason=f"quarantined: flip rate {quarantined[item.nodeid]:.0%}", strict=False,
+                ))
+        return
+    keep = [item for item in items if (item.nodeid in quarantined) == (lane == "quarantine")]
+    if len(keep) != len(items):
+        config.hook.pytest_deselected(items=[item for item in items if item not in keep])
+        items[:] = keep
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """
+    Run a test; rerun suspected-flaky failures with fresh function fixtures (new context)
+    within the rerun budget, and report only the final attempt
+    """
+    from _pytest.runner import runtestprotocol
+    from utils.flaky_tracker import FAILED, PASSED, RERUN_PASSED, RunRecord
+
+    gate, quarantined = _flaky_state()
+    flaky_marker = item.get_closest_marker("flaky") is not None
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    attempts, lost_s, total_s = 0, 0.0, 0.0
+    while True:
+        attempts += 1
+        started = time.perf_counter()
+        reports = runtestprotocol(item, nextitem=nextitem, log=False)
+        elapsed = time.perf_counter() - started
+        total_s += elapsed
+        if attempts > 1:
+            gate.charge(elapsed)
+        failed = next((r for r in reports if r.failed), None)
+        if failed is None or item.nodeid in quarantined:
+            break
+        if not gate.allow(item.nodeid, attempts, flaky_marker, failed.longreprtext, estimate_s=elapsed):
+            break
+        lost_s += elapsed
+    infrastructure = _record_infrastructure_failures(item, reports)
+    for report in reports:
+        item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+    # xfail-marked quarantined tests report a real failure as skipped with wasxfail
+    real_failure = failed is not None or any(r.skipped and hasattr(r, "wasxfail") for r in reports)
+    skipped = any(r.skipped and not hasattr(r, "wasxfail") for r in reports)
+    if not skipped:
+        outcome = FAILED if real_failure else RERUN_PASSED if attempts > 1 else PASSED
+        if item.nodeid in quarantined and real_failure:
+            lost_s += total_s
+        _flaky_runs.append(RunRecord(
+            item.nodeid, outcome, attempts, round(total_s, 2), round(lost_s, 2), item.nodeid in quarantined,
+            failed.longreprtext[-300:] if failed is not None else None, infrastructure,
+        ))
+    return True
+
+
 # ==================== Hooks ====================
 
+_corpus = None   # utils.corpus_sampler sections, loaded on the first corpus_section parametrization
+_breaker = None
+
+
+def _circuit_breaker():
+    global _breaker
+    if _breaker is None:
+        from utils.health_gate import CircuitBreaker
+        _breaker = CircuitBreaker(REPORTS_DIR)
+    return _breaker
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Make test results available to fixtures"""
@@ -249,14 +680,223 @@ def pytest_runtest_makereport(item, call):
     setattr(item, "rep_" + rep.when, rep)
 
 
+def _record_infrastructure_failures(item, reports):
+    """
+    Feed the circuit breaker from the final attempt only; a flake that passes on rerun is not counted
+    Returns whether any failure was infrastructure (kept out of the flaky history)
+    """
+    from utils.health_gate import infrastructure_failure
+    found = False
+    for report in reports:
+        if report.failed:
+            reason = infrastructure_failure(report.when, str(report.longrepr))
+            if reason:
+                _circuit_breaker().record(item.nodeid, reason)
+                found = True
+    return found
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Skip browser tests at once while the circuit breaker is open (utils.health_gate)"""
+    from utils.health_gate import BROWSER_FIXTURES
+
+    if any(name in item.fixturenames for name in BROWSER_FIXTURES):
+        reason = _circuit_breaker().open_reason()
+        if reason:
+            pytest.skip(reason)
+
+
+def pytest_addoption(parser):
+    """Suite options"""
+    parser.addoption(
+        "--impact", action="store_true", default=False,
+        help="Run only tests affected by changes since the test impact index was recorded (utils.test_impact)",
+    )
+    parser.addoption(
+        "--no-health-gate", action="store_true", default=False,
+        help="Skip the session-start boot check (utils.health_gate); the circuit breaker still applies",
+    )
+    parser.addoption(
+        "--flaky-lane", choices=("all", "blocking", "quarantine"), default="all",
+        help="all: quarantined tests run as non-strict xfail; blocking: skip them; quarantine: run only them",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Check emulator tests are serialized, apply the flaky quarantine lane, then (with --impact) deselect"""
+    from utils.qa_dataset import EMULATOR_XDIST_GROUP
+
+    for item in items:
+        if {'search_oracle', 'seeded_questions'} & set(getattr(item, 'fixturenames', ())):
+            groups = {m.args[0] if m.args else m.kwargs.get('name') for m in item.iter_markers('xdist_group')}
+            if EMULATOR_XDIST_GROUP not in groups:
+                raise pytest.UsageError(f"{item.nodeid} seeds the Firestore emulator; "
+                                        f"mark it @pytest.mark.xdist_group(EMULATOR_XDIST_GROUP)")
+    _apply_flaky_lane(config, items)
+    if not config.getoption("--impact"):
+        return
+    from utils.test_impact import SELECTION_FILE, select_for_run
+
+    selection = select_for_run({item.nodeid: {m.name for m in item.iter_markers()} for item in items})
+    if not selection.fallback:
+        keep = set(selection.selected)
+        config.hook.pytest_deselected(items=[item for item in items if item.nodeid not in keep])
+        items[:] = [item for item in items if item.nodeid in keep]
+    # Under xdist only workers collect; they all compute the same selection and the controller reports it
+    (REPORTS_DIR / SELECTION_FILE).write_text(json.dumps(selection.to_dict(), indent=2), encoding='utf-8')
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize `corpus_section` with today's stratified sample (utils.corpus_sampler)"""
+    if 'corpus_section' not in metafunc.fixturenames:
+        return
+    from utils.corpus_sampler import DEFAULT_CASE_S, STRATA, budget_cases, daily_seed, load_corpus, sample
+
+    global _corpus
+    if _corpus is None:
+        _corpus = load_corpus()
+    marker = metafunc.definition.get_closest_marker('corpus_sample')
+    options = marker.kwargs if marker else {}
+    cases = sample(
+        _corpus, daily_seed(), budget_cases(options.get('budget_s'), options.get('per_test_s', DEFAULT_CASE_S)),
+        strata=options.get('strata', STRATA), rotate=options.get('rotate', True),
+    )
+    metafunc.parametrize('corpus_section', [case.section for case in cases], ids=[case.id for case in cases])
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Circuit breaker, test impact selection and time lost to flakiness, after the results"""
+    from utils.flaky_tracker import format_run, load_worker_runs
+    from utils.health_gate import SKIP_PREFIX
+    from utils.test_impact import SELECTION_FILE, Selection
+
+    reason = _circuit_breaker().open_reason()
+    if reason:
+        skipped = sum(1 for rep in terminalreporter.stats.get('skipped', []) if SKIP_PREFIX in str(rep.longrepr))
+        if skipped:
+            terminalreporter.write_line(f"⛔ {reason}; {skipped} browser test(s) skipped", red=True)
+    runs = load_worker_runs(REPORTS_DIR)
+    if any(run.attempts > 1 or run.lost_s for run in runs):
+        terminalreporter.write_line("🔁 " + format_run(runs))
+    path = REPORTS_DIR / SELECTION_FILE
+    if config.getoption("--impact") and path.exists():
+        terminalreporter.write_line("🎯 " + Selection.from_dict(json.loads(path.read_text(encoding='utf-8'))).format())
+
+
 def pytest_configure(config):
     """Configure pytest"""
+    if not os.getenv('PYTEST_XDIST_WORKER'):
+        # Per-worker network summaries and coverage from a previous run would leak into this run's reports
+        for stale in [*REPORTS_DIR.glob('network-*.json'), *REPORTS_DIR.glob('js-coverage-*.json'),
+                      *REPORTS_DIR.glob('impact-rows-*.json'), *REPORTS_DIR.glob('flaky-runs-*.json'),
+                      *REPORTS_DIR.glob('first-paint-*-gw*.json'), *REPORTS_DIR.glob('flaky-rerun-spent.ndjson'),
+                      *REPORTS_DIR.glob('browser-tests-gw*.json'), *REPORTS_DIR.glob('health-gate.json')]:
+            stale.unlink()
+        _circuit_breaker().reset()
+        # Workers inherit the environment; pinning the seed keeps their collections identical
+        from utils.corpus_sampler import daily_seed
+        os.environ['CORPUS_SAMPLE_SEED'] = str(daily_seed())
     print(f"\n🚀 Starting Kitzur App E2E Tests")
     print(f"📍 Base URL: {BASE_URL}")
     print(f"📁 Screenshots: {SCREENSHOTS_DIR}")
-    print(f"📊 Reports: {REPORTS_DIR}\n")
+    print(f"📊 Reports: {REPORTS_DIR}")
+    print(f"🎲 Corpus sample seed: {os.environ.get('CORPUS_SAMPLE_SEED')}\n")
+
+
+def _run_health_gate(config):
+    """Open the app once (utils.health_gate); a failed check trips the circuit breaker"""
+    if config.getoption("--no-health-gate") or config.option.collectonly:
+        return
+    from utils.health_gate import run_health_gate
+
+    # The browser the session's fixtures launch (pytest-playwright --browser / --browser-channel / --headed)
+    browser_name = (config.getoption("--browser") or ['chromium'])[0]
+    launch_args = {'headless': not config.getoption("--headed")}
+    if config.getoption("--browser-channel"):
+        launch_args['channel'] = config.getoption("--browser-channel")
+    report = run_health_gate(BASE_URL, browser_name=browser_name, launch_args=launch_args)
+    (REPORTS_DIR / 'health-gate.json').write_text(json.dumps(report.to_dict(), indent=2), encoding='utf-8')
+    print(f"{'🩺' if report.ok else '⛔'} {report.format()}")
+    if not report.ok:
+        _circuit_breaker().trip(report.reason)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_finish(session):
+    """Health gate: run it before the first test, and only when a collected test uses the browser"""
+    from utils.health_gate import BROWSER_FIXTURES
+
+    browser_tests = sum(1 for item in session.items if any(name in item.fixturenames for name in BROWSER_FIXTURES))
+    worker = os.getenv('PYTEST_XDIST_WORKER')
+    if worker:
+        # The xdist controller collects nothing; it reads this before scheduling any test
+        (REPORTS_DIR / f'browser-tests-{worker}.json').write_text(json.dumps(browser_tests), encoding='utf-8')
+    elif browser_tests:
+        _run_health_gate(session.config)
+
+
+_health_gate_checked = False
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    """Health gate under xdist: after the first worker has collected, before tests are scheduled"""
+    global _health_gate_checked
+    if _health_gate_checked:
+        return
+    _health_gate_checked = True
+    counts = REPORTS_DIR / f'browser-tests-{node.gateway.id}.json'
+    if counts.exists() and json.loads(counts.read_text(encoding='utf-8')):
+        _run_health_gate(node.config)
 
 
 def pytest_sessionfinish(session, exitstatus):
     """Session cleanup"""
+    if not os.getenv('PYTEST_XDIST_WORKER') and exitstatus == pytest.ExitCode.OK and _circuit_breaker().open_reason():
+        # Skipped browser tests must not turn an app that does not boot into a green run
+        session.exitstatus = exitstatus = pytest.ExitCode.TESTS_FAILED
+    if _network_rows:
+        from utils.network_ledger import write_worker_summary
+        write_worker_summary(_network_rows, REPORTS_DIR, os.getenv('PYTEST_XDIST_WORKER'))
+    if _js_coverage is not None:
+        _js_coverage.write(REPORTS_DIR, os.getenv('PYTEST_XDIST_WORKER'))
+    if os.getenv('JS_COVERAGE') and not os.getenv('PYTEST_XDIST_WORKER'):
+        # Workers have written their files by now; union them and map through the source maps
+        from utils.js_coverage import write_reports
+        summary = write_reports(REPORTS_DIR)
+        if summary:
+            print(f"\n🧪 {summary}\n   lcov/HTML: {REPORTS_DIR / 'js-coverage'}")
+    if not os.getenv('PYTEST_XDIST_WORKER'):
+        from utils.parsha_shards import merge_first_paint
+        merge_first_paint(REPORTS_DIR)
+    if _flaky_runs:
+        from utils.flaky_tracker import write_worker_runs
+        write_worker_runs(_flaky_runs, REPORTS_DIR, os.getenv('PYTEST_XDIST_WORKER'))
+    if not os.getenv('PYTEST_XDIST_WORKER'):
+        from utils.flaky_tracker import FlakyHistory, load_worker_runs
+        runs = load_worker_runs(REPORTS_DIR)
+        if runs:
+            history = FlakyHistory.load()
+            history.record(runs)
+            history.save()
+    if _impact_rows:
+        from utils.test_impact import write_worker_rows
+        write_worker_rows(_impact_rows, REPORTS_DIR, os.getenv('PYTEST_XDIST_WORKER'))
+    if os.getenv('TEST_IMPACT_RECORD') and not os.getenv('PYTEST_XDIST_WORKER'):
+        from utils.test_impact import merge_worker_rows
+        index = merge_worker_rows(REPORTS_DIR)
+        if index:
+            print(f"\n🎯 Test impact index: {len(index.tests)} tests at {index.commit[:10] if index.commit else '?'}")
     print(f"\n✅ Test session finished with status: {exitstatus}")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Per-route network totals at the top of the HTML report"""
+    from utils.network_ledger import load_summaries, summary_html
+
+    rows = load_summaries(REPORTS_DIR)
+    if rows:
+        prefix.append(summary_html(rows))
+
@@ -0,0 +1,409 @@
+"""
+Async Base Page Object
+asyncio counterpart of BasePage for driving many pages concurrently in one worker
+"""
+from playwright.async_api import Page, Locator, expect
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import asyncio
+import inspect
+import time
+from .base_page import CHILD_TEXTS_JS, ELEMENT_FACTS_JS, SNAPSHOT_JS
+from utils.console_collector import ConsoleCollector
+from utils.scroll_probe import (
+    FRAME_COLLECT_JS, FRAME_RECORDER_JS, SCROLL_TARGET_JS, SCROLL_TOP_JS, SmoothScroller, smoothness_stats,
+)
+
+
+class AsyncBasePage:
+    """asyncio counterpart of BasePage with the same method surface"""
+    
+    def __init__(self, page: Page):
+        self.page = page
+        self.base_url = "http://localhost:8081"
+    
+    def _adopt_locators(self, page_class):
+        """Reuse the selectors of the matching sync page object so both layers stay in step"""
+        for name, value in vars(page_class(None)).items():
+            if name not in ("page", "base_url"):
+                setattr(self, name, value)
+    
+    # ==================== Navigation ====================
+    
+    async def goto(self, path: str = ""):
+        """Navigate to a specific path"""
+        url = f"{self.base_url}/{path}" if path else self.base_url
+        await self.page.goto(url)
+        await self.wait_for_page_load()
+    
+    async def wait_for_page_load(self, timeout: int = 30000):
+        """Wait for page to fully load"""
+        await self.page.wait_for_load_state("networkidle", timeout=timeout)
+        await self.page.wait_for_load_state("domcontentloaded", timeout=timeout)
+    
+    async def reload(self):
+        """Reload the current page"""
+        await self.page.reload()
+        await self.wait_for_page_load()
+    
+    async def go_back(self):
+        """Navigate back"""
+        await self.page.go_back()
+        await self.wait_for_page_load()
+    
+    # ==================== Element Interactions ====================
+    
+    async def click(self, selector: str, timeout: int = 10000):
+        """Click an element"""
+        await self.page.click(selector, timeout=timeout)
+        await self.page.wait_for_timeout(500)  # Brief pause after click
+    
+    async def fill(self, selector: str, text: str):
+        """Fill an input field"""
+        await self.page.fill(selector, text)
+    
+    async def type(self, selector: str, text: str, delay: int = 100):
+        """Type text with delay (simulates human typing)"""
+        await self.page.type(selector, text, delay=delay)
+    
+    async def select_option(self, selector: str, value: str):
+        """Select an option from dropdown"""
+        await self.page.select_option(selector, value)
+    
+    async def check(self, selector: str):
+        """Check a checkbox"""
+        await self.page.check(selector)
+    
+    async def uncheck(self, selector: str):
+        """Uncheck a checkbox"""
+        await self.page.uncheck(selector)
+    
+    # ==================== Element Queries ====================
+    
+    def get_element(self, selector: str) -> Locator:
+        """Get a single element"""
+        return self.page.locator(selector)
+    
+    async def get_elements(self, selector: str) -> list[Locator]:
+        """Get multiple elements"""
+        return await self.page.locator(selector).all()
+    
+    async def get_text(self, selector: str) -> str:
+        """Get element text content"""
+        return (await self.page.locator(selector).text_content()) or ""
+    
+    async def get_attribute(self, selector: str, attribute: str) -> Optional[str]:
+        """Get element attribute"""
+        return await self.page.locator(selector).get_attribute(attribute)
+    
+    async def get_value(self, selector: str) -> str:
+        """Get input value"""
+        return await self.page.locator(selector).input_value()
+    
+    # ==================== Bulk Snapshot ====================
+    
+    async def snapshot(self, selectors: Iterable[str], limit: int = 50) -> Dict[str, Dict[str, Any]]:
+        """
+        Count, texts, visibility, bounding boxes and computed direction for many selectors in one evaluate
+        Per-element lists are capped at `limit`; selectors only Playwright understands cost one extra call each
+        """
+        selectors = list(dict.fromkeys(selectors))
+        result = await self.page.evaluate(SNAPSHOT_JS, {"selectors": selectors, "limit": limit})
+        for selector in selectors:
+            if result.get(selector) is None:
+                result[selector] = await self.page.locator(selector).evaluate_all(
+                    f"elements => ({ELEMENT_FACTS_JS.strip()})(elements, {int(limit)})"
+                )
+        return result
+    
+    async def count(self, selector: str) -> int:
+        """Number of elements matching selector (one round trip)"""
+        return (await self.snapshot([selector], limit=0))[selector]["count"]
+    
+    async def texts(self, selector: str, limit: int = 50) -> List[str]:
+        """Trimmed text of the first `limit` matches (one round trip)"""
+        return (await self.snapshot([selector], limit=limit))[selector]["texts"]
+    
+    async def child_texts(self, container: str, child: str, limit: int = 50) -> List[str]:
+        """Text of the first `child` inside each of the first `limit` containers, '' where missing (one round trip)"""
+        return await self.page.locator(container).evaluate_all(CHILD_TEXTS_JS, [child, limit])
+    
+    # ==================== Visibility & State ====================
+    
+    async def is_visible(self, selector: str, timeout: int = 5000) -> bool:
+        """Check if element is visible"""
+        try:
+            return await self.page.locator(selector).is_visible(timeout=timeout)
+        except:
+            return False
+    
+    async def is_hidden(self, selector: str) -> bool:
+        """Check if element is hidden"""
+        return await self.page.locator(selector).is_hidden()
+    
+    async def is_enabled(self, selector: str) -> bool:
+        """Check if element is enabled"""
+        return await self.page.locator(selector).is_enabled()
+    
+    async def is_disabled(self, selector: str) -> bool:
+        """Check if element is disabled"""
+        return await self.page.locator(selector).is_disabled()
+    
+    async def is_checked(self, selector: str) -> bool:
+        """Check if checkbox/radio is checked"""
+        return await self.page.locator(selector).is_checked()
+    
+    # ==================== Waiting ====================
+    
+    async def wait_for_selector(self, selector: str, timeout: int = 10000):
+        """Wait for element to appear"""
+        await self.page.wait_for_selector(selector, timeout=timeout)
+    
+    async def wait_for_text(self, text: str, timeout: int = 10000):
+        """Wait for specific text to appear"""
+        await self.page.wait_for_selector(f"text={text}", timeout=timeout)
+    
+    async def wait_for_url(self, url_pattern: str, timeout: int = 10000):
+        """Wait for URL to match pattern"""
+        await self.page.wait_for_url(url_pattern, timeout=timeout)
+    
+    async def wait_for_timeout(self, milliseconds: int):
+        """Wait for specific duration"""
+        await self.page.wait_for_timeout(milliseconds)
+    
+    async def wait_for_element_hidden(self, selector: str, timeout: int = 10000):
+        """Wait for element to disappear"""
+        await self.page.wait_for_selector(selector, state="hidden", timeout=timeout)
+    
+    # ==================== Assertions ====================
+    
+    async def assert_visible(self, selector: str, message: str = ""):
+        """Assert element is visible"""
+        await expect(self.page.locator(selector)).to_be_visible()
+    
+    async def assert_hidden(self, selector: str):
+        """Assert element is hidden"""
+        await expect(self.page.locator(selector)).to_be_hidden()
+    
+    async def assert_text(self, selector: str, expected_text: str):
+        """Assert element contains text"""
+        await expect(self.page.locator(selector)).to_contain_text(expected_text)
+    
+    async def assert_exact_text(self, selector: str, expected_text: str):
+        """Assert element has exact text"""
+        await expect(self.page.locator(selector)).to_have_text(expected_text)
+    
+    async def assert_count(self, selector: str, expected_count: int):
+        """Assert number of elements"""
+        await expect(self.page.locator(selector)).to_have_count(expected_count)
+    
+    async def assert_url_contains(self, url_part: str):
+        """Assert URL contains string"""
+        await expect(self.page).to_have_url(lambda url: url_part in url)
+    
+    async def assert_attribute(self, selector: str, attribute: str, value: str):
+        """Assert element attribute value"""
+        await expect(self.page.locator(selector)).to_have_attribute(attribute, value)
+    
+    # ==================== Scrolling ====================
+    
+    async def scroll_to_element(self, selector: str):
+        """Scroll element into view"""
+        await self.page.locator(selector).scroll_into_view_if_needed()
+    
+    async def scroll_to_top(self):
+        """Scroll to top of page"""
+        await self.page.evaluate("window.scrollTo(0, 0)")
+    
+    async def scroll_to_bottom(self):
+        """Scroll to bottom of page"""
+        await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    
+    async def scroll_by(self, x: int, y: int):
+        """Scroll by specific amount"""
+        await self.page.evaluate(f"window.scrollBy({x}, {y})")
+    
+    # ==================== Screenshots ====================
+    
+    async def take_screenshot(self, name: str, full_page: bool = True) -> str:
+        """Take a screenshot"""
+        path = f"screenshots/{name}-{int(time.time())}.png"
+        await self.page.screenshot(path=path, full_page=full_page)
+        return path
+    
+    async def take_element_screenshot(self, selector: str, name: str) -> str:
+        """Take screenshot of specific element"""
+        path = f"screenshots/{name}-{int(time.time())}.png"
+        await self.page.locator(selector).screenshot(path=path)
+        return path
+    
+    # ==================== JavaScript Execution ====================
+    
+    async def execute_script(self, script: str, *args):
+        """Execute JavaScript"""
+        return await self.page.evaluate(script, *args)
+    
+    async def get_local_storage(self, key: str) -> Optional[str]:
+        """Get localStorage item"""
+        return await self.execute_script(f"localStorage.getItem('{key}')")
+    
+    async def set_local_storage(self, key: str, value: str):
+        """Set localStorage item"""
+        await self.execute_script(f"localStorage.setItem('{key}', '{value}')")
+    
+    async def clear_local_storage(self):
+        """Clear all localStorage"""
+        await self.execute_script("localStorage.clear()")
+    
+    # ==================== Performance Probes ====================
+    
+    async def measure_settle(self, action, quiet_ms: int = 150, timeout: int = 30000) -> float:
+        """
+        Run action and return ms until the DOM stops changing (last mutation after it started)
+        Returns 0 if the action caused no mutation at all
+        """
+        await self.page.evaluate("""() => {
+            window.__kzLastMutation = null;
+            if (!window.__kzSettleObserver) {
+                window.__kzSettleObserver = new MutationObserver(() => { window.__kzLastMutation = performance.now(); });
+                window.__kzSettleObserver.observe(document, { childList: true, subtree: true, characterData: true });
+            }
+            window.__kzActionStart = performance.now();
+        }""")
+        result = action()
+        if inspect.isawaitable(result):
+            await result
+        await self.page.wait_for_function(
+            """quiet => performance.now() - (window.__kzLastMutation ?? window.__kzActionStart) > quiet""",
+            arg=quiet_ms, timeout=timeout, polling="raf",
+        )
+        return await self.page.evaluate(
+            "() => window.__kzLastMutation === null ? 0 : window.__kzLastMutation - window.__kzActionStart"
+        )
+    
+    async def dom_node_count(self) -> int:
+        """Number of elements in the document"""
+        return await self.page.evaluate("() => document.getElementsByTagName('*').length")
+    
+    async def js_heap_used(self, collect_garbage: bool = True) -> Optional[int]:
+        """Used JS heap in bytes via CDP (Chromium only; None elsewhere)"""
+        try:
+            cdp = await self.page.context.new_cdp_session(self.page)
+        except Exception:
+            return None
+        try:
+            if collect_garbage:
+                await cdp.send("HeapProfiler.collectGarbage")
+            await cdp.send("Performance.enable")
+            metrics = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+            return int(metrics["JSHeapUsedSize"])
+        finally:
+            await cdp.detach()
+    
+    def round_trips(self) -> Optional[int]:
+        """
+        Messages sent to the Playwright driver so far on this connection; diff two readings to count round trips
+        Reads a private counter of the Python client, so returns None if a Playwright upgrade moves it
+        """
+        connection = getattr(getattr(self.page, "_impl_obj", None), "_connection", None)
+        last_id = getattr(connection, "_last_id", None)
+        return last_id if isinstance(last_id, int) else None
+    
+    async def measure_scroll_smoothness(self, distance: Optional[int] = None, velocity: float = 1500,
+                                        source: str = "wheel") -> dict:
+        """
+        Scroll the scrolling element with real wheel/touch input at `velocity` px/s (default: to its bottom)
+        Returns FPS percentiles, janky-frame ratio, long tasks and the distance actually scrolled
+        """
+        target = await self.page.evaluate(SCROLL_TARGET_JS, None)
+        if distance is None:
+            distance = target["remaining"]
+        await self.page.evaluate(FRAME_RECORDER_JS)
+        start = time.perf_counter()
+        browser = self.page.context.browser
+        if source == "touch" and browser is not None and browser.browser_type.name == "chromium":
+            cdp = await self.page.context.new_cdp_session(self.page)
+            try:
+                await cdp.send("Input.synthesizeScrollGesture", {
+                    "x": target["x"],
+                    "y": target["touch_y"],
+                    "yDistance": -distance,
+                    "speed": int(velocity),
+                    "gestureSourceType": "touch",
+                    "preventFling": True,
+                })
+            finally:
+                await cdp.detach()
+        else:
+            await self.page.mouse.move(target["x"], target["y"])
+            step = max(1, int(velocity * SmoothScroller.WHEEL_STEP_MS / 1000))
+            scrolled = 0
+            while scrolled < distance:
+                delta = min(step, distance - scrolled)
+                await self.page.mouse.wheel(0, delta)
+                scrolled += delta
+                await asyncio.sleep(SmoothScroller.WHEEL_STEP_MS / 1000)
+        await self.page.wait_for_timeout(100)
+        recorded = await self.page.evaluate(FRAME_COLLECT_JS)
+        stats = smoothness_stats(recorded["intervals"], recorded["longTasks"])
+        stats.update({
+            "source": source,
+            "requested_px": distance,
+            "distance_px": round(await self.page.evaluate(SCROLL_TOP_JS) - target["scroll_top"]),
+            "velocity_px_s": velocity,
+            "duration_ms": round((time.perf_counter() - start) * 1000),
+        })
+        return stats
+    
+    # ==================== Mobile Specific ====================
+    
+    async def swipe_left(self):
+        """Swipe left (mobile gesture)"""
+        await self.page.evaluate("window.scrollBy(300, 0)")
+    
+    async def swipe_right(self):
+        """Swipe right (mobile gesture)"""
+        await self.page.evaluate("window.scrollBy(-300, 0)")
+    
+    async def swipe_up(self):
+        """Swipe up (mobile gesture)"""
+        await self.page.evaluate("window.scrollBy(0, 300)")
+    
+    async def swipe_down(self):
+        """Swipe down (mobile gesture)"""
+        await self.page.evaluate("window.scrollBy(0, -300)")
+    
+    # ==================== Hebrew/RTL Helpers ====================
+    
+    async def assert_rtl_direction(self, selector: str):
+        """Assert element has RTL direction"""
+        direction = await self.get_attribute(selector, "dir")
+        assert direction == "rtl", f"Element is not RTL. Direction: {direction}"
+    
+    async def get_computed_style(self, selector: str, property: str) -> str:
+        """Get computed CSS property"""
+        return await self.execute_script(
+            f"getComputedStyle(document.querySelector('{selector}')).{property}"
+        )
+    
+    # ==================== Debug Helpers ====================
+    
+    async def pause(self):
+        """Pause execution for debugging"""
+        await self.page.pause()
+    
+    def print_console_logs(self, levels: Optional[Sequence[str]] = None):
+        """Print console messages, page errors and failed requests captured for this page's context"""
+        collector = ConsoleCollector.for_context(self.page.context)
+        if collector is None:
+            # Read-only: the console_collector fixture attaches (and detaches) the collector
+            print("Console logs: (no collector on this context; the console_collector fixture records them)")
+            return
+        print(f"Console logs:\n{collector.format(levels) or '(none)'}")
+    
+    async def get_page_title(self) -> str:
+        """Get page title"""
+        return await self.page.title()
+    
+    def get_current_url(self) -> str:
+        """Get current URL"""
+        return self.page.url
@@ -0,0 +1,46 @@
+"""
+Async Browse Page Object
+asyncio counterpart of BrowsePage
+"""
+from .async_base_page import AsyncBasePage
+from .browse_page import BrowsePage
+from playwright.async_api import Page
+
+
+class AsyncBrowsePage(AsyncBasePage):
+    """Browse chapters functionality"""
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self._adopt_locators(BrowsePage)
+    
+    async def goto_browse(self):
+        """Navigate to browse page"""
+        await self.goto("browse")
+        await self.wait_for_selector(self.page_title)
+    
+    async def get_chapters_count(self) -> int:
+        """Count visible chapters"""
+        return await self.count(self.chapter_items)
+    
+    async def click_chapter(self, chapter_number: int):
+        """Click specific chapter by number"""
+        selector = f"text=סימן {chapter_number}"
+        await self.click(selector)
+        await self.wait_for_url("**/chapter/**")
+    
+    async def search_chapters(self, query: str):
+        """Search for chapters"""
+        await self.fill(self.search_input, query)
+        await self.wait_for_timeout(500)
+    
+    async def get_first_chapter_title(self) -> str:
+        """Get first chapter title"""
+        selector = f"{self.chapter_items}:first-of-type [class*='title']"
+        return await self.get_text(selector)
+    
+    async def assert_chapters_loaded(self):
+        """Verify chapters are displayed"""
+        count = await self.get_chapters_count()
+        assert count > 0, "No chapters loaded"
+        assert count == 221, f"Expected 221 chapters, got {count}"
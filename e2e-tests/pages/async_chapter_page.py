@@ -0,0 +1,48 @@
+"""
+Async Chapter Page Object
+asyncio counterpart of ChapterPage
+"""
+from .async_base_page import AsyncBasePage
+from .chapter_page import ChapterPage
+from playwright.async_api import Page
+
+
+class AsyncChapterPage(AsyncBasePage):
+    """Chapter reading and interaction"""
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self._adopt_locators(ChapterPage)
+    
+    async def goto_chapter(self, chapter_id: str):
+        """Navigate to specific chapter"""
+        await self.goto(f"chapter/{chapter_id}")
+        await self.wait_for_selector(self.chapter_title)
+    
+    async def get_chapter_title(self) -> str:
+        """Get chapter title"""
+        return await self.get_text(self.chapter_title)
+    
+    async def get_sections_count(self) -> int:
+        """Count sections in chapter"""
+        return await self.count(self.section_items)
+    
+    async def click_section(self, section_number: int):
+        """Click specific section"""
+        selector = f"text=סעיף {section_number}"
+        await self.click(selector)
+        await self.wait_for_url("**/section/**")
+    
+    async def mark_as_completed(self):
+        """Mark chapter as completed"""
+        await self.click(self.mark_complete_button)
+        await self.wait_for_timeout(500)
+    
+    async def is_marked_completed(self) -> bool:
+        """Check if chapter is marked as completed"""
+        return await self.is_visible("text=בוטל סימון")
+    
+    async def go_back_to_browse(self):
+        """Navigate back to browse"""
+        await self.click(self.back_button)
+        await self.wait_for_url("**/browse")
@@ -0,0 +1,221 @@
+"""
+Async Home Page Object
+asyncio counterpart of HomePage
+"""
+from .async_base_page import AsyncBasePage
+from .home_page import HomePage
+from playwright.async_api import Page
+from typing import Dict, List
+
+
+class AsyncHomePage(AsyncBasePage):
+    """Home page interactions and verifications"""
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self._adopt_locators(HomePage)
+    
+    # ==================== Navigation ====================
+    
+    async def goto_home(self):
+        """Navigate to home page"""
+        await self.goto("")
+        await self.wait_for_home_loaded()
+    
+    async def wait_for_home_loaded(self):
+        """Wait for home page to fully load"""
+        await self.wait_for_selector(self.daily_quote_title, timeout=15000)
+        await self.wait_for_page_load()
+    
+    async def click_home_tab(self):
+        """Click home tab in navigation"""
+        await self.click(self.home_tab)
+        await self.wait_for_home_loaded()
+    
+    async def get_dashboard_state(self) -> Dict[str, bool]:
+        """Visibility of every home card and quick action from a single snapshot"""
+        sections = {
+            "daily_quote": self.daily_quote_title,
+            "continue_learning": self.continue_learning_card,
+            "progress_ring": self.progress_ring,
+            "streak_counter": self.streak_counter,
+            "quick_actions": self.quick_actions_grid,
+            "recent_questions": self.recent_questions,
+            "browse": self.browse_button,
+            "questions": self.questions_button,
+            "bookmarks": self.bookmarks_button,
+            "parsha": self.parsha_button,
+        }
+        snapshot = await self.snapshot(sections.values(), limit=5)
+        return {name: snapshot[selector]["visible_count"] > 0 for name, selector in sections.items()}
+    
+    # ==================== Daily Quote ====================
+    
+    async def is_daily_quote_visible(self) -> bool:
+        """Check if daily quote card is visible"""
+        return await self.is_visible(self.daily_quote_title)
+    
+    async def get_daily_quote_title(self) -> str:
+        """Get the current daily halacha title"""
+        selector = f"{self.daily_quote_title} + *"
+        return await self.get_text(selector)
+    
+    async def click_daily_quote(self):
+        """Click on daily quote card to navigate to section"""
+        await self.click(self.daily_quote_title)
+        await self.wait_for_url("**/section/**")
+    
+    async def assert_daily_quote_shows_chapter(self, chapter_number: int):
+        """Verify daily quote shows specific chapter"""
+        selector = f"text=סימן {chapter_number}"
+        await self.assert_visible(selector)
+    
+    # ==================== Continue Learning ====================
+    
+    async def is_continue_learning_visible(self) -> bool:
+        """Check if continue learning card exists"""
+        return await self.is_visible(self.continue_learning_card)
+    
+    async def click_continue_learning(self):
+        """Click continue learning card"""
+        await self.click(self.continue_learning_card)
+        await self.wait_for_timeout(1000)
+    
+    async def get_continue_learning_text(self) -> str:
+        """Get continue learning card text"""
+        return await self.get_text(self.continue_learning_card)
+    
+    # ==================== Progress Ring ====================
+    
+    async def is_progress_ring_visible(self) -> bool:
+        """Check if progress ring is displayed"""
+        return await self.is_visible(self.progress_ring)
+    
+    async def get_progress_percentage(self) -> str:
+        """Get progress percentage text"""
+        selector = f"{self.progress_ring} text='%'"
+        return await self.get_text(selector)
+    
+    async def get_completed_sections_count(self) -> str:
+        """Get count of completed sections"""
+        selector = "text=סימנים שהושלמו"
+        return await self.get_text(selector)
+    
+    # ==================== Streak Counter ====================
+    
+    async def is_streak_counter_visible(self) -> bool:
+        """Check if streak counter is shown"""
+        return await self.is_visible(self.streak_counter)
+    
+    async def get_streak_days(self) -> int:
+        """Get current streak in days"""
+        selector = f"{self.streak_counter}"
+        text = await self.get_text(selector)
+        # Extract number from "X ימים ברצף"
+        import re
+        match = re.search(r'(\d+)', text)
+        return int(match.group(1)) if match else 0
+    
+    async def assert_streak_greater_than(self, minimum: int):
+        """Assert streak is at least minimum days"""
+        streak = await self.get_streak_days()
+        assert streak >= minimum, f"Streak {streak} is less than {minimum}"
+    
+    # ==================== Quick Actions ====================
+    
+    async def is_quick_actions_visible(self) -> bool:
+        """Check if quick actions grid is shown"""
+        return await self.is_visible(self.quick_actions_grid)
+    
+    async def click_browse(self):
+        """Click browse quick action"""
+        await self.click(self.browse_button)
+        await self.wait_for_url("**/browse")
+    
+    async def click_questions(self):
+        """Click questions quick action"""
+        await self.click(self.questions_button)
+        await self.wait_for_url("**/questions")
+    
+    async def click_bookmarks(self):
+        """Click bookmarks quick action"""
+        await self.click(self.bookmarks_button)
+        await self.wait_for_url("**/bookmarks")
+    
+    async def click_parsha(self):
+        """Click parsha quick action"""
+        await self.click(self.parsha_button)
+        await self.wait_for_url("**/shnayim-mikra")
+    
+    async def assert_all_quick_actions_visible(self):
+        """Verify all quick action buttons are present"""
+        await self.assert_visible(self.browse_button, "Browse button not visible")
+        await self.assert_visible(self.questions_button, "Questions button not visible")
+        await self.assert_visible(self.bookmarks_button, "Bookmarks button not visible")
+        await self.assert_visible(self.parsha_button, "Parsha button not visible")
+    
+    # ==================== Recent Questions ====================
+    
+    async def is_recent_questions_visible(self) -> bool:
+        """Check if recent questions section exists"""
+        return await self.is_visible(self.recent_questions)
+    
+    async def get_recent_questions_count(self) -> int:
+        """Count visible recent questions"""
+        return await self.count("[class*='questionCard']")
+    
+    async def click_first_recent_question(self):
+        """Click on the first recent question"""
+        await self.click("[class*='questionCard']:first-of-type")
+        await self.wait_for_url("**/question/**")
+    
+    async def get_recent_question_title(self, index: int = 0) -> str:
+        """Get title of a recent question by index"""
+        titles = await self.get_recent_question_titles(limit=index + 1)
+        return titles[index] if index < len(titles) else ""
+    
+    async def get_recent_question_titles(self, limit: int = 50) -> List[str]:
+        """Titles of the first `limit` recent questions in one round trip"""
+        return await self.child_texts("[class*='questionCard']", "[class*='questionTitle']", limit=limit)
+    
+    async def assert_recent_questions_exist(self):
+        """Verify at least one recent question is shown"""
+        count = await self.get_recent_questions_count()
+        assert count > 0, "No recent questions visible"
+    
+    # ==================== Bottom Navigation ====================
+    
+    async def navigate_to_browse(self):
+        """Navigate using bottom tab"""
+        await self.click("text=דפדוף")
+        await self.wait_for_timeout(1000)
+    
+    async def navigate_to_questions(self):
+        """Navigate to questions tab"""
+        await self.click("text=שאלות")
+        await self.wait_for_timeout(1000)
+    
+    async def navigate_to_settings(self):
+        """Navigate to settings tab"""
+        await self.click("text=הגדרות")
+        await self.wait_for_timeout(1000)
+    
+    # ==================== Assertions ====================
+    
+    async def assert_home_page_loaded(self):
+        """Comprehensive check that home page loaded correctly"""
+        await self.assert_visible(self.daily_quote_title, "Daily quote not visible")
+        await self.assert_visible(self.progress_ring, "Progress ring not visible")
+        await self.assert_visible(self.quick_actions_grid, "Quick actions not visible")
+    
+    async def assert_hebrew_text_displayed(self):
+        """Verify Hebrew content is showing correctly"""
+        # Check if main text elements contain Hebrew characters
+        title_text = await self.get_text(self.daily_quote_title)
+        assert any(ord(c) >= 0x0590 and ord(c) <= 0x05FF for c in title_text), \
+            "No Hebrew characters found in daily quote"
+    
+    async def assert_rtl_layout(self):
+        """Verify RTL (Right-to-Left) layout is applied"""
+        direction = await self.get_attribute("body", "dir")
+        assert direction == "rtl", f"Body does not have RTL direction: {direction}"
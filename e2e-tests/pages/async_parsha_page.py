@@ -0,0 +1,48 @@
+"""
+Async Parsha Page Object
+asyncio counterpart of ParshaPage
+"""
+from .async_base_page import AsyncBasePage
+from .parsha_page import ParshaPage, FIRST_VERSE_OBSERVER
+from playwright.async_api import Page
+from typing import Dict, Optional
+
+
+class AsyncParshaPage(AsyncBasePage):
+    """Parsha reader and Shnayim Mikra index"""
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self._adopt_locators(ParshaPage)
+    
+    async def goto_parsha(self, parsha_id: str):
+        """Navigate to a parsha reader"""
+        await self.goto(f"parsha/{parsha_id}")
+
+    async def goto_shnayim_mikra(self):
+        """Navigate to the Shnayim Mikra index"""
+        await self.goto("shnayim-mikra")
+
+    async def is_not_found(self) -> bool:
+        """Check for the 'parsha not found' message"""
+        return await self.is_visible(self.not_found_text, timeout=1000)
+
+    async def measure_first_paint(self, path: str, ready_selector: Optional[str] = None,
+                                  timeout: int = 30000) -> Dict[str, Optional[float]]:
+        """
+        Load path in full and return paint timings in ms since navigation start
+        first_verse_ms is when pointed Hebrew text entered the DOM (None if it never did);
+        the numbers are only cold on a page that has not loaded the app yet (cold_page fixture)
+        """
+        await self.page.add_init_script(FIRST_VERSE_OBSERVER)
+        await self.page.goto(f"{self.base_url}/{path}", wait_until="commit")
+        await self.wait_for_selector(ready_selector or self.verse_text, timeout=timeout)
+        return await self.page.evaluate("""() => {
+            const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+            const nav = performance.getEntriesByType('navigation')[0];
+            return {
+                first_contentful_paint_ms: fcp ? Math.round(fcp.startTime * 10) / 10 : null,
+                first_verse_ms: window.__kzFirstVerseMs === null ? null : Math.round(window.__kzFirstVerseMs * 10) / 10,
+                dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd * 10) / 10 : null,
+            };
+        }""")
@@ -0,0 +1,107 @@
+"""
+Async Questions Page Object
+asyncio counterpart of QuestionsPage
+"""
+from .async_base_page import AsyncBasePage
+from .questions_page import QuestionsPage, LONG_TASK_OBSERVER
+from playwright.async_api import Page
+from typing import Dict, List, Optional
+
+
+class AsyncQuestionsPage(AsyncBasePage):
+    """Questions and answers functionality"""
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self._adopt_locators(QuestionsPage)
+    
+    async def goto_questions(self):
+        """Navigate to questions page"""
+        await self.goto("questions")
+        await self.wait_for_selector(self.page_title)
+    
+    async def search_questions(self, query: str):
+        """Search for questions"""
+        await self.fill(self.search_bar, query)
+        await self.wait_for_timeout(800)
+    
+    async def filter_by_category(self, category: str):
+        """Filter questions by category"""
+        await self.click(f"text={category}")
+        await self.wait_for_timeout(500)
+    
+    async def filter_unanswered_only(self):
+        """Show only unanswered questions"""
+        await self.click(self.filter_unanswered)
+        await self.wait_for_timeout(500)
+    
+    async def sort_by_rating(self):
+        """Sort by rating descending"""
+        await self.click("text=לפי דירוג")
+        await self.wait_for_timeout(500)
+    
+    async def get_questions_count(self) -> int:
+        """Count visible questions"""
+        return await self.count(self.question_cards)
+    
+    async def click_first_question(self):
+        """Open first question"""
+        await self.click(f"{self.question_cards}:first-of-type")
+        await self.wait_for_url("**/question/**")
+    
+    async def click_ask_question(self):
+        """Navigate to ask question form"""
+        await self.click(self.ask_question_button)
+        await self.wait_for_url("**/ask-question")
+    
+    async def get_question_title(self, index: int = 0) -> str:
+        """Get question title by index"""
+        titles = await self.get_question_titles(limit=index + 1)
+        return titles[index] if index < len(titles) else ""
+    
+    async def get_question_titles(self, limit: int = 50) -> List[str]:
+        """Title of each of the first `limit` question cards in one round trip"""
+        return await self.child_texts(self.question_cards, "[class*='title']", limit=limit)
+    
+    async def get_question_texts(self, limit: int = 50) -> List[str]:
+        """Question text of the first `limit` cards, in display order"""
+        return await self.child_texts(self.question_cards, "[class*='questionText']", limit=limit)
+    
+    async def assert_questions_loaded(self):
+        """Verify questions are displayed"""
+        count = await self.get_questions_count()
+        assert count > 0, "No questions loaded"
+    
+    # ==================== Scale Measurements ====================
+    
+    async def measure_tti(self, quiet_ms: int = 2000, timeout: int = 120000) -> Dict[str, Optional[float]]:
+        """
+        Cold-load /questions and return first-card time and TTI (ms since navigation)
+        TTI is the end of the last long task once the main thread has been quiet for quiet_ms
+        """
+        await self.page.add_init_script(LONG_TASK_OBSERVER)
+        await self.page.goto(f"{self.base_url}/questions", wait_until="commit")
+        await self.wait_for_selector(self.question_cards, timeout=timeout)
+        first_card = await self.page.evaluate("() => performance.now()")
+        await self.page.wait_for_function(
+            """quiet => {
+                const tasks = window.__kzLongTasks || [];
+                const last = tasks.length ? Math.max(...tasks) : 0;
+                return performance.now() - last > quiet;
+            }""",
+            arg=quiet_ms, timeout=timeout, polling=250,
+        )
+        last_task = await self.page.evaluate(
+            "() => (window.__kzLongTasks || []).reduce((a, b) => Math.max(a, b), 0)"
+        )
+        return {"first_card_ms": round(first_card, 1), "tti_ms": round(max(first_card, last_task), 1)}
+    
+    async def timed_search(self, query: str) -> float:
+        """Type a search and return ms until the list settles"""
+        return await self.measure_settle(lambda: self.page.locator(self.search_bar).first.fill(query))
+    
+    async def timed_category_filter(self, category_label: str) -> float:
+        """Apply a category filter and return ms until the list settles"""
+        chip = self.page.locator(f"{self.category_filters} >> text={category_label}")
+        target = chip.first if await chip.count() else self.page.locator(f"text={category_label}").first
+        return await self.measure_settle(target.click)
@@ -0,0 +1,67 @@
+"""
+Async Section Page Object
+asyncio counterpart of SectionPage
+"""
+from .async_base_page import AsyncBasePage
+from .section_page import SectionPage
+from playwright.async_api import Page
+
+
+class AsyncSectionPage(AsyncBasePage):
+    """Section reading page"""
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self._adopt_locators(SectionPage)
+    
+    async def goto_section(self, section_id: str):
+        """Navigate to specific section"""
+        await self.goto(f"section/{section_id}")
+        await self.wait_for_selector(self.section_text)
+    
+    async def get_section_text(self) -> str:
+        """Get the Hebrew text content"""
+        return await self.get_text(self.section_text)
+    
+    async def click_next_section(self):
+        """Navigate to next section"""
+        await self.click(self.next_button)
+        await self.wait_for_timeout(1000)
+    
+    async def click_previous_section(self):
+        """Navigate to previous section"""
+        await self.click(self.previous_button)
+        await self.wait_for_timeout(1000)
+    
+    async def toggle_bookmark(self):
+        """Add/remove bookmark"""
+        await self.click(self.bookmark_button)
+        await self.wait_for_timeout(500)
+    
+    async def is_bookmarked(self) -> bool:
+        """Check if section is bookmarked"""
+        # Check for filled bookmark icon
+        return "bookmark" in await self.get_attribute(self.bookmark_button, "name")
+    
+    async def increase_text_size(self):
+        """Increase text size"""
+        await self.click("text=גדול")
+        await self.wait_for_timeout(300)
+    
+    async def decrease_text_size(self):
+        """Decrease text size"""
+        await self.click("text=קטן")
+        await self.wait_for_timeout(300)
+    
+    async def share_section(self):
+        """Click share button"""
+        await self.click(self.share_button)
+        await self.wait_for_timeout(1000)
+    
+    async def assert_hebrew_text_visible(self):
+        """Verify Hebrew content is displayed"""
+        text = await self.get_section_text()
+        assert len(text) > 0, "Section text is empty"
+        # Check for Hebrew characters
+        assert any(0x0590 <= ord(c) <= 0x05FF for c in text), \
+            "No Hebrew characters in section text"
@@ -3,8 +3,74 @@ Base Page Object
 All page objects inherit from this class
 """
 from playwright.sync_api import Page, Locator, expect
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 import time
+from utils.console_collector import ConsoleCollector
+from utils.scroll_probe import SmoothScroller
+
+
+# Facts for a list of elements; shared by the in-page snapshot and the locator fallback
+ELEMENT_FACTS_JS = """
+(elements, limit) => {
+  const head = elements.slice(0, limit);
+  const visible = el => {
+    const box = el.getBoundingClientRect();
+    return box.width > 0 && box.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+  };
+  const flags = head.map(visible);
+  return {
+    count: elements.length,
+    texts: head.map(el => (el.textContent || '').trim()),
+    visible: flags,
+    visible_count: flags.filter(Boolean).length,
+    boxes: head.map(el => { const b = el.getBoundingClientRect(); return { x: b.x, y: b.y, width: b.width, height: b.height }; }),
+    directions: head.map(el => getComputedStyle(el).direction),
+  };
+}
+"""
+
+# One evaluation for many selectors: CSS plus Playwright-style text= (substring, "exact", /regex/);
+# anything else (>>, :has-text, xpath...) comes back null for the locator fallback
+SNAPSHOT_JS = """
+({ selectors, limit }) => {
+  const facts = %s;
+  const norm = s => (s || '').replace(/\\s+/g, ' ').trim();
+  const textMatcher = body => {
+    const re = body.match(/^\\/(.*)\\/([a-z]*)$/s);
+    if (re) { const rx = new RegExp(re[1], re[2]); return t => rx.test(t); }
+    const exact = body.match(/^"(.*)"$/s);
+    if (exact) return t => t === exact[1];
+    const needle = body.toLowerCase();
+    return t => t.toLowerCase().includes(needle);
+  };
+  const byText = body => {
+    const matches = textMatcher(body);
+    const hits = Array.from(document.body.querySelectorAll('*')).filter(el => matches(norm(el.textContent)));
+    return hits.filter(el => !Array.from(el.children).some(child => matches(norm(child.textContent))));
+  };
+  const out = {};
+  for (const selector of selectors) {
+    try {
+      const elements = selector.startsWith('text=')
+        ? byText(selector.slice(5))
+        : Array.from(document.querySelectorAll(selector));
+      out[selector] = facts(elements, limit);
+    } catch (e) {
+      out[selector] = null;
+    }
+  }
+  return out;
+}
+""" % ELEMENT_FACTS_JS.strip()
+
+
+# Text of the first `child` match inside each container, so a card's extra matches never shift later cards
+CHILD_TEXTS_JS = """
+(containers, [child, limit]) => containers.slice(0, limit).map(container => {
+  const node = container.querySelector(child);
+  return node ? (node.textContent || '').trim() : '';
+})
+"""
 
 
 class BasePage:
@@ -86,6 +152,34 @@ class BasePage:
         """Get input value"""
         return self.page.locator(selector).input_value()
     
+    # ==================== Bulk Snapshot ====================
+    
+    def snapshot(self, selectors: Iterable[str], limit: int = 50) -> Dict[str, Dict[str, Any]]:
+        """
+        Count, texts, visibility, bounding boxes and computed direction for many selectors in one evaluate
+        Per-element lists are capped at `limit`; selectors only Playwright understands cost one extra call each
+        """
+        selectors = list(dict.fromkeys(selectors))
+        result = self.page.evaluate(SNAPSHOT_JS, {"selectors": selectors, "limit": limit})
+        for selector in selectors:
+            if result.get(selector) is None:
+                result[selector] = self.page.locator(selector).evaluate_all(
+                    f"elements => ({ELEMENT_FACTS_JS.strip()})(elements, {int(limit)})"
+                )
+        return result
+    
+    def count(self, selector: str) -> int:
+        """Number of elements matching selector (one round trip)"""
+        return self.snapshot([selector], limit=0)[selector]["count"]
+    
+    def texts(self, selector: str, limit: int = 50) -> List[str]:
+        """Trimmed text of the first `limit` matches (one round trip)"""
+        return self.snapshot([selector], limit=limit)[selector]["texts"]
+    
+    def child_texts(self, container: str, child: str, limit: int = 50) -> List[str]:
+        """Text of the first `child` inside each of the first `limit` containers, '' where missing (one round trip)"""
+        return self.page.locator(container).evaluate_all(CHILD_TEXTS_JS, [child, limit])
+    
     # ==================== Visibility & State ====================
     
     def is_visible(self, selector: str, timeout: int = 5000) -> bool:
@@ -213,6 +307,66 @@ class BasePage:
         """Clear all localStorage"""
         self.execute_script("localStorage.clear()")
     
+    # ==================== Performance Probes ====================
+    
+    def measure_settle(self, action, quiet_ms: int = 150, timeout: int = 30000) -> float:
+        """
+        Run action and return ms until the DOM stops changing (last mutation after it started)
+        Returns 0 if the action caused no mutation at all
+        """
+        self.page.evaluate("""() => {
+            window.__kzLastMutation = null;
+            if (!window.__kzSettleObserver) {
+                window.__kzSettleObserver = new MutationObserver(() => { window.__kzLastMutation = performance.now(); });
+                window.__kzSettleObserver.observe(document, { childList: true, subtree: true, characterData: true });
+            }
+            window.__kzActionStart = performance.now();
+        }""")
+        action()
+        self.page.wait_for_function(
+            """quiet => performance.now() - (window.__kzLastMutation ?? window.__kzActionStart) > quiet""",
+            arg=quiet_ms, timeout=timeout, polling="raf",
+        )
+        return self.page.evaluate(
+            "() => window.__kzLastMutation === null ? 0 : window.__kzLastMutation - window.__kzActionStart"
+        )
+    
+    def dom_node_count(self) -> int:
+        """Number of elements in the document"""
+        return self.page.evaluate("() => document.getElementsByTagName('*').length")
+    
+    def js_heap_used(self, collect_garbage: bool = True) -> Optional[int]:
+        """Used JS heap in bytes via CDP (Chromium only; None elsewhere)"""
+        try:
+            cdp = self.page.context.new_cdp_session(self.page)
+        except Exception:
+            return None
+        try:
+            if collect_garbage:
+                cdp.send("HeapProfiler.collectGarbage")
+            cdp.send("Performance.enable")
+            metrics = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+            return int(metrics["JSHeapUsedSize"])
+        finally:
+            cdp.detach()
+    
+    def round_trips(self) -> Optional[int]:
+        """
+        Messages sent to the Playwright driver so far on this connection; diff two readings to count round trips
+        Reads a private counter of the Python client, so returns None if a Playwright upgrade moves it
+        """
+        connection = getattr(getattr(self.page, "_impl_obj", None), "_connection", None)
+        last_id = getattr(connection, "_last_id", None)
+        return last_id if isinstance(last_id, int) else None
+    
+    def measure_scroll_smoothness(self, distance: Optional[int] = None, velocity: float = 1500,
+                                  source: str = "wheel") -> dict:
+        """
+        Scroll the scrolling element with real wheel/touch input at `velocity` px/s (default: to its bottom)
+        Returns FPS percentiles, janky-frame ratio, long tasks and the distance actually scrolled
+        """
+        return SmoothScroller(self.page).measure(distance, velocity, source)
+    
     # ==================== Mobile Specific ====================
     
     def swipe_left(self):
@@ -250,10 +404,14 @@ class BasePage:
         """Pause execution for debugging"""
         self.page.pause()
     
-    def print_console_logs(self):
-        """Print browser console logs"""
-        logs = self.execute_script("console.log.toString()")
-        print(f"Console logs: {logs}")
+    def print_console_logs(self, levels: Optional[Sequence[str]] = None):
+        """Print console messages, page errors and failed requests captured for this page's context"""
+        collector = ConsoleCollector.for_context(self.page.context)
+        if collector is None:
+            # Read-only: the console_collector fixture attaches (and detaches) the collector
+            print("Console logs: (no collector on this context; the console_collector fixture records them)")
+            return
+        print(f"Console logs:\n{collector.format(levels) or '(none)'}")
     
     def get_page_title(self) -> str:
         """Get page title"""
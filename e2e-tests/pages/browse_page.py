@@ -26,7 +26,7 @@ class BrowsePage(BasePage):
     
     def get_chapters_count(self) -> int:
         """Count visible chapters"""
-        return len(self.get_elements(self.chapter_items))
+        return self.count(self.chapter_items)
     
     def click_chapter(self, chapter_number: int):
         """Click specific chapter by number"""
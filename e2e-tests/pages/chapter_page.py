@@ -31,7 +31,7 @@ class ChapterPage(BasePage):
     
     def get_sections_count(self) -> int:
         """Count sections in chapter"""
-        return len(self.get_elements(self.section_items))
+        return self.count(self.section_items)
     
     def click_section(self, section_number: int):
         """Click specific section"""
@@ -4,6 +4,7 @@ Main screen with daily learning, quick actions, and recent questions
 """
 from .base_page import BasePage
 from playwright.sync_api import Page, expect
+from typing import Dict, List
 
 
 class HomePage(BasePage):
@@ -44,6 +45,23 @@ class HomePage(BasePage):
         self.click(self.home_tab)
         self.wait_for_home_loaded()
     
+    def get_dashboard_state(self) -> Dict[str, bool]:
+        """Visibility of every home card and quick action from a single snapshot"""
+        sections = {
+            "daily_quote": self.daily_quote_title,
+            "continue_learning": self.continue_learning_card,
+            "progress_ring": self.progress_ring,
+            "streak_counter": self.streak_counter,
+            "quick_actions": self.quick_actions_grid,
+            "recent_questions": self.recent_questions,
+            "browse": self.browse_button,
+            "questions": self.questions_button,
+            "bookmarks": self.bookmarks_button,
+            "parsha": self.parsha_button,
+        }
+        snapshot = self.snapshot(sections.values(), limit=5)
+        return {name: snapshot[selector]["visible_count"] > 0 for name, selector in sections.items()}
+    
     # ==================== Daily Quote ====================
     
     def is_daily_quote_visible(self) -> bool:
@@ -157,8 +175,7 @@ class HomePage(BasePage):
     
     def get_recent_questions_count(self) -> int:
         """Count visible recent questions"""
-        questions = self.get_elements("[class*='questionCard']")
-        return len(questions)
+        return self.count("[class*='questionCard']")
     
     def click_first_recent_question(self):
         """Click on the first recent question"""
@@ -167,8 +184,12 @@ class HomePage(BasePage):
     
     def get_recent_question_title(self, index: int = 0) -> str:
         """Get title of a recent question by index"""
-        selector = f"[class*='questionCard']:nth-of-type({index + 1}) [class*='questionTitle']"
-        return self.get_text(selector)
+        titles = self.get_recent_question_titles(limit=index + 1)
+        return titles[index] if index < len(titles) else ""
+    
+    def get_recent_question_titles(self, limit: int = 50) -> List[str]:
+        """Titles of the first `limit` recent questions in one round trip"""
+        return self.child_texts("[class*='questionCard']", "[class*='questionTitle']", limit=limit)
     
     def assert_recent_questions_exist(self):
         """Verify at least one recent question is shown"""
@@ -0,0 +1,72 @@
+"""
+Parsha Page Object
+Weekly parsha (Shnayim Mikra) reading pages
+"""
+from .base_page import BasePage
+from playwright.sync_api import Page
+from typing import Dict, Optional
+
+
+# Records when the first pointed Hebrew text (nikud/cantillation: verses, parsha names) is added
+FIRST_VERSE_OBSERVER = """
+(() => {
+  window.__kzFirstVerseMs = null;
+  const marks = /[\\u0591-\\u05C7]/;
+  const observer = new MutationObserver(records => {
+    for (const record of records) {
+      for (const node of record.addedNodes) {
+        if (marks.test(node.textContent || '')) {
+          window.__kzFirstVerseMs = performance.now();
+          observer.disconnect();
+          return;
+        }
+      }
+    }
+  });
+  observer.observe(document, { childList: true, subtree: true });
+})();
+"""
+
+
+class ParshaPage(BasePage):
+    """Parsha reader and Shnayim Mikra index"""
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+
+        # Locators
+        self.loading_text = "text=טוען פרשה..."
+        self.not_found_text = "text=לא נמצאה פרשה"
+        self.verse_text = "text=/[\\u0591-\\u05C7]/"
+
+    def goto_parsha(self, parsha_id: str):
+        """Navigate to a parsha reader"""
+        self.goto(f"parsha/{parsha_id}")
+
+    def goto_shnayim_mikra(self):
+        """Navigate to the Shnayim Mikra index"""
+        self.goto("shnayim-mikra")
+
+    def is_not_found(self) -> bool:
+        """Check for the 'parsha not found' message"""
+        return self.is_visible(self.not_found_text, timeout=1000)
+
+    def measure_first_paint(self, path: str, ready_selector: Optional[str] = None,
+                            timeout: int = 30000) -> Dict[str, Optional[float]]:
+        """
+        Load path in full and return paint timings in ms since navigation start
+        first_verse_ms is when pointed Hebrew text entered the DOM (None if it never did);
+        the numbers are only cold on a page that has not loaded the app yet (cold_page fixture)
+        """
+        self.page.add_init_script(FIRST_VERSE_OBSERVER)
+        self.page.goto(f"{self.base_url}/{path}", wait_until="commit")
+        self.wait_for_selector(ready_selector or self.verse_text, timeout=timeout)
+        return self.page.evaluate("""() => {
+            const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+            const nav = performance.getEntriesByType('navigation')[0];
+            return {
+                first_contentful_paint_ms: fcp ? Math.round(fcp.startTime * 10) / 10 : null,
+                first_verse_ms: window.__kzFirstVerseMs === null ? null : Math.round(window.__kzFirstVerseMs * 10) / 10,
+                dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd * 10) / 10 : null,
+            };
+        }""")
@@ -4,6 +4,20 @@ Questions & Answers functionality
 """
 from .base_page import BasePage
 from playwright.sync_api import Page
+from typing import Dict, List, Optional
+
+
+# Collects long tasks from the first byte, for time-to-interactive
+LONG_TASK_OBSERVER = """
+(() => {
+  window.__kzLongTasks = [];
+  try {
+    new PerformanceObserver(list => {
+      for (const entry of list.getEntries()) window.__kzLongTasks.push(entry.startTime + entry.duration);
+    }).observe({ type: 'longtask', buffered: true });
+  } catch (e) {}
+})();
+"""
 
 
 class QuestionsPage(BasePage):
@@ -14,7 +28,7 @@ class QuestionsPage(BasePage):
         
         # Locators
         self.page_title = "text=שאלות ותשובות"
-        self.search_bar = "input[placeholder*='חיפוש']"
+        self.search_bar = "input[placeholder*='חיפוש'], input[placeholder*='חפש']"
         self.category_filters = "[class*='categoryFilter']"
         self.sort_options = "[class*='sortOptions']"
         self.question_cards = "[class*='questionCard']"
@@ -49,7 +63,7 @@ class QuestionsPage(BasePage):
     
     def get_questions_count(self) -> int:
         """Count visible questions"""
-        return len(self.get_elements(self.question_cards))
+        return self.count(self.question_cards)
     
     def click_first_question(self):
         """Open first question"""
@@ -63,10 +77,52 @@ class QuestionsPage(BasePage):
     
     def get_question_title(self, index: int = 0) -> str:
         """Get question title by index"""
-        selector = f"{self.question_cards}:nth-of-type({index + 1}) [class*='title']"
-        return self.get_text(selector)
+        titles = self.get_question_titles(limit=index + 1)
+        return titles[index] if index < len(titles) else ""
+    
+    def get_question_titles(self, limit: int = 50) -> List[str]:
+        """Title of each of the first `limit` question cards in one round trip"""
+        return self.child_texts(self.question_cards, "[class*='title']", limit=limit)
+    
+    def get_question_texts(self, limit: int = 50) -> List[str]:
+        """Question text of the first `limit` cards, in display order"""
+        return self.child_texts(self.question_cards, "[class*='questionText']", limit=limit)
     
     def assert_questions_loaded(self):
         """Verify questions are displayed"""
         count = self.get_questions_count()
         assert count > 0, "No questions loaded"
+    
+    # ==================== Scale Measurements ====================
+    
+    def measure_tti(self, quiet_ms: int = 2000, timeout: int = 120000) -> Dict[str, Optional[float]]:
+        """
+        Cold-load /questions and return first-card time and TTI (ms since navigation)
+        TTI is the end of the last long task once the main thread has been quiet for quiet_ms
+        """
+        self.page.add_init_script(LONG_TASK_OBSERVER)
+        self.page.goto(f"{self.base_url}/questions", wait_until="commit")
+        self.wait_for_selector(self.question_cards, timeout=timeout)
+        first_card = self.page.evaluate("() => performance.now()")
+        self.page.wait_for_function(
+            """quiet => {
+                const tasks = window.__kzLongTasks || [];
+                const last = tasks.length ? Math.max(...tasks) : 0;
+                return performance.now() - last > quiet;
+            }""",
+            arg=quiet_ms, timeout=timeout, polling=250,
+        )
+        last_task = self.page.evaluate(
+            "() => (window.__kzLongTasks || []).reduce((a, b) => Math.max(a, b), 0)"
+        )
+        return {"first_card_ms": round(first_card, 1), "tti_ms": round(max(first_card, last_task), 1)}
+    
+    def timed_search(self, query: str) -> float:
+        """Type a search and return ms until the list settles"""
+        return self.measure_settle(lambda: self.page.locator(self.search_bar).first.fill(query))
+    
+    def timed_category_filter(self, category_label: str) -> float:
+        """Apply a category filter and return ms until the list settles"""
+        chip = self.page.locator(f"{self.category_filters} >> text={category_label}")
+        target = chip.first if chip.count() else self.page.locator(f"text={category_label}").first
+        return self.measure_settle(target.click)
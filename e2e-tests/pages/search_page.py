@@ -0,0 +1,52 @@
+"""
+Search Page Object
+Global content search (/search) over every chapter and section
+"""
+from .base_page import BasePage
+from playwright.sync_api import Page
+from typing import List
+
+
+# app/search.tsx waits this long after the last keystroke before calling searchContent()
+SEARCH_DEBOUNCE_MS = 250
+
+
+class SearchPage(BasePage):
+    """Full-text search across all content"""
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        
+        # Locators
+        self.page_title = "text=חפש בכל הסימנים"
+        self.search_input = "input[placeholder*='חפש בתכנים']"
+        self.loading_indicator = "text=מחפש..."
+        self.no_results = "text=לא נמצאו תוצאות"
+        self.result_cards = "[class*='resultCard']"
+    
+    def goto_search(self):
+        """Navigate to the search screen"""
+        self.goto("search")
+        self.wait_for_selector(self.search_input)
+    
+    def search(self, query: str):
+        """Type a query and wait for the results (or the empty state)"""
+        self.fill(self.search_input, query)
+        self.wait_for_timeout(SEARCH_DEBOUNCE_MS)
+        self.page.wait_for_selector(self.loading_indicator, state="hidden", timeout=60000)
+    
+    def timed_search(self, query: str, timeout: int = 60000) -> float:
+        """Type a query and return ms until the result list settles (debounce included)"""
+        # Quiet window must outlast the debounce, during which nothing re-renders
+        return self.measure_settle(
+            lambda: self.page.locator(self.search_input).first.fill(query),
+            quiet_ms=SEARCH_DEBOUNCE_MS + 150, timeout=timeout,
+        )
+    
+    def get_results_count(self) -> int:
+        """Rendered result cards (the screen shows at most 100)"""
+        return self.count(self.result_cards)
+    
+    def get_result_titles(self, limit: int = 20) -> List[str]:
+        """'<label> - <title>' of each of the first `limit` results in one round trip"""
+        return self.child_texts(self.result_cards, "[class*='resultTitle']", limit=limit)
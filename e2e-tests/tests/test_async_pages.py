@@ -0,0 +1,131 @@
+"""
+Async Page Object Tests
+Parity of the asyncio page layer with the sync one, the page pool, and pages/sec versus the sync path
+"""
+import asyncio
+import inspect
+import json
+import os
+import time
+from pathlib import Path
+import pytest
+from pages.async_base_page import AsyncBasePage
+from pages.async_browse_page import AsyncBrowsePage
+from pages.async_chapter_page import AsyncChapterPage
+from pages.async_home_page import AsyncHomePage
+from pages.async_parsha_page import AsyncParshaPage
+from pages.async_questions_page import AsyncQuestionsPage
+from pages.async_section_page import AsyncSectionPage
+from pages.base_page import BasePage
+from pages.browse_page import BrowsePage
+from pages.chapter_page import ChapterPage
+from pages.home_page import HomePage
+from pages.parsha_page import ParshaPage
+from pages.questions_page import QuestionsPage
+from pages.section_page import SectionPage
+from utils.async_runner import run_on_pool
+
+
+PAIRS = [
+    (BasePage, AsyncBasePage),
+    (BrowsePage, AsyncBrowsePage),
+    (ChapterPage, AsyncChapterPage),
+    (HomePage, AsyncHomePage),
+    (ParshaPage, AsyncParshaPage),
+    (QuestionsPage, AsyncQuestionsPage),
+    (SectionPage, AsyncSectionPage),
+]
+# Methods that never touch the driver stay plain functions in both layers
+SYNC_METHODS = {"get_element", "round_trips", "get_current_url", "print_console_logs"}
+REPORT_PATH = Path(__file__).parent.parent / 'reports' / 'async-throughput.json'
+CRAWL_PAGES = int(os.getenv('ASYNC_CRAWL_PAGES', '24'))
+
+
+def _methods(cls):
+    return {name for name, _ in inspect.getmembers(cls, inspect.isfunction) if not name.startswith("_")}
+
+
+class TestAsyncPageLayer:
+    """Test the async layer mirrors the sync page objects (no browser needed)"""
+
+    @pytest.mark.parametrize("sync_cls,async_cls", PAIRS, ids=[a.__name__ for _, a in PAIRS])
+    def test_001_same_method_surface(self, sync_cls, async_cls):
+        """Test every sync method has an async counterpart and only driver-free ones stay sync"""
+        assert _methods(async_cls) == _methods(sync_cls)
+        for name in _methods(async_cls) - SYNC_METHODS:
+            assert inspect.iscoroutinefunction(getattr(async_cls, name)), f"{async_cls.__name__}.{name} is not async"
+
+    @pytest.mark.parametrize("sync_cls,async_cls", PAIRS[1:], ids=[a.__name__ for _, a in PAIRS[1:]])
+    def test_002_locators_shared(self, sync_cls, async_cls):
+        """Test async page objects use the sync page objects' selectors"""
+        expected = {k: v for k, v in vars(sync_cls(None)).items() if k != "page"}
+
+        assert {k: v for k, v in vars(async_cls(None)).items() if k != "page"} == expected
+
+    def test_003_pool_bounds_concurrency(self):
+        """Test scenarios share the pool, never exceed its size, and keep their order and errors"""
+        active, peak = set(), []
+
+        def scenario(index):
+            async def run(page):
+                assert page not in active, "page handed to two scenarios at once"
+                active.add(page)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.discard(page)
+                if index == 3:
+                    raise ValueError("boom")
+                return index
+            return run
+
+        summary = asyncio.run(run_on_pool(["p1", "p2", "p3"], {f"s{i}": scenario(i) for i in range(10)}))
+
+        assert max(peak) == 3
+        assert [r.name for r in summary.results] == [f"s{i}" for i in range(10)]
+        assert [r.name for r in summary.failures] == ["s3"]
+        assert summary.values()["s9"] == 9
+        with pytest.raises(AssertionError, match="s3"):
+            summary.raise_failures()
+
+
+class TestAsyncThroughput:
+    """Compare pages per second of the sync page objects and the async pool"""
+
+    @pytest.mark.performance
+    @pytest.mark.content
+    @pytest.mark.slow
+    def test_004_crawl_pages_per_second(self, page, async_runner, section_locator):
+        """Test the async pool reads sections faster than one sync page"""
+        paths = list(section_locator.deep_links("kitzur_orach_chaim-001"))
+        paths = (paths * (CRAWL_PAGES // max(1, len(paths)) + 1))[:CRAWL_PAGES]
+        section_ids = [path.split("/", 1)[1] for path in paths]
+
+        sync_section = SectionPage(page)
+        start = time.perf_counter()
+        for section_id in section_ids:
+            sync_section.goto_section(section_id)
+            sync_section.assert_hebrew_text_visible()
+        sync_rate = len(section_ids) / (time.perf_counter() - start)
+
+        def read(section_id):
+            async def run(async_page):
+                section = AsyncSectionPage(async_page)
+                await section.goto_section(section_id)
+                await section.assert_hebrew_text_visible()
+            return run
+
+        summary = async_runner.run({f"{i}:{sid}": read(sid) for i, sid in enumerate(section_ids)})
+        summary.raise_failures()
+
+        report = {
+            "pages": len(section_ids),
+            "sync_pages_per_second": round(sync_rate, 2),
+            "async_pages_per_second": round(summary.pages_per_second, 2),
+            "async_pool_size": summary.concurrency,
+            "worker": os.getenv("PYTEST_XDIST_WORKER", "main"),
+        }
+        REPORT_PATH.parent.mkdir(exist_ok=True)
+        REPORT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n⚡ sync {report['sync_pages_per_second']} vs async {report['async_pages_per_second']} pages/s")
+
+        assert summary.pages_per_second > sync_rate, "Async pool was not faster than the sync path"
@@ -0,0 +1,113 @@
+"""
+Bundle Analyzer Tests
+Source map attribution, grouping, startup content flags and build diffs (no browser needed)
+"""
+import json
+from utils.bundle_analyzer import (
+    analyze_export,
+    build_summary,
+    decode_mappings,
+    diff_summaries,
+    format_diff,
+    format_summary,
+    source_group,
+)
+
+
+APP = "/home/ci/kitzur"
+CHAPTER = "אם יש לו טלית קטן"
+
+_B64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+def _vlq(value):
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    out = ""
+    while True:
+        digit, value = value & 31, value >> 5
+        out += _B64[digit | (32 if value else 0)]
+        if not value:
+            return out
+
+
+def _bundle(modules):
+    """One module per line: (source path, code) -> (bundle code, source map)"""
+    lines, mappings, previous = [], [], 0
+    for index, (_, code) in enumerate(modules):
+        lines.append(code)
+        mappings.append(_vlq(0) + _vlq(index - previous) + _vlq(0) + _vlq(0))
+        previous = index
+    lines.append("//# sourceMappingURL=entry.js.map")
+    mappings.append("")
+    source_map = {"version": 3, "sources": [path for path, _ in modules], "mappings": ";".join(mappings)}
+    return "\n".join(lines), source_map
+
+
+def _dist(tmp_path, entry_modules, lazy_modules):
+    js = tmp_path / "_expo" / "static" / "js" / "web"
+    js.mkdir(parents=True)
+    for name, modules in (("entry.js", entry_modules), ("chapter.js", lazy_modules)):
+        code, source_map = _bundle(modules)
+        (js / name).write_text(code, encoding="utf-8")
+        (js / f"{name}.map").write_text(json.dumps(source_map), encoding="utf-8")
+    (tmp_path / "index.html").write_text(
+        '<html><body><script src="/_expo/static/js/web/entry.js" defer></script></body></html>', encoding="utf-8"
+    )
+    return tmp_path
+
+
+class TestBundleAnalyzer:
+    """Test bundle byte attribution"""
+
+    def test_001_decode_mappings(self):
+        """Test VLQ segments decode to relative columns and source indexes"""
+        segments = list(decode_mappings("AAAA,KCAA;;GAAA,E"))
+
+        assert segments == [(0, 0, 0), (0, 5, 1), (2, 3, 1), (2, 5, None)]
+
+    def test_002_source_groups(self):
+        """Test paths group by book, app folder or package"""
+        assert source_group(f"{APP}/content/orach_chaim/orach_chaim-001.json") == \
+            ("content/orach_chaim/orach_chaim-001.json", "content/orach_chaim")
+        assert source_group(f"{APP}/content/chapters-index.ts") == ("content/chapters-index.ts", "content")
+        assert source_group(f"{APP}/utils/contentLoader.ts")[1] == "utils"
+        assert source_group(f"{APP}/node_modules/@firebase/firestore/dist/index.esm.js")[1] == \
+            "node_modules/@firebase/firestore"
+        assert source_group("webpack:///./components/SectionCard.tsx")[1] == "components"
+
+    def test_003_startup_content_flagged(self, tmp_path):
+        """Test content JSON in the entry chunk is flagged while lazy content is not"""
+        dist = _dist(
+            tmp_path,
+            [(f"{APP}/utils/contentLoader.ts", "function load(){return 1}"),
+             (f"{APP}/content/chapters/kitzur_orach_chaim-001.json", f'module.exports={{"t":"{CHAPTER}"}}')],
+            [(f"{APP}/content/orach_chaim/orach_chaim-001.json", f'module.exports={{"t":"{CHAPTER * 3}"}}')],
+        )
+
+        reports = analyze_export(dist)
+        summary = build_summary(reports, "main")
+        entry = next(r for r in reports if r.startup)
+
+        assert [r.startup for r in reports] == [False, True]  # sorted: chapter.js, entry.js
+        chapter = next(s for s in entry.sources if s.path.endswith(".json"))
+        assert chapter.raw_bytes == len(f'module.exports={{"t":"{CHAPTER}"}}'.encode("utf-8"))
+        assert entry.raw_bytes == sum(s.raw_bytes for s in entry.sources)
+        assert summary["startup_content"]["files"] == 1
+        assert summary["startup_content"]["top"][0]["path"] == "content/chapters/kitzur_orach_chaim-001.json"
+        assert "content/orach_chaim" in summary["groups"]["lazy"]
+        assert "content JSON file(s) in the startup chunk" in format_summary(summary)
+
+    def test_004_diff_builds(self, tmp_path):
+        """Test moving content out of the entry chunk shows up as startup shrink and lazy growth"""
+        loader = (f"{APP}/utils/contentLoader.ts", "function load(){return 1}")
+        content = (f"{APP}/content/chapters/kitzur_orach_chaim-001.json", f'module.exports={{"t":"{CHAPTER}"}}')
+        before = build_summary(analyze_export(_dist(tmp_path / "a", [loader, content], [loader])), "before")
+        after = build_summary(analyze_export(_dist(tmp_path / "b", [loader], [loader, content])), "after")
+
+        rows = {(r["kind"], r["group"]): r for r in diff_summaries(before, after)}
+
+        size = len(content[1].encode("utf-8"))
+        assert rows[("startup", "content/chapters")]["raw_delta"] == -size
+        assert rows[("lazy", "content/chapters")]["raw_delta"] == size
+        assert after["startup_content"]["files"] == 0
+        assert "content/chapters" in format_diff(list(rows.values()))
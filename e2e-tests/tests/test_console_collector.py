@@ -0,0 +1,96 @@
+"""
+Console Collector Tests
+Ring buffer, allowlist and budget accounting of browser console events (no browser needed)
+"""
+from types import SimpleNamespace
+import pytest
+from utils.console_collector import ConsoleBudget, ConsoleCollector
+
+
+class FakeContext:
+    """Just enough of BrowserContext's event emitter"""
+
+    def __init__(self):
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def emit(self, event, payload):
+        for handler in list(self.listeners.get(event, [])):
+            handler(payload)
+
+
+class TestConsoleCollector:
+    """Test buffering and budgets"""
+
+    def test_001_ring_is_bounded_but_totals_are_not(self):
+        """Test old events are evicted while error totals keep counting"""
+        collector = ConsoleCollector(capacity=3, allowlist=[])
+        for i in range(10):
+            collector.record("error", f"Failed to load chapter: kitzur_orach_chaim-{i:03d}")
+
+        assert len(collector.events) == 3
+        assert collector.events[0].text.endswith("-007")
+        assert collector.errors == 10
+
+    def test_002_allowlist_and_budget(self):
+        """Test allowlisted noise is not charged and over-budget levels are reported"""
+        collector = ConsoleCollector(allowlist=[r"Hebcal"])
+        collector.record("warning", "Hebcal API did not return parsha, using fallback calculation")
+        collector.record("warning", "VirtualizedList: You have a large list that is slow to update")
+        collector.record("error", "Failed to load chapter: yoreh_deah-999")
+
+        assert collector.warnings == 1 and collector.allowed["warning"] == 1
+        assert collector.violations(ConsoleBudget(max_errors=1, max_warnings=None)) == []
+        assert collector.violations(ConsoleBudget(max_errors=0, max_warnings=0)) == [
+            "1 browser error(s) > budget 0",
+            "1 browser warning(s) > budget 0",
+        ]
+        assert "[allowed]" in collector.format()
+        assert "Hebcal" not in collector.format(levels=("error",))
+
+    def test_003_context_events(self):
+        """Test console, page error and failed request events are captured until detached"""
+        context = FakeContext()
+        collector = ConsoleCollector(allowlist=[]).attach(context)
+
+        context.emit("console", SimpleNamespace(type="error", text="boom",
+                                                location={"url": "http://localhost:8081/app.js", "lineNumber": 12}))
+        context.emit("weberror", SimpleNamespace(error=SimpleNamespace(name="TypeError", message="x is undefined")))
+        context.emit("requestfailed", SimpleNamespace(method="GET", failure="net::ERR_FAILED",
+                                                      url="http://localhost:8081/content/x.json"))
+
+        assert ConsoleCollector.for_context(context) is collector
+        assert [e.level for e in collector.events] == ["error", "pageerror", "requestfailed"]
+        assert collector.events[0].line == 12
+        assert collector.events[1].text == "TypeError: x is undefined"
+        assert collector.errors == 3
+
+        collector.detach()
+        context.emit("console", SimpleNamespace(type="error", text="after", location={}))
+        assert collector.errors == 3
+        assert ConsoleCollector.for_context(context) is None
+
+    @pytest.mark.console_budget(errors=2)
+    def test_004_marker_registered(self, request):
+        """Test the console_budget marker is registered and readable"""
+        assert request.node.get_closest_marker("console_budget").kwargs == {"errors": 2}
+
+    def test_004_aborted_requests_are_not_errors(self):
+        """Test requests the browser aborted on navigation are allowed by default, real failures are not"""
+        context = FakeContext()
+        collector = ConsoleCollector().attach(context)
+
+        for failure in ("net::ERR_ABORTED", "NS_BINDING_ABORTED", "cancelled"):
+            context.emit("requestfailed", SimpleNamespace(
+                method="POST", failure=failure,
+                url="https://firestore.googleapis.com/google.firestore.v1.Firestore/Listen/channel"))
+        context.emit("requestfailed", SimpleNamespace(method="GET", failure="net::ERR_CONNECTION_REFUSED",
+                                                      url="http://localhost:8081/content/x.json"))
+
+        assert collector.allowed["requestfailed"] == 3
+        assert collector.errors == 1
@@ -0,0 +1,83 @@
+"""
+Content Bundle Tests
+Sharded, compressed content bundle and its on-demand reader (no browser needed)
+"""
+import json
+import pytest
+from utils import content_bundle
+from utils.content_bundle import BundleError, ContentBundle, benchmark, build_bundle
+from utils.content_tree import iter_content_files
+
+
+class TestContentBundle:
+    """Test building and reading the bundle"""
+
+    @pytest.mark.content
+    def test_001_every_record_round_trips(self, mini_content_dir, tmp_path):
+        """Test each chapter and parsha decodes to its original bytes"""
+        bundle_dir = tmp_path / "bundle"
+        build_bundle(mini_content_dir, bundle_dir)
+
+        with ContentBundle(bundle_dir) as bundle:
+            for _, book, path in iter_content_files(mini_content_dir):
+                if book == "special":
+                    continue
+                assert bundle.get_bytes(path.stem, book) == path.read_bytes()
+
+    @pytest.mark.content
+    def test_002_get_searches_books_and_decodes_json(self, mini_content_dir, tmp_path):
+        """Test lookup without a book, duplicate ids resolving like the registry, and JSON decoding"""
+        duplicate = mini_content_dir / "chapters" / "orach_chaim-001.json"
+        duplicate.write_text(json.dumps({"id": "orach_chaim-001", "stale": True, "sections": []}), encoding="utf-8")
+        bundle_dir = tmp_path / "bundle"
+        build_bundle(mini_content_dir, bundle_dir)
+
+        with ContentBundle(bundle_dir) as bundle:
+            chapter = bundle.get("kitzur_orach_chaim-002")
+            parsha = bundle.get("bo")
+            missing = bundle.get("kitzur_orach_chaim-999")
+            registry_copy = bundle.get("orach_chaim-001")
+            chapters_copy = bundle.get("orach_chaim-001", "chapters")
+
+        assert "stale" not in registry_copy and registry_copy["sections"][0]["id"] == "orach_chaim-001-1"
+        assert chapters_copy["stale"] is True
+        assert chapter["sections"][1]["id"] == "kitzur_orach_chaim-002-s2"
+        assert parsha["chapters"][0]["chapter"] == 10
+        assert missing is None
+
+    @pytest.mark.content
+    def test_003_records_split_across_shards(self, mini_content_dir, tmp_path, monkeypatch):
+        """Test shards roll over at the size target and offsets stay valid"""
+        monkeypatch.setattr(content_bundle, "SHARD_TARGET_BYTES", 1)
+        bundle_dir = tmp_path / "bundle"
+        stats = {s["book"]: s for s in build_bundle(mini_content_dir, bundle_dir)}
+
+        with ContentBundle(bundle_dir) as bundle:
+            assert stats["chapters"]["shards"] == 2
+            assert bundle.locate("kitzur_orach_chaim-002")[1] == 1
+            assert bundle.get("kitzur_orach_chaim-001")["id"] == "kitzur_orach_chaim-001"
+
+    @pytest.mark.content
+    def test_004_rejects_corrupt_index(self, mini_content_dir, tmp_path):
+        """Test a bad index header raises BundleError"""
+        bundle_dir = tmp_path / "bundle"
+        build_bundle(mini_content_dir, bundle_dir)
+        (bundle_dir / "parshiot.idx").write_bytes(b"JUNKJUNKJUNKJUNK")
+
+        with ContentBundle(bundle_dir) as bundle:
+            with pytest.raises(BundleError):
+                bundle.get("bo", "parshiot")
+
+    @pytest.mark.content
+    @pytest.mark.performance
+    def test_005_benchmark_reports_size_and_latency(self, mini_content_dir, tmp_path):
+        """Test the benchmark compares the bundle with the JSON layout"""
+        bundle_dir = tmp_path / "bundle"
+        build_bundle(mini_content_dir, bundle_dir)
+
+        report = benchmark(mini_content_dir, bundle_dir, samples=20)
+
+        assert report["records"] == 4
+        assert report["bundle_bytes"] > 0
+        assert {"p50_ms", "p95_ms", "max_ms"} <= set(report["bundle_fetch"])
+        json.dumps(report)
@@ -0,0 +1,86 @@
+"""
+Content Cache Tests
+Incremental, hash-keyed validation over kitzur/content (no browser needed)
+"""
+import json
+import os
+import pytest
+from utils.content_cache import ContentCache
+from utils.content_validator import validate_content
+
+
+class TestContentCache:
+    """Test that only changed files are reprocessed"""
+
+    @pytest.mark.content
+    def test_001_warm_cache_rescans_nothing(self, mini_content_dir, tmp_path):
+        """Test a second run reuses every cached file"""
+        cache_path = tmp_path / "cache.json"
+        cache = ContentCache(cache_path)
+        cold = validate_content(mini_content_dir, jobs=1, cache=cache)
+        cache.save()
+
+        warm = validate_content(mini_content_dir, jobs=1, cache=ContentCache(cache_path))
+
+        assert cold.rescanned == 5
+        assert warm.rescanned == 0
+        assert warm.findings == cold.findings
+
+    @pytest.mark.content
+    def test_002_touched_but_unchanged_file_is_reused(self, mini_content_dir, tmp_path):
+        """Test a new mtime with the same bytes does not trigger a rescan"""
+        cache = ContentCache(tmp_path / "cache.json")
+        cache.refresh(mini_content_dir, jobs=1)
+        path = mini_content_dir / "parshiot/bo.json"
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+
+        cache.refresh(mini_content_dir, jobs=1)
+
+        assert cache.changed == []
+
+    @pytest.mark.content
+    def test_003_changed_file_is_rescanned_and_merged(self, mini_content_dir, tmp_path):
+        """Test an edited file is rescanned and cross-file checks still see cached files"""
+        cache = ContentCache(tmp_path / "cache.json")
+        validate_content(mini_content_dir, jobs=1, cache=cache)
+
+        path = mini_content_dir / "chapters/kitzur_orach_chaim-002.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["sections"][0]["id"] = "kitzur_orach_chaim-001-s1"
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        report = validate_content(mini_content_dir, jobs=1, cache=cache)
+
+        assert cache.changed == ["chapters/kitzur_orach_chaim-002.json"]
+        assert any(f.code == "duplicate-section-id" and "also defined in" in f.message
+                   for f in report.findings)
+
+    @pytest.mark.content
+    def test_004_removed_files_are_dropped(self, mini_content_dir, tmp_path):
+        """Test deleted files leave the cache and missing-file checks fire"""
+        cache = ContentCache(tmp_path / "cache.json")
+        cache.refresh(mini_content_dir, jobs=1)
+        (mini_content_dir / "orach_chaim/orach_chaim-001.json").unlink()
+
+        report = validate_content(mini_content_dir, jobs=1, cache=cache)
+
+        assert cache.removed == ["orach_chaim/orach_chaim-001.json"]
+        assert "orach_chaim/orach_chaim-001.json" not in cache.digests()
+        assert any(f.code == "missing-file" for f in report.findings)
+
+    @pytest.mark.content
+    @pytest.mark.hebrew
+    def test_005_facts_include_hebrew_text_stats(self, mini_content_dir, tmp_path):
+        """Test cached facts carry section IDs, counts and Hebrew stats"""
+        cache = ContentCache(tmp_path / "cache.json")
+        facts = {f.path: f for f in cache.refresh(mini_content_dir, jobs=1)}
+
+        chapter = facts["chapters/kitzur_orach_chaim-001.json"]
+        parsha = facts["parshiot/bo.json"]
+
+        assert chapter.section_ids[0] == "kitzur_orach_chaim-001-s1"
+        assert chapter.item_count == 3
+        assert chapter.text_stats["hebrew_letters"] > 0
+        assert chapter.text_stats["nikud_marks"] > 0
+        assert parsha.item_count == 3
+        assert parsha.text_stats["nikud_marks"] > parsha.text_stats["hebrew_letters"] / 2
@@ -0,0 +1,124 @@
+"""
+Content Delta Tests
+Patch bundles between content trees or git revisions (no browser needed)
+"""
+import json
+import shutil
+import subprocess
+import pytest
+from utils.content_delta import DeltaError, apply_delta, read_directory, read_git_revision, write_delta
+
+
+def _edit(content_dir):
+    """Change one section with a version bump, one without; add, remove, binary files"""
+    path = content_dir / "chapters/kitzur_orach_chaim-001.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["sections"][1]["text"] = "שויתי ה' לנגדי תמיד"
+    data["version"] = 2
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    path = content_dir / "orach_chaim/orach_chaim-001.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["sections"].append({"id": "orach_chaim-001-3", "section": 3, "text": "סעיף חדש"})
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    (content_dir / "special/borei_nefashot.json").unlink()
+    (content_dir / "special/new_prayer.json").write_text('{"name": "חדש"}\n', encoding="utf-8")
+    (content_dir / "chapters.backup").write_bytes(b"\xff\xfe\x00binary")
+
+
+class TestContentDelta:
+    """Test generating and applying content deltas"""
+
+    @pytest.mark.content
+    def test_001_apply_reproduces_new_tree(self, mini_content_dir, tmp_path):
+        """Test old tree + delta equals the new tree byte for byte"""
+        old_dir = tmp_path / "old"
+        shutil.copytree(mini_content_dir, old_dir)
+        _edit(mini_content_dir)
+
+        write_delta(read_directory(old_dir), read_directory(mini_content_dir), tmp_path / "delta")
+        apply_delta(tmp_path / "delta/delta.kzd", old_dir)
+
+        assert read_directory(old_dir) == read_directory(mini_content_dir)
+
+    @pytest.mark.content
+    def test_002_manifest_lists_versions_and_sections(self, mini_content_dir, tmp_path):
+        """Test version bumps, missing bumps and section-level changes"""
+        old = read_directory(mini_content_dir)
+        _edit(mini_content_dir)
+
+        manifest = write_delta(old, read_directory(mini_content_dir), tmp_path / "delta")
+        chapters = {c["id"]: c for c in manifest["chapters"]}
+
+        assert (chapters["kitzur_orach_chaim-001"]["old_version"], chapters["kitzur_orach_chaim-001"]["new_version"]) == (1, 2)
+        assert chapters["kitzur_orach_chaim-001"]["sections_modified"] == ["kitzur_orach_chaim-001-s2"]
+        assert chapters["orach_chaim-001"]["sections_added"] == ["orach_chaim-001-3"]
+        assert manifest["not_bumped"] == ["orach_chaim-001"]
+        assert manifest["files"] == {"add": 2, "patch": 2, "replace": 0, "remove": 1}
+
+    @pytest.mark.content
+    def test_003_apply_refuses_wrong_base(self, mini_content_dir, tmp_path):
+        """Test a base digest mismatch raises before any file is written"""
+        old_dir = tmp_path / "old"
+        shutil.copytree(mini_content_dir, old_dir)
+        _edit(mini_content_dir)
+        write_delta(read_directory(old_dir), read_directory(mini_content_dir), tmp_path / "delta")
+
+        (old_dir / "orach_chaim/orach_chaim-001.json").write_text("{}", encoding="utf-8")
+        before = read_directory(old_dir)
+
+        with pytest.raises(DeltaError, match="orach_chaim-001.json: base digest mismatch"):
+            apply_delta(tmp_path / "delta/delta.kzd", old_dir)
+        assert read_directory(old_dir) == before
+
+    @pytest.mark.content
+    def test_004_diff_between_git_revisions(self, mini_content_dir, tmp_path):
+        """Test reading both sides straight from git revisions"""
+        repo = mini_content_dir.parent
+        git = ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run(git + ["init", "-q"], check=True)
+        subprocess.run(git + ["add", "content"], check=True)
+        subprocess.run(git + ["commit", "-qm", "old"], check=True)
+        old_dir = tmp_path / "old"
+        shutil.copytree(mini_content_dir, old_dir)
+        _edit(mini_content_dir)
+        subprocess.run(git + ["add", "-A", "content"], check=True)
+        subprocess.run(git + ["commit", "-qm", "new"], check=True)
+
+        old = read_git_revision("HEAD~1", mini_content_dir)
+        new = read_git_revision("HEAD", mini_content_dir)
+        write_delta(old, new, tmp_path / "delta")
+        apply_delta(tmp_path / "delta/delta.kzd", old_dir)
+
+        assert new == read_directory(mini_content_dir)
+        assert read_directory(old_dir) == new
+
+    @pytest.mark.performance
+    def test_005_size_report(self, mini_content_dir, tmp_path):
+        """Test the delta is reported against a full re-download"""
+        old = read_directory(mini_content_dir)
+        path = mini_content_dir / "chapters/kitzur_orach_chaim-002.json"
+        path.write_text(path.read_text(encoding="utf-8").replace("ברכות השחר", "ברכות השחר!"), encoding="utf-8")
+
+        size = write_delta(old, read_directory(mini_content_dir), tmp_path / "delta")["size"]
+
+        assert size["delta_bytes"] == (tmp_path / "delta/delta.kzd").stat().st_size
+        assert size["delta_bytes"] < size["full_compressed_bytes"] < size["full_bytes"]
+
+    @pytest.mark.content
+    def test_006_malformed_chapter_still_patched(self, mini_content_dir, tmp_path):
+        """Test a chapter with malformed sections is patched as a file, without a section summary"""
+        old_dir = tmp_path / "old"
+        shutil.copytree(mini_content_dir, old_dir)
+        (mini_content_dir / "chapters/kitzur_orach_chaim-002.json").write_text(
+            '{"id": "kitzur_orach_chaim-002", "sections": ["not a section"]}', encoding="utf-8")
+        (mini_content_dir / "orach_chaim/orach_chaim-001.json").write_text(
+            '{"id": "orach_chaim-001", "sections": {"1": {}}}', encoding="utf-8")
+
+        manifest = write_delta(read_directory(old_dir), read_directory(mini_content_dir), tmp_path / "delta")
+        apply_delta(tmp_path / "delta/delta.kzd", old_dir)
+
+        assert manifest["chapters"] == []
+        assert manifest["files"]["patch"] == 2
+        assert read_directory(old_dir) == read_directory(mini_content_dir)
@@ -0,0 +1,113 @@
+"""
+Content Validator Tests
+Schema, numbering, and cross-file checks over kitzur/content (no browser needed)
+"""
+import json
+import pytest
+from utils.content_tree import CONTENT_DIR
+from utils.content_validator import validate_content, main
+
+
+def _codes(report):
+    return {f.code for f in report.findings}
+
+
+def _edit(path, change):
+    data = json.loads(path.read_text(encoding="utf-8"))
+    change(data)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+class TestContentValidator:
+    """Test per-file and cross-file content checks"""
+
+    @pytest.mark.content
+    def test_001_clean_tree_has_no_findings(self, mini_content_dir):
+        """Test a valid tree produces no findings"""
+        report = validate_content(mini_content_dir, jobs=1)
+
+        assert report.ok
+        assert report.findings == []
+        assert report.files == 5
+        assert report.sections == 7
+
+    @pytest.mark.content
+    def test_002_detects_section_gap_and_empty_text(self, mini_content_dir):
+        """Test gaps in section numbering and empty text are errors"""
+        def change(data):
+            data["sections"][1]["section"] = 5
+            data["sections"][2]["text"] = "   "
+        _edit(mini_content_dir / "chapters/kitzur_orach_chaim-001.json", change)
+
+        report = validate_content(mini_content_dir, jobs=1)
+
+        assert not report.ok
+        assert {"numbering-gap", "empty-text"} <= _codes(report)
+
+    @pytest.mark.content
+    def test_003_detects_duplicate_section_ids(self, mini_content_dir):
+        """Test duplicate section IDs within and across files"""
+        def within(data):
+            data["sections"][1]["id"] = data["sections"][0]["id"]
+        def across(data):
+            data["sections"][0]["id"] = "kitzur_orach_chaim-001-s3"
+        _edit(mini_content_dir / "chapters/kitzur_orach_chaim-001.json", within)
+        _edit(mini_content_dir / "chapters/kitzur_orach_chaim-002.json", across)
+
+        report = validate_content(mini_content_dir, jobs=1)
+
+        duplicates = [f for f in report.findings if f.code == "duplicate-section-id"]
+        assert len(duplicates) == 2
+        assert any("also defined in" in f.message for f in duplicates)
+
+    @pytest.mark.content
+    def test_004_detects_schema_and_json_errors(self, mini_content_dir):
+        """Test invalid JSON and wrong field types are reported"""
+        (mini_content_dir / "chapters/kitzur_orach_chaim-002.json").write_text("{", encoding="utf-8")
+        _edit(mini_content_dir / "orach_chaim/orach_chaim-001.json",
+              lambda data: data.update(id="orach_chaim-999", title=None))
+
+        report = validate_content(mini_content_dir, jobs=1)
+
+        assert {"invalid-json", "schema", "id-mismatch"} <= _codes(report)
+
+    @pytest.mark.content
+    def test_005_detects_manifest_mismatches(self, mini_content_dir):
+        """Test manifest.json, chapter-ids.txt and disk are cross-checked"""
+        (mini_content_dir / "manifest.json").write_text(
+            json.dumps(["kitzur_orach_chaim-001", "siman-001"]), encoding="utf-8"
+        )
+        (mini_content_dir / "chapters/kitzur_orach_chaim-002.json").unlink()
+
+        report = validate_content(mini_content_dir, jobs=1)
+        messages = [f.message for f in report.findings]
+
+        assert "manifest-mismatch" in _codes(report)
+        assert any("'siman-001' has no file" in m for m in messages)
+        assert any("'kitzur_orach_chaim-002' has no file" in m for m in messages)
+
+    @pytest.mark.content
+    def test_006_cli_emits_machine_readable_findings(self, mini_content_dir, tmp_path):
+        """Test the CLI writes JSON findings and fails on errors"""
+        output = tmp_path / "findings.json"
+        (mini_content_dir / "parshiot/manifest.json").write_text(
+            json.dumps({"parshiot": ["bo", "noach"]}), encoding="utf-8"
+        )
+
+        status = main(["--content-dir", str(mini_content_dir), "--jobs", "1", "--output", str(output)])
+        payload = json.loads(output.read_text(encoding="utf-8"))
+
+        assert status == 1
+        assert payload["summary"]["errors"] == 1
+        assert payload["findings"][0]["code"] == "missing-file"
+
+    @pytest.mark.content
+    @pytest.mark.performance
+    def test_007_full_corpus_parallel_matches_serial(self):
+        """Test the process pool gives the same findings as a serial scan"""
+        parallel = validate_content(CONTENT_DIR, jobs=4)
+        serial = validate_content(CONTENT_DIR, jobs=1)
+
+        assert parallel.files > 2000
+        assert parallel.findings == serial.findings
+        assert parallel.elapsed_ms < 2000, f"Validation took {parallel.elapsed_ms:.0f}ms"
@@ -0,0 +1,70 @@
+"""
+Corpus Sampler Tests
+Stratified, deterministic, budgeted section samples and their weekly rotation (no browser needed)
+"""
+from datetime import date
+
+from utils.corpus_sampler import (
+    STRATA,
+    budget_cases,
+    daily_seed,
+    load_corpus,
+    rotation,
+    sample,
+    strata_pools,
+    week_coverage,
+)
+
+
+class TestCorpusSampler:
+    """Test section sampling over a small content tree"""
+
+    def test_001_load_corpus(self, mini_content_dir):
+        """Test every registered section is loaded with its position and text features"""
+        corpus = {s.section_id: s for s in load_corpus(mini_content_dir)}
+
+        assert len(corpus) == 7
+        first, second, last = (corpus[f"kitzur_orach_chaim-001-s{i}"] for i in (1, 2, 3))
+        assert (first.position, second.position, last.position) == ("first", "middle", "last")
+        assert second.has_parens and second.has_abbrev and not first.has_parens
+        assert corpus["orach_chaim-001-1"].book == "orach_chaim"
+        assert first.book == "chapters" and first.chapter_size == 3
+
+    def test_002_strata(self, mini_content_dir, monkeypatch):
+        """Test every stratum has a pool and the sample draws from each book"""
+        monkeypatch.setattr("utils.corpus_sampler.BIG_CHAPTERS", 1)
+        corpus = load_corpus(mini_content_dir)
+        pools = strata_pools(corpus)
+
+        assert {"book:chapters", "book:orach_chaim", "first", "middle", "last", "longest", "parens",
+                "abbrev", "big_chapter"} <= set(pools)
+        assert {s.chapter_id for s in pools["big_chapter"]} == {"kitzur_orach_chaim-001"}
+        cases = sample(corpus, seed=5, max_cases=100, picks=1, rotate=False)
+        assert {c.stratum for c in cases} >= {"book:chapters", "book:orach_chaim"}
+        assert pools["longest"][0] in [c.section for c in cases]
+        assert len({c.section.section_id for c in cases}) == len(cases)
+
+    def test_003_deterministic_and_budgeted(self, mini_content_dir, monkeypatch):
+        """Test the same seed gives the same ids, and the budget caps the case count"""
+        corpus = load_corpus(mini_content_dir)
+
+        assert [c.id for c in sample(corpus, 9, 4)] == [c.id for c in sample(corpus, 9, 4)]
+        assert len(sample(corpus, 9, 3)) == 3
+        assert [c.stratum for c in sample(corpus, 9, 100, strata=("longest",), picks=1, rotate=False)] == ["longest"]
+        assert budget_cases(60, case_s=4) == 15 and budget_cases(1, case_s=4) == 1
+        monkeypatch.setenv("CORPUS_SAMPLE_BUDGET_S", "20")
+        assert budget_cases(case_s=4) == 5
+
+    def test_004_daily_rotation(self, mini_content_dir, monkeypatch):
+        """Test seeds change daily, can be pinned, and a week of rotations covers the corpus"""
+        corpus = load_corpus(mini_content_dir)
+        monkeypatch.delenv("CORPUS_SAMPLE_SEED", raising=False)
+
+        assert daily_seed(date(2026, 3, 2)) == daily_seed(date(2026, 3, 1)) + 1
+        monkeypatch.setenv("CORPUS_SAMPLE_SEED", "42")
+        assert daily_seed(date(2026, 3, 1)) == 42
+        # One case per day: rotation alone has to walk every section within a few weeks
+        seen = {s.section_id for day in range(7 * 7) for s in rotation(corpus, 700 + day, 1)}
+        assert seen == {s.section_id for s in corpus}
+        assert week_coverage(corpus, 700, max_cases=100) == 1.0
+        assert set(STRATA) >= {"book", "longest", "abbrev"}
@@ -0,0 +1,106 @@
+"""
+Flaky Tracker Tests
+Flip rates, rerun decisions, quarantine and time-lost reporting (no browser needed)
+"""
+from utils.flaky_tracker import (
+    FAILED,
+    PASSED,
+    RERUN_LEDGER_FILE,
+    RERUN_PASSED,
+    FlakyHistory,
+    FlakyPolicy,
+    RerunGate,
+    RunRecord,
+    flip_rate,
+    format_history,
+    format_run,
+    load_worker_runs,
+    write_worker_runs,
+)
+
+
+TABS = "tests/test_navigation.py::TestNavigationState::test_023_rapid_tab_switching[chromium]"
+STABLE = "tests/test_navigation.py::TestBasicNavigation::test_001_app_loads_successfully[chromium]"
+HEBCAL = "tests/test_parsha.py::TestParshaHebcalIntegration::test_010_parsha_synced_with_hebcal[chromium]"
+TIMEOUT = "playwright._impl._errors.TimeoutError: Locator.click: Timeout 30000ms exceeded."
+
+
+class TestFlakyTracker:
+    """Test flakiness bookkeeping"""
+
+    def test_001_flip_rate(self):
+        """Test P/F changes and in-run rerun passes both count as flips"""
+        assert flip_rate("") == flip_rate("PPPP") == flip_rate("FFFF") == 0.0
+        assert flip_rate("PFPF") == 0.75
+        assert flip_rate("PPRP") == 0.25
+        assert flip_rate("PPPF") == 0.25
+
+    def test_002_rerun_gate(self):
+        """Test only suspected failures rerun, up to max_reruns and within the time budget"""
+        history = FlakyHistory()
+        history.record([RunRecord(TABS, o) for o in "PFP"])
+        gate = RerunGate(history, FlakyPolicy(rerun_budget_s=10.0, max_reruns=1))
+
+        assert gate.allow(TABS, 1, flaky_marker=False, error="AssertionError", estimate_s=3.0)
+        assert not gate.allow(STABLE, 1, flaky_marker=False, error="AssertionError", estimate_s=3.0)
+        assert gate.allow(STABLE, 1, flaky_marker=False, error=TIMEOUT, estimate_s=3.0)
+        assert gate.allow(STABLE, 1, flaky_marker=True, error=None, estimate_s=3.0)
+        assert not gate.allow(TABS, 2, flaky_marker=True, error=None, estimate_s=3.0)
+        gate.charge(8.0)
+        assert not gate.allow(TABS, 1, flaky_marker=True, error=None, estimate_s=3.0)
+
+    def test_003_quarantine(self, tmp_path):
+        """Test chronic flakes are quarantined once they have enough runs, and history round-trips"""
+        history = FlakyHistory()
+        history.record([RunRecord(TABS, o) for o in "PFPRPFPP"])
+        history.record([RunRecord(STABLE, PASSED) for _ in range(12)])
+        policy = FlakyPolicy(quarantine_flip_rate=0.3, quarantine_min_runs=10)
+
+        assert history.quarantined(policy) == {}
+        history.record([RunRecord(TABS, o) for o in "FP"])
+        loaded = FlakyHistory.load(history.save(tmp_path / "history.json"))
+
+        assert list(loaded.quarantined(policy)) == [TABS]
+        assert "[quarantined]" in format_history(loaded, policy)
+
+    def test_004_time_lost_across_workers(self, tmp_path):
+        """Test per-worker runs merge and the report charges retried and quarantined failures"""
+        write_worker_runs([RunRecord(TABS, RERUN_PASSED, attempts=2, duration_s=40.0, lost_s=30.0)],
+                          tmp_path, "gw0")
+        write_worker_runs([RunRecord(STABLE, PASSED, duration_s=50.0),
+                           RunRecord(HEBCAL, FAILED, duration_s=10.0, lost_s=10.0,
+                                     quarantined=True)], tmp_path, "gw1")
+
+        runs = load_worker_runs(tmp_path)
+        report = format_run(runs)
+
+        assert len(runs) == 3
+        assert "1 rerun, 1 passed on rerun, 1 quarantined failure(s); 40.0s lost (40.0% of test time)" in report
+        assert report.splitlines()[1].strip().startswith("30.0s  R x2")
+
+    def test_005_rerun_budget_shared_by_workers(self, tmp_path, monkeypatch):
+        """Test reruns charged by one worker count against every worker's budget"""
+        ledger = tmp_path / RERUN_LEDGER_FILE
+        policy = FlakyPolicy(rerun_budget_s=10.0, max_reruns=1)
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+        gw0 = RerunGate(FlakyHistory(), policy, ledger=ledger)
+        gw1 = RerunGate(FlakyHistory(), policy, ledger=ledger)
+
+        gw0.charge(4.0)
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        gw1.charge(4.0)
+
+        assert gw0.spent_s == gw1.spent_s == 8.0
+        assert gw0.allow(TABS, 1, flaky_marker=True, error=None, estimate_s=2.0)
+        assert not gw0.allow(TABS, 1, flaky_marker=True, error=None, estimate_s=3.0)
+
+    def test_006_infrastructure_failures_stay_out_of_history(self):
+        """Test a dev-server outage does not add F (two flips) to the tests it broke"""
+        history = FlakyHistory()
+        history.record([RunRecord(STABLE, PASSED) for _ in range(3)])
+        history.record([RunRecord(STABLE, FAILED, error="net::ERR_CONNECTION_REFUSED", infrastructure=True),
+                        RunRecord(TABS, FAILED, error="net::ERR_CONNECTION_REFUSED", infrastructure=True)])
+        history.record([RunRecord(STABLE, PASSED)])
+
+        assert history.outcomes(STABLE) == "PPPP" and history.flip_rate(STABLE) == 0.0
+        assert TABS not in history.tests
@@ -0,0 +1,59 @@
+"""
+Health Gate Tests
+Infrastructure failure classification, the shared circuit breaker and gate reports (no browser needed)
+"""
+from utils.health_gate import SKIP_PREFIX, CircuitBreaker, HealthCheck, HealthReport, infrastructure_failure
+
+
+GOTO_TIMEOUT = """conftest.py:50: in page
+    page.goto(BASE_URL)
+E   playwright._impl._errors.TimeoutError: Page.goto: Timeout 30000ms exceeded.
+E   Call log:
+E     - navigating to "http://localhost:8081/", waiting until "load\""""
+REFUSED = "E   playwright._impl._errors.Error: Page.goto: net::ERR_CONNECTION_REFUSED at http://localhost:8081/"
+ASSERTION = "E   AssertionError: No chapters displayed\nE   assert 0 > 0"
+LOCATOR_TIMEOUT = "E   playwright._impl._errors.TimeoutError: Locator.click: Timeout 30000ms exceeded."
+
+
+class TestHealthGate:
+    """Test the fast-fail guards around a broken app"""
+
+    def test_001_infrastructure_failures(self):
+        """Test app shell timeouts and refused connections count, test failures do not"""
+        assert "Page.goto: Timeout 30000ms" in infrastructure_failure("setup", GOTO_TIMEOUT)
+        assert "ERR_CONNECTION_REFUSED" in infrastructure_failure("call", REFUSED)
+        assert infrastructure_failure("setup", LOCATOR_TIMEOUT) is not None
+        assert infrastructure_failure("call", LOCATOR_TIMEOUT) is None
+        assert infrastructure_failure("call", ASSERTION) is None
+
+    def test_002_breaker_threshold_across_workers(self, tmp_path, monkeypatch):
+        """Test failures recorded by any worker open the breaker for all of them"""
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+        gw0 = CircuitBreaker(tmp_path, threshold=3)
+        gw1 = CircuitBreaker(tmp_path, threshold=3)
+
+        gw0.record("tests/a.py::test_1", "Page.goto: Timeout 30000ms exceeded.")
+        gw1.record("tests/b.py::test_2", "Page.goto: Timeout 30000ms exceeded.")
+        assert gw0.open_reason() is None and gw1.open_reason() is None
+        gw1.record("tests/b.py::test_3", "net::ERR_CONNECTION_REFUSED")
+
+        reason = gw0.open_reason()
+        assert reason.startswith(SKIP_PREFIX) and "3 app shell failures" in reason and "test_3" in reason
+        assert gw1.open_reason() == reason
+        gw0.reset()
+        assert CircuitBreaker(tmp_path, threshold=3).open_reason() is None
+
+    def test_003_gate_report_trips_breaker(self, tmp_path):
+        """Test a failed gate names its first failed check and opens the breaker at once"""
+        report = HealthReport("http://localhost:8081", [
+            HealthCheck("boot", True, 850.0),
+            HealthCheck("route /browse", False, 20000.0, "no Hebrew text on /browse within 20s (blank screen?)"),
+        ])
+        assert not report.ok and not HealthReport("http://localhost:8081").ok
+        assert report.reason == "health gate failed at route /browse: no Hebrew text on /browse within 20s (blank screen?)"
+        assert report.format().startswith("Health gate FAILED after 20.9s at route /browse")
+        assert report.to_dict()["checks"][1]["ok"] is False
+
+        breaker = CircuitBreaker(tmp_path, threshold=100)
+        breaker.trip(report.reason)
+        assert breaker.open_reason() == f"{SKIP_PREFIX}: {report.reason}"
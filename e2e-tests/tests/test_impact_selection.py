@@ -0,0 +1,166 @@
+"""
+Test Impact Selection Tests
+Route/content mapping, source resolution, selection rules and staleness fallbacks (no browser needed)
+"""
+import json
+import subprocess
+import time
+from utils.test_impact import (
+    ImpactIndex,
+    SourceResolver,
+    impact_row,
+    merge_worker_rows,
+    python_dependencies,
+    route_content,
+    select,
+    select_for_run,
+    staleness,
+    write_worker_rows,
+)
+
+
+BASE = "http://localhost:8081"
+NAV = "tests/test_navigation.py::TestBasicNavigation"
+SEARCH = "tests/test_hebrew_content.py::TestHebrewSearch::test_010_search"
+PARSHA = "tests/test_parsha.py::TestParsha::test_021_parsha_first_paint[bo]"
+SECTION = "tests/test_content_loading.py::TestSectionLoading::test_003_section"
+PURE = "tests/test_qa_search.py::TestQASearch::test_001_index_matches_naive"
+
+
+def _index():
+    index = ImpactIndex()
+    index.update([
+        impact_row(f"{NAV}::test_001_app_loads_successfully", ["app/(tabs)/index.tsx"], [f"{BASE}/"], 2.0,
+                   markers=["smoke"]),
+        impact_row(SEARCH, ["app/search.tsx", "utils/hebrewNormalize.ts", "utils/contentLoader.ts"],
+                   [f"{BASE}/", f"{BASE}/search"], 6.0),
+        impact_row(PARSHA, ["utils/parshaLoader.ts"], [f"{BASE}/parsha/bo"], 8.0),
+        impact_row(SECTION, ["utils/contentLoader.ts"], [f"{BASE}/section/kitzur_orach_chaim-001-s1"], 4.0,
+                   chapter_paths={"kitzur_orach_chaim-001": "content/chapters/kitzur_orach_chaim-001.json"}),
+        impact_row(PURE, [], [], 0.5),
+    ], commit="abc123")
+    return index
+
+
+def _tests(index, extra=()):
+    tests = {nodeid: set(entry["markers"]) for nodeid, entry in index.tests.items()}
+    tests.update({nodeid: set() for nodeid in extra})
+    return tests
+
+
+def _select(changed, extra=(), deps=None, existed=lambda path: True):
+    index = _index()
+    return select(index, _tests(index, extra), changed, deps or {}, existed)
+
+
+class TestImpactSelection:
+    """Test change -> test selection"""
+
+    def test_001_route_content(self):
+        """Test routes map to the content files they read"""
+        assert route_content(f"{BASE}/parsha/bo?x=1") == {"content/parshiot/bo.json"}
+        assert route_content(f"{BASE}/section/kitzur_orach_chaim-012-s3") == {"content/*/kitzur_orach_chaim-012.json"}
+        assert route_content(f"{BASE}/browse") == route_content(f"{BASE}/") == {"content/*"}
+        assert route_content(f"{BASE}/birkat-hamazon") == {"content/special/birkat_hamazon.json"}
+        assert route_content(f"{BASE}/settings") == set()
+
+    def test_002_source_resolver(self):
+        """Test executed ranges resolve to the app sources whose generated code they cover"""
+        code = "aaaa;bbbb;cccc\nreact()\n//# sourceMappingURL=index.map"
+        # columns 0 / 5 / 10 of line 0 -> sources 0 / 1 / 2, line 1 -> source 3
+        source_map = {"version": 3, "mappings": "AAAA,KCAA,KCAA;ACAA;", "sources": [
+            "/ci/kitzur/utils/hebrewNormalize.ts", "/ci/kitzur/utils/progress.ts",
+            "/ci/kitzur/content/chapters-index.ts", "/ci/kitzur/node_modules/react/index.js",
+        ]}
+        served = {f"{BASE}/index.bundle": code, f"{BASE}/index.map": json.dumps(source_map)}
+        resolver = SourceResolver(fetch=served.__getitem__)
+
+        assert resolver.sources({f"{BASE}/index.bundle": [(1, 3), (11, 20)]}) == {
+            "utils/hebrewNormalize.ts", "content/chapters-index.ts",
+        }
+
+    def test_003_selection_rules(self):
+        """Test sources, content, data files, python modules, smoke and new tests each pull in the right tests"""
+        new = "tests/test_search.py::TestSearchFuzz::test_021_fuzz"
+        deps = {"tests/test_parsha.py": {"tests/test_parsha.py", "pages/parsha_page.py", "pages/base_page.py"}}
+
+        source = _select(["kitzur/utils/hebrewNormalize.ts"], extra=[new])
+        content = _select(["kitzur/content/chapters/kitzur_orach_chaim-001.json"])
+        python = _select(["e2e-tests/pages/parsha_page.py", "docs/notes.md"], deps=deps)
+        backend = _select(["functions/index.js"])
+        data = _select(["e2e-tests/test_data/search_regressions.ndjson", "e2e-tests/test_data/flaky-history.json"],
+                       deps={"tests/test_hebrew_content.py": {"utils/search_fuzzer.py"}})
+
+        assert source.reasons == {
+            f"{NAV}::test_001_app_loads_successfully": "smoke", new: "new test",
+            SEARCH: "source: utils/hebrewNormalize.ts",
+        }
+        assert source.saved_s == 12.5 and "3/6 tests" in source.format()
+        assert set(content.selected) == {f"{NAV}::test_001_app_loads_successfully", SEARCH, SECTION}
+        assert python.reasons[PARSHA] == "python: pages/parsha_page.py" and PURE not in python.selected
+        assert backend.selected == [f"{NAV}::test_001_app_loads_successfully"]
+        assert data.fallback is None and data.reasons[SEARCH] == "data: test_data/search_regressions.ndjson"
+
+    def test_004_full_suite_fallbacks(self):
+        """Test config changes, unindexed or unmapped files, big diffs and stale indexes run everything"""
+        index = _index()
+
+        assert _select(["e2e-tests/conftest.py"]).fallback == "e2e-tests/conftest.py changed"
+        assert "not in the index" in _select(["kitzur/utils/newThing.ts"], existed=lambda p: False).fallback
+        assert "not tracked" in _select(["kitzur/assets/fonts/FrankRuehl.ttf"]).fallback
+        assert "files changed" in select(index, _tests(index), [f"kitzur/x{i}.md" for i in range(5)], {},
+                                         lambda p: True, max_changed=3).fallback
+        assert _select(["kitzur/utils/deadCode.ts"]).selected == [f"{NAV}::test_001_app_loads_successfully"]
+        for unmapped in ("firebase.json", "server/src/index.ts", "e2e-tests/run_tests.sh", "kitzur/web/index.html"):
+            assert "not tracked" in _select([unmapped]).fallback, unmapped
+        assert "no impact index" in staleness(None, 7)
+        assert "days old" in staleness(index, 7, now=time.time() + 8 * 86400)
+        assert staleness(index, 7) is None
+
+    def test_005_index_from_worker_rows(self, tmp_path):
+        """Test worker rows fold into the index and re-recorded tests replace their entries"""
+        write_worker_rows([impact_row(SEARCH, ["utils/a.ts"], [], 1.0)], tmp_path, "gw0")
+        write_worker_rows([impact_row(PARSHA, ["utils/b.ts"], [], 2.0)], tmp_path, "gw1")
+        index_path = tmp_path / "index.json"
+        merge_worker_rows(tmp_path, index_path, commit="c1")
+        write_worker_rows([impact_row(SEARCH, ["utils/c.ts"], [], 1.0)], tmp_path, "gw0")
+        (tmp_path / "impact-rows-gw1.json").unlink()
+
+        index = merge_worker_rows(tmp_path, index_path, commit="c2")
+
+        assert ImpactIndex.load(index_path).tests == index.tests
+        assert index.tests[SEARCH]["sources"] == ["utils/c.ts"] and index.tests[SEARCH]["commit"] == "c2"
+        assert index.tests[PARSHA]["commit"] == "c1" and index.commits() == {"c1", "c2"}
+
+    def test_006_python_dependencies(self):
+        """Test a test module depends on the page objects it imports, transitively"""
+        deps = python_dependencies(["tests/test_navigation.py"])["tests/test_navigation.py"]
+
+        assert {"tests/test_navigation.py", "pages/home_page.py", "pages/base_page.py"} <= deps
+
+    def test_007_select_against_git(self, tmp_path):
+        """Test the working tree diff against the indexed commit drives the selection"""
+        def git(*args):
+            subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=tmp_path,
+                           check=True, capture_output=True)
+        (tmp_path / "kitzur" / "utils").mkdir(parents=True)
+        (tmp_path / "kitzur" / "utils" / "hebrewNormalize.ts").write_text("export {}\n")
+        git("init", "-q")
+        git("add", ".")
+        git("commit", "-q", "-m", "base")
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=tmp_path, capture_output=True,
+                                text=True).stdout.strip()
+        index = _index()
+        index.update([], commit)
+        for entry in index.tests.values():
+            entry["commit"] = commit
+        index_path = index.save(tmp_path / "e2e-tests" / "test_data" / "test-impact-index.json")
+        (tmp_path / "kitzur" / "utils" / "hebrewNormalize.ts").write_text("export const x = 1\n")
+
+        selection = select_for_run(_tests(index), index_path, repo=tmp_path)
+        index.tests[SEARCH]["commit"] = "0" * 40
+        unknown = select_for_run(_tests(index), index.save(index_path), repo=tmp_path)
+
+        assert selection.fallback is None
+        assert SEARCH in selection.selected and PARSHA not in selection.selected
+        assert "unknown to git" in unknown.fallback
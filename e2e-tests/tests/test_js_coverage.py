@@ -0,0 +1,119 @@
+"""
+JS Coverage Tests
+Interval folding, cross-worker merging and source-mapped line coverage (no browser needed)
+"""
+import json
+from utils.js_coverage import (
+    CoverageStore,
+    build_line_coverage,
+    executed_ranges,
+    format_summary,
+    overlaps,
+    subtract,
+    union,
+    write_html,
+    write_lcov,
+)
+
+
+BUNDLE = "http://localhost:8081/index.bundle?platform=web"
+MAP = "http://localhost:8081/index.map?platform=web"
+APP = "/home/ci/kitzur"
+
+
+def _segment(column, source, line):
+    """VLQ for small non-negative deltas (< 16)"""
+    b64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+    return "".join(b64[v << 1] if v >= 0 else b64[(-v << 1) | 1] for v in (column, source, line, 0))
+
+
+def _served_bundle():
+    """
+    line 0: contentLoader.ts line 1 (ran) | line 2 (skipped branch)
+    line 1: progress.ts line 1 (never ran)
+    line 2: node_modules code (ran, excluded from the report)
+    """
+    code = "\n".join([
+        "load();if(x){miss()}",
+        "function p(){}",
+        "react();",
+        f"//# sourceMappingURL={MAP}",
+    ])
+    mappings = ";".join([
+        _segment(0, 0, 0) + "," + _segment(7, 0, 1),
+        _segment(0, 1, -1),
+        _segment(0, 1, 0),
+        "",
+    ])
+    source_map = {"version": 3, "mappings": mappings, "sources": [
+        f"{APP}/utils/contentLoader.ts", f"{APP}/utils/progress.ts", f"{APP}/node_modules/react/index.js",
+    ]}
+    return code, {BUNDLE: code, MAP: json.dumps(source_map)}
+
+
+class TestJSCoverage:
+    """Test coverage merging and mapping"""
+
+    def test_001_interval_algebra(self):
+        """Test union joins overlaps, subtract cuts holes and overlaps bisects"""
+        assert union([(5, 9), (0, 3), (2, 4), (9, 10), (7, 7)]) == [(0, 4), (5, 10)]
+        assert subtract([(0, 10), (20, 30)], [(2, 4), (8, 22)]) == [(0, 2), (4, 8), (22, 30)]
+        assert overlaps([(0, 4), (10, 12)], 3, 5) and overlaps([(0, 4), (10, 12)], 8, 11)
+        assert not overlaps([(0, 4), (10, 12)], 4, 10)
+
+    def test_002_block_coverage_to_ranges(self):
+        """Test unexecuted blocks are cut out of the executed functions around them"""
+        functions = [
+            {"ranges": [{"startOffset": 0, "endOffset": 100, "count": 1}]},
+            {"ranges": [{"startOffset": 10, "endOffset": 40, "count": 3},
+                        {"startOffset": 20, "endOffset": 30, "count": 0}]},
+            {"ranges": [{"startOffset": 60, "endOffset": 80, "count": 0}]},
+        ]
+
+        assert executed_ranges(functions) == [(0, 20), (30, 60), (80, 100)]
+
+    def test_003_workers_merge_by_union(self, tmp_path):
+        """Test worker files union per script instead of keeping per-test copies"""
+        gw0, gw1 = CoverageStore(), CoverageStore()
+        gw0.add(BUNDLE, [(0, 10)])
+        gw0.add(BUNDLE, [(5, 20)])
+        gw1.add(BUNDLE, [(30, 40)])
+        gw1.add("http://localhost:8081/chunk.js", [(0, 1)])
+        gw0.pages, gw0.collect_ms = 3, 12.0
+        gw0.write(tmp_path, "gw0")
+        gw1.write(tmp_path, "gw1")
+
+        merged = CoverageStore.load(tmp_path)
+
+        assert gw0.scripts[BUNDLE] == [(0, 20)]
+        assert merged.scripts[BUNDLE] == [(0, 20), (30, 40)]
+        assert len(merged.scripts) == 2 and merged.pages == 3
+
+    def test_004_source_mapped_lines(self, tmp_path):
+        """Test executed ranges map to hit and missed lines of app sources only"""
+        code, served = _served_bundle()
+        store = CoverageStore()
+        line_2 = code.index("react")
+        store.add(BUNDLE, [(0, 7), (line_2, line_2 + 8)])
+
+        files = build_line_coverage(store, fetch=served.__getitem__)
+        lcov = write_lcov(files, tmp_path / "lcov.info", root=tmp_path).read_text()
+        index = write_html(files, tmp_path / "html", root=tmp_path).read_text()
+
+        assert files == {"utils/contentLoader.ts": {1: True, 2: False}, "utils/progress.ts": {1: False}}
+        assert "DA:1,1\nDA:2,0\nLF:2\nLH:1" in lcov
+        assert "utils/progress.ts" in index
+        assert "1/3 lines (33.3%)" in format_summary(files, store)
+
+    def test_005_executed_function_inside_skipped_block(self):
+        """Test the innermost range wins: a hoisted function called before an early return counts as run"""
+        functions = [
+            # script body; everything after the early return (30..100) never ran
+            {"ranges": [{"startOffset": 0, "endOffset": 100, "count": 1},
+                        {"startOffset": 30, "endOffset": 100, "count": 0}]},
+            # function declared at 50..70 (after the return), called once; its `if` branch was not taken
+            {"ranges": [{"startOffset": 50, "endOffset": 70, "count": 1},
+                        {"startOffset": 60, "endOffset": 65, "count": 0}]},
+        ]
+
+        assert executed_ranges(functions) == [(0, 30), (50, 60), (65, 70)]
@@ -0,0 +1,75 @@
+"""
+List Performance Tests
+Mounted vs logical rows, fling frame drops and layout cost for long lists
+"""
+import json
+from pathlib import Path
+import pytest
+from pages.browse_page import BrowsePage
+from pages.chapter_page import ChapterPage
+from pages.questions_page import QuestionsPage
+from utils.scroll_probe import ListBudget, ScrollProbe
+
+
+# Tighten max_mounted_ratio once a list is virtualized; until then it only guards against duplicated rows
+LIST_BUDGETS = {
+    "browse": ListBudget(max_mounted_ratio=1.0, max_dropped_pct=10, max_layout_ms=60, max_style_ms=60),
+    "chapter": ListBudget(max_mounted_ratio=1.0, max_dropped_pct=10, max_layout_ms=60, max_style_ms=60),
+    "questions": ListBudget(max_dropped_pct=15, max_layout_ms=100, max_style_ms=100),
+}
+CHAPTER_ID = "kitzur_orach_chaim-001"
+REPORT_PATH = Path(__file__).resolve().parents[1] / "reports" / "list-performance.json"
+
+
+@pytest.fixture(scope="module")
+def list_report():
+    """Collect probe results into reports/list-performance.json"""
+    results = {}
+    yield results
+    if results:
+        REPORT_PATH.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+def _check(result, list_report):
+    list_report[result.name] = result.to_dict()
+    violations = result.violations(LIST_BUDGETS[result.name])
+    assert not violations, "; ".join(violations)
+
+
+class TestListPerformance:
+    """Probe virtualization and scroll smoothness per list"""
+
+    @pytest.mark.performance
+    def test_001_browse_list(self, page, list_report):
+        """Test the browse chapter list within its budget"""
+        browse = BrowsePage(page)
+        browse.goto_browse()
+
+        result = ScrollProbe(page).measure("browse", browse.chapter_items, logical_rows=221)
+
+        assert result.mounted_rows > 0, "No chapter rows mounted"
+        _check(result, list_report)
+
+    @pytest.mark.performance
+    def test_002_chapter_sections_list(self, page, section_locator, list_report):
+        """Test a chapter's section list within its budget"""
+        chapter = ChapterPage(page)
+        chapter.goto_chapter(CHAPTER_ID)
+
+        result = ScrollProbe(page).measure(
+            "chapter", chapter.section_items, logical_rows=len(section_locator.sections_of(CHAPTER_ID))
+        )
+
+        assert result.mounted_rows > 0, "No section rows mounted"
+        _check(result, list_report)
+
+    @pytest.mark.performance
+    @pytest.mark.questions
+    def test_003_questions_list(self, page, list_report):
+        """Test the questions list within its budget"""
+        questions = QuestionsPage(page)
+        questions.goto_questions()
+
+        result = ScrollProbe(page).measure("questions", questions.question_cards)
+
+        _check(result, list_report)
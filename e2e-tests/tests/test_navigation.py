@@ -1,5 +1,5 @@
 """
-Navigation Tests - 30 comprehensive tests
+Navigation Tests - 31 comprehensive tests
 Testing app navigation, routing, and user flows
 """
 import pytest
@@ -167,10 +167,12 @@ class TestDeepLinking:
         assert chapter.get_sections_count() > 0
     
     @pytest.mark.navigation
-    def test_017_direct_section_url(self, page):
+    def test_017_direct_section_url(self, page, section_locator):
         """Test direct navigation to section URL"""
+        location = section_locator.resolve("kitzur_orach_chaim-001-s1")
+        assert location is not None, "Deep link target missing from content"
         section = SectionPage(page)
-        section.goto_section("siman-001-seif-001")
+        section.goto_section(location.section_id)
         section.assert_hebrew_text_visible()
     
     @pytest.mark.navigation
@@ -228,6 +230,7 @@ class TestNavigationState:
         # This test documents the actual behavior
     
     @pytest.mark.navigation
+    @pytest.mark.flaky(reason="tab presses can land before the previous screen mounts")
     def test_023_rapid_tab_switching(self, page):
         """Test rapid switching between tabs"""
         home = HomePage(page)
@@ -243,6 +246,7 @@ class TestNavigationState:
         home.assert_home_page_loaded()
     
     @pytest.mark.navigation
+    @pytest.mark.flaky(reason="races the chapter load it interrupts")
     def test_024_navigation_during_loading(self, page):
         """Test navigation while page is loading"""
         page.goto("http://localhost:8081/browse")
@@ -320,3 +324,31 @@ class TestSpecialNavigation:
         
         # Settings page should load
         assert page.is_visible("text=גודל טקסט") or page.is_visible("text=ערכת נושא")
+
+
+COLD_START_ROUTES = ["/", "/browse", "/section/kitzur_orach_chaim-001-s1", "/parsha/bo"]
+COLD_START_BUDGET_MS = 5000
+
+
+class TestColdStart:
+    """Cold-start waterfall from navigation to first Hebrew text"""
+    
+    @pytest.mark.performance
+    @pytest.mark.navigation
+    @pytest.mark.hebrew
+    @pytest.mark.parametrize("route", COLD_START_ROUTES)
+    def test_031_cold_start_waterfall(self, browser, browser_name, browser_context_args, route):
+        """Test each route shows Hebrew text within budget from an empty cache, and log its phases"""
+        if browser_name != "chromium":
+            pytest.skip("Startup traces need Chromium tracing")
+        from utils.startup_profiler import StartupProfiler, append_history, waterfall
+        
+        profile = StartupProfiler(browser, browser_context_args).profile(route)
+        append_history([profile])
+        
+        print("\n🚀 " + waterfall(profile))
+        first_hebrew = profile.milestones["first_hebrew_text_ms"]
+        assert first_hebrew is not None, f"{route}: no Hebrew text appeared"
+        assert profile.phase("bundle_download"), f"{route}: no script downloads recorded"
+        assert first_hebrew <= COLD_START_BUDGET_MS, \
+            f"{route}: first Hebrew text after {first_hebrew:.0f} ms (budget {COLD_START_BUDGET_MS} ms)"
@@ -0,0 +1,91 @@
+"""
+Network Ledger Tests
+CDP event bookkeeping, duplicate detection, route budgets and the report summary (no browser needed)
+"""
+from utils.network_ledger import NetworkLedger, RouteBudget, load_summaries, summary_html, write_worker_summary
+
+
+BASE = "http://localhost:8081"
+
+
+def _fetch(ledger, request_id, url, size, start=1.0, end=1.05, cache=None, initiator=None):
+    """Replay the CDP events of one request"""
+    ledger._on_request({
+        "requestId": request_id,
+        "request": {"url": url, "method": "GET"},
+        "type": "Fetch",
+        "initiator": initiator or {"type": "script", "stack": {"callFrames": [{"url": f"{BASE}/index.bundle"}]}},
+        "timestamp": start,
+    })
+    if cache == "memory":
+        ledger._on_memory_cache({"requestId": request_id})
+    ledger._on_response({"requestId": request_id, "response": {"status": 200, "fromDiskCache": cache == "disk"}})
+    ledger._on_finished({"requestId": request_id, "encodedDataLength": size, "timestamp": end})
+
+
+class TestNetworkLedger:
+    """Test request accounting"""
+
+    def test_001_entries_from_cdp_events(self):
+        """Test size, timing, cache status and initiator come from the CDP events"""
+        ledger = NetworkLedger(duplicate_allowlist=[])
+        _fetch(ledger, "1", f"{BASE}/content/chapters/kitzur_orach_chaim-001.json", 5120)
+        _fetch(ledger, "2", f"{BASE}/assets/fonts/FrankRuehl.ttf", 90000, cache="disk")
+        ledger._on_request({"requestId": "3", "request": {"url": "data:image/png;base64,AA"}})
+
+        first, second = ledger.entries
+
+        assert (first.encoded_bytes, first.duration_ms, first.cache) == (5120, 50.0, "network")
+        assert first.resource_type == "fetch" and first.initiator == f"script {BASE}/index.bundle"
+        assert second.from_cache and second.cache == "disk"
+        assert ledger.summary()["cache_hits"] == 1 and ledger.summary()["bytes"] == 95120
+
+    def test_002_redirects_and_failures(self):
+        """Test redirect hops and failed or unfinished requests are all booked"""
+        ledger = NetworkLedger(duplicate_allowlist=[])
+        ledger._on_request({"requestId": "r", "request": {"url": f"{BASE}/old"}, "timestamp": 1.0})
+        ledger._on_request({"requestId": "r", "request": {"url": f"{BASE}/new"}, "timestamp": 1.1,
+                            "redirectResponse": {"status": 301, "encodedDataLength": 200}})
+        _fetch(ledger, "f", f"{BASE}/missing.json", 0)
+        ledger._on_request({"requestId": "x", "request": {"url": f"{BASE}/broken"}, "timestamp": 2.0})
+        ledger._on_failed({"requestId": "x", "errorText": "net::ERR_CONNECTION_REFUSED"})
+        ledger.detach()
+
+        by_url = {e.url.rsplit("/", 1)[1]: e for e in ledger.entries}
+        assert by_url["old"].status == 301 and by_url["old"].encoded_bytes == 200
+        assert by_url["new"].failed == "unfinished"
+        assert by_url["broken"].failed == "net::ERR_CONNECTION_REFUSED"
+        assert ledger.summary()["failed"] == 2
+
+    def test_003_duplicates_and_budget(self):
+        """Test repeated network fetches are flagged, cached and allowlisted repeats are not"""
+        ledger = NetworkLedger(duplicate_allowlist=[r"/Listen/channel"])
+        chapter = f"{BASE}/content/chapters/yoreh_deah-331.json"
+        _fetch(ledger, "1", chapter, 40000)
+        _fetch(ledger, "2", chapter, 40000)
+        _fetch(ledger, "3", chapter, 0, cache="memory")
+        _fetch(ledger, "4", "https://firestore.googleapis.com/google.firestore.v1.Firestore/Listen/channel", 10)
+        _fetch(ledger, "5", "https://firestore.googleapis.com/google.firestore.v1.Firestore/Listen/channel", 10)
+
+        assert ledger.duplicates() == {f"GET {chapter}": 2}
+        assert ledger.violations(RouteBudget(max_requests=10, max_bytes=100000, max_duplicates=1)) == []
+        assert ledger.violations(RouteBudget(max_requests=4, max_bytes=50000), "content") == [
+            "content: requests 5 > 4",
+            "content: bytes 80,020 > 50,000",
+            "content: duplicate fetches 1 > 0",
+            f"content:   2x GET {chapter}",
+        ]
+
+    def test_004_report_summary(self, tmp_path):
+        """Test worker summaries merge into one per-route HTML table"""
+        ledger = NetworkLedger()
+        _fetch(ledger, "1", f"{BASE}/content/parshiot/bo.json", 2 ** 20)
+        row = {"test": "t", "route": "parsha", "summary": ledger.summary(), "violations": []}
+        write_worker_summary([row], tmp_path, "gw0")
+        write_worker_summary([dict(row, violations=["x"])], tmp_path, "gw1")
+
+        rows = load_summaries(tmp_path)
+        table = summary_html(rows)
+
+        assert len(rows) == 2
+        assert "<td>parsha</td><td>2</td><td>2</td><td>2.00</td><td>0</td><td>0</td><td>1</td>" in table
@@ -0,0 +1,99 @@
+"""
+Parsha Shard Tests
+Per-chapter parsha shards, header index and lazy verse loader (no browser needed)
+"""
+import json
+import pytest
+from utils.parsha_shards import (
+    ParshaShards, build_parsha_shards, compare_first_paint, load_first_paint, merge_first_paint, report,
+)
+
+
+class TestParshaShards:
+    """Test splitting parshiot and reading them back lazily"""
+
+    @pytest.mark.content
+    def test_001_round_trip(self, mini_content_dir, tmp_path):
+        """Test shards reassemble to the original parsha document"""
+        shards_dir = tmp_path / "shards"
+        build_parsha_shards(mini_content_dir, shards_dir)
+
+        original = json.loads((mini_content_dir / "parshiot/bo.json").read_text(encoding="utf-8"))
+
+        assert ParshaShards(shards_dir).load_parsha("bo") == original
+
+    @pytest.mark.content
+    def test_002_header_describes_chapters(self, mini_content_dir, tmp_path):
+        """Test the header carries verse ranges without any verse text"""
+        shards_dir = tmp_path / "shards"
+        build_parsha_shards(mini_content_dir, shards_dir)
+
+        header = ParshaShards(shards_dir).header("bo")
+
+        assert [(c["chapter"], c["verses"], c["first_verse"], c["last_verse"]) for c in header["chapters"]] == [
+            (10, 2, 1, 2),
+            (11, 1, 1, 1),
+        ]
+        assert "hebrew" not in json.dumps(header)
+        assert ParshaShards(shards_dir).header("noach") is None
+
+    @pytest.mark.content
+    def test_003_verses_load_lazily(self, mini_content_dir, tmp_path):
+        """Test the generator opens a chapter shard only when it reaches it"""
+        shards_dir = tmp_path / "shards"
+        build_parsha_shards(mini_content_dir, shards_dir)
+        (shards_dir / "bo/011.json").unlink()
+
+        verses = ParshaShards(shards_dir).iter_verses("bo")
+
+        assert [next(verses)[0], next(verses)[0]] == [10, 10]
+        with pytest.raises(FileNotFoundError):
+            next(verses)
+        assert [c for c, _ in ParshaShards(shards_dir).iter_verses("bo", chapters=[10])] == [10, 10]
+
+    @pytest.mark.content
+    def test_004_incremental_build_skips_unchanged(self, mini_content_dir, tmp_path):
+        """Test only parshiot whose source changed are rewritten"""
+        shards_dir = tmp_path / "shards"
+        build_parsha_shards(mini_content_dir, shards_dir)
+        assert build_parsha_shards(mini_content_dir, shards_dir)["rebuilt"] == []
+
+        path = mini_content_dir / "parshiot/bo.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        del data["chapters"][1]
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        assert build_parsha_shards(mini_content_dir, shards_dir)["rebuilt"] == ["bo"]
+        assert not (shards_dir / "bo/011.json").exists()
+        assert ParshaShards(shards_dir).load_parsha("bo") == data
+
+    @pytest.mark.performance
+    def test_005_reports(self, mini_content_dir, tmp_path):
+        """Test the data-level report and the first-paint comparison"""
+        shards_dir = tmp_path / "shards"
+        build_parsha_shards(mini_content_dir, shards_dir)
+        before, after = tmp_path / "before.json", tmp_path / "after.json"
+        before.write_text(json.dumps({"routes": {"parsha/bo": {"first_verse_ms": 900.0}}}))
+        after.write_text(json.dumps({"routes": {"parsha/bo": {"first_verse_ms": 400.0}}}))
+
+        stats = report(mini_content_dir, shards_dir, repeat=1)
+
+        assert stats["parshiot"] == 1
+        assert stats["header_bytes"] < stats["whole_bytes"]
+        assert compare_first_paint(before, after)[0]["first_verse_ms"]["delta"] == -500.0
+
+    @pytest.mark.performance
+    def test_006_merges_worker_first_paint(self, tmp_path):
+        """Test xdist worker files are folded into one file per label"""
+        for worker, route in (("gw0", "parsha/bo"), ("gw1", "shnayim-mikra")):
+            (tmp_path / f"first-paint-sharded-{worker}.json").write_text(
+                json.dumps({"label": "sharded", "routes": {route: {"first_verse_ms": 300.0}}}))
+        (tmp_path / "first-paint-whole.json").write_text(
+            json.dumps({"routes": {"parsha/bo": {"first_verse_ms": 800.0}}}))
+
+        assert set(load_first_paint(tmp_path / "first-paint-sharded.json")) == {"parsha/bo", "shnayim-mikra"}
+        assert merge_first_paint(tmp_path) == [tmp_path / "first-paint-sharded.json"]
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["first-paint-sharded.json", "first-paint-whole.json"]
+        rows = compare_first_paint(tmp_path / "first-paint-whole.json", tmp_path / "first-paint-sharded.json")
+        assert rows == [{"route": "parsha/bo", "first_verse_ms": {"before": 800.0, "after": 300.0, "delta": -500.0}}]
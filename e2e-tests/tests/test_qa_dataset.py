@@ -0,0 +1,102 @@
+"""
+Q&A Dataset Tests
+Seedable synthetic question generator and its stand-in datastores (no browser needed)
+"""
+import itertools
+import time
+import pytest
+from utils.qa_dataset import (
+    CATEGORY_KEYS,
+    QADatasetGenerator,
+    QuestionStore,
+    read_ndjson,
+    to_firestore_fields,
+    write_ndjson,
+)
+from utils.test_helpers import get_test_categories
+
+
+QUESTION_FIELDS = {
+    "id", "question", "category", "askedBy", "askedByName", "timestamp", "createdAt", "status",
+    "moderationStatus", "minimumApprovalsRequired", "stats", "tags", "relatedQuestions", "isPrivate", "visibility",
+}
+
+
+class TestQADataset:
+    """Test the dataset generator"""
+
+    @pytest.mark.questions
+    def test_001_same_seed_same_bytes(self, tmp_path):
+        """Test output is reproducible per seed and differs across seeds"""
+        paths = [tmp_path / "a.ndjson", tmp_path / "b.ndjson", tmp_path / "c.ndjson.gz"]
+        for path, seed in zip(paths, (3, 3, 4)):
+            write_ndjson(QADatasetGenerator(seed).questions(500), path)
+
+        assert paths[0].read_bytes() == paths[1].read_bytes()
+        assert list(read_ndjson(paths[0])) != list(read_ndjson(paths[2]))
+        assert len(list(read_ndjson(paths[2]))) == 500
+
+    @pytest.mark.questions
+    @pytest.mark.hebrew
+    def test_002_records_match_question_type(self):
+        """Test fields, categories from get_test_categories and answer timing"""
+        questions = list(QADatasetGenerator(1).questions(2000))
+        categories = {CATEGORY_KEYS[label] for label in get_test_categories()}
+
+        assert len({q["id"] for q in questions}) == 2000
+        assert {q["category"] for q in questions} == categories
+        for q in questions:
+            assert QUESTION_FIELDS <= set(q)
+            assert any("א" <= ch <= "ת" for ch in q["question"])
+            if "answer" in q:
+                assert q["answer"]["answeredAt"] > q["createdAt"]
+                assert q["status"] != "rejected"
+        assert 0.4 < sum("answer" in q for q in questions) / 2000 < 0.7
+
+    @pytest.mark.questions
+    def test_003_generator_is_lazy(self):
+        """Test records stream without materialising the whole dataset"""
+        stream = QADatasetGenerator(0).questions(10_000_000)
+
+        first = list(itertools.islice(stream, 3))
+
+        assert [q["id"] for q in first] == ["qa-0-0000000", "qa-0-0000001", "qa-0-0000002"]
+
+    @pytest.mark.questions
+    def test_004_store_orders_like_subscribe_to_questions(self):
+        """Test the SQLite stand-in returns createdAt-descending results"""
+        questions = list(QADatasetGenerator(2).questions(1000))
+        store = QuestionStore()
+
+        assert store.load(questions, batch=128) == 1000
+        ordered = store.ordered()
+        shabbat = store.ordered(limit=5, category="shabbat")
+
+        assert store.count() == 1000
+        assert [q["createdAt"] for q in ordered] == sorted((q["createdAt"] for q in questions), reverse=True)
+        assert len(shabbat) == 5 and {q["category"] for q in shabbat} == {"shabbat"}
+        store.close()
+
+    @pytest.mark.questions
+    def test_005_firestore_encoding(self):
+        """Test REST field encoding for the Firestore emulator"""
+        question = next(QADatasetGenerator(5).questions(1))
+
+        fields = to_firestore_fields(question)
+
+        assert "id" not in fields
+        assert fields["createdAt"]["timestampValue"].endswith("Z")
+        assert fields["stats"]["mapValue"]["fields"]["views"] == {"integerValue": str(question["stats"]["views"])}
+        assert fields["isPrivate"] == {"booleanValue": question["isPrivate"]}
+        assert "values" in fields["tags"]["arrayValue"]
+
+    @pytest.mark.questions
+    @pytest.mark.performance
+    def test_006_generation_throughput(self):
+        """Test 10k records generate well within the time needed for 100k-scale runs"""
+        start = time.perf_counter()
+        count = sum(1 for _ in QADatasetGenerator(9).questions(10_000))
+        elapsed = time.perf_counter() - start
+
+        assert count == 10_000
+        assert elapsed < 5, f"10k questions took {elapsed:.2f}s"
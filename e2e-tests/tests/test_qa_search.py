@@ -0,0 +1,95 @@
+"""
+Q&A Search Oracle Tests
+The Python port of fuzzySearchQuestions and its token index agree with the app's scoring (no browser needed)
+"""
+import pytest
+from utils.qa_dataset import QADatasetGenerator
+from utils.qa_search import QuestionSearchIndex, app_normalize, benchmark, fuzzy_search_naive, sample_queries
+
+
+EDGE_QUERIES = [
+    "", "   ", "ש", "ש ב", "שַׁבָּת", "שבת  קודש", "טבילת\tכלים", "כשר", "מותר?", "בשר בחלב",
+    "צדקה", "חמץ", "מה הדין", 'חז"ל', "ר'", "SHABBAT", "ab", " שבת ",
+]
+
+
+def _question(qid, text, answer=None, tags=(), timestamp=0, category="shabbat"):
+    question = {"id": qid, "question": text, "tags": list(tags), "timestamp": timestamp, "category": category}
+    if answer is not None:
+        question["answer"] = {"text": answer}
+    return question
+
+
+@pytest.fixture(scope="module")
+def generated():
+    return list(QADatasetGenerator(seed=7).questions(1500))
+
+
+class TestQASearchOracle:
+    """Test the ranking oracle"""
+
+    @pytest.mark.hebrew
+    def test_001_normalize_matches_app(self):
+        """Test nikud, final letters, quote marks and JS trim follow hebrewNormalize.ts"""
+        assert app_normalize("שַׁבָּת שָׁלוֹם") == "שבת שלומ"
+        assert app_normalize('חז"ל') == "חז״ל" and app_normalize("ר'") == "ר׳"
+        assert app_normalize("  Tefillin\n") == "tefillin"
+        assert app_normalize(None) == ""
+
+    @pytest.mark.questions
+    def test_002_scores_by_field(self):
+        """Test exact/partial question, tag and answer scores plus the exact-match bonus"""
+        questions = [
+            _question("q", "האם מותר לבשל בשבת", answer="אסור", tags=["שבת"]),
+            _question("t", "שאלה אחרת", answer="כן", tags=["שבת קודש"]),
+            _question("n", "שאלה שלישית", answer="לא"),
+        ]
+        ranked = QuestionSearchIndex(questions).ranked("שבת")
+
+        # q: partial question word "בשבת" 20 + exact tag 25; t: tag word exact 25
+        assert [(q["id"], score) for q, score in ranked] == [("q", 45), ("t", 25)]
+        ranked = QuestionSearchIndex(questions).ranked("שבת קודש")
+        assert [(q["id"], score) for q, score in ranked] == [("t", 25 + 25 + 2 * 5), ("q", 20 + 25)]
+
+    @pytest.mark.questions
+    def test_003_unanswered_always_match(self):
+        """Test the app quirk: '' answer words give every unanswered question +12 per query word"""
+        questions = [_question("a", "אחד", answer="תשובה"), _question("u", "שתיים")]
+        index = QuestionSearchIndex(questions)
+
+        assert [(q["id"], s) for q, s in index.ranked("לגמרי אחר")] == [("u", 24)]
+        assert fuzzy_search_naive("לגמרי אחר", questions) == index.search("לגמרי אחר")
+        # Only single-character words: no threshold, input order
+        assert [q["id"] for q in index.search("א ב")] == ["a", "u"]
+
+    @pytest.mark.questions
+    @pytest.mark.hebrew
+    def test_004_index_equals_naive_port(self, generated):
+        """Test identical result lists on generated data for sampled and edge-case queries"""
+        index = QuestionSearchIndex(generated)
+        for query in EDGE_QUERIES + sample_queries(generated, 60, seed=3):
+            expected = [q["id"] for q in fuzzy_search_naive(query, generated)]
+            assert [q["id"] for q in index.search(query)] == expected, query
+
+    @pytest.mark.questions
+    def test_005_displayed_order(self):
+        """Test applyAllFilters order: category, unanswered first, then newest first"""
+        questions = [
+            _question("old-open", "שבת", timestamp=1),
+            _question("new-done", "שבת", answer="מותר", timestamp=9),
+            _question("new-open", "שבת", timestamp=5),
+            _question("other", "שבת", timestamp=7, category="kashrut"),
+        ]
+        index = QuestionSearchIndex(questions)
+
+        assert [q["id"] for q in index.displayed("שבת", category="shabbat")] == ["new-open", "old-open", "new-done"]
+        assert [q["id"] for q in index.displayed(unanswered_only=True)] == ["other", "new-open", "old-open"]
+
+    @pytest.mark.performance
+    @pytest.mark.questions
+    def test_006_index_faster_than_naive(self, generated):
+        """Test the index answers sampled queries an order of magnitude faster than the naive port"""
+        result = benchmark(generated, sample_queries(generated, 10, seed=5))
+
+        assert result["mismatches"] == []
+        assert result["index"]["p50_ms"] * 10 < result["naive"]["p50_ms"], result
@@ -3,8 +3,13 @@ Questions & Answers Advanced Tests
 Testing Q&A system, approval workflow, trust scoring, and categories
 """
 import pytest
+from playwright.sync_api import expect
 from pages.home_page import HomePage
 from pages.questions_page import QuestionsPage
+from utils.qa_dataset import EMULATOR_XDIST_GROUP
+
+
+ORACLE_QUERIES = ["שבת", "שַׁבָּת", "כשר", "טבילת כלים", "מה הדין", "צדקה"]
 
 
 class TestQuestionsDisplay:
@@ -352,3 +357,24 @@ class TestQuestionsHomeIntegration:
         home.click_questions()
         
         assert "/questions" in page.url, "Did not navigate to questions"
+
+
+@pytest.mark.xdist_group(EMULATOR_XDIST_GROUP)  # search_oracle clears and reseeds the shared emulator
+class TestQuestionsSearchOracle:
+    """Test search results against the Python port of fuzzySearchQuestions"""
+    
+    @pytest.mark.hebrew
+    @pytest.mark.questions
+    @pytest.mark.parametrize("query", ORACLE_QUERIES)
+    def test_027_search_matches_oracle_order(self, page, search_oracle, query):
+        """Test the rendered result count and first cards match the oracle exactly"""
+        expected = search_oracle.displayed(query)
+        questions = QuestionsPage(page)
+        questions.goto_questions()
+        page.wait_for_selector(questions.question_cards, timeout=60000)
+        
+        questions.search_questions(query)
+        
+        expect(page.locator(f"text={len(expected)} שאלות").first).to_be_visible()
+        shown = questions.get_question_texts(limit=20)
+        assert shown == [q['question'] for q in expected[:20]], f"Order differs from oracle for {query!r}"
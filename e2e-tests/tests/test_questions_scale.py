@@ -0,0 +1,81 @@
+"""
+Questions Scale Benchmark
+TTI, search/filter latency, DOM size and JS heap of /questions at growing collection sizes
+"""
+import os
+import pytest
+from pages.questions_page import QuestionsPage
+from utils.qa_dataset import (
+    EMULATOR_XDIST_GROUP,
+    SCALES,
+    clear_firestore_emulator,
+    emulator_host,
+    emulator_reachable,
+    ensure_dataset,
+    load_into_firestore_emulator,
+    read_ndjson,
+)
+from utils.scale_bench import format_curves, record, write_summary
+
+
+SIZES = [int(s) for s in os.getenv('QA_SCALE_SIZES', ','.join(map(str, SCALES))).split(',')]
+SCALE_LOG = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'reports', 'questions-scale.ndjson')
+SEARCHES = ["שבת", "טבילת כלים", "מה הדין"]
+CATEGORY_LABELS = ["שבת", "כשרות"]
+
+
+pytestmark = [
+    pytest.mark.performance,
+    pytest.mark.questions,
+    pytest.mark.slow,
+    # Clears and reloads the shared emulator; never concurrently with the search oracle tests
+    pytest.mark.xdist_group(EMULATOR_XDIST_GROUP),
+    pytest.mark.skipif(not os.getenv('FIRESTORE_EMULATOR_HOST'), reason="FIRESTORE_EMULATOR_HOST not set"),
+]
+
+
+@pytest.fixture(scope="module")
+def scale_log():
+    """Fresh measurement log for this run; fitted curves are printed at the end"""
+    if os.path.exists(SCALE_LOG):
+        os.remove(SCALE_LOG)
+    yield SCALE_LOG
+    if os.path.exists(SCALE_LOG):
+        print("\n📈 Questions scaling curves:\n" + format_curves(write_summary(SCALE_LOG)))
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"{n}q")
+def seeded_questions(request):
+    """Emulator holding exactly `size` generated questions"""
+    if not emulator_reachable():
+        pytest.skip(f"Firestore emulator not reachable at {emulator_host()}")
+    size = request.param
+    clear_firestore_emulator()
+    load_into_firestore_emulator(read_ndjson(ensure_dataset(size, seed=0)))
+    return size
+
+
+class TestQuestionsScale:
+    """Measure /questions as the collection grows"""
+
+    def test_001_load_and_interact(self, page, seeded_questions, scale_log):
+        """Test TTI, search and filter latency, DOM nodes and heap at one size"""
+        questions = QuestionsPage(page)
+
+        load = questions.measure_tti()
+        metrics = {
+            **load,
+            "dom_nodes": questions.dom_node_count(),
+            "js_heap_mb": round((questions.js_heap_used() or 0) / 2 ** 20, 2),
+            "cards": questions.get_questions_count(),
+        }
+        for query in SEARCHES:
+            metrics[f"search_ms[{query}]"] = round(questions.timed_search(query), 1)
+        questions.timed_search("")
+        for label in CATEGORY_LABELS:
+            metrics[f"filter_ms[{label}]"] = round(questions.timed_category_filter(label), 1)
+        metrics["js_heap_after_mb"] = round((questions.js_heap_used() or 0) / 2 ** 20, 2)
+
+        record(scale_log, "questions", seeded_questions, metrics)
+
+        assert metrics["cards"] > 0, "No question cards rendered"
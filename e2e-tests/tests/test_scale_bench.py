@@ -0,0 +1,51 @@
+"""
+Scale Benchmark Tests
+Complexity fitting and scaling-curve summaries (no browser needed)
+"""
+import math
+import random
+import pytest
+from utils.scale_bench import fit_complexity, record, write_summary
+
+
+SIZES = [1_000, 3_000, 10_000, 30_000, 100_000]
+
+
+def _noisy(fn, seed=1, noise=0.05):
+    rng = random.Random(seed)
+    return [fn(n) * (1 + rng.uniform(-noise, noise)) for n in SIZES]
+
+
+class TestScaleBench:
+    """Test fitted complexity estimates"""
+
+    @pytest.mark.performance
+    @pytest.mark.parametrize("model, fn", [
+        ("O(1)", lambda n: 40.0),
+        ("O(log n)", lambda n: 10 * math.log(n)),
+        ("O(n)", lambda n: 0.01 * n + 20),
+        ("O(n^2)", lambda n: 1e-6 * n * n + 5),
+    ])
+    def test_001_identifies_growth_model(self, model, fn):
+        """Test noisy synthetic curves are classified correctly"""
+        assert fit_complexity(SIZES, _noisy(fn))["model"] == model
+
+    @pytest.mark.performance
+    def test_002_exponent_from_log_log_slope(self):
+        """Test the empirical exponent of a pure power law"""
+        assert fit_complexity(SIZES, [n ** 1.5 for n in SIZES])["exponent"] == pytest.approx(1.5, abs=0.01)
+
+    @pytest.mark.performance
+    def test_003_summary_uses_median_per_size(self, tmp_path):
+        """Test repeated measurements collapse to medians before fitting"""
+        log = tmp_path / "scale.ndjson"
+        for n in SIZES:
+            for jitter in (0.9, 1.0, 5.0):
+                record(log, "questions", n, {"tti_ms": 0.02 * n * jitter, "label": "ignored"})
+
+        curves = write_summary(log)
+
+        assert (tmp_path / "scale.json").exists()
+        assert curves["questions"]["tti_ms"]["points"][10_000] == pytest.approx(200.0)
+        assert curves["questions"]["tti_ms"]["fit"]["model"] == "O(n)"
+        assert "label" not in curves["questions"]
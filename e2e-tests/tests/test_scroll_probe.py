@@ -0,0 +1,61 @@
+"""
+Scroll Probe Tests
+Frame-drop accounting, smoothness stats, trace parsing and list budgets (no browser needed)
+"""
+import json
+import pytest
+from utils.scroll_probe import ListBudget, ListProbeResult, frame_stats, smoothness_stats, trace_durations
+
+
+class TestScrollProbe:
+    """Test the probe's pure calculations"""
+
+    @pytest.mark.performance
+    def test_001_frame_stats_counts_missed_vsyncs(self):
+        """Test a 50ms interval counts as two dropped frames"""
+        stats = frame_stats([16.7] * 8 + [50.0])
+
+        assert stats["frames"] == 9
+        assert stats["dropped"] == 2
+        assert stats["dropped_pct"] == pytest.approx(100 * 2 / 11, abs=0.01)
+        assert frame_stats([])["dropped_pct"] == 0.0
+
+    @pytest.mark.performance
+    def test_002_trace_durations(self):
+        """Test Layout and style recalc totals from complete events"""
+        trace = json.dumps({"traceEvents": [
+            {"ph": "X", "name": "Layout", "dur": 1500},
+            {"ph": "X", "name": "Layout", "dur": 500},
+            {"ph": "X", "name": "UpdateLayoutTree", "dur": 3000},
+            {"ph": "B", "name": "Layout"},
+            {"ph": "X", "name": "Paint", "dur": 9000},
+        ]}).encode()
+
+        assert trace_durations(trace) == {"layout_ms": 2.0, "style_ms": 3.0}
+
+    @pytest.mark.performance
+    def test_003_budget_violations(self):
+        """Test only exceeded, enabled thresholds are reported"""
+        result = ListProbeResult("browse", logical_rows=221, mounted_rows=221, visible_rows=12,
+                                 frames={"dropped_pct": 4.0}, layout_ms=80.0, style_ms=None)
+
+        violations = result.violations(ListBudget(max_mounted_ratio=0.25, max_dropped_pct=10, max_layout_ms=60,
+                                                  max_style_ms=10))
+
+        assert violations == [
+            "browse: mounted/logical rows 1.00 > 0.25",
+            "browse: layout ms 80.00 > 60",
+        ]
+        assert result.to_dict()["mounted_ratio"] == 1.0
+
+    @pytest.mark.performance
+    def test_004_smoothness_stats(self):
+        """Test FPS percentiles pick up the worst frames and jank ratio counts slow ones"""
+        stats = smoothness_stats([1000 / 60] * 95 + [50.0] * 5, long_tasks=[70.0, 120.0])
+
+        assert stats["frames"] == 100
+        assert stats["fps_p50"] == pytest.approx(60.0, abs=0.1)
+        assert stats["fps_p1"] == pytest.approx(20.0, abs=0.1)
+        assert stats["jank_ratio"] == 0.05
+        assert stats["long_tasks"] == 2 and stats["long_task_ms"] == 190.0
+        assert smoothness_stats([])["fps_p50"] is None
@@ -2,9 +2,41 @@
 Search Functionality Tests
 Testing Hebrew search with normalization and fuzzy matching
 """
+import os
 import pytest
 from pages.questions_page import QuestionsPage
 from pages.browse_page import BrowsePage
+from pages.search_page import SearchPage
+from utils.qa_dataset import EMULATOR_XDIST_GROUP
+from utils.search_fuzzer import FuzzCase, QueryFuzzer, add_to_corpus, corpus_words, fuzz, load_corpus
+
+
+FUZZ_CASES = int(os.getenv('SEARCH_FUZZ_CASES', '40'))
+FUZZ_SEED = int(os.getenv('SEARCH_FUZZ_SEED', '0'))
+SEARCH_BUDGET_MS = float(os.getenv('SEARCH_BUDGET_MS', '1000'))  # includes the app's 300 ms debounce
+RESULT_PREFIX = 20
+PROFILE_QUERIES = int(os.getenv('SEARCH_PROFILE_QUERIES', '12'))
+PROFILE_BUDGET_MS = float(os.getenv('SEARCH_PROFILE_BUDGET_MS', '500'))  # warm busy CPU per query
+
+
+def _as_typed(query: str) -> str:
+    """A single-line <input> drops line breaks from its value"""
+    return query.replace('\r', '').replace('\n', '')
+
+
+def _app_search(questions: QuestionsPage):
+    """Search in the app; (result count, first card texts) plus settle time"""
+    def search(query: str):
+        latency = questions.timed_search(query)
+        return (questions.get_questions_count(), questions.get_question_texts(limit=RESULT_PREFIX)), latency
+    return search
+
+
+def _oracle_search(oracle):
+    def search(query: str):
+        expected = oracle.displayed(query)
+        return len(expected), [q['question'] for q in expected[:RESULT_PREFIX]]
+    return search
 
 
 class TestHebrewSearch:
@@ -289,3 +321,72 @@ class TestSearchEdgeCases:
             search_input = page.locator("input[placeholder*='חיפוש']")
             search_value = search_input.input_value()
             # Either preserved or cleared is acceptable
+
+
+@pytest.mark.xdist_group(EMULATOR_XDIST_GROUP)  # search_oracle clears and reseeds the shared emulator
+class TestSearchFuzz:
+    """Property-based queries from the seeded corpus, checked against the search oracle"""
+    
+    @pytest.fixture
+    def questions(self, page, search_oracle):
+        questions = QuestionsPage(page)
+        questions.goto_questions()
+        page.wait_for_selector(questions.question_cards, timeout=60000)
+        return questions
+    
+    @pytest.mark.hebrew
+    @pytest.mark.questions
+    @pytest.mark.performance
+    def test_021_fuzzed_queries_match_oracle(self, questions, search_oracle):
+        """Test generated Hebrew queries give the oracle's results within the latency budget"""
+        fuzzer = QueryFuzzer(corpus_words(search_oracle.questions), seed=FUZZ_SEED)
+        cases = [FuzzCase(_as_typed(c.query), c.strategy) for c in fuzzer.cases(FUZZ_CASES)]
+        
+        report = fuzz(cases, _app_search(questions), _oracle_search(search_oracle),
+                      budget_ms=SEARCH_BUDGET_MS, timed=True)
+        
+        print("\n🔎 Search fuzz:\n" + report.format())
+        if os.getenv('SEARCH_FUZZ_SAVE'):
+            print(f"Added {add_to_corpus(report)} case(s) to the regression corpus")
+        assert not report.failures, report.format()
+    
+    @pytest.mark.hebrew
+    @pytest.mark.questions
+    @pytest.mark.regression
+    @pytest.mark.parametrize("entry", load_corpus(), ids=lambda e: f"{e['reason']}-{e['strategy']}")
+    def test_022_regression_corpus(self, questions, search_oracle, entry):
+        """Test minimized queries from earlier fuzz runs still match the oracle within budget"""
+        report = fuzz([FuzzCase(_as_typed(entry['query']), entry['strategy'])], _app_search(questions),
+                      _oracle_search(search_oracle), budget_ms=SEARCH_BUDGET_MS, timed=True, minimize=False)
+        
+        assert not report.failures, report.format()
+
+
+class TestGlobalSearchProfile:
+    """Profile the global /search screen with corpus-derived queries"""
+    
+    @pytest.mark.performance
+    @pytest.mark.content
+    @pytest.mark.slow
+    def test_023_search_cpu_profile(self, page, browser_name):
+        """Test cold and warm search CPU time per query, with a ranked table and flame graphs"""
+        if browser_name != "chromium":
+            pytest.skip("CPU profiles need the Chromium DevTools protocol")
+        from utils.content_tree import chapter_paths_by_id, load_json, read_registry_ids
+        from utils.search_profiler import SearchProfiler, profile_queries, ranked_table
+        
+        paths = chapter_paths_by_id()
+        chapters = [load_json(paths[cid]) for cid in read_registry_ids() if cid in paths]
+        profiler = SearchProfiler(SearchPage(page))
+        
+        results = profiler.run(profile_queries(chapters, PROFILE_QUERIES), cold=2)
+        report = profiler.write_report()
+        
+        print(f"\n🔥 /search CPU profile ({report.parent}):\n" + ranked_table(results))
+        cold = [r for r in results if r.mode == "cold"]
+        warm = {r.query: r for r in results if r.mode == "warm"}
+        for first in cold:
+            assert first.categories["registry_load"] >= warm[first.query].categories["registry_load"], \
+                f"{first.query!r}: warm search reloaded the registry"
+        slow = [f"{r.query!r} {r.busy_ms:.0f} ms" for r in warm.values() if r.busy_ms > PROFILE_BUDGET_MS]
+        assert not slow, f"Warm searches over {PROFILE_BUDGET_MS:.0f} ms CPU: {slow}"
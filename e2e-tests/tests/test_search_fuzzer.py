@@ -0,0 +1,99 @@
+"""
+Search Fuzzer Tests
+Query generation, shrinking and the regression corpus, fuzzed against the search oracle (no browser needed)
+"""
+import pytest
+from utils.qa_dataset import QADatasetGenerator
+from utils.qa_search import QuestionSearchIndex, fuzzy_search_naive
+from utils.search_fuzzer import (
+    MAQAF,
+    NIKUD,
+    FuzzCase,
+    QueryFuzzer,
+    add_to_corpus,
+    corpus_words,
+    fuzz,
+    load_corpus,
+    shrink,
+)
+
+
+@pytest.fixture(scope="module")
+def questions():
+    return list(QADatasetGenerator(seed=5).questions(600))
+
+
+def _ids(results):
+    return [q["id"] for q in results]
+
+
+class TestSearchFuzzer:
+    """Test the fuzzer itself"""
+
+    @pytest.mark.hebrew
+    def test_001_generator_is_seeded_and_covers_strategies(self, questions):
+        """Test same seed gives same cases and every strategy produces its kind of input"""
+        words = corpus_words(questions)
+        cases = list(QueryFuzzer(words, seed=1).cases(48))
+        by_strategy = {}
+        for case in cases:
+            by_strategy.setdefault(case.strategy, []).append(case.query)
+
+        assert cases == list(QueryFuzzer(words, seed=1).cases(48))
+        assert len(by_strategy) == 12
+        assert all(MAQAF in q for q in by_strategy["maqaf"])
+        assert any(c in NIKUD for q in by_strategy["nikud"] for c in q)
+        assert all(len(q.split()) >= 40 for q in by_strategy["long"])
+
+    def test_002_shrink_keeps_the_failure(self):
+        """Test ddmin drops every word and character the failure does not need"""
+        query = "האם מותר לאכול בשר אחרי חלב בשבת קודש"
+
+        minimized = shrink(query, lambda q: "בשר" in q and "חלב" in q)
+
+        assert minimized == "בשרחלב"
+
+    @pytest.mark.hebrew
+    @pytest.mark.questions
+    def test_003_mismatch_is_minimized(self, questions):
+        """Test a planted maqaf bug is found and shrunk to the maqaf alone"""
+        cases = QueryFuzzer(corpus_words(questions), seed=2).cases(24)
+
+        def expected(query):
+            return _ids(fuzzy_search_naive(query, questions[:50]))
+
+        def actual(query):
+            return [] if MAQAF in query else expected(query)
+
+        report = fuzz(cases, actual, expected)
+
+        assert {r.case.strategy for r in report.failures} == {"maqaf"}
+        assert {r.minimized for r in report.failures} == {MAQAF}
+
+    @pytest.mark.hebrew
+    @pytest.mark.questions
+    @pytest.mark.performance
+    def test_004_index_matches_naive_port(self, questions):
+        """Test the token index agrees with the naive port on fuzzed input within a latency budget"""
+        index = QuestionSearchIndex(questions)
+
+        report = fuzz(
+            QueryFuzzer(corpus_words(questions), seed=3).cases(120),
+            actual=lambda q: _ids(index.search(q)),
+            expected=lambda q: _ids(fuzzy_search_naive(q, questions)),
+            budget_ms=250,
+            minimize_slowest=0,
+        )
+
+        assert not report.failures, report.format()
+
+    def test_005_regression_corpus(self, tmp_path):
+        """Test findings are appended once, and the shipped corpus loads"""
+        path = tmp_path / "regressions.ndjson"
+        report = fuzz([FuzzCase("שבת", "plain"), FuzzCase("ספר", "plain")],
+                      actual=lambda q: q == "שבת", expected=lambda q: False, minimize=False)
+
+        assert add_to_corpus(report, path, slowest=0) == 1
+        assert add_to_corpus(report, path, slowest=0) == 0
+        assert [(e["query"], e["reason"]) for e in load_corpus(path)] == [("שבת", "results differ")]
+        assert all({"query", "strategy", "reason"} <= set(e) for e in load_corpus())
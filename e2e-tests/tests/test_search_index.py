@@ -0,0 +1,95 @@
+"""
+Search Index Tests
+Precomputed searchContent() index artifact (no browser needed)
+"""
+import json
+import pytest
+from utils.search_index import (
+    SearchIndex,
+    brute_force_search,
+    build_index,
+    decode_postings,
+    encode_postings,
+    verify_index,
+)
+
+
+def _chapters(content_dir):
+    ids = ["kitzur_orach_chaim-001", "kitzur_orach_chaim-002", "orach_chaim-001"]
+    paths = {p.stem: p for p in content_dir.glob("*/*.json")}
+    return [json.loads(paths[i].read_text(encoding="utf-8")) for i in ids]
+
+
+def _texts(content_dir):
+    texts = {(c["id"], s["id"]): s["text"] for c in _chapters(content_dir) for s in c["sections"]}
+    return lambda chapter_id, section_id: texts[(chapter_id, section_id)]
+
+
+class TestSearchIndex:
+    """Test the index matches a brute-force searchContent() scan"""
+
+    @pytest.mark.content
+    def test_001_postings_round_trip(self):
+        """Test delta/varint encoding, including multi-byte deltas"""
+        for ordinals in ([], [0], [3, 4, 200, 201, 70000]):
+            assert decode_postings(encode_postings(ordinals)) == ordinals
+
+    @pytest.mark.content
+    @pytest.mark.hebrew
+    @pytest.mark.parametrize("query", ["שבת", "ב", "הלכות שבת", "ברכות השחר", "(טור)", "שולחן", "סימן", "  לנגדי  "])
+    def test_002_matches_brute_force(self, mini_content_dir, tmp_path, query):
+        """Test indexed results, scores and order equal the linear scan"""
+        index_path = tmp_path / "search-index.bin"
+        build_index(mini_content_dir, index_path)
+
+        index = SearchIndex(index_path)
+
+        assert index.search(query, _texts(mini_content_dir)) == brute_force_search(_chapters(mini_content_dir), query)
+
+    @pytest.mark.content
+    def test_003_incremental_build_equals_full_build(self, mini_content_dir, tmp_path):
+        """Test patching a changed chapter gives the same artifact as a full rebuild"""
+        incremental_path = tmp_path / "incremental.bin"
+        build_index(mini_content_dir, incremental_path)
+
+        path = mini_content_dir / "chapters/kitzur_orach_chaim-002.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["sections"][0]["text"] = "הלכות תפילין ושבת"
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        stats = build_index(mini_content_dir, incremental_path)
+        build_index(mini_content_dir, tmp_path / "full.bin", incremental=False)
+
+        assert stats["chapters_rebuilt"] == 1
+        assert stats["patched"]
+        assert incremental_path.read_bytes() == (tmp_path / "full.bin").read_bytes()
+
+    @pytest.mark.content
+    def test_004_section_count_change_falls_back_to_rebuild(self, mini_content_dir, tmp_path):
+        """Test adding a section rebuilds postings instead of patching"""
+        index_path = tmp_path / "search-index.bin"
+        build_index(mini_content_dir, index_path)
+
+        path = mini_content_dir / "chapters/kitzur_orach_chaim-001.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["sections"].append({"id": "kitzur_orach_chaim-001-s4", "section": 4, "text": "סעיף חדש"})
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        stats = build_index(mini_content_dir, index_path)
+        results = SearchIndex(index_path).search("חדש")
+
+        assert not stats["patched"]
+        assert results == [("kitzur_orach_chaim-001-s4", "kitzur_orach_chaim-001", 10)]
+
+    @pytest.mark.content
+    @pytest.mark.performance
+    def test_005_verify_reports_no_mismatches(self, mini_content_dir, tmp_path):
+        """Test the verification step and its size/latency report"""
+        index_path = tmp_path / "search-index.bin"
+        build_index(mini_content_dir, index_path)
+
+        report = verify_index(mini_content_dir, index_path, queries=40)
+
+        assert report["mismatches"] == []
+        assert report["index_bytes"] > 0
+        assert report["index_query_ms"]["p50"] >= 0
@@ -0,0 +1,93 @@
+"""
+Search Profiler Tests
+CPU profile attribution, flame graphs and the /search query set (no browser needed)
+"""
+import json
+from utils.search_profiler import (
+    QueryProfile,
+    SearchProfiler,
+    categorize,
+    flame_svg,
+    folded_stacks,
+    load_report,
+    profile_queries,
+    ranked_table,
+)
+
+
+BUNDLE = "http://localhost:8081/index.bundle"
+
+
+def _node(node_id, name, children=(), url=BUNDLE):
+    return {"id": node_id, "callFrame": {"functionName": name, "url": url}, "children": list(children)}
+
+
+def _profile():
+    """(root) -> idle | gc | searchContent -> (sort, listChapters) | anonymous chunk code | React work loop"""
+    nodes = [
+        _node(1, "(root)", [2, 3, 4, 7, 8], url=""),
+        _node(2, "(idle)", url=""),
+        _node(3, "(garbage collector)", url=""),
+        _node(4, "searchContent", [5, 6]),
+        _node(5, "sort"),
+        _node(6, "listChapters"),
+        _node(7, "", url="http://localhost:8081/content/chapters-index.bundle"),
+        _node(8, "performWorkOnRoot", [9]),
+        _node(9, "renderWithHooks"),
+    ]
+    # Each sample lasts until the next one: 1 ms apart, the last one counts 0
+    samples = [4, 4, 4, 5, 6, 7, 7, 9, 3, 2, 2]
+    return {"nodes": nodes, "samples": samples, "timeDeltas": [1000] * len(samples)}
+
+
+class TestSearchProfiler:
+    """Test profile analysis"""
+
+    def test_001_categorize_by_stack(self):
+        """Test samples land in the first matching category of their stack"""
+        categories = categorize(_profile())
+
+        assert categories["scan"] == 3
+        assert categories["sort"] == 1
+        assert categories["registry_load"] == 3  # listChapters + chapter chunk code
+        assert categories["render"] == 1
+        assert categories["gc"] == 1
+        assert categories["idle"] == 1  # last sample has no successor
+
+    def test_002_folded_stacks_and_flame_graph(self):
+        """Test collapsed stacks skip idle and the SVG carries a frame per stack level"""
+        folded = folded_stacks(_profile())
+
+        assert folded["searchContent"] == 3 and folded["searchContent;sort"] == 1
+        assert folded["performWorkOnRoot;renderWithHooks"] == 1
+        assert "(idle)" not in folded
+
+        svg = flame_svg(folded, "warm 'של'")
+        assert svg.startswith("<svg") and svg.endswith("</svg>")
+        assert "<title>searchContent (5.0 ms" in svg and "<title>sort (1.0 ms" in svg
+
+    def test_003_query_set(self, mini_content_dir):
+        """Test queries are 2+ chars, start with the widest bigrams and include a miss"""
+        files = (json.loads(p.read_text(encoding="utf-8")) for p in sorted(mini_content_dir.glob("*/*.json")))
+        chapters = [data for data in files if "sections" in data]
+
+        queries = profile_queries(chapters, count=12, seed=1, pathological=3)
+
+        assert len(queries) == len(set(queries)) == 12
+        assert all(len(q.strip()) >= 2 for q in queries)
+        assert "קקקקקקקק" in queries
+        assert all(len(q) == 2 for q in queries[:3])
+
+    def test_004_ranked_report(self, tmp_path):
+        """Test the report ranks by busy time and round-trips"""
+        profiler = SearchProfiler(None, output_dir=tmp_path)
+        profiler.results = [
+            QueryProfile("שבת", "warm", 300.0, 12.5, 100, {"scan": 10.0}, {"lowercase_ms": 4.0}),
+            QueryProfile("של", "cold", 900.0, 420.0, 100, {"registry_load": 380.0, "scan": 30.0}),
+        ]
+
+        results = load_report(profiler.write_report())
+        table = ranked_table(results)
+
+        assert [r.query for r in results] == ["של", "שבת"]
+        assert table.splitlines()[2].startswith("של") and "380.0" in table
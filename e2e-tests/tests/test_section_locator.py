@@ -0,0 +1,102 @@
+"""
+Section Locator Tests
+Section ID -> (chapter, index) lookup table and deep-link helpers (no browser needed)
+"""
+import json
+import pytest
+from utils.content_cache import ContentCache
+from utils.content_tree import chapter_paths_by_id, load_json, read_registry_ids
+from utils.section_locator import SectionLocator, build_section_table, write_section_table
+
+
+def _linear_find(content_dir, section_id):
+    """findSectionById(): first registered chapter containing the section"""
+    paths = chapter_paths_by_id(content_dir)
+    for chapter_id in read_registry_ids(content_dir):
+        if chapter_id not in paths:
+            continue
+        for index, section in enumerate(load_json(paths[chapter_id])["sections"]):
+            if section["id"] == section_id:
+                return chapter_id, index
+    return None
+
+
+class TestSectionLocator:
+    """Test the lookup table agrees with findSectionById()"""
+
+    @pytest.mark.content
+    def test_001_resolves_every_section(self, mini_content_dir):
+        """Test every section resolves to its chapter and position"""
+        locator = SectionLocator.from_content(mini_content_dir)
+
+        assert len(locator) == 7
+        for chapter_id, path in chapter_paths_by_id(mini_content_dir).items():
+            for index, section in enumerate(load_json(path)["sections"]):
+                location = locator.resolve(section["id"])
+                assert (location.chapter_id, location.index) == (chapter_id, index)
+
+    @pytest.mark.content
+    def test_002_table_is_sorted_and_round_trips(self, mini_content_dir, tmp_path):
+        """Test the artifact has sorted ids and loads back identically"""
+        table = build_section_table(mini_content_dir)
+        path = write_section_table(table, tmp_path / "section-locations.json")
+
+        assert table["ids"] == sorted(table["ids"])
+        assert json.loads(path.read_text(encoding="utf-8")) == table
+        assert SectionLocator.load(path).resolve("orach_chaim-001-2").chapter_id == "orach_chaim-001"
+
+    @pytest.mark.content
+    def test_003_first_registered_chapter_wins(self, mini_content_dir):
+        """Test a section id in two chapters resolves like the app's scan"""
+        path = mini_content_dir / "orach_chaim/orach_chaim-001.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["sections"].append({"id": "kitzur_orach_chaim-002-s1", "section": 3, "text": "כפול"})
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        location = SectionLocator.from_content(mini_content_dir).resolve("kitzur_orach_chaim-002-s1")
+
+        assert (location.chapter_id, location.index) == _linear_find(mini_content_dir, "kitzur_orach_chaim-002-s1")
+        assert location.chapter_id == "kitzur_orach_chaim-002"
+
+    @pytest.mark.content
+    def test_004_cache_build_matches_direct_build(self, mini_content_dir, tmp_path):
+        """Test building from ContentCache facts gives the same table"""
+        cache = ContentCache(tmp_path / "cache.json")
+
+        assert build_section_table(mini_content_dir, cache) == build_section_table(mini_content_dir)
+
+    @pytest.mark.content
+    @pytest.mark.navigation
+    def test_005_deep_link_helpers(self, mini_content_dir):
+        """Test URL validation, neighbours and deep-link generation"""
+        locator = SectionLocator.from_content(mini_content_dir)
+
+        assert locator.resolve_url("http://localhost:8081/section/kitzur_orach_chaim-001-s2").index == 1
+        assert locator.resolve_url("/section/kitzur_orach_chaim-001-s9") is None
+        assert locator.resolve_url("/chapter/kitzur_orach_chaim-001") is None
+        assert locator.neighbours("kitzur_orach_chaim-001-s2") == ("kitzur_orach_chaim-001-s1", "kitzur_orach_chaim-001-s3")
+        assert locator.neighbours("kitzur_orach_chaim-002-s1") == (None, "kitzur_orach_chaim-002-s2")
+        assert list(locator.deep_links("kitzur_orach_chaim-002")) == [
+            "section/kitzur_orach_chaim-002-s1",
+            "section/kitzur_orach_chaim-002-s2",
+        ]
+        assert sum(1 for _ in locator.deep_links()) == len(locator)
+
+    @pytest.mark.content
+    @pytest.mark.navigation
+    def test_006_duplicate_id_keeps_later_chapter_positions(self, mini_content_dir, tmp_path):
+        """Test a chapter containing an id an earlier chapter owns keeps its own order for neighbours"""
+        path = mini_content_dir / "orach_chaim/orach_chaim-001.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["sections"].insert(0, {"id": "kitzur_orach_chaim-001-s3", "section": 0, "text": "כפול"})
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        table = build_section_table(mini_content_dir)
+        locator = SectionLocator.load(write_section_table(table, tmp_path / "section-locations.json"))
+
+        assert locator.resolve("kitzur_orach_chaim-001-s3").chapter_id == "kitzur_orach_chaim-001"
+        assert locator.sections_of("orach_chaim-001") == [
+            "kitzur_orach_chaim-001-s3", "orach_chaim-001-1", "orach_chaim-001-2",
+        ]
+        assert locator.neighbours("orach_chaim-001-1") == ("kitzur_orach_chaim-001-s3", "orach_chaim-001-2")
+        assert locator.neighbours("orach_chaim-001-2") == ("orach_chaim-001-1", None)
@@ -0,0 +1,108 @@
+"""
+Snapshot Round-Trip Benchmark
+Driver round trips and wall time of per-element queries versus BasePage.snapshot
+"""
+import json
+import time
+from pathlib import Path
+import pytest
+from pages.browse_page import BrowsePage
+from pages.home_page import HomePage
+from pages.questions_page import QuestionsPage
+
+
+REPORT_PATH = Path(__file__).parent.parent / 'reports' / 'snapshot-roundtrips.json'
+SAMPLE = 10
+
+
+def _measure(page_object, action):
+    """(round trips, ms, result) of one action"""
+    before = page_object.round_trips()
+    start = time.perf_counter()
+    result = action()
+    elapsed = (time.perf_counter() - start) * 1000
+    after = page_object.round_trips()
+    trips = after - before if before is not None and after is not None else None
+    return trips, round(elapsed, 1), result
+
+
+@pytest.fixture(scope="module")
+def roundtrip_report():
+    """Per-scenario comparison written to reports/snapshot-roundtrips.json"""
+    results = {}
+    yield results
+    if results:
+        REPORT_PATH.parent.mkdir(exist_ok=True)
+        REPORT_PATH.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+class TestSnapshotRoundTrips:
+    """Compare chatty element loops with a single snapshot"""
+
+    def _compare(self, report, name, page_object, legacy, bulk):
+        legacy_trips, legacy_ms, legacy_result = _measure(page_object, legacy)
+        bulk_trips, bulk_ms, bulk_result = _measure(page_object, bulk)
+        report[name] = {
+            "legacy": {"round_trips": legacy_trips, "ms": legacy_ms},
+            "snapshot": {"round_trips": bulk_trips, "ms": bulk_ms},
+        }
+        print(f"\n{name}: {legacy_trips} → {bulk_trips} round trips, {legacy_ms} → {bulk_ms} ms")
+        assert bulk_result == legacy_result, f"{name}: snapshot disagrees with per-element queries"
+        if legacy_trips is not None:
+            assert bulk_trips < legacy_trips, f"{name}: snapshot did not reduce round trips"
+
+    @pytest.mark.performance
+    @pytest.mark.questions
+    def test_001_question_titles(self, page, roundtrip_report):
+        """Test reading question titles takes one round trip instead of one per card"""
+        questions = QuestionsPage(page)
+        questions.goto_questions()
+
+        def legacy():
+            # Per card, like get_question_titles: its first title, or '' when it has none
+            titles = []
+            for card in page.locator(questions.question_cards).all()[:SAMPLE]:
+                title = card.locator("[class*='title']")
+                titles.append((title.first.text_content() or "").strip() if title.count() else "")
+            return titles
+
+        self._compare(roundtrip_report, "questions.titles", questions,
+                      legacy, lambda: questions.get_question_titles(limit=SAMPLE))
+
+    @pytest.mark.performance
+    @pytest.mark.navigation
+    def test_002_home_dashboard(self, page, roundtrip_report):
+        """Test checking every home card is visible takes one round trip"""
+        home = HomePage(page)
+        home.goto_home()
+        selectors = [home.daily_quote_title, home.browse_button, home.questions_button,
+                     home.bookmarks_button, home.parsha_button]
+
+        def legacy():
+            return [page.locator(selector).first.is_visible() for selector in selectors]
+
+        def bulk():
+            snapshot = home.snapshot(selectors, limit=1)
+            return [snapshot[selector]["visible_count"] > 0 for selector in selectors]
+
+        self._compare(roundtrip_report, "home.dashboard", home, legacy, bulk)
+
+    @pytest.mark.performance
+    @pytest.mark.content
+    @pytest.mark.hebrew
+    def test_003_browse_rows(self, page, roundtrip_report):
+        """Test counting chapters and reading their text and direction in one round trip"""
+        browse = BrowsePage(page)
+        browse.goto_browse()
+
+        def legacy():
+            rows = page.locator(browse.chapter_items).all()
+            head = rows[:SAMPLE]
+            return (len(rows), [(row.text_content() or "").strip() for row in head],
+                    [row.evaluate("el => getComputedStyle(el).direction") for row in head])
+
+        def bulk():
+            facts = browse.snapshot([browse.chapter_items], limit=SAMPLE)[browse.chapter_items]
+            return facts["count"], facts["texts"], facts["directions"]
+
+        self._compare(roundtrip_report, "browse.rows", browse, legacy, bulk)
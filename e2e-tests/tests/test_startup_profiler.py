@@ -0,0 +1,107 @@
+"""
+Startup Profiler Tests
+Phase extraction from resource timing and traces, waterfalls and the history trend (no browser needed)
+"""
+from utils.startup_profiler import (
+    FIRST_HEBREW_MARK,
+    append_history,
+    build_profile,
+    format_trend,
+    load_history,
+    trace_origin_us,
+    trend,
+    waterfall,
+)
+
+
+BASE = "http://localhost:8081"
+ORIGIN_US = 5_000_000   # trace timestamp of performance.timeOrigin
+
+
+def _resource(url, start, end):
+    return {"name": url, "initiatorType": "script", "startTime": start, "responseEnd": end, "transferSize": 1}
+
+
+def _timings(first_hebrew=900.0):
+    return {
+        "navigation": {"startTime": 0.0, "responseEnd": 40.0, "domContentLoadedEventEnd": 300.0},
+        "resources": [
+            _resource(f"{BASE}/index.bundle?platform=web", 50.0, 250.0),
+            _resource(f"{BASE}/content/chapters-index.bundle", 400.0, 500.0),
+            _resource("https://firestore.googleapis.com/google.firestore.v1.Firestore/Listen/channel?x=1", 450.0, 700.0),
+            _resource(f"{BASE}/assets/logo.png", 60.0, 80.0),
+        ],
+        "marks": [{"name": "app:boot", "startTime": 260.0}, {"name": FIRST_HEBREW_MARK, "startTime": first_hebrew}],
+        "fcp": 320.0,
+    }
+
+
+def _event(name, start_ms, dur_ms, url=f"{BASE}/index.bundle"):
+    return {"name": name, "ph": "X", "ts": ORIGIN_US + start_ms * 1000, "dur": dur_ms * 1000,
+            "args": {"data": {"url": url}}}
+
+
+def _trace():
+    return {"traceEvents": [
+        {"name": "navigationStart", "ph": "R", "ts": ORIGIN_US - 7000},
+        {"name": "app:boot", "cat": "blink.user_timing", "ph": "R", "ts": ORIGIN_US + 260_000},
+        _event("v8.compile", 250.0, 20.0),
+        {"name": "v8.compileModule", "ph": "X", "ts": ORIGIN_US + 275_000, "dur": 5000,
+         "args": {"fileName": f"{BASE}/index.bundle"}},
+        _event("EvaluateScript", 280.0, 100.0),
+        _event("EvaluateScript", 510.0, 30.0, url=f"{BASE}/content/chapters-index.bundle"),
+    ]}
+
+
+class TestStartupProfiler:
+    """Test cold-start phase extraction"""
+
+    def test_001_trace_origin_from_user_timing(self):
+        """Test the shared mark aligns trace time, falling back to navigationStart"""
+        events = _trace()["traceEvents"]
+
+        assert trace_origin_us(events, _timings()["marks"]) == ORIGIN_US
+        assert trace_origin_us(events, []) == ORIGIN_US - 7000
+        assert trace_origin_us([], []) is None
+
+    def test_002_phases_from_resources_and_trace(self):
+        """Test downloads, compile/evaluate work and the registry chunk land in their own phases"""
+        profile = build_profile("/browse", _timings(), _trace())
+
+        assert [p.name for p in profile.phases] == [
+            "document", "bundle_download", "parse_compile", "evaluate", "registry_import", "firestore_init",
+            "first_hebrew_text",
+        ]
+        assert (profile.phase("bundle_download").start_ms, profile.phase("bundle_download").end_ms) == (50.0, 250.0)
+        assert profile.phase("parse_compile").busy_ms == 25.0
+        assert profile.phase("evaluate").duration_ms == 100.0  # registry evaluation is not counted here
+        registry = profile.phase("registry_import")
+        assert (registry.start_ms, registry.end_ms, registry.busy_ms) == (400.0, 540.0, 30.0)
+        assert profile.phase("first_hebrew_text").start_ms == 700.0  # after the Firestore channel opened
+        assert profile.milestones == {
+            "first_contentful_paint_ms": 320.0, "dom_content_loaded_ms": 300.0, "first_hebrew_text_ms": 900.0,
+        }
+
+    def test_003_without_trace(self):
+        """Test non-Chromium runs still get resource phases and the Hebrew milestone"""
+        profile = build_profile("/", _timings())
+
+        assert profile.phase("parse_compile") is None
+        assert profile.phase("registry_import").end_ms == 500.0
+        assert "first_hebrew_text" in waterfall(profile)
+
+    def test_004_history_trend(self, tmp_path):
+        """Test the latest run is compared with the median of earlier runs per route and phase"""
+        history = tmp_path / "startup-history.ndjson"
+        for first_hebrew in (800.0, 900.0, 1000.0, 1500.0):
+            append_history([build_profile("/", _timings(first_hebrew))], history, label="ci")
+
+        entries = load_history(history)
+        rows = {r["phase"]: r for r in trend(entries, window=3)}
+
+        assert len(entries) == 4 and entries[0]["label"] == "ci"
+        assert rows["first_hebrew_text_ms"]["latest_ms"] == 1500.0
+        assert rows["first_hebrew_text_ms"]["baseline_ms"] == 900.0
+        assert rows["first_hebrew_text_ms"]["delta_ms"] == 600.0
+        assert rows["bundle_download"]["delta_ms"] == 0.0
+        assert "+600.0" in format_trend(list(rows.values()))
@@ -0,0 +1,126 @@
+"""
+Async Runner
+Run independent page scenarios concurrently over a bounded pool of pages in one context
+
+Each scenario is an async callable taking a playwright.async_api Page (wrap it in an
+Async*Page object as needed). run() drives its own browser and event loop on a helper
+thread, so it can be called from ordinary sync tests next to pytest-playwright's
+sync `page` fixture.
+
+Usage:
+    async def read(page):
+        section = AsyncSectionPage(page)
+        await section.goto_section("kitzur_orach_chaim-001-s1")
+        return await section.get_section_text()
+
+    results = async_runner.run({"s1": read})
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+import asyncio
+import time
+from playwright.async_api import async_playwright
+
+
+Scenario = Callable[[Any], Awaitable[Any]]
+
+
+@dataclass
+class ScenarioResult:
+    """Outcome of one scenario"""
+    name: str
+    value: Any = None
+    error: Optional[BaseException] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class RunSummary:
+    """All scenario results of one run plus wall-clock throughput"""
+    results: List[ScenarioResult]
+    seconds: float
+    concurrency: int
+
+    @property
+    def failures(self) -> List[ScenarioResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def pages_per_second(self) -> float:
+        return len(self.results) / self.seconds if self.seconds else 0.0
+
+    def values(self) -> Dict[str, Any]:
+        return {r.name: r.value for r in self.results}
+
+    def raise_failures(self):
+        """Raise the first scenario error, naming every failed scenario"""
+        if self.failures:
+            names = ", ".join(r.name for r in self.failures)
+            raise AssertionError(f"{len(self.failures)} scenario(s) failed: {names}") from self.failures[0].error
+
+
+async def run_on_pool(pages: List[Any], scenarios: Mapping[str, Scenario]) -> RunSummary:
+    """Run scenarios with each one borrowing a page from `pages`; at most len(pages) run at once"""
+    pool: asyncio.Queue = asyncio.Queue()
+    for page in pages:
+        pool.put_nowait(page)
+
+    async def _one(name: str, scenario: Scenario) -> ScenarioResult:
+        page = await pool.get()
+        start = time.perf_counter()
+        try:
+            return ScenarioResult(name, value=await scenario(page), seconds=time.perf_counter() - start)
+        except Exception as error:
+            return ScenarioResult(name, error=error, seconds=time.perf_counter() - start)
+        finally:
+            pool.put_nowait(page)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(_one(name, fn) for name, fn in scenarios.items()))
+    return RunSummary(list(results), time.perf_counter() - start, len(pages))
+
+
+class AsyncScenarioRunner:
+    """Bounded page pool over one browser context"""
+
+    def __init__(self, browser_name: str = "chromium", launch_args: Optional[Dict[str, Any]] = None,
+                 context_args: Optional[Dict[str, Any]] = None, concurrency: int = 4,
+                 default_timeout: int = 30000):
+        self.browser_name = browser_name
+        self.launch_args = launch_args or {}
+        self.context_args = context_args or {}
+        self.concurrency = concurrency
+        self.default_timeout = default_timeout
+
+    def run(self, scenarios: Mapping[str, Scenario], concurrency: Optional[int] = None) -> RunSummary:
+        """Run every scenario (name -> async fn(page)) and return results in input order"""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.run_async(scenarios, concurrency)).result()
+
+    async def run_async(self, scenarios: Mapping[str, Scenario], concurrency: Optional[int] = None) -> RunSummary:
+        """Same as run() for callers already inside an event loop"""
+        size = max(1, min(concurrency or self.concurrency, len(scenarios) or 1))
+        async with async_playwright() as playwright:
+            browser = await getattr(playwright, self.browser_name).launch(**self.launch_args)
+            context = await browser.new_context(**self.context_args)
+            try:
+                pages = [await context.new_page() for _ in range(size)]
+                for page in pages:
+                    page.set_default_timeout(self.default_timeout)
+                return await run_on_pool(pages, scenarios)
+            finally:
+                await context.close()
+                await browser.close()
+
+
+__all__ = [
+    'AsyncScenarioRunner',
+    'RunSummary',
+    'ScenarioResult',
+    'run_on_pool',
+]
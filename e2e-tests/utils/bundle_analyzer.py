@@ -0,0 +1,386 @@
+"""
+Bundle Analyzer
+Attributes web bundle bytes (raw and gzipped) to app source paths through source maps
+
+content/chapters-index.ts require()s every chapter JSON, so Metro inlines the content into
+whatever chunk imports it. This walks each chunk's source map, charges every generated
+segment to its original source, groups sources (content/<book>, utils, components, app,
+node_modules/<package>) and flags content JSON that ends up in a startup chunk.
+
+Chunks come from either:
+    a running dev server   startup chunks are the <script src> tags of the HTML shell;
+                           lazy chunk URLs can be passed with --chunk
+    an `expo export -p web --source-maps` directory
+                           startup chunks are the ones index.html loads, the rest are lazy
+
+Source map columns are UTF-16 offsets; content is BMP-only (Hebrew), so they are used as
+string indexes directly.
+
+Usage:
+    python -m utils.bundle_analyzer analyze --url http://localhost:8081 --output reports/bundle-main.json
+    python -m utils.bundle_analyzer analyze --dist ../kitzur/dist --fail-on-startup-content
+    python -m utils.bundle_analyzer diff reports/bundle-main.json reports/bundle-branch.json
+"""
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+from urllib.request import urlopen
+import argparse
+import base64
+import gzip
+import json
+import re
+import sys
+
+
+UNMAPPED = '(unmapped)'
+
+# First path component under kitzur/ that names a group on its own
+APP_GROUPS = ('utils', 'components', 'app', 'hooks', 'contexts', 'constants', 'config', 'src', 'types')
+
+SOURCE_MAPPING_URL = re.compile(r'//[#@] sourceMappingURL=(\S+)\s*$')
+
+_BASE64 = {c: i for i, c in enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+
+
+@dataclass
+class SourceSize:
+    path: str
+    group: str
+    raw_bytes: int = 0
+    gzip_bytes: int = 0     # this source's generated code gzipped on its own (an upper bound)
+
+    @property
+    def is_content_json(self) -> bool:
+        return self.group.startswith('content') and self.path.endswith('.json')
+
+
+@dataclass
+class ChunkReport:
+    name: str
+    startup: bool
+    raw_bytes: int
+    gzip_bytes: int
+    sources: List[SourceSize] = field(default_factory=list)
+
+    def groups(self) -> Dict[str, Dict[str, int]]:
+        totals: Dict[str, Dict[str, int]] = {}
+        for source in self.sources:
+            bucket = totals.setdefault(source.group, {'raw_bytes': 0, 'gzip_bytes': 0, 'sources': 0})
+            bucket['raw_bytes'] += source.raw_bytes
+            bucket['gzip_bytes'] += source.gzip_bytes
+            bucket['sources'] += 1
+        return dict(sorted(totals.items(), key=lambda kv: -kv[1]['raw_bytes']))
+
+
+# ==================== Source Maps ====================
+
+def _vlq_values(segment: str) -> List[int]:
+    values, shift, value = [], 0, 0
+    for char in segment:
+        digit = _BASE64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        shift, value = 0, 0
+    return values
+
+
+def decode_segments(mappings: str) -> Iterator[Tuple[int, int, Optional[int], Optional[int]]]:
+    """Yield (generated line, generated column, source index, original line) per segment"""
+    source, original_line = 0, 0
+    for line, group in enumerate(mappings.split(';')):
+        column = 0
+        for segment in group.split(','):
+            if not segment:
+                continue
+            values = _vlq_values(segment)
+            column += values[0]
+            if len(values) >= 4:
+                source += values[1]
+                original_line += values[2]
+                yield line, column, source, original_line
+            else:
+                yield line, column, None, None
+
+
+def decode_mappings(mappings: str) -> Iterator[Tuple[int, int, Optional[int]]]:
+    """Yield (generated line, generated column, source index or None) per segment"""
+    for line, column, source, _ in decode_segments(mappings):
+        yield line, column, source
+
+
+def flatten_map(source_map: Dict[str, Any]) -> Iterator[Tuple[int, int, Optional[str], Optional[int]]]:
+    """(line, column, source path, original line) segments of a plain or indexed ("sections") map"""
+    if 'sections' in source_map:
+        for section in source_map['sections']:
+            offset = section.get('offset', {})
+            line_offset, column_offset = offset.get('line', 0), offset.get('column', 0)
+            for line, column, source, original in flatten_map(section['map']):
+                yield line + line_offset, column + (column_offset if line == 0 else 0), source, original
+        return
+    root = source_map.get('sourceRoot') or ''
+    sources = [root + s if root and not s.startswith('/') else s for s in source_map.get('sources', [])]
+    for line, column, index, original in decode_segments(source_map.get('mappings', '')):
+        yield line, column, sources[index] if index is not None else None, original
+
+
+def source_group(path: str) -> Tuple[str, str]:
+    """(normalized path, group) for a source map entry"""
+    path = re.sub(r'^(webpack|file)://+', '/', path).replace('\\', '/')
+    if 'node_modules/' in path:
+        rest = path.rsplit('node_modules/', 1)[1]
+        parts = rest.split('/')
+        package = '/'.join(parts[:2]) if parts[0].startswith('@') else parts[0]
+        return 'node_modules/' + rest, f'node_modules/{package}'
+    if '/kitzur/' in path:
+        path = path.rsplit('/kitzur/', 1)[1]
+    path = path.lstrip('/').removeprefix('./')
+    parts = path.split('/')
+    if parts[0] == 'content':
+        return path, f"content/{parts[1]}" if len(parts) > 2 else 'content'
+    if parts[0] in APP_GROUPS:
+        return path, parts[0]
+    return path, 'other'
+
+
+def attribute(code: str, source_map: Dict[str, Any]) -> Dict[str, str]:
+    """Generated text of each source (plus UNMAPPED), in bundle order"""
+    lines = code.split('\n')
+    pieces: Dict[str, List[str]] = {}
+    by_line: Dict[int, List[Tuple[int, Optional[str]]]] = {}
+    for line, column, source, _ in flatten_map(source_map):
+        by_line.setdefault(line, []).append((column, source))
+    for number, text in enumerate(lines):
+        segments = sorted(by_line.get(number, ()), key=lambda s: s[0])
+        # Bytes before the first segment (and whole unmapped lines) belong to no source
+        cursor, owner = 0, None
+        for column, source in segments + [(len(text), None)]:
+            if column > cursor:
+                pieces.setdefault(owner or UNMAPPED, []).append(text[cursor:column])
+            cursor, owner = max(cursor, column), source
+        if number < len(lines) - 1:
+            pieces.setdefault(UNMAPPED, []).append('\n')
+    return {source: ''.join(parts) for source, parts in pieces.items()}
+
+
+def analyze_chunk(name: str, code: str, source_map: Optional[Dict[str, Any]], startup: bool) -> ChunkReport:
+    raw = code.encode('utf-8')
+    report = ChunkReport(name, startup, len(raw), len(gzip.compress(raw, 9)))
+    texts = attribute(code, source_map) if source_map else {UNMAPPED: code}
+    sources: Dict[str, SourceSize] = {}
+    for path, text in texts.items():
+        normalized, group = (path, UNMAPPED) if path == UNMAPPED else source_group(path)
+        data = text.encode('utf-8')
+        size = sources.setdefault(normalized, SourceSize(normalized, group))
+        size.raw_bytes += len(data)
+        size.gzip_bytes += len(gzip.compress(data, 6)) if data.strip() else 0
+    report.sources = sorted(sources.values(), key=lambda s: -s.raw_bytes)
+    return report
+
+
+# ==================== Loading Chunks ====================
+
+class _ScriptTags(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.srcs: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        src = dict(attrs).get('src')
+        if tag == 'script' and src:
+            self.srcs.append(src)
+
+
+def script_srcs(html: str) -> List[str]:
+    parser = _ScriptTags()
+    parser.feed(html)
+    return parser.srcs
+
+
+def fetch_text(url: str, timeout: int = 300) -> str:
+    with urlopen(url, timeout=timeout) as response:
+        return response.read().decode('utf-8')
+
+
+def source_map_for(code: str, chunk_url: str, fetch: Callable[[str], str] = fetch_text) -> Optional[Dict[str, Any]]:
+    """Source map named by the chunk's sourceMappingURL comment (inline data: URLs included)"""
+    tail = code[-2048:].rstrip()
+    match = SOURCE_MAPPING_URL.search(tail)
+    if not match:
+        return None
+    ref = match.group(1)
+    if ref.startswith('data:'):
+        return json.loads(base64.b64decode(ref.split(',', 1)[1]))
+    return json.loads(fetch(urljoin(chunk_url, ref)))
+
+
+def analyze_server(base_url: str, lazy_chunks: Optional[List[str]] = None,
+                   fetch: Callable[[str], str] = fetch_text) -> List[ChunkReport]:
+    """Chunks of a running dev server: the HTML shell's scripts, then the given lazy chunk URLs"""
+    startup = [urljoin(base_url, src) for src in script_srcs(fetch(base_url))]
+    reports = []
+    for url in startup + [u for u in lazy_chunks or [] if u not in startup]:
+        code = fetch(url)
+        reports.append(analyze_chunk(url.split('?')[0].rsplit('/', 1)[-1] or url, code,
+                                     source_map_for(code, url, fetch), url in startup))
+    return reports
+
+
+def analyze_export(dist: Path) -> List[ChunkReport]:
+    """Chunks of `expo export -p web --source-maps`: index.html's scripts are the startup set"""
+    dist = Path(dist)
+    startup = {src.lstrip('/') for src in script_srcs((dist / 'index.html').read_text(encoding='utf-8'))}
+    reports = []
+    for path in sorted(dist.rglob('*.js')):
+        relative = path.relative_to(dist).as_posix()
+        map_path = path.with_name(path.name + '.map')
+        source_map = json.loads(map_path.read_text(encoding='utf-8')) if map_path.exists() else None
+        reports.append(analyze_chunk(relative, path.read_text(encoding='utf-8'), source_map, relative in startup))
+    return reports
+
+
+# ==================== Reports ====================
+
+def startup_content(reports: List[ChunkReport]) -> List[Tuple[str, SourceSize]]:
+    """(chunk, source) for every content JSON module inside a startup chunk"""
+    return [(r.name, s) for r in reports if r.startup for s in r.sources if s.is_content_json]
+
+
+def build_summary(reports: List[ChunkReport], label: str = 'current') -> Dict[str, Any]:
+    groups: Dict[str, Dict[str, Dict[str, int]]] = {'startup': {}, 'lazy': {}}
+    for report in reports:
+        kind = groups['startup' if report.startup else 'lazy']
+        for group, totals in report.groups().items():
+            bucket = kind.setdefault(group, {'raw_bytes': 0, 'gzip_bytes': 0, 'sources': 0})
+            for key, value in totals.items():
+                bucket[key] += value
+    flagged = startup_content(reports)
+    return {
+        'label': label,
+        'totals': {
+            kind: {
+                'chunks': sum(1 for r in reports if r.startup == (kind == 'startup')),
+                'raw_bytes': sum(r.raw_bytes for r in reports if r.startup == (kind == 'startup')),
+                'gzip_bytes': sum(r.gzip_bytes for r in reports if r.startup == (kind == 'startup')),
+            } for kind in ('startup', 'lazy')
+        },
+        'groups': groups,
+        'startup_content': {
+            'files': len(flagged),
+            'raw_bytes': sum(s.raw_bytes for _, s in flagged),
+            'gzip_bytes': sum(s.gzip_bytes for _, s in flagged),
+            'top': [{'chunk': chunk, **asdict(s)} for chunk, s in sorted(flagged, key=lambda f: -f[1].raw_bytes)[:20]],
+        },
+        'chunks': [{**{k: v for k, v in asdict(r).items() if k != 'sources'},
+                    'groups': r.groups(),
+                    'sources': {s.path: [s.raw_bytes, s.gzip_bytes] for s in r.sources}} for r in reports],
+    }
+
+
+def diff_summaries(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per (startup|lazy, group) byte deltas between two builds, biggest change first"""
+    rows = []
+    for kind in ('startup', 'lazy'):
+        before, after = old['groups'].get(kind, {}), new['groups'].get(kind, {})
+        for group in set(before) | set(after):
+            a, b = before.get(group, {}), after.get(group, {})
+            raw = b.get('raw_bytes', 0) - a.get('raw_bytes', 0)
+            gz = b.get('gzip_bytes', 0) - a.get('gzip_bytes', 0)
+            if raw or gz:
+                rows.append({'kind': kind, 'group': group, 'old_raw': a.get('raw_bytes', 0),
+                             'new_raw': b.get('raw_bytes', 0), 'raw_delta': raw, 'gzip_delta': gz})
+    return sorted(rows, key=lambda r: -abs(r['raw_delta']))
+
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:,.1f} KB"
+
+
+def format_summary(summary: Dict[str, Any], limit: int = 12) -> str:
+    lines = []
+    for kind in ('startup', 'lazy'):
+        totals = summary['totals'][kind]
+        lines.append(f"{kind}: {totals['chunks']} chunk(s), {_kb(totals['raw_bytes'])} raw, "
+                     f"{_kb(totals['gzip_bytes'])} gzip")
+        for group, sizes in list(summary['groups'][kind].items())[:limit]:
+            lines.append(f"  {group:<34} {_kb(sizes['raw_bytes']):>14} {_kb(sizes['gzip_bytes']):>12} "
+                         f"{sizes['sources']:>6} files")
+    flagged = summary['startup_content']
+    if flagged['files']:
+        lines.append(f"⚠️  {flagged['files']} content JSON file(s) in the startup chunk: "
+                     f"{_kb(flagged['raw_bytes'])} raw, {_kb(flagged['gzip_bytes'])} gzip")
+        lines.extend(f"    {f['path']} ({_kb(f['raw_bytes'])})" for f in flagged['top'][:5])
+    return '\n'.join(lines)
+
+
+def format_diff(rows: List[Dict[str, Any]], limit: int = 20) -> str:
+    if not rows:
+        return "No size changes"
+    lines = [f"{'kind':<8} {'group':<34} {'old':>14} {'new':>14} {'Δ raw':>12} {'Δ gzip':>12}"]
+    for row in rows[:limit]:
+        lines.append(f"{row['kind']:<8} {row['group']:<34} {_kb(row['old_raw']):>14} {_kb(row['new_raw']):>14} "
+                     f"{row['raw_delta'] / 1024:>+12,.1f} {row['gzip_delta'] / 1024:>+12,.1f}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Web bundle composition by source group")
+    sub = parser.add_subparsers(dest='command', required=True)
+    analyze = sub.add_parser('analyze', help="Attribute chunk bytes to sources")
+    source = analyze.add_mutually_exclusive_group(required=True)
+    source.add_argument('--url', help="Dev server base URL, e.g. http://localhost:8081")
+    source.add_argument('--dist', type=Path, help="expo export -p web --source-maps output directory")
+    analyze.add_argument('--chunk', action='append', default=[], help="Extra (lazy) chunk URL, repeatable")
+    analyze.add_argument('--label', default='current')
+    analyze.add_argument('--output', type=Path)
+    analyze.add_argument('--fail-on-startup-content', action='store_true')
+    compare = sub.add_parser('diff', help="Group deltas between two saved analyses")
+    compare.add_argument('old', type=Path)
+    compare.add_argument('new', type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == 'diff':
+        old, new = (json.loads(p.read_text(encoding='utf-8')) for p in (args.old, args.new))
+        print(f"{old['label']} → {new['label']}")
+        print(format_diff(diff_summaries(old, new)))
+        return 0
+
+    reports = analyze_server(args.url, args.chunk) if args.url else analyze_export(args.dist)
+    summary = build_summary(reports, args.label)
+    print(format_summary(summary))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\nSaved {args.output}")
+    return 1 if args.fail_on_startup_content and summary['startup_content']['files'] else 0
+
+
+__all__ = [
+    'ChunkReport',
+    'SourceSize',
+    'analyze_chunk',
+    'analyze_export',
+    'analyze_server',
+    'attribute',
+    'build_summary',
+    'decode_mappings',
+    'decode_segments',
+    'diff_summaries',
+    'fetch_text',
+    'flatten_map',
+    'format_diff',
+    'format_summary',
+    'script_srcs',
+    'source_group',
+    'source_map_for',
+    'startup_content',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
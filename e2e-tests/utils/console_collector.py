@@ -0,0 +1,155 @@
+"""
+Console Collector
+Bounded buffer of browser console messages, page errors and failed requests per context
+
+Handlers only read fields Playwright already delivered with the event (no extra
+round trips) and append to a fixed-size ring, so a chatty page costs O(1) per message.
+Totals keep counting after old events fall out of the ring. Messages matching the
+allowlist are counted as allowed and never charged against a ConsoleBudget.
+"""
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Pattern, Sequence
+import re
+import time
+import weakref
+
+
+# Known noise: offline Hebcal lookups, dev-server chatter, favicon misses, and requests the
+# browser aborted itself (Firestore Listen channels and fetches cut off by a navigation)
+DEFAULT_ALLOWLIST = [
+    r"Hebcal",
+    r"\[HMR\]|\[Fast Refresh\]",
+    r"Download the React DevTools",
+    r"favicon\.ico",
+    r"^[A-Z]+ (net::ERR_ABORTED|NS_BINDING_ABORTED|cancelled)$",
+]
+
+ERROR_LEVELS = ('error', 'pageerror', 'requestfailed')
+WARNING_LEVELS = ('warning',)
+
+_collectors: "weakref.WeakKeyDictionary[Any, ConsoleCollector]" = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class BrowserEvent:
+    """One console message, uncaught page error or failed request"""
+    level: str          # console type (log, warning, error...), 'pageerror' or 'requestfailed'
+    text: str
+    url: str = ""
+    line: Optional[int] = None
+    at: float = 0.0     # seconds since the collector started
+    allowed: bool = False
+
+    def format(self) -> str:
+        where = f" ({self.url}:{self.line})" if self.url and self.line is not None else (f" ({self.url})" if self.url else "")
+        mark = " [allowed]" if self.allowed else ""
+        return f"[{self.at:7.2f}s] {self.level.upper():<13} {self.text}{where}{mark}"
+
+
+@dataclass
+class ConsoleBudget:
+    """Maximum non-allowlisted errors/warnings for a test; None means unlimited"""
+    max_errors: Optional[int] = 0
+    max_warnings: Optional[int] = None
+
+
+class ConsoleCollector:
+    """Ring buffer of BrowserEvents plus running totals per level"""
+
+    def __init__(self, capacity: int = 500, allowlist: Iterable[str] = DEFAULT_ALLOWLIST):
+        self.events: Deque[BrowserEvent] = deque(maxlen=capacity)
+        self.totals: Counter = Counter()
+        self.allowed: Counter = Counter()
+        self.allowlist: List[Pattern] = [re.compile(pattern) for pattern in allowlist]
+        self._started = time.perf_counter()
+        self._context = None
+
+    # ==================== Recording ====================
+
+    def record(self, level: str, text: str, url: str = "", line: Optional[int] = None) -> BrowserEvent:
+        allowed = any(p.search(text) or (url and p.search(url)) for p in self.allowlist)
+        event = BrowserEvent(level, text, url, line, round(time.perf_counter() - self._started, 3), allowed)
+        self.events.append(event)
+        (self.allowed if allowed else self.totals)[level] += 1
+        return event
+
+    def _on_console(self, message):
+        location = message.location or {}
+        self.record(message.type, message.text, location.get('url', ''), location.get('lineNumber'))
+
+    def _on_web_error(self, web_error):
+        error = web_error.error
+        self.record('pageerror', f"{error.name}: {error.message}" if error.name else error.message)
+
+    def _on_request_failed(self, request):
+        self.record('requestfailed', f"{request.method} {request.failure or 'failed'}", request.url)
+
+    def attach(self, context) -> "ConsoleCollector":
+        """Subscribe to every page of a BrowserContext (sync or async API)"""
+        context.on('console', self._on_console)
+        context.on('weberror', self._on_web_error)
+        context.on('requestfailed', self._on_request_failed)
+        self._context = context
+        _collectors[context] = self
+        return self
+
+    def detach(self):
+        if self._context is not None:
+            self._context.remove_listener('console', self._on_console)
+            self._context.remove_listener('weberror', self._on_web_error)
+            self._context.remove_listener('requestfailed', self._on_request_failed)
+            _collectors.pop(self._context, None)
+            self._context = None
+
+    @staticmethod
+    def for_context(context) -> Optional["ConsoleCollector"]:
+        """Collector attached to a context, if any"""
+        try:
+            return _collectors.get(context)
+        except TypeError:
+            return None
+
+    # ==================== Budgets & Reporting ====================
+
+    def count(self, levels: Sequence[str]) -> int:
+        """Non-allowlisted events of the given levels (including ones evicted from the ring)"""
+        return sum(self.totals[level] for level in levels)
+
+    @property
+    def errors(self) -> int:
+        return self.count(ERROR_LEVELS)
+
+    @property
+    def warnings(self) -> int:
+        return self.count(WARNING_LEVELS)
+
+    def violations(self, budget: ConsoleBudget) -> List[str]:
+        """Human-readable budget failures (empty when within budget)"""
+        failures = []
+        if budget.max_errors is not None and self.errors > budget.max_errors:
+            failures.append(f"{self.errors} browser error(s) > budget {budget.max_errors}")
+        if budget.max_warnings is not None and self.warnings > budget.max_warnings:
+            failures.append(f"{self.warnings} browser warning(s) > budget {budget.max_warnings}")
+        return failures
+
+    def format(self, levels: Optional[Sequence[str]] = None) -> str:
+        """Buffered events, one per line (optionally only some levels)"""
+        return '\n'.join(e.format() for e in self.events if levels is None or e.level in levels)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'totals': dict(self.totals),
+            'allowed': dict(self.allowed),
+            'events': [asdict(e) for e in self.events],
+        }
+
+
+__all__ = [
+    'BrowserEvent',
+    'ConsoleBudget',
+    'ConsoleCollector',
+    'DEFAULT_ALLOWLIST',
+    'ERROR_LEVELS',
+    'WARNING_LEVELS',
+]
@@ -0,0 +1,345 @@
+"""
+Content Bundle
+Packs each book into compressed shards with a binary offset index
+
+Layout of a bundle directory:
+    {book}.idx            - offset index (see below)
+    {book}-{n:03d}.shard  - concatenated, independently compressed records
+
+Every record is one content file, deflated on its own with a per-book preset
+dictionary, so a single chapter can be decoded without touching its
+neighbours. The reader memory-maps shards and only loads an index the first
+time its book is asked for.
+
+Index format (little-endian):
+    magic b'KZIX' | version u16 | shard_count u16 | record_count u32 | dict_len u32
+    dict bytes
+    record_count x (id_len u8 | id utf-8 | shard u16 | offset u32 | length u32)
+
+Usage:
+    python -m utils.content_bundle build [--output build/content-bundle]
+    python -m utils.content_bundle get kitzur_orach_chaim-001
+    python -m utils.content_bundle bench
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import json
+import mmap
+import random
+import statistics
+import struct
+import sys
+import time
+import zlib
+
+from utils.content_tree import CONTENT_DIR, CHAPTER_BOOKS, PARSHIOT_DIR, iter_content_files
+
+
+BUNDLE_BOOKS = CHAPTER_BOOKS + (PARSHIOT_DIR,)
+
+DEFAULT_BUNDLE_DIR = Path(__file__).resolve().parents[1] / 'build' / 'content-bundle'
+
+INDEX_MAGIC = b'KZIX'
+INDEX_VERSION = 1
+_HEADER = struct.Struct('<4sHHII')
+_RECORD = struct.Struct('<HII')
+
+# Compressed bytes per shard before starting a new one
+SHARD_TARGET_BYTES = 512 * 1024
+# zlib uses at most the last 32KB of a preset dictionary
+DICT_BYTES = 32 * 1024
+DICT_SAMPLE_BYTES = 1024
+COMPRESSION_LEVEL = 9
+
+
+class BundleError(Exception):
+    """Raised for missing or malformed bundle files"""
+
+
+# ==================== Building ====================
+
+def build_dictionary(records: List[bytes]) -> bytes:
+    """
+    Preset dictionary from evenly sampled record prefixes
+    Chapters in a book share keys, titles and common phrases, which is what
+    makes small independently-compressed records expensive without one
+    """
+    if not records:
+        return b''
+    step = max(1, len(records) * DICT_SAMPLE_BYTES // DICT_BYTES)
+    sample = b''.join(record[:DICT_SAMPLE_BYTES] for record in records[::step])
+    return sample[-DICT_BYTES:]
+
+
+def _compress(data: bytes, zdict: bytes) -> bytes:
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict) \
+        if zdict else zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _decompress(data: bytes, zdict: bytes) -> bytes:
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=zdict) \
+        if zdict else zlib.decompressobj(-zlib.MAX_WBITS)
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+def build_book(book: str, files: List[Path], output_dir: Path) -> Dict[str, Any]:
+    """Write one book's shards and index; returns size stats"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for stale in output_dir.glob(f'{book}-*.shard'):
+        stale.unlink()
+
+    records = [(path.stem, path.read_bytes()) for path in files]
+    zdict = build_dictionary([data for _, data in records])
+
+    entries: List[Tuple[str, int, int, int]] = []
+    shard_number, shard_size = 0, 0
+    shard = open(output_dir / f'{book}-{shard_number:03d}.shard', 'wb')
+    try:
+        for record_id, data in records:
+            blob = _compress(data, zdict)
+            if shard_size and shard_size + len(blob) > SHARD_TARGET_BYTES:
+                shard.close()
+                shard_number, shard_size = shard_number + 1, 0
+                shard = open(output_dir / f'{book}-{shard_number:03d}.shard', 'wb')
+            entries.append((record_id, shard_number, shard_size, len(blob)))
+            shard.write(blob)
+            shard_size += len(blob)
+    finally:
+        shard.close()
+
+    index = bytearray(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, shard_number + 1, len(entries), len(zdict)))
+    index += zdict
+    for record_id, shard_no, offset, length in sorted(entries):
+        encoded = record_id.encode('utf-8')
+        index += struct.pack('<B', len(encoded)) + encoded + _RECORD.pack(shard_no, offset, length)
+    (output_dir / f'{book}.idx').write_bytes(bytes(index))
+
+    return {
+        'book': book,
+        'records': len(entries),
+        'shards': shard_number + 1,
+        'raw_bytes': sum(len(data) for _, data in records),
+        'bundle_bytes': len(index) + sum(
+            (output_dir / f'{book}-{n:03d}.shard').stat().st_size for n in range(shard_number + 1)
+        ),
+    }
+
+
+def build_bundle(content_dir: Path = CONTENT_DIR, output_dir: Path = DEFAULT_BUNDLE_DIR) -> List[Dict[str, Any]]:
+    """Build shards and indexes for every book"""
+    by_book: Dict[str, List[Path]] = {book: [] for book in BUNDLE_BOOKS}
+    for _, book, path in iter_content_files(content_dir):
+        if book in by_book:
+            by_book[book].append(path)
+    return [build_book(book, files, output_dir) for book, files in by_book.items() if files]
+
+
+# ==================== Reading ====================
+
+class BookIndex:
+    """Parsed offset index for one book"""
+
+    def __init__(self, path: Path):
+        data = Path(path).read_bytes()
+        if len(data) < _HEADER.size:
+            raise BundleError(f"Truncated index: {path}")
+        magic, version, shard_count, count, dict_len = _HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise BundleError(f"Unsupported index format: {path}")
+
+        pos = _HEADER.size
+        self.zdict = data[pos:pos + dict_len]
+        pos += dict_len
+        self.shard_count = shard_count
+        self.records: Dict[str, Tuple[int, int, int]] = {}
+        for _ in range(count):
+            id_len = data[pos]
+            record_id = data[pos + 1:pos + 1 + id_len].decode('utf-8')
+            pos += 1 + id_len
+            self.records[record_id] = _RECORD.unpack_from(data, pos)
+            pos += _RECORD.size
+
+
+class ContentBundle:
+    """Read single records from a bundle directory on demand"""
+
+    def __init__(self, bundle_dir: Path = DEFAULT_BUNDLE_DIR):
+        self.bundle_dir = Path(bundle_dir)
+        if not self.bundle_dir.is_dir():
+            raise BundleError(f"Bundle not found: {self.bundle_dir}")
+        self.books = [book for book in BUNDLE_BOOKS if (self.bundle_dir / f'{book}.idx').exists()]
+        self._indexes: Dict[str, BookIndex] = {}
+        self._shards: Dict[Tuple[str, int], mmap.mmap] = {}
+        self._files = []
+
+    def index(self, book: str) -> BookIndex:
+        if book not in self._indexes:
+            self._indexes[book] = BookIndex(self.bundle_dir / f'{book}.idx')
+        return self._indexes[book]
+
+    def _shard(self, book: str, number: int) -> mmap.mmap:
+        key = (book, number)
+        if key not in self._shards:
+            f = open(self.bundle_dir / f'{book}-{number:03d}.shard', 'rb')
+            self._files.append(f)
+            self._shards[key] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._shards[key]
+
+    def locate(self, record_id: str, book: Optional[str] = None) -> Optional[Tuple[str, int, int, int]]:
+        """(book, shard, offset, length) for a record
+
+        Without a book, an id present in several books resolves like the app registry
+        (chapters-index.ts), where the later directory wins.
+        """
+        for candidate in [book] if book else reversed(self.books):
+            entry = self.index(candidate).records.get(record_id)
+            if entry:
+                return (candidate,) + tuple(entry)
+        return None
+
+    def get_bytes(self, record_id: str, book: Optional[str] = None) -> Optional[bytes]:
+        """Original file bytes for a chapter ID or parsha name"""
+        location = self.locate(record_id, book)
+        if location is None:
+            return None
+        book, shard, offset, length = location
+        blob = self._shard(book, shard)[offset:offset + length]
+        return _decompress(blob, self.index(book).zdict)
+
+    def get(self, record_id: str, book: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Decoded chapter / parsha JSON, or None if not in the bundle"""
+        data = self.get_bytes(record_id, book)
+        return json.loads(data) if data is not None else None
+
+    def ids(self, book: str) -> List[str]:
+        return sorted(self.index(book).records)
+
+    def close(self):
+        for shard in self._shards.values():
+            shard.close()
+        for f in self._files:
+            f.close()
+        self._shards.clear()
+        self._files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==================== Benchmark ====================
+
+def _percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples_ms)
+    return {
+        'p50_ms': round(statistics.median(ordered), 3),
+        'p95_ms': round(ordered[int(0.95 * (len(ordered) - 1))], 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+def benchmark(content_dir: Path = CONTENT_DIR, bundle_dir: Path = DEFAULT_BUNDLE_DIR,
+              samples: int = 200, seed: int = 0) -> Dict[str, Any]:
+    """
+    Compare the bundle with the current JSON layout
+    - size: raw JSON bytes vs bundle bytes
+    - cold open: loading the whole registry (what chapters-index.ts does) vs opening the bundle
+    - fetch: one random chapter from per-file JSON vs from the bundle
+    """
+    content_dir, bundle_dir = Path(content_dir), Path(bundle_dir)
+    paths = {
+        (book, path.stem): path
+        for _, book, path in iter_content_files(content_dir) if book in BUNDLE_BOOKS
+    }
+
+    start = time.perf_counter()
+    registry = {key: json.loads(path.read_bytes()) for key, path in paths.items()}
+    registry_ms = (time.perf_counter() - start) * 1000
+    del registry
+
+    start = time.perf_counter()
+    bundle = ContentBundle(bundle_dir)
+    first_key = next(iter(paths))
+    bundle.get(first_key[1], first_key[0])
+    bundle_open_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(seed)
+    keys = rng.choices(list(paths), k=samples)
+    json_ms, bundle_ms = [], []
+    for book, record_id in keys:
+        start = time.perf_counter()
+        expected = json.loads(paths[(book, record_id)].read_bytes())
+        json_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        actual = bundle.get(record_id, book)
+        bundle_ms.append((time.perf_counter() - start) * 1000)
+        if actual != expected:
+            raise BundleError(f"Bundle mismatch for {book}/{record_id}")
+    bundle.close()
+
+    bundle_bytes = sum(p.stat().st_size for p in bundle_dir.iterdir() if p.suffix in ('.idx', '.shard'))
+    return {
+        'records': len(paths),
+        'json_bytes': sum(p.stat().st_size for p in paths.values()),
+        'bundle_bytes': bundle_bytes,
+        'registry_load_ms': round(registry_ms, 1),
+        'bundle_open_ms': round(bundle_open_ms, 3),
+        'json_fetch': _percentiles(json_ms),
+        'bundle_fetch': _percentiles(bundle_ms),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and read sharded content bundles")
+    parser.add_argument('--content-dir', type=Path, default=CONTENT_DIR)
+    parser.add_argument('--output', type=Path, default=DEFAULT_BUNDLE_DIR, help="Bundle directory")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help="Build the bundle")
+    get = sub.add_parser('get', help="Print one record")
+    get.add_argument('record_id')
+    get.add_argument('--book', choices=BUNDLE_BOOKS)
+    bench = sub.add_parser('bench', help="Build, then compare against the JSON layout")
+    bench.add_argument('--samples', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.command == 'get':
+        with ContentBundle(args.output) as bundle:
+            data = bundle.get(args.record_id, args.book)
+        if data is None:
+            print(f"Not found: {args.record_id}", file=sys.stderr)
+            return 1
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+        return 0
+
+    stats = build_bundle(args.content_dir, args.output)
+    if args.command == 'build':
+        for book in stats:
+            print(f"{book['book']}: {book['records']} records in {book['shards']} shards, "
+                  f"{book['raw_bytes']:,} -> {book['bundle_bytes']:,} bytes")
+        return 0
+
+    print(json.dumps(benchmark(args.content_dir, args.output, args.samples), indent=2))
+    return 0
+
+
+__all__ = [
+    'BUNDLE_BOOKS',
+    'DEFAULT_BUNDLE_DIR',
+    'BundleError',
+    'BookIndex',
+    'ContentBundle',
+    'build_book',
+    'build_bundle',
+    'build_dictionary',
+    'benchmark',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Content Cache
+Persistent, hash-keyed facts per content file so tools only reprocess what changed
+
+The cache maps each file (relative to the content dir) to its size, mtime,
+content digest, and the FileFacts the validator derived from it (section IDs,
+counts, Hebrew text stats, local findings). Like git's index, a matching
+size+mtime skips hashing; a fresh checkout with new mtimes still reuses
+everything whose digest is unchanged.
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+
+from utils.content_tree import CONTENT_DIR, iter_content_files, relative_path
+from utils.content_validator import FileFacts, scan_files
+
+
+# Bump when FileFacts or the per-file checks change, to force a full rescan
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / 'test_data' / 'content_cache.json'
+
+
+def file_digest(path: Path) -> str:
+    """Content digest used as the cache key"""
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=16).hexdigest()
+
+
+class ContentCache:
+    """Per-file digests and derived facts, persisted as JSON"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.content_dir: Optional[str] = None
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.changed: List[str] = []
+        self.removed: List[str] = []
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except ValueError:
+            return  # Corrupt cache: start over
+        if data.get('version') != CACHE_VERSION:
+            return
+        self.content_dir = data.get('content_dir')
+        self.entries = data.get('files', {})
+
+    def save(self):
+        """Write the cache atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'version': CACHE_VERSION,
+            'content_dir': self.content_dir,
+            'files': self.entries,
+        }
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')  # xdist workers may save concurrently
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, content_dir: Path = CONTENT_DIR, jobs: Optional[int] = None) -> List[FileFacts]:
+        """
+        Bring the cache up to date with the tree and return facts for every file
+        Only new or modified files are parsed; `changed` and `removed` list them
+        """
+        content_dir = Path(content_dir)
+        if self.content_dir != str(content_dir.resolve()):
+            self.entries = {}
+            self.content_dir = str(content_dir.resolve())
+
+        entries = list(iter_content_files(content_dir))
+        pending: Dict[str, Dict[str, Any]] = {}
+        to_scan = []
+        for kind, book, path in entries:
+            rel = relative_path(path, content_dir)
+            stat = path.stat()
+            cached = self.entries.get(rel)
+            if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                continue
+            digest = file_digest(path)
+            if cached and cached['digest'] == digest:
+                cached['mtime_ns'] = stat.st_mtime_ns
+                continue
+            pending[rel] = {'digest': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            to_scan.append((kind, book, path))
+
+        for facts in scan_files(to_scan, content_dir, jobs, with_stats=True):
+            pending[facts.path]['facts'] = facts.to_dict()
+        self.entries.update(pending)
+
+        current = [relative_path(path, content_dir) for _, _, path in entries]
+        current_set = set(current)
+        self.removed = sorted(rel for rel in self.entries if rel not in current_set)
+        for rel in self.removed:
+            del self.entries[rel]
+        self.changed = list(pending)
+
+        return [FileFacts.from_dict(self.entries[rel]['facts']) for rel in current]
+
+    def digests(self) -> Dict[str, str]:
+        """Relative path -> content digest for every cached file"""
+        return {rel: entry['digest'] for rel, entry in self.entries.items()}
+
+
+__all__ = [
+    'CACHE_VERSION',
+    'DEFAULT_CACHE_PATH',
+    'ContentCache',
+    'file_digest',
+]
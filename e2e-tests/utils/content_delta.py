@@ -0,0 +1,346 @@
+"""
+Content Delta
+Patch bundles between two content trees, keyed on the chapter `version` field
+
+Either side of a diff is a directory or a git revision (read straight from the
+object store, no checkout needed). Changed files are encoded as line-level
+copy/insert ops against the old file; the content JSON is pretty-printed with
+one section text per line, so a changed section costs roughly one line.
+
+Output directory:
+    delta.kzd       zlib-compressed JSON patch (files, ops, base/result digests)
+    versions.json   per-chapter version bumps, changed sections, size report
+
+The applier checks every base digest before writing anything and every result
+digest before replacing a file, so a patch never half-applies to the wrong tree.
+
+Usage:
+    python -m utils.content_delta diff HEAD~5                # revision -> working tree
+    python -m utils.content_delta diff old/content new/content -o build/content-delta
+    python -m utils.content_delta apply build/content-delta/delta.kzd path/to/content
+"""
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import base64
+import hashlib
+import json
+import subprocess
+import sys
+import zlib
+
+from utils.content_tree import CONTENT_DIR, CHAPTER_BOOKS
+
+
+DELTA_FORMAT = 1
+DEFAULT_DELTA_DIR = Path(__file__).resolve().parents[1] / 'build' / 'content-delta'
+DELTA_FILE = 'delta.kzd'
+VERSIONS_FILE = 'versions.json'
+COMPRESSION_LEVEL = 9
+
+
+class DeltaError(Exception):
+    """Raised when a patch does not match the tree it is applied to"""
+
+
+def digest(data: bytes) -> str:
+    """Same digest as utils.content_cache.file_digest, over bytes in memory"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# ==================== Tree Sources ====================
+
+def read_directory(root: Path) -> Dict[str, bytes]:
+    """Relative posix path -> bytes for every file under root"""
+    root = Path(root)
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob('*')) if path.is_file()
+    }
+
+
+def _git(repo: Path, *args: str, input: Optional[bytes] = None) -> bytes:
+    result = subprocess.run(['git', '-C', str(repo), *args], input=input, capture_output=True)
+    if result.returncode != 0:
+        raise DeltaError(f"git {' '.join(args)}: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.stdout
+
+
+def read_git_revision(revision: str, content_dir: Path = CONTENT_DIR) -> Dict[str, bytes]:
+    """Files under content_dir as they were at a git revision"""
+    content_dir = Path(content_dir).resolve()
+    top = Path(_git(content_dir, 'rev-parse', '--show-toplevel').decode().strip())
+    prefix = content_dir.relative_to(top).as_posix() + '/'
+
+    listing = _git(top, 'ls-tree', '-r', '-z', revision, '--', prefix)
+    entries: List[Tuple[str, str]] = []
+    for record in listing.split(b'\0'):
+        if not record:
+            continue
+        meta, path = record.decode('utf-8').split('\t', 1)
+        _, kind, sha = meta.split()
+        if kind == 'blob':
+            entries.append((path[len(prefix):], sha))
+
+    # One cat-file process for all blobs: "<sha> blob <size>\n<data>\n" per entry
+    output = _git(top, 'cat-file', '--batch', input=''.join(f"{sha}\n" for _, sha in entries).encode())
+    files: Dict[str, bytes] = {}
+    pos = 0
+    for rel, _ in entries:
+        header_end = output.index(b'\n', pos)
+        size = int(output[pos:header_end].split()[2])
+        files[rel] = output[header_end + 1:header_end + 1 + size]
+        pos = header_end + 2 + size
+    return dict(sorted(files.items()))
+
+
+def read_tree(spec: str, content_dir: Path = CONTENT_DIR) -> Dict[str, bytes]:
+    """A directory path, or else a git revision of content_dir"""
+    path = Path(spec)
+    return read_directory(path) if path.is_dir() else read_git_revision(spec, content_dir)
+
+
+# ==================== Diff ====================
+
+def line_ops(old: str, new: str) -> List[list]:
+    """Ops rebuilding new from old: ["c", start, end] copies old lines, ["i", text] inserts"""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops: List[list] = []
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append(['c', i1, i2])
+        elif j2 > j1:
+            ops.append(['i', ''.join(new_lines[j1:j2])])
+    return ops
+
+
+def apply_line_ops(old: str, ops: List[list]) -> str:
+    old_lines = old.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        parts.append(''.join(old_lines[op[1]:op[2]]) if op[0] == 'c' else op[1])
+    return ''.join(parts)
+
+
+def _is_chapter(rel: str) -> bool:
+    book, _, name = rel.partition('/')
+    return book in CHAPTER_BOOKS and name.endswith('.json') and '/' not in name
+
+
+def _sections_by_id(doc: Any) -> Optional[Dict[Any, Dict[str, Any]]]:
+    """Section id -> section, or None when the document is not chapter-shaped"""
+    if not isinstance(doc, dict):
+        return None
+    sections = doc.get('sections', [])
+    if not isinstance(sections, list) or not all(isinstance(s, dict) for s in sections):
+        return None
+    return {s.get('id'): s for s in sections}
+
+
+def _chapter_changes(rel: str, old: Optional[bytes], new: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    """Version bump and section-level changes for one chapter file; None if either side is malformed"""
+    try:
+        old_doc = json.loads(old) if old is not None else {}
+        new_doc = json.loads(new) if new is not None else {}
+    except ValueError:
+        return None
+    old_sections, new_sections = _sections_by_id(old_doc), _sections_by_id(new_doc)
+    if old_sections is None or new_sections is None:
+        # The file-level patch still carries it; there is just no section summary
+        return None
+    old_version, new_version = old_doc.get('version'), new_doc.get('version')
+    return {
+        'id': new_doc.get('id') or old_doc.get('id') or Path(rel).stem,
+        'path': rel,
+        'old_version': old_version,
+        'new_version': new_version,
+        # A chapter that changed but kept its version would be skipped by version-keyed clients
+        'bumped': old is None or new is None or (new_version is not None and new_version != old_version),
+        'sections_added': [sid for sid in new_sections if sid not in old_sections],
+        'sections_removed': [sid for sid in old_sections if sid not in new_sections],
+        'sections_modified': [
+            sid for sid in new_sections if sid in old_sections and new_sections[sid] != old_sections[sid]
+        ],
+    }
+
+
+def compute_delta(old: Dict[str, bytes], new: Dict[str, bytes]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Return (patch, chapter changes) turning tree `old` into tree `new`"""
+    files = []
+    chapters = []
+    for rel in sorted(set(old) | set(new)):
+        before, after = old.get(rel), new.get(rel)
+        if before == after:
+            continue
+        entry: Dict[str, Any] = {'path': rel}
+        if after is None:
+            entry.update(op='remove', base=digest(before))
+        elif before is None:
+            entry.update(op='add', digest=digest(after))
+        else:
+            entry.update(op='patch', base=digest(before), digest=digest(after))
+        if after is not None:
+            try:
+                old_text = before.decode('utf-8') if before is not None else None
+                new_text = after.decode('utf-8')
+            except UnicodeDecodeError:
+                entry.update(op='add' if before is None else 'replace', data=base64.b64encode(after).decode())
+            else:
+                if old_text is None:
+                    entry['text'] = new_text
+                else:
+                    entry['ops'] = line_ops(old_text, new_text)
+        files.append(entry)
+        if _is_chapter(rel):
+            changes = _chapter_changes(rel, before, after)
+            if changes is not None:
+                chapters.append(changes)
+    return {'format': DELTA_FORMAT, 'files': files}, chapters
+
+
+def encode_delta(patch: Dict[str, Any]) -> bytes:
+    payload = json.dumps(patch, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return zlib.compress(payload, COMPRESSION_LEVEL)
+
+
+def decode_delta(data: bytes) -> Dict[str, Any]:
+    try:
+        patch = json.loads(zlib.decompress(data))
+    except (zlib.error, ValueError) as e:
+        raise DeltaError(f"Unreadable delta: {e}") from e
+    if patch.get('format') != DELTA_FORMAT:
+        raise DeltaError(f"Unsupported delta format: {patch.get('format')}")
+    return patch
+
+
+def size_report(new: Dict[str, bytes], delta_bytes: int) -> Dict[str, Any]:
+    """Delta size against downloading the whole new tree (raw and compressed)"""
+    full_raw = sum(len(data) for data in new.values())
+    full_compressed = sum(len(zlib.compress(data, COMPRESSION_LEVEL)) for data in new.values())
+    return {
+        'delta_bytes': delta_bytes,
+        'full_bytes': full_raw,
+        'full_compressed_bytes': full_compressed,
+        'ratio_vs_full': round(delta_bytes / full_raw, 5) if full_raw else None,
+        'ratio_vs_compressed': round(delta_bytes / full_compressed, 5) if full_compressed else None,
+    }
+
+
+def write_delta(old: Dict[str, bytes], new: Dict[str, bytes], output: Path = DEFAULT_DELTA_DIR,
+                labels: Tuple[str, str] = ('old', 'new')) -> Dict[str, Any]:
+    """Write delta.kzd and versions.json; returns the versions manifest"""
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    patch, chapters = compute_delta(old, new)
+    patch.update({'from': labels[0], 'to': labels[1]})
+    encoded = encode_delta(patch)
+    (output / DELTA_FILE).write_bytes(encoded)
+
+    manifest = {
+        'from': labels[0],
+        'to': labels[1],
+        'delta_digest': digest(encoded),
+        'files': {op: sum(1 for f in patch['files'] if f['op'] == op) for op in ('add', 'patch', 'replace', 'remove')},
+        'chapters': chapters,
+        'not_bumped': [c['id'] for c in chapters if not c['bumped']],
+        'size': size_report(new, len(encoded)),
+    }
+    (output / VERSIONS_FILE).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    return manifest
+
+
+# ==================== Apply ====================
+
+def apply_delta(delta_path: Path, target: Path) -> Dict[str, int]:
+    """Verify and apply a delta to a content directory in place"""
+    patch = decode_delta(Path(delta_path).read_bytes())
+    target = Path(target)
+
+    writes: Dict[str, bytes] = {}
+    removes: List[str] = []
+    for entry in patch['files']:
+        rel, op = entry['path'], entry['op']
+        path = target / rel
+        current = path.read_bytes() if path.is_file() else None
+        if op == 'add':
+            if current is not None and digest(current) != entry['digest']:
+                raise DeltaError(f"{rel}: exists with different content")
+        elif current is None:
+            raise DeltaError(f"{rel}: missing from target")
+        elif digest(current) != entry['base']:
+            raise DeltaError(f"{rel}: base digest mismatch")
+
+        if op == 'remove':
+            removes.append(rel)
+            continue
+        if 'data' in entry:
+            result = base64.b64decode(entry['data'])
+        elif 'text' in entry:
+            result = entry['text'].encode('utf-8')
+        else:
+            result = apply_line_ops(current.decode('utf-8'), entry['ops']).encode('utf-8')
+        if digest(result) != entry['digest']:
+            raise DeltaError(f"{rel}: result digest mismatch")
+        writes[rel] = result
+
+    # Everything verified: only now touch the tree
+    for rel, data in writes.items():
+        path = target / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    for rel in removes:
+        (target / rel).unlink()
+    return {'written': len(writes), 'removed': len(removes)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Content delta generator and applier")
+    parser.add_argument('--content-dir', type=Path, default=CONTENT_DIR,
+                        help="Content directory (and git repo) used when a side is a revision")
+    sub = parser.add_subparsers(dest='command', required=True)
+    diff = sub.add_parser('diff', help="OLD/NEW are directories or git revisions; NEW defaults to the working tree")
+    diff.add_argument('old')
+    diff.add_argument('new', nargs='?')
+    diff.add_argument('-o', '--output', type=Path, default=DEFAULT_DELTA_DIR)
+    apply = sub.add_parser('apply')
+    apply.add_argument('delta', type=Path)
+    apply.add_argument('target', type=Path)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'diff':
+            old = read_tree(args.old, args.content_dir)
+            new = read_tree(args.new, args.content_dir) if args.new else read_directory(args.content_dir)
+            manifest = write_delta(old, new, args.output, (args.old, args.new or 'working-tree'))
+            size = manifest['size']
+            print(f"{len(manifest['chapters'])} chapters changed, files {manifest['files']}")
+            print(f"delta {size['delta_bytes']:,} B vs full {size['full_bytes']:,} B "
+                  f"({size['full_compressed_bytes']:,} B compressed) -> {args.output}")
+            if manifest['not_bumped']:
+                print(f"⚠️  changed without a version bump: {', '.join(manifest['not_bumped'][:10])}")
+        else:
+            stats = apply_delta(args.delta, args.target)
+            print(f"{stats['written']} written, {stats['removed']} removed")
+    except DeltaError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+__all__ = [
+    'DEFAULT_DELTA_DIR',
+    'DeltaError',
+    'apply_delta',
+    'compute_delta',
+    'read_directory',
+    'read_git_revision',
+    'read_tree',
+    'write_delta',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
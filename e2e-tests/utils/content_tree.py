@@ -0,0 +1,119 @@
+"""
+Content Tree Helpers
+Locating and reading the app's bundled JSON content (kitzur/content)
+"""
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+import json
+import os
+import re
+
+
+# Override with KITZUR_CONTENT_DIR to point the tools at another checkout
+CONTENT_DIR = Path(
+    os.getenv('KITZUR_CONTENT_DIR', Path(__file__).resolve().parents[2] / 'kitzur' / 'content')
+)
+
+# Same directories scanned by kitzur/scripts/generate-chapter-index.js
+CHAPTER_BOOKS = (
+    'chapters',
+    'orach_chaim',
+    'yoreh_deah',
+    'even_haezer',
+    'choshen_mishpat',
+)
+PARSHIOT_DIR = 'parshiot'
+SPECIAL_DIR = 'special'
+
+# File kinds
+KIND_CHAPTER = 'chapter'
+KIND_PARSHA = 'parsha'
+KIND_SPECIAL = 'special'
+
+MANIFEST_FILE = 'manifest.json'
+CHAPTER_IDS_TXT = 'chapter-ids.txt'
+CHAPTER_IDS_TS = 'chapter-ids-only.ts'
+
+
+def iter_content_files(content_dir: Path = CONTENT_DIR) -> Iterator[Tuple[str, str, Path]]:
+    """
+    Yield (kind, book, path) for every content JSON file, in a stable order
+    Chapters first (per book), then parshiot, then special prayers
+    """
+    content_dir = Path(content_dir)
+    for book in CHAPTER_BOOKS:
+        for path in sorted((content_dir / book).glob('*.json')):
+            yield KIND_CHAPTER, book, path
+    for path in sorted((content_dir / PARSHIOT_DIR).glob('*.json')):
+        if path.name != MANIFEST_FILE:
+            yield KIND_PARSHA, PARSHIOT_DIR, path
+    for path in sorted((content_dir / SPECIAL_DIR).glob('*.json')):
+        yield KIND_SPECIAL, SPECIAL_DIR, path
+
+
+def iter_chapter_files(content_dir: Path = CONTENT_DIR) -> Iterator[Tuple[str, Path]]:
+    """Yield (book, path) for chapter files only"""
+    for kind, book, path in iter_content_files(content_dir):
+        if kind == KIND_CHAPTER:
+            yield book, path
+
+
+def load_json(path: Path):
+    """Load a UTF-8 JSON file"""
+    with open(path, 'rb') as f:
+        return json.loads(f.read())
+
+
+def relative_path(path: Path, content_dir: Path = CONTENT_DIR) -> str:
+    """Path relative to the content dir, with forward slashes"""
+    return Path(path).relative_to(content_dir).as_posix()
+
+
+def read_manifest(content_dir: Path = CONTENT_DIR) -> List[str]:
+    """Read chapter IDs from manifest.json"""
+    return list(load_json(Path(content_dir) / MANIFEST_FILE))
+
+
+def read_parshiot_manifest(content_dir: Path = CONTENT_DIR) -> List[str]:
+    """Read parsha file stems from parshiot/manifest.json"""
+    return list(load_json(Path(content_dir) / PARSHIOT_DIR / MANIFEST_FILE)['parshiot'])
+
+
+def read_chapter_ids_txt(content_dir: Path = CONTENT_DIR) -> List[str]:
+    """Read chapter IDs from chapter-ids.txt (one per line)"""
+    text = (Path(content_dir) / CHAPTER_IDS_TXT).read_text(encoding='utf-8')
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def read_registry_ids(content_dir: Path = CONTENT_DIR) -> List[str]:
+    """
+    Read chapter IDs the app registers (chapter-ids-only.ts)
+    This is the list contentLoader.ts iterates in findSectionById/listChapters
+    """
+    text = (Path(content_dir) / CHAPTER_IDS_TS).read_text(encoding='utf-8')
+    return re.findall(r"'([^']+)'", text)
+
+
+def chapter_paths_by_id(content_dir: Path = CONTENT_DIR) -> Dict[str, Path]:
+    """Map chapter ID (file stem) -> path"""
+    return {path.stem: path for _, path in iter_chapter_files(content_dir)}
+
+
+__all__ = [
+    'CONTENT_DIR',
+    'CHAPTER_BOOKS',
+    'PARSHIOT_DIR',
+    'SPECIAL_DIR',
+    'KIND_CHAPTER',
+    'KIND_PARSHA',
+    'KIND_SPECIAL',
+    'iter_content_files',
+    'iter_chapter_files',
+    'load_json',
+    'relative_path',
+    'read_manifest',
+    'read_parshiot_manifest',
+    'read_chapter_ids_txt',
+    'read_registry_ids',
+    'chapter_paths_by_id',
+]
@@ -0,0 +1,510 @@
+"""
+Content Validator
+Checks every JSON file under kitzur/content in one parallel pass
+
+Per-file checks run in a process pool (schema, id vs filename, duplicate
+section IDs, gaps in section numbering, empty text). Cross-file checks run
+once over the collected facts (duplicate IDs across files, manifest.json vs
+chapter-ids.txt vs chapter-ids-only.ts vs files on disk).
+
+Usage:
+    python -m utils.content_validator [--jobs N] [--output findings.json]
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import argparse
+import json
+import os
+import sys
+import time
+
+from utils.content_tree import (
+    CONTENT_DIR,
+    KIND_CHAPTER,
+    KIND_PARSHA,
+    KIND_SPECIAL,
+    iter_content_files,
+    relative_path,
+    read_manifest,
+    read_parshiot_manifest,
+    read_chapter_ids_txt,
+    read_registry_ids,
+)
+
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# Files per worker task; keeps pickling overhead low for ~2,000 small files
+DEFAULT_CHUNK_SIZE = 64
+
+
+@dataclass
+class Finding:
+    """A single validation finding (machine-readable)"""
+    code: str
+    severity: str
+    path: str
+    message: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+
+@dataclass
+class FileFacts:
+    """What one content file contributes to the cross-file checks"""
+    path: str
+    kind: str
+    book: str
+    doc_id: str
+    section_ids: List[str] = field(default_factory=list)
+    item_count: int = 0
+    findings: List[Finding] = field(default_factory=list)
+    text_stats: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FileFacts':
+        data = dict(data)
+        data['findings'] = [Finding(**f) for f in data.get('findings', [])]
+        return cls(**data)
+
+
+@dataclass
+class ValidationReport:
+    """Result of a full validation run"""
+    files: int
+    sections: int
+    findings: List[Finding]
+    elapsed_ms: float
+    rescanned: int = 0
+
+    @property
+    def errors(self) -> List[Finding]:
+        return [f for f in self.findings if f.severity == ERROR]
+
+    @property
+    def warnings(self) -> List[Finding]:
+        return [f for f in self.findings if f.severity == WARNING]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'summary': {
+                'files': self.files,
+                'sections': self.sections,
+                'errors': len(self.errors),
+                'warnings': len(self.warnings),
+                'rescanned': self.rescanned,
+                'elapsed_ms': round(self.elapsed_ms, 1),
+            },
+            'findings': [f.to_dict() for f in self.findings],
+        }
+
+
+# ==================== Per-File Checks ====================
+
+def _check_numbering(numbers: List[int], path: str, label: str) -> List[Finding]:
+    """Numbers must run 1..n with no gaps or repeats"""
+    findings = []
+    seen = set()
+    repeated = sorted({n for n in numbers if n in seen or seen.add(n)})
+    if repeated:
+        findings.append(Finding('duplicate-number', ERROR, path,
+                                f"Repeated {label} numbers: {repeated}"))
+    missing = sorted(set(range(1, len(numbers) + 1)) - seen)
+    if missing:
+        findings.append(Finding('numbering-gap', ERROR, path,
+                                f"Missing {label} numbers: {missing[:20]}"))
+    elif numbers != sorted(numbers):
+        findings.append(Finding('numbering-order', WARNING, path,
+                                f"{label.capitalize()} numbers are out of order"))
+    return findings
+
+
+def _require_str(obj: dict, key: str, path: str, where: str) -> Optional[Finding]:
+    value = obj.get(key)
+    if not isinstance(value, str):
+        return Finding('schema', ERROR, path, f"{where}: '{key}' must be a string")
+    return None
+
+
+def _check_chapter(data: Any, facts: FileFacts, stem: str):
+    path = facts.path
+    if not isinstance(data, dict):
+        facts.findings.append(Finding('schema', ERROR, path, "Chapter must be an object"))
+        return
+
+    for key in ('id', 'chapterLabel', 'title'):
+        finding = _require_str(data, key, path, 'chapter')
+        if finding:
+            facts.findings.append(finding)
+    if 'version' in data and not isinstance(data['version'], int):
+        facts.findings.append(Finding('schema', ERROR, path, "chapter: 'version' must be a number"))
+
+    chapter_id = data.get('id')
+    facts.doc_id = chapter_id if isinstance(chapter_id, str) else stem
+    if chapter_id != stem:
+        facts.findings.append(Finding('id-mismatch', ERROR, path,
+                                      f"Chapter id '{chapter_id}' does not match filename '{stem}'"))
+
+    sections = data.get('sections')
+    if not isinstance(sections, list) or not sections:
+        facts.findings.append(Finding('schema', ERROR, path, "chapter: 'sections' must be a non-empty list"))
+        return
+
+    numbers = []
+    seen_ids = set()
+    for index, section in enumerate(sections):
+        where = f"sections[{index}]"
+        if not isinstance(section, dict):
+            facts.findings.append(Finding('schema', ERROR, path, f"{where} must be an object"))
+            continue
+        for key in ('id', 'text'):
+            finding = _require_str(section, key, path, where)
+            if finding:
+                facts.findings.append(finding)
+        number = section.get('section')
+        if isinstance(number, int) and not isinstance(number, bool):
+            numbers.append(number)
+        else:
+            facts.findings.append(Finding('schema', ERROR, path, f"{where}: 'section' must be a number"))
+
+        section_id = section.get('id')
+        if isinstance(section_id, str):
+            if section_id in seen_ids:
+                facts.findings.append(Finding('duplicate-section-id', ERROR, path,
+                                              f"Section id '{section_id}' appears twice"))
+            seen_ids.add(section_id)
+            facts.section_ids.append(section_id)
+            if not section_id.startswith(f"{facts.doc_id}-"):
+                facts.findings.append(Finding('section-id-prefix', WARNING, path,
+                                              f"Section id '{section_id}' is not prefixed by the chapter id"))
+
+        text = section.get('text')
+        if isinstance(text, str) and not text.strip():
+            facts.findings.append(Finding('empty-text', ERROR, path, f"{where} has empty text"))
+
+    facts.item_count = len(sections)
+    facts.findings.extend(_check_numbering(numbers, path, 'section'))
+
+
+def _check_verses(chapters: Any, facts: FileFacts, where: str):
+    """Parsha-style body: chapters[] of verses[]"""
+    path = facts.path
+    if not isinstance(chapters, list) or not chapters:
+        facts.findings.append(Finding('schema', ERROR, path, f"{where}: 'chapters' must be a non-empty list"))
+        return
+
+    for chapter in chapters:
+        if not isinstance(chapter, dict) or not isinstance(chapter.get('verses'), list):
+            facts.findings.append(Finding('schema', ERROR, path, f"{where}: chapter entry needs 'verses'"))
+            continue
+        label = f"chapter {chapter.get('chapter')}"
+        numbers = [v.get('verseNum') for v in chapter['verses'] if isinstance(v, dict)]
+        if not all(isinstance(n, int) for n in numbers):
+            facts.findings.append(Finding('schema', ERROR, path, f"{label}: 'verseNum' must be a number"))
+        elif numbers and numbers != list(range(numbers[0], numbers[0] + len(numbers))):
+            # Parshiot may start mid-chapter, so only contiguity is required
+            facts.findings.append(Finding('numbering-gap', ERROR, path,
+                                          f"{label}: verse numbers are not contiguous"))
+        for verse in chapter['verses']:
+            if not isinstance(verse, dict):
+                continue
+            hebrew = verse.get('hebrew')
+            if not isinstance(hebrew, str) or not hebrew.strip():
+                facts.findings.append(Finding('empty-text', ERROR, path,
+                                              f"{label}:{verse.get('verseNum')} has empty Hebrew text"))
+            for key in ('targum', 'english'):
+                value = verse.get(key)
+                if value is not None and (not isinstance(value, str) or not value.strip()):
+                    facts.findings.append(Finding('empty-text', WARNING, path,
+                                                  f"{label}:{verse.get('verseNum')} has empty {key}"))
+            facts.item_count += 1
+
+
+def _check_parsha(data: Any, facts: FileFacts, stem: str):
+    if not isinstance(data, dict):
+        facts.findings.append(Finding('schema', ERROR, facts.path, "Parsha must be an object"))
+        return
+    for key in ('name', 'book'):
+        finding = _require_str(data, key, facts.path, 'parsha')
+        if finding:
+            facts.findings.append(finding)
+    facts.doc_id = stem
+    _check_verses(data.get('chapters'), facts, 'parsha')
+
+
+def _check_special(data: Any, facts: FileFacts, stem: str):
+    path = facts.path
+    facts.doc_id = stem
+    if not isinstance(data, dict):
+        facts.findings.append(Finding('schema', ERROR, path, "Special content must be an object"))
+        return
+    finding = _require_str(data, 'name', path, 'special')
+    if finding:
+        facts.findings.append(finding)
+
+    if 'chapters' in data:
+        _check_verses(data['chapters'], facts, 'special')
+        return
+
+    paragraphs = data.get('paragraphs')
+    if not isinstance(paragraphs, list) or not paragraphs:
+        facts.findings.append(Finding('schema', ERROR, path, "special: needs 'paragraphs' or 'chapters'"))
+        return
+    numbers = []
+    for index, paragraph in enumerate(paragraphs):
+        if not isinstance(paragraph, dict):
+            facts.findings.append(Finding('schema', ERROR, path, f"paragraphs[{index}] must be an object"))
+            continue
+        if isinstance(paragraph.get('paragraph'), int):
+            numbers.append(paragraph['paragraph'])
+        body = paragraph.get('text', paragraph.get('parts'))
+        if not body or (isinstance(body, str) and not body.strip()):
+            facts.findings.append(Finding('empty-text', ERROR, path, f"paragraphs[{index}] has no text"))
+    facts.item_count = len(paragraphs)
+    facts.findings.extend(_check_numbering(numbers, path, 'paragraph'))
+
+
+_CHECKERS = {
+    KIND_CHAPTER: _check_chapter,
+    KIND_PARSHA: _check_parsha,
+    KIND_SPECIAL: _check_special,
+}
+
+
+# ==================== Text Stats ====================
+
+HEBREW_LETTERS = [chr(c) for c in range(0x05D0, 0x05EB)]
+NIKUD_MARKS = [chr(c) for c in range(0x0591, 0x05C8)]  # Same range normalize_hebrew strips
+
+
+def _body_texts(kind: str, data: Any) -> List[str]:
+    """The readable text of a file: section text, verse Hebrew, or paragraph text"""
+    if not isinstance(data, dict):
+        return []
+    if kind == KIND_CHAPTER:
+        items = data.get('sections') or []
+        return [s['text'] for s in items if isinstance(s, dict) and isinstance(s.get('text'), str)]
+    if 'chapters' in data:
+        return [
+            v['hebrew']
+            for c in data.get('chapters') or [] if isinstance(c, dict)
+            for v in c.get('verses') or [] if isinstance(v, dict) and isinstance(v.get('hebrew'), str)
+        ]
+    items = data.get('paragraphs') or []
+    return [p['text'] for p in items if isinstance(p, dict) and isinstance(p.get('text'), str)]
+
+
+def text_stats(texts: List[str]) -> Dict[str, int]:
+    """Character, Hebrew letter, nikud/cantillation mark, and word counts"""
+    # str.count per code point is several times faster than a regex scan here
+    text = '\n'.join(texts)
+    return {
+        'chars': len(text),
+        'hebrew_letters': sum(text.count(c) for c in HEBREW_LETTERS),
+        'nikud_marks': sum(text.count(c) for c in NIKUD_MARKS),
+        'words': len(text.split()),
+    }
+
+
+def scan_file(kind: str, book: str, path: Path, content_dir: Path = CONTENT_DIR,
+              with_stats: bool = False) -> FileFacts:
+    """Parse one content file and run its local checks"""
+    path = Path(path)
+    facts = FileFacts(path=relative_path(path, content_dir), kind=kind, book=book, doc_id=path.stem)
+    try:
+        data = json.loads(path.read_bytes())
+    except (ValueError, UnicodeDecodeError) as e:
+        facts.findings.append(Finding('invalid-json', ERROR, facts.path, str(e)))
+        return facts
+    _CHECKERS[kind](data, facts, path.stem)
+    if with_stats:
+        facts.text_stats = text_stats(_body_texts(kind, data))
+    return facts
+
+
+def _scan_batch(batch: List[Tuple[str, str, str]], content_dir: str, with_stats: bool) -> List[FileFacts]:
+    return [scan_file(kind, book, Path(path), Path(content_dir), with_stats) for kind, book, path in batch]
+
+
+def scan_files(entries: List[Tuple[str, str, Path]], content_dir: Path = CONTENT_DIR,
+               jobs: Optional[int] = None, with_stats: bool = False) -> List[FileFacts]:
+    """
+    Scan files in a process pool (jobs=1 scans in-process)
+    Results keep the input order so findings are deterministic
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(entries) < DEFAULT_CHUNK_SIZE:
+        return [scan_file(kind, book, path, content_dir, with_stats) for kind, book, path in entries]
+
+    chunk = max(1, min(DEFAULT_CHUNK_SIZE, len(entries) // (jobs * 2) or 1))
+    batches = [
+        [(kind, book, str(path)) for kind, book, path in entries[i:i + chunk]]
+        for i in range(0, len(entries), chunk)
+    ]
+    facts: List[FileFacts] = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        args = [str(content_dir)] * len(batches), [with_stats] * len(batches)
+        for batch_facts in pool.map(_scan_batch, batches, *args):
+            facts.extend(batch_facts)
+    return facts
+
+
+# ==================== Cross-File Checks ====================
+
+def _list_diff(name_a: str, a: Iterable[str], name_b: str, b: Iterable[str]) -> Optional[str]:
+    a, b = list(a), list(b)
+    if a == b:
+        return None
+    set_a, set_b = set(a), set(b)
+    only_a = [x for x in a if x not in set_b]
+    only_b = [x for x in b if x not in set_a]
+    if not only_a and not only_b:
+        return f"{name_a} and {name_b} list the same IDs in a different order"
+    return (f"{len(only_a)} only in {name_a} {only_a[:5]}, "
+            f"{len(only_b)} only in {name_b} {only_b[:5]}")
+
+
+def check_cross_file(facts: List[FileFacts], content_dir: Path = CONTENT_DIR) -> List[Finding]:
+    """Invariants that need the whole tree"""
+    content_dir = Path(content_dir)
+    findings: List[Finding] = []
+
+    # Duplicate section IDs across files (within-file repeats are reported per file)
+    owners: Dict[str, str] = {}
+    for f in facts:
+        for section_id in dict.fromkeys(f.section_ids):
+            if section_id in owners and owners[section_id] != f.path:
+                findings.append(Finding('duplicate-section-id', ERROR, f.path,
+                                        f"Section id '{section_id}' also defined in {owners[section_id]}"))
+            else:
+                owners[section_id] = f.path
+
+    chapters = [f for f in facts if f.kind == KIND_CHAPTER]
+    by_stem: Dict[str, str] = {}
+    for f in chapters:
+        stem = Path(f.path).stem
+        if stem in by_stem:
+            findings.append(Finding('duplicate-chapter-id', ERROR, f.path,
+                                    f"Chapter '{stem}' also exists at {by_stem[stem]}"))
+        by_stem.setdefault(stem, f.path)
+
+    # manifest.json <-> chapter-ids.txt <-> files on disk
+    manifest = read_manifest(content_dir) if (content_dir / 'manifest.json').exists() else []
+    if (content_dir / 'chapter-ids.txt').exists():
+        diff = _list_diff('manifest.json', manifest, 'chapter-ids.txt', read_chapter_ids_txt(content_dir))
+        if diff:
+            findings.append(Finding('manifest-mismatch', ERROR, 'manifest.json', diff))
+    for chapter_id in manifest:
+        if chapter_id not in by_stem:
+            findings.append(Finding('missing-file', ERROR, 'manifest.json',
+                                    f"Listed chapter '{chapter_id}' has no file on disk"))
+
+    # chapter-ids-only.ts is what the app's loader iterates
+    if (content_dir / 'chapter-ids-only.ts').exists():
+        registry = read_registry_ids(content_dir)
+        registered = set(registry)
+        for chapter_id in registry:
+            if chapter_id not in by_stem:
+                findings.append(Finding('missing-file', ERROR, 'chapter-ids-only.ts',
+                                        f"Registered chapter '{chapter_id}' has no file on disk"))
+        for stem, path in by_stem.items():
+            if stem not in registered:
+                findings.append(Finding('unregistered-file', WARNING, path,
+                                        f"Chapter '{stem}' is not in chapter-ids-only.ts"))
+
+    if (content_dir / 'parshiot' / 'manifest.json').exists():
+        parsha_files = {Path(f.path).stem for f in facts if f.kind == KIND_PARSHA}
+        listed = read_parshiot_manifest(content_dir)
+        for name in listed:
+            if name not in parsha_files:
+                findings.append(Finding('missing-file', ERROR, 'parshiot/manifest.json',
+                                        f"Listed parsha '{name}' has no file on disk"))
+        for name in sorted(parsha_files - set(listed)):
+            findings.append(Finding('unregistered-file', WARNING, f"parshiot/{name}.json",
+                                    f"Parsha '{name}' is not in parshiot/manifest.json"))
+
+    return findings
+
+
+# ==================== Entry Points ====================
+
+def validate_content(content_dir: Path = CONTENT_DIR, jobs: Optional[int] = None,
+                     cache=None) -> ValidationReport:
+    """
+    Validate the whole content tree
+    With a ContentCache, only changed files are parsed; cross-file checks always run globally
+    """
+    start = time.perf_counter()
+    content_dir = Path(content_dir)
+    if cache is not None:
+        facts = cache.refresh(content_dir, jobs)
+        rescanned = len(cache.changed)
+    else:
+        facts = scan_files(list(iter_content_files(content_dir)), content_dir, jobs)
+        rescanned = len(facts)
+    findings = [finding for f in facts for finding in f.findings]
+    findings.extend(check_cross_file(facts, content_dir))
+    return ValidationReport(
+        files=len(facts),
+        sections=sum(len(f.section_ids) for f in facts),
+        findings=findings,
+        elapsed_ms=(time.perf_counter() - start) * 1000,
+        rescanned=rescanned,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate kitzur/content JSON files")
+    parser.add_argument('--content-dir', type=Path, default=CONTENT_DIR)
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--output', type=Path, help="Write findings JSON here instead of stdout")
+    parser.add_argument('--cache', type=Path, nargs='?', const='default',
+                        help="Reuse facts for unchanged files (default: test_data/content_cache.json)")
+    args = parser.parse_args(argv)
+
+    cache = None
+    if args.cache:
+        from utils.content_cache import ContentCache, DEFAULT_CACHE_PATH
+        cache = ContentCache(DEFAULT_CACHE_PATH if str(args.cache) == 'default' else args.cache)
+
+    report = validate_content(args.content_dir, args.jobs, cache)
+    if cache is not None:
+        cache.save()
+    payload = json.dumps(report.to_dict(), ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(payload, encoding='utf-8')
+    else:
+        print(payload)
+
+    summary = report.to_dict()['summary']
+    print(f"{summary['files']} files, {summary['sections']} sections: "
+          f"{summary['errors']} errors, {summary['warnings']} warnings "
+          f"({summary['rescanned']} rescanned) in {summary['elapsed_ms']}ms", file=sys.stderr)
+    return 0 if report.ok else 1
+
+
+__all__ = [
+    'Finding',
+    'FileFacts',
+    'ValidationReport',
+    'scan_file',
+    'scan_files',
+    'check_cross_file',
+    'validate_content',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
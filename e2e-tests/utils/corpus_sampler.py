@@ -0,0 +1,239 @@
+"""
+Corpus Sampler
+Deterministic, stratified section samples for parametrized content tests
+
+Section tests used to pin kitzur_orach_chaim-001-s1; opening all ~15k registered sections
+on every PR is too slow. A test that takes a `corpus_section` argument is parametrized
+(conftest.pytest_generate_tests) with a sample built in two layers:
+
+    strata    a few picks per stratum: each book, first / middle / last section of a
+              chapter, the longest texts, text with parentheses, text with Hebrew
+              abbreviations (עכ"פ / כו'), the chapters with the most sections
+    rotation  the corpus is split into ROTATION_DAYS shards by a stable hash of the section
+              id; day N tests shard N % ROTATION_DAYS, continuing where that shard's
+              previous run stopped, so every section is visited within a week when the
+              budget fits a shard, or within a few weeks when it does not
+
+The budget (CORPUS_SAMPLE_BUDGET_S seconds per parametrized test, divided by the estimated
+seconds per case) caps the case count; strata picks come first, the rotation fills the rest.
+The seed is the day number (CORPUS_SAMPLE_SEED overrides it). The controller pins it in the
+environment, so every xdist worker collects the same ids, even across midnight.
+Chapters come from the registry (chapter-ids-only.ts), which lists every chapter the app
+loads; manifest.json only lists a subset.
+
+Usage:
+    python -m utils.corpus_sampler show [--seed 740000] [--budget 300]
+    python -m utils.corpus_sampler coverage            # corpus share a week of runs covers
+"""
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+import argparse
+import hashlib
+import os
+import random
+import re
+import sys
+
+from utils.content_tree import CONTENT_DIR, chapter_paths_by_id, load_json, read_registry_ids
+
+
+ROTATION_DAYS = 7
+PICKS_PER_STRATUM = 2
+LONGEST_POOL = 50           # the 'longest' stratum draws from the N longest texts
+BIG_CHAPTERS = 5            # the 'big_chapter' stratum draws from the N chapters with the most sections
+DEFAULT_BUDGET_S = 300.0
+DEFAULT_CASE_S = 4.0
+
+STRATA = ('book', 'first', 'middle', 'last', 'longest', 'parens', 'abbrev', 'big_chapter')
+
+# Gershayim between Hebrew letters or a closing geresh: עכ"פ, רמב״ם, ה', וכו׳
+_ABBREVIATION = re.compile(r'[א-ת]["״][א-ת]|[א-ת][\'׳](?![א-ת])')
+
+
+@dataclass(frozen=True)
+class CorpusSection:
+    """One section and the facts the strata are built from"""
+    section_id: str
+    chapter_id: str
+    book: str
+    position: str               # first / middle / last / other within its chapter
+    length: int
+    has_parens: bool
+    has_abbrev: bool
+    chapter_size: int
+    text: str = ''
+
+    def __str__(self) -> str:
+        return self.section_id
+
+
+@dataclass(frozen=True)
+class SampleCase:
+    """A sampled section and the stratum that picked it (used in the test id)"""
+    stratum: str
+    section: CorpusSection
+
+    @property
+    def id(self) -> str:
+        return f"{self.stratum}-{self.section.section_id}"
+
+
+def _position(index: int, size: int) -> str:
+    if index == 0:
+        return 'first'
+    if index == size - 1:
+        return 'last'
+    if index == size // 2:
+        return 'middle'
+    return 'other'
+
+
+def load_corpus(content_dir: Path = CONTENT_DIR) -> List[CorpusSection]:
+    """Every section of every registered chapter, in registry order"""
+    paths = chapter_paths_by_id(content_dir)
+    corpus = []
+    for chapter_id in read_registry_ids(content_dir):
+        path = paths.get(chapter_id)
+        if path is None:
+            continue
+        sections = load_json(path).get('sections', [])
+        for index, section in enumerate(sections):
+            text = section.get('text', '')
+            corpus.append(CorpusSection(
+                section['id'], chapter_id, path.parent.name, _position(index, len(sections)), len(text),
+                '(' in text, bool(_ABBREVIATION.search(text)), len(sections), text,
+            ))
+    return corpus
+
+
+def daily_seed(day: Optional[date] = None) -> int:
+    """Today's seed, or CORPUS_SAMPLE_SEED when set"""
+    override = os.getenv('CORPUS_SAMPLE_SEED')
+    if override:
+        return int(override)
+    return (day or date.today()).toordinal()
+
+
+def shard_of(section_id: str, shards: int = ROTATION_DAYS) -> int:
+    """Stable shard (independent of PYTHONHASHSEED and corpus order)"""
+    return int.from_bytes(hashlib.blake2b(section_id.encode('utf-8'), digest_size=4).digest(), 'big') % shards
+
+
+def strata_pools(corpus: Sequence[CorpusSection]) -> Dict[str, List[CorpusSection]]:
+    """Stratum name -> candidate sections; one 'book:<name>' stratum per book"""
+    pools: Dict[str, List[CorpusSection]] = {}
+    for section in corpus:
+        pools.setdefault(f'book:{section.book}', []).append(section)
+        if section.position != 'other':
+            pools.setdefault(section.position, []).append(section)
+        if section.has_parens:
+            pools.setdefault('parens', []).append(section)
+        if section.has_abbrev:
+            pools.setdefault('abbrev', []).append(section)
+    pools['longest'] = sorted(corpus, key=lambda s: (-s.length, s.section_id))[:LONGEST_POOL]
+    chapters = sorted({(s.chapter_size, s.chapter_id) for s in corpus}, key=lambda c: (-c[0], c[1]))
+    big = {chapter_id for _, chapter_id in chapters[:BIG_CHAPTERS]}
+    pools['big_chapter'] = [s for s in corpus if s.chapter_id in big]
+    return pools
+
+
+def rotation(corpus: Sequence[CorpusSection], seed: int, size: int,
+             days: int = ROTATION_DAYS) -> List[CorpusSection]:
+    """The day's shard, `size` sections starting where the same weekday stopped a week earlier"""
+    shard = sorted((s for s in corpus if shard_of(s.section_id, days) == seed % days),
+                   key=lambda s: shard_of(s.section_id + '#order', 1 << 30))
+    if not shard or size <= 0:
+        return []
+    start = (seed // days) * size % len(shard)
+    return (shard[start:] + shard[:start])[:size]
+
+
+def sample(corpus: Sequence[CorpusSection], seed: int, max_cases: int,
+           strata: Iterable[str] = STRATA, picks: int = PICKS_PER_STRATUM,
+           rotate: bool = True, days: int = ROTATION_DAYS) -> List[SampleCase]:
+    """Stratified picks first, then the day's rotation, up to max_cases distinct sections"""
+    rng = random.Random(seed)
+    wanted = set(strata)
+    cases: List[SampleCase] = []
+    seen = set()
+
+    def _add(stratum: str, section: CorpusSection):
+        if section.section_id not in seen and len(cases) < max_cases:
+            seen.add(section.section_id)
+            cases.append(SampleCase(stratum, section))
+
+    for name, pool in sorted(strata_pools(corpus).items()):
+        if name.split(':')[0] not in wanted:
+            continue
+        if name == 'longest':
+            # The single longest text is in every run; everything else is drawn by the seed
+            _add(name, pool[0])
+        for section in rng.sample(pool, min(len(pool), picks * 3)):
+            if sum(1 for c in cases if c.stratum == name) >= picks:
+                break
+            _add(name, section)
+    if rotate:
+        for section in rotation(corpus, seed, max_cases - len(cases), days):
+            _add(f'day{seed % days}', section)
+    return cases
+
+
+def budget_cases(budget_s: Optional[float] = None, case_s: float = DEFAULT_CASE_S) -> int:
+    budget = budget_s if budget_s is not None else float(os.getenv('CORPUS_SAMPLE_BUDGET_S', DEFAULT_BUDGET_S))
+    return max(1, int(budget // case_s))
+
+
+def week_coverage(corpus: Sequence[CorpusSection], first_seed: int, max_cases: int,
+                  days: int = ROTATION_DAYS) -> float:
+    """Share of the corpus sampled by `days` consecutive daily runs"""
+    covered = set()
+    for offset in range(days):
+        covered.update(c.section.section_id for c in sample(corpus, first_seed + offset, max_cases, days=days))
+    return len(covered) / len(corpus) if corpus else 0.0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stratified section samples for content tests")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--budget', type=float, default=None, help="Seconds per parametrized test")
+    parser.add_argument('--case-seconds', type=float, default=DEFAULT_CASE_S)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('show', help="Print today's sample")
+    sub.add_parser('coverage', help="Corpus share covered by a week of daily seeds")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus()
+    seed = args.seed if args.seed is not None else daily_seed()
+    max_cases = budget_cases(args.budget, args.case_seconds)
+    if args.command == 'coverage':
+        share = week_coverage(corpus, seed, max_cases)
+        biggest = max((sum(1 for s in corpus if shard_of(s.section_id) == d) for d in range(ROTATION_DAYS)), default=0)
+        print(f"{len(corpus)} sections, {max_cases} cases/run: a week of runs from seed {seed} covers {share:.1%}")
+        print(f"full weekly coverage needs about {(biggest + len(STRATA) * PICKS_PER_STRATUM) * args.case_seconds:.0f}s per run")
+        return 0
+    cases = sample(corpus, seed, max_cases)
+    print(f"seed {seed}: {len(cases)} of {len(corpus)} sections")
+    for case in cases:
+        print(f"  {case.stratum:<22} {case.section.section_id:<36} {case.section.length:>6} chars")
+    return 0
+
+
+__all__ = [
+    'CorpusSection',
+    'SampleCase',
+    'STRATA',
+    'budget_cases',
+    'daily_seed',
+    'load_corpus',
+    'rotation',
+    'sample',
+    'shard_of',
+    'strata_pools',
+    'week_coverage',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Flaky Tracker
+Per-test outcome history, flip rates, budgeted reruns and a quarantine lane
+
+Every run appends one outcome per test to test_data/flaky-history.json:
+    P  passed          F  failed (including after its reruns)
+    R  failed, then passed on a rerun in a fresh browser context
+The flip rate is (P/F changes between consecutive runs + R runs) / runs over the last
+HISTORY_WINDOW runs. Failures the circuit breaker classes as infrastructure (the app shell
+timing out, the dev server refusing connections) are not recorded: one outage would otherwise
+add an F to every test that ran.
+
+A failure is rerun when the test is suspected flaky: marked @pytest.mark.flaky, it has flipped
+before, or it failed on a Playwright timeout. Reruns stop after max_reruns per test and once
+the run has spent FLAKY_RERUN_BUDGET_S seconds on reruns. Under xdist the spent time is
+shared: each rerun appends its seconds to reports/flaky-rerun-spent.ndjson and every
+worker checks the total, so the budget holds for the whole run, not per worker. Function-scoped fixtures are
+set up again, so each rerun gets a new context and page. Only the final attempt is reported,
+so a flake that passes on rerun does not count toward --maxfail.
+
+Tests whose flip rate reaches the quarantine threshold over enough runs go to the quarantine
+lane (`--flaky-lane`):
+    all         quarantined tests run as non-strict xfail (default)
+    blocking    quarantined tests are deselected
+    quarantine  only quarantined tests run
+
+Usage:
+    python -m utils.flaky_tracker report      # flip rates, quarantine and time lost
+"""
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import argparse
+import json
+import os
+import sys
+import time
+
+
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parents[1] / 'test_data' / 'flaky-history.json'
+
+HISTORY_WINDOW = 30
+
+PASSED, FAILED, RERUN_PASSED = 'P', 'F', 'R'
+
+RERUN_LEDGER_FILE = 'flaky-rerun-spent.ndjson'
+
+# Failures that look like environment noise rather than a broken assertion
+TIMEOUT_SIGNATURES = ('TimeoutError', 'Timeout ', 'net::ERR_', 'Target page, context or browser has been closed')
+
+
+@dataclass
+class FlakyPolicy:
+    """Thresholds; every field can be overridden from the environment"""
+    rerun_budget_s: float = 120.0
+    max_reruns: int = 1
+    suspect_flip_rate: float = 0.0      # any flip at all makes a failure worth a rerun
+    quarantine_flip_rate: float = 0.3
+    quarantine_min_runs: int = 10
+
+    @classmethod
+    def from_env(cls) -> "FlakyPolicy":
+        return cls(
+            rerun_budget_s=float(os.getenv('FLAKY_RERUN_BUDGET_S', cls.rerun_budget_s)),
+            max_reruns=int(os.getenv('FLAKY_MAX_RERUNS', cls.max_reruns)),
+            quarantine_flip_rate=float(os.getenv('FLAKY_QUARANTINE_FLIP_RATE', cls.quarantine_flip_rate)),
+            quarantine_min_runs=int(os.getenv('FLAKY_QUARANTINE_MIN_RUNS', cls.quarantine_min_runs)),
+        )
+
+
+def flip_rate(outcomes: str) -> float:
+    """Share of runs that flipped: P/F changes between consecutive runs plus in-run R flakes"""
+    if not outcomes:
+        return 0.0
+    settled = outcomes.replace(RERUN_PASSED, PASSED)
+    changes = sum(1 for a, b in zip(settled, settled[1:]) if a != b)
+    return round((changes + outcomes.count(RERUN_PASSED)) / len(outcomes), 3)
+
+
+@dataclass
+class RunRecord:
+    """One test's attempts in this run"""
+    nodeid: str
+    outcome: str
+    attempts: int = 1
+    duration_s: float = 0.0
+    lost_s: float = 0.0                 # failed attempts that were retried, or failures of quarantined tests
+    quarantined: bool = False
+    error: Optional[str] = None
+    infrastructure: bool = False        # failed because the app shell / dev server broke; kept out of history
+
+
+@dataclass
+class FlakyHistory:
+    tests: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_HISTORY_PATH) -> "FlakyHistory":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls(json.loads(path.read_text(encoding='utf-8')).get('tests', {}))
+
+    def save(self, path: Path = DEFAULT_HISTORY_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'tests': self.tests}, ensure_ascii=False, indent=1), encoding='utf-8')
+        return path
+
+    def outcomes(self, nodeid: str) -> str:
+        return self.tests.get(nodeid, {}).get('outcomes', '')
+
+    def flip_rate(self, nodeid: str) -> float:
+        return flip_rate(self.outcomes(nodeid))
+
+    def record(self, runs: Iterable[RunRecord]):
+        for run in runs:
+            if run.infrastructure:
+                continue
+            entry = self.tests.setdefault(run.nodeid, {'outcomes': '', 'lost_s': 0.0, 'reruns': 0})
+            entry['outcomes'] = (entry['outcomes'] + run.outcome)[-HISTORY_WINDOW:]
+            entry['lost_s'] = round(entry['lost_s'] + run.lost_s, 1)
+            entry['reruns'] += run.attempts - 1
+            entry['last_run'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    def quarantined(self, policy: FlakyPolicy) -> Dict[str, float]:
+        """Chronically flaky node ids and their flip rates"""
+        return {
+            nodeid: rate for nodeid, entry in self.tests.items()
+            if len(entry['outcomes']) >= policy.quarantine_min_runs
+            and (rate := flip_rate(entry['outcomes'])) >= policy.quarantine_flip_rate
+        }
+
+
+class RerunGate:
+    """Decides whether a failed attempt is rerun, within the run's rerun budget"""
+
+    def __init__(self, history: FlakyHistory, policy: FlakyPolicy, ledger: Optional[Path] = None):
+        self.history = history
+        self.policy = policy
+        self.ledger = Path(ledger) if ledger else None
+        self._spent_s = 0.0
+
+    @property
+    def spent_s(self) -> float:
+        """Rerun seconds spent by every process sharing the ledger (this process alone without one)"""
+        if self.ledger is None or not self.ledger.exists():
+            return self._spent_s
+        rows = self.ledger.read_text(encoding='utf-8').splitlines()
+        return sum(json.loads(row)['seconds'] for row in rows if row.strip())
+
+    def suspected(self, nodeid: str, flaky_marker: bool, error: Optional[str]) -> bool:
+        if flaky_marker or any(sig in (error or '') for sig in TIMEOUT_SIGNATURES):
+            return True
+        rate = self.history.flip_rate(nodeid)
+        return rate > self.policy.suspect_flip_rate
+
+    def allow(self, nodeid: str, attempt: int, flaky_marker: bool, error: Optional[str],
+              estimate_s: float) -> bool:
+        """Rerun when suspected, under max_reruns, and the next attempt fits the remaining budget"""
+        if attempt > self.policy.max_reruns or not self.suspected(nodeid, flaky_marker, error):
+            return False
+        return self.spent_s + estimate_s <= self.policy.rerun_budget_s
+
+    def charge(self, seconds: float):
+        self._spent_s += seconds
+        if self.ledger is not None:
+            # One short line per O_APPEND write, so concurrent workers do not interleave
+            row = {'worker': os.getenv('PYTEST_XDIST_WORKER', 'main'), 'seconds': round(seconds, 3)}
+            with open(self.ledger, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps(row) + '\n')
+
+
+# ==================== Reports ====================
+
+def write_worker_runs(runs: List[RunRecord], reports_dir: Path, worker: Optional[str] = None) -> Path:
+    path = Path(reports_dir) / f"flaky-runs-{worker or 'main'}.json"
+    path.write_text(json.dumps([asdict(run) for run in runs], ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+def load_worker_runs(reports_dir: Path) -> List[RunRecord]:
+    runs: List[RunRecord] = []
+    for path in sorted(Path(reports_dir).glob('flaky-runs-*.json')):
+        runs.extend(RunRecord(**row) for row in json.loads(path.read_text(encoding='utf-8')))
+    return runs
+
+
+def run_summary(runs: List[RunRecord]) -> Dict[str, Any]:
+    rerun = [r for r in runs if r.attempts > 1]
+    return {
+        'tests': len(runs),
+        'rerun': len(rerun),
+        'passed_on_rerun': sum(1 for r in rerun if r.outcome == RERUN_PASSED),
+        'quarantined_failures': sum(1 for r in runs if r.quarantined and r.outcome == FAILED),
+        'lost_s': round(sum(r.lost_s for r in runs), 1),
+        'run_s': round(sum(r.duration_s for r in runs), 1),
+    }
+
+
+def format_run(runs: List[RunRecord]) -> str:
+    summary = run_summary(runs)
+    share = 100 * summary['lost_s'] / summary['run_s'] if summary['run_s'] else 0.0
+    lines = [f"Flakiness: {summary['rerun']} rerun, {summary['passed_on_rerun']} passed on rerun, "
+             f"{summary['quarantined_failures']} quarantined failure(s); "
+             f"{summary['lost_s']:.1f}s lost ({share:.1f}% of test time)"]
+    for run in sorted(runs, key=lambda r: -r.lost_s)[:10]:
+        if run.lost_s:
+            lines.append(f"  {run.lost_s:6.1f}s  {run.outcome} x{run.attempts}  {run.nodeid}")
+    return '\n'.join(lines)
+
+
+def format_history(history: FlakyHistory, policy: FlakyPolicy, limit: int = 20) -> str:
+    quarantined = history.quarantined(policy)
+    rows = sorted(history.tests.items(), key=lambda kv: (-flip_rate(kv[1]['outcomes']), -kv[1]['lost_s']))
+    lines = [f"{'flip':>6} {'runs':>5} {'lost':>8} {'reruns':>7}  test"]
+    for nodeid, entry in rows[:limit]:
+        rate = flip_rate(entry['outcomes'])
+        if not rate and not entry['lost_s']:
+            break
+        flag = '  [quarantined]' if nodeid in quarantined else ''
+        lines.append(f"{rate:6.2f} {len(entry['outcomes']):5d} {entry['lost_s']:7.1f}s {entry['reruns']:7d}  "
+                     f"{nodeid}  {entry['outcomes'][-15:]}{flag}")
+    total = sum(entry['lost_s'] for entry in history.tests.values())
+    lines.append(f"{len(quarantined)} quarantined; {total:.1f}s lost to flakiness over the recorded window")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Flaky test history")
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    report = sub.add_parser('report', help="Flip rates, quarantine and time lost")
+    report.add_argument('--limit', type=int, default=20)
+    sub.add_parser('quarantine', help="Print quarantined node ids, one per line")
+    args = parser.parse_args(argv)
+
+    history = FlakyHistory.load(args.history)
+    policy = FlakyPolicy.from_env()
+    if args.command == 'quarantine':
+        for nodeid in sorted(history.quarantined(policy)):
+            print(nodeid)
+        return 0
+    print(format_history(history, policy, args.limit))
+    return 0
+
+
+__all__ = [
+    'FAILED',
+    'PASSED',
+    'RERUN_LEDGER_FILE',
+    'RERUN_PASSED',
+    'FlakyHistory',
+    'FlakyPolicy',
+    'RerunGate',
+    'RunRecord',
+    'flip_rate',
+    'format_history',
+    'format_run',
+    'load_worker_runs',
+    'run_summary',
+    'write_worker_runs',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Health Gate
+One boot check before the run, and a circuit breaker shared by every xdist worker
+
+When the app does not boot (Metro compile error, blank screen, dev server down) every
+browser test waits out its 30s timeouts before failing, on every worker; --maxfail only
+stops each worker after ten of those. Two guards stop that early:
+
+    gate      after collection and before the first test, the controller opens the app once
+              (only when a collected test uses the browser): the document loads, no compile
+              error overlay, Hebrew text renders, and each key route renders Hebrew
+    breaker   every infrastructure-class failure (the app shell timing out or refusing the
+              connection) is appended to reports/circuit-breaker.ndjson; once the gate has
+              failed or CIRCUIT_BREAKER_THRESHOLD failures (default 3) are recorded, every
+              worker skips its remaining browser tests with the reason, and the run fails
+
+Pure tests (no page / context / browser fixture) always run.
+
+Usage:
+    python -m utils.health_gate [--base-url http://localhost:8081] [--browser firefox]   # run the gate alone
+"""
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import argparse
+import json
+import os
+import sys
+import time
+
+
+HEALTH_ROUTES = ('/', '/browse', '/section/kitzur_orach_chaim-001-s1')
+
+HEBREW_TEXT = "text=/[א-ת]{5,}/"
+
+BREAKER_FILE = 'circuit-breaker.ndjson'
+
+SKIP_PREFIX = 'Circuit breaker open'
+
+# Fixtures that need the running app; tests using none of them are never skipped
+BROWSER_FIXTURES = ('page', 'context', 'browser', 'async_runner')
+
+# What Metro / the web bundle shows instead of the app
+COMPILE_ERRORS = ('Unable to resolve module', 'Failed to compile', 'SyntaxError:', 'Uncaught Error')
+
+# App shell failures: the server is down or the shell never finished loading
+SHELL_FAILURES = (
+    'net::ERR_CONNECTION_REFUSED',
+    'net::ERR_EMPTY_RESPONSE',
+    'net::ERR_CONNECTION_RESET',
+    'Page.goto: Timeout',
+    'Page.wait_for_load_state: Timeout',
+)
+
+
+@dataclass
+class HealthCheck:
+    name: str
+    ok: bool
+    elapsed_ms: float
+    detail: str = ''
+
+
+@dataclass
+class HealthReport:
+    base_url: str
+    checks: List[HealthCheck] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.checks) and all(check.ok for check in self.checks)
+
+    @property
+    def failed(self) -> Optional[HealthCheck]:
+        return next((check for check in self.checks if not check.ok), None)
+
+    @property
+    def reason(self) -> str:
+        failed = self.failed
+        return f"health gate failed at {failed.name}: {failed.detail}" if failed else ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'base_url': self.base_url, 'ok': self.ok, 'checks': [asdict(check) for check in self.checks]}
+
+    def format(self) -> str:
+        total = sum(check.elapsed_ms for check in self.checks)
+        if self.ok:
+            return f"Health gate passed: {len(self.checks)} checks in {total / 1000:.1f}s ({self.base_url})"
+        failed = self.failed
+        where = f"at {failed.name}: {failed.detail}" if failed else "no checks ran"
+        return f"Health gate FAILED after {total / 1000:.1f}s {where}"
+
+
+def _first_line(error: Exception) -> str:
+    return (str(error).strip().splitlines() or [type(error).__name__])[0][:200]
+
+
+def check_route(page, base_url: str, route: str, timeout_ms: float) -> str:
+    """Load a route and wait for Hebrew text; returns a failure detail or ''"""
+    response = page.goto(base_url.rstrip('/') + route, wait_until='domcontentloaded', timeout=timeout_ms)
+    if response is not None and response.status >= 400:
+        return f"HTTP {response.status} for {route}"
+    try:
+        page.locator(HEBREW_TEXT).first.wait_for(timeout=timeout_ms)
+    except Exception:
+        body = page.locator('body').inner_text(timeout=1000) if page.locator('body').count() else ''
+        overlay = next((sig for sig in COMPILE_ERRORS if sig in body), None)
+        if overlay:
+            return f"compile error on {route}: {body[body.index(overlay):][:160]!r}"
+        return f"no Hebrew text on {route} within {timeout_ms / 1000:.0f}s (blank screen?)"
+    return ''
+
+
+def run_health_gate(base_url: str, routes: Sequence[str] = HEALTH_ROUTES, timeout_ms: Optional[float] = None,
+                    context_args: Optional[Dict[str, Any]] = None, browser_name: str = 'chromium',
+                    launch_args: Optional[Dict[str, Any]] = None) -> HealthReport:
+    """
+    Boot, Hebrew render and key routes in one browser (headless unless launch_args say otherwise);
+    stops at the first failed check
+    """
+    from playwright.sync_api import sync_playwright
+
+    timeout_ms = timeout_ms or float(os.getenv('HEALTH_GATE_TIMEOUT_S', '20')) * 1000
+    report = HealthReport(base_url)
+    started = time.perf_counter()
+
+    def _check(name: str, detail: str):
+        report.checks.append(HealthCheck(name, not detail, round((time.perf_counter() - started) * 1000, 1), detail))
+
+    try:
+        with sync_playwright() as playwright:
+            browser = getattr(playwright, browser_name).launch(**{'headless': True, **(launch_args or {})})
+            try:
+                page = browser.new_context(**(context_args or {'locale': 'he-IL'})).new_page()
+                page_errors: List[str] = []
+                page.on('pageerror', lambda error: page_errors.append(_first_line(error)))
+                for index, route in enumerate(routes):
+                    started = time.perf_counter()
+                    try:
+                        detail = check_route(page, base_url, route, timeout_ms)
+                    except Exception as error:
+                        detail = _first_line(error)
+                    if index == 0 and page_errors and detail:
+                        detail += f" (page error: {page_errors[0]})"
+                    _check('boot' if index == 0 else f'route {route}', detail)
+                    if detail:
+                        break
+            finally:
+                browser.close()
+    except Exception as error:
+        _check('browser launch', _first_line(error))
+    return report
+
+
+def infrastructure_failure(when: str, longrepr: str) -> Optional[str]:
+    """Short reason when a failed report looks like the app shell, not the test, broke"""
+    line = next((line.strip() for line in longrepr.splitlines() if any(sig in line for sig in SHELL_FAILURES)), None)
+    if line:
+        return line[:160]
+    if when == 'setup' and 'TimeoutError' in longrepr:
+        return 'fixture setup timed out loading the app shell'
+    return None
+
+
+class CircuitBreaker:
+    """Infrastructure failures appended to one file that every worker reads"""
+
+    def __init__(self, reports_dir: Path, threshold: Optional[int] = None):
+        self.path = Path(reports_dir) / BREAKER_FILE
+        self.threshold = threshold or int(os.getenv('CIRCUIT_BREAKER_THRESHOLD', '3'))
+        self._reason: Optional[str] = None
+
+    def _append(self, row: Dict[str, Any]):
+        # One short line per O_APPEND write, so concurrent workers do not interleave
+        with open(self.path, 'a', encoding='utf-8') as handle:
+            handle.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+    def record(self, nodeid: str, reason: str):
+        self._append({'nodeid': nodeid, 'reason': reason, 'worker': os.getenv('PYTEST_XDIST_WORKER', 'main')})
+
+    def trip(self, reason: str):
+        self._append({'trip': reason})
+
+    def events(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        return [json.loads(line) for line in self.path.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+    def open_reason(self) -> Optional[str]:
+        """Why the breaker is open, or None; once open it stays open for this process"""
+        if self._reason:
+            return self._reason
+        events = self.events()
+        tripped = next((event['trip'] for event in events if 'trip' in event), None)
+        failures = [event for event in events if 'nodeid' in event]
+        if tripped:
+            self._reason = f"{SKIP_PREFIX}: {tripped}"
+        elif len(failures) >= self.threshold:
+            last = failures[-1]
+            self._reason = (f"{SKIP_PREFIX}: {len(failures)} app shell failures "
+                            f"(threshold {self.threshold}), last {last['nodeid']}: {last['reason']}")
+        return self._reason
+
+    def reset(self):
+        self.path.unlink(missing_ok=True)
+        self._reason = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the app boots and renders Hebrew before a test run")
+    parser.add_argument('--base-url', default=os.getenv('BASE_URL', 'http://localhost:8081'))
+    parser.add_argument('--route', action='append', dest='routes', help="Route to check (repeatable)")
+    parser.add_argument('--browser', default='chromium', choices=('chromium', 'firefox', 'webkit'))
+    parser.add_argument('--browser-channel', default=None, help="e.g. chrome, msedge")
+    args = parser.parse_args(argv)
+
+    launch_args = {'channel': args.browser_channel} if args.browser_channel else None
+    report = run_health_gate(args.base_url, args.routes or HEALTH_ROUTES, browser_name=args.browser,
+                             launch_args=launch_args)
+    for check in report.checks:
+        print(f"  {'ok  ' if check.ok else 'FAIL'} {check.name:<40} {check.elapsed_ms:8.0f}ms  {check.detail}")
+    print(report.format())
+    return 0 if report.ok else 1
+
+
+__all__ = [
+    'BROWSER_FIXTURES',
+    'HEALTH_ROUTES',
+    'SKIP_PREFIX',
+    'CircuitBreaker',
+    'HealthCheck',
+    'HealthReport',
+    'infrastructure_failure',
+    'run_health_gate',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,376 @@
+"""
+JS Coverage
+Precise V8 block coverage of the app's TypeScript, collected per page and merged across workers
+
+With JS_COVERAGE=1 every Chromium page gets Profiler.startPreciseCoverage (block granularity,
+no call counts). When the test ends, each script's executed byte ranges are folded into a
+per-worker CoverageStore as a sorted union of [start, end) intervals. Nothing is written per
+test. At session end each worker writes reports/js-coverage-<worker>.json. The controller
+unions those files, fetches each bundle and its source map once, and marks an original line
+as hit when any of its generated segments overlaps an executed range. Output:
+    reports/js-coverage/lcov.info   (genhtml / IDE / CI upload)
+    reports/js-coverage/index.html  per-file line coverage with annotated sources
+
+Collection time (CDP round trips plus interval folding) is tracked per worker and printed with
+the report, so the nightly job can watch the overhead.
+
+Usage:
+    JS_COVERAGE=1 pytest -m "content or questions or parsha"
+    python -m utils.js_coverage report          # rebuild lcov/HTML from the worker files
+"""
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import argparse
+import html
+import json
+import re
+import sys
+import time
+
+from utils.bundle_analyzer import fetch_text, flatten_map, source_group, source_map_for
+
+
+Interval = Tuple[int, int]
+
+# Loader modules the request-level summary calls out by name
+KEY_SOURCES = (
+    'utils/contentLoader.ts',
+    'utils/parshaLoader.ts',
+    'utils/progress.ts',
+    'utils/questionsFirebase.ts',
+)
+
+# App code only: no packages, no inlined content JSON
+APP_SOURCE = re.compile(r'^(app|components|contexts|hooks|utils|src|config|constants)/.+\.(ts|tsx|js|jsx)$')
+APP_SOURCE_ROOT = Path(__file__).resolve().parents[2] / 'kitzur'
+
+
+# ==================== Intervals ====================
+
+def union(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sorted, non-overlapping union (touching intervals are joined)"""
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract(intervals: List[Interval], holes: List[Interval]) -> List[Interval]:
+    """`intervals` minus `holes`; both sorted and disjoint"""
+    result, i = [], 0
+    for start, end in intervals:
+        while i < len(holes) and holes[i][1] <= start:
+            i += 1
+        j, cursor = i, start
+        while j < len(holes) and holes[j][0] < end:
+            if holes[j][0] > cursor:
+                result.append((cursor, holes[j][0]))
+            cursor = max(cursor, holes[j][1])
+            j += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def overlaps(intervals: List[Interval], start: int, end: int) -> bool:
+    """Whether [start, end) touches any interval of a sorted, disjoint list"""
+    index = bisect_right(intervals, (start, float('inf'))) - 1
+    if index >= 0 and intervals[index][1] > start:
+        return True
+    return index + 1 < len(intervals) and intervals[index + 1][0] < end
+
+
+def executed_ranges(functions: List[Dict[str, Any]]) -> List[Interval]:
+    """
+    Executed byte ranges of one script from Profiler.takePreciseCoverage
+    V8 block ranges nest, and the innermost range covering a byte decides its count: a function
+    that ran can sit inside a block that did not (a hoisted declaration after an early return).
+    Ranges are sorted by start, then by descending end, so each child follows its parent and
+    overrides it for its own span.
+    """
+    ranges = sorted(((r['startOffset'], r['endOffset'], r['count'] > 0) for function in functions
+                     for r in function['ranges']), key=lambda r: (r[0], -r[1]))
+    executed: List[Interval] = []
+    stack: List[Tuple[int, bool]] = []      # (end, ran) of the open ranges, innermost last
+    cursor = 0
+
+    def _paint(upto: int):
+        nonlocal cursor
+        if stack and upto > cursor and stack[-1][1]:
+            executed.append((cursor, upto))
+        cursor = max(cursor, upto)
+
+    for start, end, ran in ranges:
+        while stack and stack[-1][0] <= start:
+            _paint(stack[-1][0])
+            stack.pop()
+        _paint(start)
+        stack.append((end, ran))
+    while stack:
+        _paint(stack[-1][0])
+        stack.pop()
+    return union(executed)
+
+
+# ==================== Collection ====================
+
+class CoverageStore:
+    """Per-process executed intervals by script URL"""
+
+    def __init__(self):
+        self.scripts: Dict[str, List[Interval]] = {}
+        self.pages = 0
+        self.collect_ms = 0.0
+
+    def add(self, url: str, intervals: List[Interval]):
+        current = self.scripts.get(url)
+        self.scripts[url] = union(current + intervals) if current else intervals
+
+    def merge(self, other: "CoverageStore"):
+        for url, intervals in other.scripts.items():
+            self.add(url, intervals)
+        self.pages += other.pages
+        self.collect_ms += other.collect_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'pages': self.pages, 'collect_ms': round(self.collect_ms, 1),
+                'scripts': {url: [list(i) for i in intervals] for url, intervals in self.scripts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CoverageStore":
+        store = cls()
+        store.pages, store.collect_ms = data.get('pages', 0), data.get('collect_ms', 0.0)
+        store.scripts = {url: [tuple(i) for i in intervals] for url, intervals in data['scripts'].items()}
+        return store
+
+    def write(self, reports_dir: Path, worker: Optional[str] = None) -> Path:
+        path = Path(reports_dir) / f"js-coverage-{worker or 'main'}.json"
+        path.write_text(json.dumps(self.to_dict()), encoding='utf-8')
+        return path
+
+    @classmethod
+    def load(cls, reports_dir: Path) -> "CoverageStore":
+        """Union of every worker file in reports_dir"""
+        store = cls()
+        for path in sorted(Path(reports_dir).glob('js-coverage-*.json')):
+            store.merge(cls.from_dict(json.loads(path.read_text(encoding='utf-8'))))
+        return store
+
+
+class JSCoverage:
+    """Precise coverage for the pages it is attached to, folded into a CoverageStore"""
+
+    def __init__(self, store: CoverageStore, script_filter: Callable[[str], bool]):
+        self.store = store
+        self.script_filter = script_filter
+        self._sessions: List[Any] = []
+
+    def attach(self, page) -> "JSCoverage":
+        """Start block coverage on a page; a no-op outside Chromium"""
+        started = time.perf_counter()
+        try:
+            cdp = page.context.new_cdp_session(page)
+        except Exception:
+            return self
+        cdp.send('Profiler.enable')
+        cdp.send('Profiler.startPreciseCoverage', {'callCount': False, 'detailed': True})
+        self._sessions.append(cdp)
+        self.store.pages += 1
+        self.store.collect_ms += (time.perf_counter() - started) * 1000
+        return self
+
+    def collect(self):
+        """Fold every attached page's coverage into the store and close the sessions"""
+        started = time.perf_counter()
+        for cdp in self._sessions:
+            try:
+                result = cdp.send('Profiler.takePreciseCoverage')['result']
+                cdp.send('Profiler.stopPreciseCoverage')
+                cdp.detach()
+            except Exception:
+                continue    # page already closed
+            for script in result:
+                if script['url'] and self.script_filter(script['url']):
+                    self.store.add(script['url'], executed_ranges(script['functions']))
+        self._sessions.clear()
+        self.store.collect_ms += (time.perf_counter() - started) * 1000
+
+
+# ==================== Source Mapping ====================
+
+def _line_starts(code: str) -> List[int]:
+    return [0, *accumulate(len(line) + 1 for line in code.split('\n')[:-1])]
+
+
+def map_lines(code: str, source_map: Dict[str, Any], executed: List[Interval],
+              include: Callable[[str], bool]) -> Dict[str, Dict[int, bool]]:
+    """{source path: {original line (1-based): hit}} for the sources `include` accepts"""
+    starts = _line_starts(code)
+    segments = sorted((line, column, source, original) for line, column, source, original in flatten_map(source_map)
+                      if line < len(starts))
+    files: Dict[str, Dict[int, bool]] = {}
+    groups: Dict[str, Optional[str]] = {}
+    for index, (line, column, source, original) in enumerate(segments):
+        if source is None:
+            continue
+        if source not in groups:
+            path, _ = source_group(source)
+            groups[source] = path if include(path) else None
+        path = groups[source]
+        if path is None:
+            continue
+        start = starts[line] + column
+        following = segments[index + 1] if index + 1 < len(segments) else None
+        line_end = starts[line + 1] - 1 if line + 1 < len(starts) else len(code)
+        end = starts[following[0]] + following[1] if following and following[0] == line else line_end
+        lines = files.setdefault(path, {})
+        hit = end > start and overlaps(executed, start, end)
+        lines[original + 1] = lines.get(original + 1, False) or hit
+    return files
+
+
+def build_line_coverage(store: CoverageStore, fetch: Callable[[str], str] = fetch_text,
+                        include: Callable[[str], bool] = APP_SOURCE.match) -> Dict[str, Dict[int, bool]]:
+    """Map every stored script through its source map and union line hits per source"""
+    files: Dict[str, Dict[int, bool]] = {}
+    for url, executed in sorted(store.scripts.items()):
+        code = fetch(url)
+        source_map = source_map_for(code, url, fetch)
+        if not source_map:
+            continue
+        for path, lines in map_lines(code, source_map, executed, include).items():
+            merged = files.setdefault(path, {})
+            for line, hit in lines.items():
+                merged[line] = merged.get(line, False) or hit
+    return files
+
+
+# ==================== Reports ====================
+
+def summarize(files: Dict[str, Dict[int, bool]]) -> List[Dict[str, Any]]:
+    rows = []
+    for path, lines in sorted(files.items()):
+        hit = sum(lines.values())
+        rows.append({'path': path, 'lines': len(lines), 'hit': hit,
+                     'percent': round(100 * hit / len(lines), 1) if lines else 0.0})
+    return rows
+
+
+def write_lcov(files: Dict[str, Dict[int, bool]], path: Path, root: Path = APP_SOURCE_ROOT) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    records = []
+    for source, lines in sorted(files.items()):
+        body = [f"SF:{root / source}"]
+        body += [f"DA:{line},{int(hit)}" for line, hit in sorted(lines.items())]
+        body += [f"LF:{len(lines)}", f"LH:{sum(lines.values())}", "end_of_record"]
+        records.append('\n'.join(body))
+    path.write_text('\n'.join(records) + '\n', encoding='utf-8')
+    return path
+
+
+def write_html(files: Dict[str, Dict[int, bool]], output_dir: Path, root: Path = APP_SOURCE_ROOT) -> Path:
+    """index.html plus one annotated page per source (when the source is on disk)"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rows = []
+    for row in summarize(files):
+        page = row['path'].replace('/', '__') + '.html'
+        source = root / row['path']
+        lines = files[row['path']]
+        if source.exists():
+            body = ''.join(
+                f"<tr class='{'' if n not in lines else 'hit' if lines[n] else 'miss'}'><td>{n}</td>"
+                f"<td><pre>{html.escape(text)}</pre></td></tr>"
+                for n, text in enumerate(source.read_text(encoding='utf-8').splitlines(), 1)
+            )
+            (output_dir / page).write_text(
+                f"<html><head><meta charset='utf-8'><style>{_CSS}</style></head><body>"
+                f"<h1>{html.escape(row['path'])} ({row['percent']}%)</h1><table>{body}</table></body></html>",
+                encoding='utf-8',
+            )
+        name = f"<a href='{page}'>{html.escape(row['path'])}</a>" if source.exists() else html.escape(row['path'])
+        key = ' class="key"' if row['path'] in KEY_SOURCES else ''
+        rows.append(f"<tr{key}><td>{name}</td><td>{row['hit']}/{row['lines']}</td><td>{row['percent']}%</td></tr>")
+    index = output_dir / 'index.html'
+    index.write_text(
+        f"<html><head><meta charset='utf-8'><style>{_CSS}</style></head><body><h1>App JS coverage</h1>"
+        f"<table><tr><th>Source</th><th>Lines</th><th>%</th></tr>{''.join(rows)}</table></body></html>",
+        encoding='utf-8',
+    )
+    return index
+
+
+_CSS = ("body{font-family:sans-serif}td{padding:0 8px}pre{margin:0}.hit{background:#e6ffec}"
+        ".miss{background:#ffebe9}.key{font-weight:bold}")
+
+
+def format_summary(files: Dict[str, Dict[int, bool]], store: Optional[CoverageStore] = None) -> str:
+    rows = summarize(files)
+    total = sum(r['lines'] for r in rows)
+    hit = sum(r['hit'] for r in rows)
+    lines = [f"App JS coverage: {hit}/{total} lines ({100 * hit / total if total else 0:.1f}%) in {len(rows)} files"]
+    by_path = {r['path']: r for r in rows}
+    for key in KEY_SOURCES:
+        row = by_path.get(key)
+        lines.append(f"  {key:<30} " + (f"{row['percent']:5.1f}% ({row['hit']}/{row['lines']})" if row
+                                        else "not loaded"))
+    if store is not None:
+        per_page = store.collect_ms / store.pages if store.pages else 0.0
+        lines.append(f"Collection: {store.collect_ms:.0f} ms over {store.pages} pages ({per_page:.1f} ms/page)")
+    return '\n'.join(lines)
+
+
+def write_reports(reports_dir: Path, fetch: Callable[[str], str] = fetch_text) -> Optional[str]:
+    """Merge worker files in reports_dir into js-coverage/lcov.info + index.html; returns the summary"""
+    store = CoverageStore.load(reports_dir)
+    if not store.scripts:
+        return None
+    files = build_line_coverage(store, fetch)
+    output = Path(reports_dir) / 'js-coverage'
+    write_lcov(files, output / 'lcov.info')
+    write_html(files, output)
+    return format_summary(files, store)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Merge per-worker JS coverage into lcov and HTML")
+    sub = parser.add_subparsers(dest='command', required=True)
+    report = sub.add_parser('report', help="Rebuild reports/js-coverage from the worker files")
+    report.add_argument('--reports-dir', type=Path, default=Path(__file__).resolve().parents[1] / 'reports')
+    args = parser.parse_args(argv)
+
+    summary = write_reports(args.reports_dir)
+    if summary is None:
+        print(f"No js-coverage-*.json in {args.reports_dir}")
+        return 1
+    print(summary)
+    return 0
+
+
+__all__ = [
+    'CoverageStore',
+    'JSCoverage',
+    'KEY_SOURCES',
+    'build_line_coverage',
+    'executed_ranges',
+    'format_summary',
+    'map_lines',
+    'overlaps',
+    'subtract',
+    'union',
+    'write_html',
+    'write_lcov',
+    'write_reports',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
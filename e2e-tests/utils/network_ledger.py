@@ -0,0 +1,281 @@
+"""
+Network Ledger
+Per-test request accounting: transferred bytes, timing, cache status, initiator and duplicate fetches
+
+In Chromium every page gets a CDP session listening to the Network domain, so sizes are
+the on-the-wire Network.loadingFinished encodedDataLength (headers + compressed body).
+Other browsers fall back to Playwright's request events (counts only, no bytes/cache).
+Tests marked with a route marker are checked against that route's RouteBudget.
+"""
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern
+import html
+import json
+import re
+
+
+ROUTE_MARKERS = ('content', 'questions', 'parsha')
+
+
+@dataclass
+class RouteBudget:
+    """Per-test thresholds; None disables a check"""
+    max_requests: Optional[int] = None
+    max_bytes: Optional[int] = None
+    max_duplicates: Optional[int] = 0
+
+
+# Starting points for the dev server build; tighten as the bundle shrinks
+DEFAULT_ROUTE_BUDGETS: Dict[str, RouteBudget] = {
+    'content': RouteBudget(max_requests=150, max_bytes=12 * 2 ** 20),
+    'questions': RouteBudget(max_requests=250, max_bytes=12 * 2 ** 20),
+    'parsha': RouteBudget(max_requests=150, max_bytes=20 * 2 ** 20),
+}
+
+# URLs that legitimately repeat: Firestore long-polling channels and dev-server hot reload
+DUPLICATE_ALLOWLIST = [
+    r"firestore\.googleapis\.com/.*/Listen/channel",
+    r"/google\.firestore\.v1\.Firestore/",
+    r"localhost:8080/",
+    r"/hot$|/symbolicate$|\.hot-update\.",
+]
+
+
+@dataclass
+class NetworkEntry:
+    """One request as seen by the browser"""
+    url: str
+    method: str = 'GET'
+    resource_type: str = ''
+    status: Optional[int] = None
+    encoded_bytes: Optional[int] = None
+    cache: str = 'network'              # network | memory | disk | service-worker | prefetch
+    duration_ms: Optional[float] = None
+    initiator: str = ''                 # "<type> <url>" of whatever started the request
+    failed: Optional[str] = None
+
+    @property
+    def from_cache(self) -> bool:
+        return self.cache != 'network'
+
+
+class NetworkLedger:
+    """Collects NetworkEntries for every page it is attached to"""
+
+    def __init__(self, duplicate_allowlist: Iterable[str] = DUPLICATE_ALLOWLIST):
+        self.entries: List[NetworkEntry] = []
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._sessions: List[Any] = []
+        self._duplicate_allowlist: List[Pattern] = [re.compile(p) for p in duplicate_allowlist]
+
+    # ==================== Recording ====================
+
+    def attach(self, page) -> "NetworkLedger":
+        """Start recording a page (CDP in Chromium, request events elsewhere)"""
+        try:
+            cdp = page.context.new_cdp_session(page)
+        except Exception:
+            page.on('requestfinished', lambda request: self._from_request(request))
+            page.on('requestfailed', lambda request: self._from_request(request, failed=request.failure or 'failed'))
+            return self
+        cdp.on('Network.requestWillBeSent', self._on_request)
+        cdp.on('Network.responseReceived', self._on_response)
+        cdp.on('Network.requestServedFromCache', self._on_memory_cache)
+        cdp.on('Network.loadingFinished', self._on_finished)
+        cdp.on('Network.loadingFailed', self._on_failed)
+        cdp.send('Network.enable')
+        self._sessions.append(cdp)
+        return self
+
+    def detach(self):
+        """Close CDP sessions; requests still in flight are recorded as unfinished"""
+        for cdp in self._sessions:
+            try:
+                cdp.detach()
+            except Exception:
+                pass
+        self._sessions.clear()
+        for pending in self._pending.values():
+            self.entries.append(self._entry(pending, failed='unfinished'))
+        self._pending.clear()
+
+    def _from_request(self, request, failed: Optional[str] = None):
+        self.entries.append(NetworkEntry(request.url, request.method, request.resource_type, failed=failed))
+
+    @staticmethod
+    def _entry(pending: Dict[str, Any], **extra) -> NetworkEntry:
+        fields = {k: v for k, v in pending.items() if k != 'started'}
+        fields.update(extra)
+        return NetworkEntry(**fields)
+
+    def _on_request(self, params: Dict[str, Any]):
+        url = params['request']['url']
+        if url.startswith('data:'):
+            return
+        request_id = params['requestId']
+        redirect = params.get('redirectResponse')
+        if redirect and request_id in self._pending:
+            # Same requestId continues after a redirect; book the hop that just finished
+            self.entries.append(self._entry(
+                self._pending.pop(request_id),
+                status=redirect.get('status'),
+                encoded_bytes=int(redirect.get('encodedDataLength') or 0),
+            ))
+        initiator = params.get('initiator') or {}
+        initiator_url = initiator.get('url') or next(
+            (frame.get('url') for frame in (initiator.get('stack') or {}).get('callFrames', []) if frame.get('url')), ''
+        )
+        self._pending[request_id] = {
+            'url': url,
+            'method': params['request'].get('method', 'GET'),
+            'resource_type': (params.get('type') or '').lower(),
+            'initiator': f"{initiator.get('type', '')} {initiator_url}".strip(),
+            'started': params.get('timestamp'),
+        }
+
+    def _on_response(self, params: Dict[str, Any]):
+        pending = self._pending.get(params['requestId'])
+        if pending is None:
+            return
+        response = params['response']
+        pending['status'] = response.get('status')
+        if response.get('fromServiceWorker'):
+            pending['cache'] = 'service-worker'
+        elif response.get('fromPrefetchCache'):
+            pending['cache'] = 'prefetch'
+        elif response.get('fromDiskCache'):
+            pending['cache'] = 'disk'
+
+    def _on_memory_cache(self, params: Dict[str, Any]):
+        pending = self._pending.get(params['requestId'])
+        if pending is not None:
+            pending['cache'] = 'memory'
+
+    def _on_finished(self, params: Dict[str, Any]):
+        pending = self._pending.pop(params['requestId'], None)
+        if pending is None:
+            return
+        started = pending.get('started')
+        self.entries.append(self._entry(
+            pending,
+            encoded_bytes=int(params.get('encodedDataLength') or 0),
+            duration_ms=round((params['timestamp'] - started) * 1000, 1) if started is not None else None,
+        ))
+
+    def _on_failed(self, params: Dict[str, Any]):
+        pending = self._pending.pop(params['requestId'], None)
+        if pending is not None:
+            reason = 'canceled' if params.get('canceled') else params.get('errorText', 'failed')
+            self.entries.append(self._entry(pending, failed=reason, encoded_bytes=0))
+
+    # ==================== Analysis ====================
+
+    def duplicates(self) -> Dict[str, int]:
+        """method+URL fetched over the network more than once (allowlisted URLs excluded)"""
+        counts: Dict[str, int] = {}
+        for entry in self.entries:
+            if entry.from_cache or entry.failed or any(p.search(entry.url) for p in self._duplicate_allowlist):
+                continue
+            key = f"{entry.method} {entry.url}"
+            counts[key] = counts.get(key, 0) + 1
+        return {key: count for key, count in counts.items() if count > 1}
+
+    def summary(self) -> Dict[str, Any]:
+        by_type: Dict[str, Dict[str, int]] = {}
+        for entry in self.entries:
+            bucket = by_type.setdefault(entry.resource_type or 'other', {'requests': 0, 'bytes': 0})
+            bucket['requests'] += 1
+            bucket['bytes'] += entry.encoded_bytes or 0
+        duplicates = self.duplicates()
+        return {
+            'requests': len(self.entries),
+            'network_requests': sum(1 for e in self.entries if not e.from_cache),
+            'cache_hits': sum(1 for e in self.entries if e.from_cache),
+            'failed': sum(1 for e in self.entries if e.failed),
+            'bytes': sum(e.encoded_bytes or 0 for e in self.entries),
+            'duplicate_fetches': sum(count - 1 for count in duplicates.values()),
+            'duplicates': duplicates,
+            'by_type': by_type,
+        }
+
+    def violations(self, budget: RouteBudget, label: str = '') -> List[str]:
+        """Human-readable budget failures (empty when within budget)"""
+        summary = self.summary()
+        prefix = f"{label}: " if label else ''
+        checks = [
+            ('requests', summary['requests'], budget.max_requests),
+            ('bytes', summary['bytes'], budget.max_bytes),
+            ('duplicate fetches', summary['duplicate_fetches'], budget.max_duplicates),
+        ]
+        failures = [f"{prefix}{name} {value:,} > {limit:,}" for name, value, limit in checks
+                    if limit is not None and value > limit]
+        if budget.max_duplicates is not None and summary['duplicate_fetches'] > budget.max_duplicates:
+            failures += [f"{prefix}  {count}x {key}" for key, count in summary['duplicates'].items()]
+        return failures
+
+    def format(self, limit: int = 25) -> str:
+        """Summary line plus the heaviest requests"""
+        summary = self.summary()
+        lines = [
+            f"{summary['requests']} requests ({summary['cache_hits']} cached, {summary['failed']} failed), "
+            f"{summary['bytes'] / 1024:,.1f} KiB transferred, {summary['duplicate_fetches']} duplicate fetch(es)"
+        ]
+        for entry in sorted(self.entries, key=lambda e: e.encoded_bytes or 0, reverse=True)[:limit]:
+            size = f"{(entry.encoded_bytes or 0) / 1024:9,.1f} KiB"
+            timing = f"{entry.duration_ms:8.1f} ms" if entry.duration_ms is not None else f"{'-':>11}"
+            lines.append(f"{size} {timing} {entry.cache:<14} {entry.status or '-':>3} {entry.method} {entry.url}")
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'summary': self.summary(), 'entries': [asdict(e) for e in self.entries]}
+
+
+# ==================== Session Summary ====================
+
+def write_worker_summary(rows: List[Dict[str, Any]], reports_dir: Path, worker: Optional[str] = None):
+    """Persist this process's per-test rows as network-<worker>.json"""
+    path = Path(reports_dir) / f"network-{worker or 'main'}.json"
+    path.write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def load_summaries(reports_dir: Path) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for path in sorted(Path(reports_dir).glob('network-*.json')):
+        rows.extend(json.loads(path.read_text(encoding='utf-8')))
+    return rows
+
+
+def summary_html(rows: List[Dict[str, Any]]) -> str:
+    """Per-route totals table for the top of the HTML report"""
+    routes: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        route = routes.setdefault(row.get('route') or '-', {'tests': 0, 'requests': 0, 'bytes': 0,
+                                                            'cache_hits': 0, 'duplicate_fetches': 0, 'over': 0})
+        route['tests'] += 1
+        for key in ('requests', 'bytes', 'cache_hits', 'duplicate_fetches'):
+            route[key] += row['summary'][key]
+        route['over'] += bool(row.get('violations'))
+    body = ''.join(
+        f"<tr><td>{html.escape(name)}</td><td>{r['tests']}</td><td>{r['requests']}</td>"
+        f"<td>{r['bytes'] / 2 ** 20:,.2f}</td><td>{r['cache_hits']}</td><td>{r['duplicate_fetches']}</td>"
+        f"<td>{r['over']}</td></tr>"
+        for name, r in sorted(routes.items())
+    )
+    return (
+        "<h2>Network</h2><table><tr><th>Route</th><th>Tests</th><th>Requests</th><th>MiB</th>"
+        f"<th>Cache hits</th><th>Duplicate fetches</th><th>Over budget</th></tr>{body}</table>"
+    )
+
+
+__all__ = [
+    'DEFAULT_ROUTE_BUDGETS',
+    'DUPLICATE_ALLOWLIST',
+    'NetworkEntry',
+    'NetworkLedger',
+    'ROUTE_MARKERS',
+    'RouteBudget',
+    'load_summaries',
+    'summary_html',
+    'write_worker_summary',
+]
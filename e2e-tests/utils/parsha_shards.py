@@ -0,0 +1,316 @@
+"""
+Parsha Shards
+Split each parsha into per-chapter shards behind a small header index
+
+Every parsha JSON carries all its verses (Hebrew with cantillation, Targum,
+English), so reading the name or chapter list means parsing ~80KB. The build
+stage writes:
+
+    build/parsha-shards/index.json            headers for every parsha
+    build/parsha-shards/<id>/header.json      name, book, per-chapter verse ranges
+    build/parsha-shards/<id>/<chapter>.json   {"chapter": n, "verses": [...]}
+
+ParshaShards reads headers on their own and yields verses lazily, opening a
+chapter shard only when iteration reaches it.
+
+Usage:
+    python -m utils.parsha_shards build [--full]
+    python -m utils.parsha_shards verses bo --chapter 12 --limit 3
+    python -m utils.parsha_shards report
+    python -m utils.parsha_shards compare reports/first-paint-before.json reports/first-paint-after.json
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+
+from utils.content_cache import file_digest
+from utils.content_tree import CONTENT_DIR, KIND_PARSHA, iter_content_files, load_json, read_parshiot_manifest
+
+
+SHARDS_VERSION = 1
+DEFAULT_SHARDS_DIR = Path(__file__).resolve().parents[1] / 'build' / 'parsha-shards'
+INDEX_FILE = 'index.json'
+HEADER_FILE = 'header.json'
+
+
+def shard_name(chapter: int) -> str:
+    return f"{chapter:03d}.json"
+
+
+def _dump(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+# ==================== Build ====================
+
+def split_parsha(parsha_id: str, data: Dict[str, Any], digest: str) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """Return (header, {shard file name: bytes}) for one parsha"""
+    shards: Dict[str, bytes] = {}
+    chapters = []
+    for chapter in data.get('chapters', []):
+        verses = chapter.get('verses', [])
+        name = shard_name(chapter['chapter'])
+        shards[name] = _dump({'chapter': chapter['chapter'], 'verses': verses})
+        chapters.append({
+            'chapter': chapter['chapter'],
+            'verses': len(verses),
+            'first_verse': verses[0]['verseNum'] if verses else None,
+            'last_verse': verses[-1]['verseNum'] if verses else None,
+            'file': name,
+            'bytes': len(shards[name]),
+        })
+    extra = {k: v for k, v in data.items() if k not in ('name', 'book', 'chapters')}
+    header = {
+        'id': parsha_id,
+        'name': data.get('name'),
+        'book': data.get('book'),
+        'digest': digest,
+        'verses': sum(c['verses'] for c in chapters),
+        'chapters': chapters,
+    }
+    if extra:
+        header['extra'] = extra  # Unknown top-level keys survive the round trip
+    return header, shards
+
+
+def _parsha_order(content_dir: Path) -> List[Path]:
+    """Parsha files in manifest order, then any unlisted ones alphabetically"""
+    paths = {path.stem: path for kind, _, path in iter_content_files(content_dir) if kind == KIND_PARSHA}
+    ordered = [paths.pop(pid) for pid in read_parshiot_manifest(content_dir) if pid in paths]
+    return ordered + [paths[pid] for pid in sorted(paths)]
+
+
+def build_parsha_shards(content_dir: Path = CONTENT_DIR, output: Path = DEFAULT_SHARDS_DIR,
+                        incremental: bool = True) -> Dict[str, Any]:
+    """Write shards and headers; unchanged parshiot (same digest) are skipped"""
+    content_dir, output = Path(content_dir), Path(output)
+    previous: Dict[str, Dict[str, Any]] = {}
+    if incremental and (output / INDEX_FILE).exists():
+        index = json.loads((output / INDEX_FILE).read_text(encoding='utf-8'))
+        if index.get('version') == SHARDS_VERSION:
+            previous = {h['id']: h for h in index['parshiot']}
+
+    headers = []
+    rebuilt = []
+    for path in _parsha_order(content_dir):
+        parsha_id = path.stem
+        digest = file_digest(path)
+        cached = previous.get(parsha_id)
+        if cached and cached['digest'] == digest and (output / parsha_id / HEADER_FILE).exists():
+            headers.append(cached)
+            continue
+
+        header, shards = split_parsha(parsha_id, load_json(path), digest)
+        parsha_dir = output / parsha_id
+        parsha_dir.mkdir(parents=True, exist_ok=True)
+        for stale in set(p.name for p in parsha_dir.glob('*.json')) - set(shards) - {HEADER_FILE}:
+            (parsha_dir / stale).unlink()
+        for name, payload in shards.items():
+            (parsha_dir / name).write_bytes(payload)
+        (parsha_dir / HEADER_FILE).write_bytes(_dump(header))
+        headers.append(header)
+        rebuilt.append(parsha_id)
+
+    current = {h['id'] for h in headers}
+    for stale_dir in [p for p in output.glob('*') if p.is_dir() and p.name not in current]:
+        for shard in stale_dir.glob('*.json'):
+            shard.unlink()
+        stale_dir.rmdir()
+
+    output.mkdir(parents=True, exist_ok=True)
+    (output / INDEX_FILE).write_bytes(_dump({'version': SHARDS_VERSION, 'parshiot': headers}))
+    return {'parshiot': len(headers), 'rebuilt': rebuilt}
+
+
+# ==================== Loader ====================
+
+class ParshaShards:
+    """Header lookups and lazy verse iteration over a shard directory"""
+
+    def __init__(self, root: Path = DEFAULT_SHARDS_DIR):
+        self.root = Path(root)
+        self._headers: Dict[str, Dict[str, Any]] = {}
+
+    def ids(self) -> List[str]:
+        """Parsha ids in manifest order"""
+        return [h['id'] for h in self.index()]
+
+    def index(self) -> List[Dict[str, Any]]:
+        """Every header, from the single index file"""
+        data = json.loads((self.root / INDEX_FILE).read_text(encoding='utf-8'))
+        for header in data['parshiot']:
+            self._headers.setdefault(header['id'], header)
+        return data['parshiot']
+
+    def header(self, parsha_id: str) -> Optional[Dict[str, Any]]:
+        """Name, book and chapter ranges, without touching any verse"""
+        if parsha_id not in self._headers:
+            path = self.root / parsha_id / HEADER_FILE
+            if not path.exists():
+                return None
+            self._headers[parsha_id] = json.loads(path.read_text(encoding='utf-8'))
+        return self._headers[parsha_id]
+
+    def load_chapter(self, parsha_id: str, chapter: int) -> Dict[str, Any]:
+        """One chapter shard"""
+        return json.loads((self.root / parsha_id / shard_name(chapter)).read_text(encoding='utf-8'))
+
+    def iter_verses(self, parsha_id: str, chapters: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (chapter, verse); each shard is read when iteration first reaches it"""
+        header = self.header(parsha_id)
+        if header is None:
+            raise KeyError(parsha_id)
+        wanted = set(chapters) if chapters is not None else None
+        for entry in header['chapters']:
+            if wanted is not None and entry['chapter'] not in wanted:
+                continue
+            for verse in self.load_chapter(parsha_id, entry['chapter'])['verses']:
+                yield entry['chapter'], verse
+
+    def load_parsha(self, parsha_id: str) -> Optional[Dict[str, Any]]:
+        """Reassemble the original parsha document"""
+        header = self.header(parsha_id)
+        if header is None:
+            return None
+        data = {'name': header['name'], 'book': header['book']}
+        data.update(header.get('extra', {}))
+        data['chapters'] = [self.load_chapter(parsha_id, entry['chapter']) for entry in header['chapters']]
+        return data
+
+
+# ==================== Reports ====================
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def report(content_dir: Path = CONTENT_DIR, shards_dir: Path = DEFAULT_SHARDS_DIR, repeat: int = 5) -> Dict[str, Any]:
+    """Bytes parsed and time to the header / first verse, whole file vs shards"""
+    shards = ParshaShards(shards_dir)
+    paths = {p.stem: p for p in _parsha_order(content_dir)}
+    ids = [pid for pid in shards.ids() if pid in paths]
+
+    def whole_header():
+        for pid in ids:
+            data = load_json(paths[pid])
+            (data['name'], [c['chapter'] for c in data['chapters']])
+
+    def shard_header():
+        for pid in ids:
+            ParshaShards(shards_dir).header(pid)
+
+    def whole_first_verse():
+        for pid in ids:
+            load_json(paths[pid])['chapters'][0]['verses'][0]
+
+    def shard_first_verse():
+        for pid in ids:
+            next(ParshaShards(shards_dir).iter_verses(pid))
+
+    first_shards = [shards.header(pid)['chapters'][0]['bytes'] for pid in ids if shards.header(pid)['chapters']]
+    return {
+        'parshiot': len(ids),
+        'whole_bytes': sum(paths[pid].stat().st_size for pid in ids),
+        'header_bytes': sum((Path(shards_dir) / pid / HEADER_FILE).stat().st_size for pid in ids),
+        'first_shard_bytes': sum(first_shards),
+        'header_ms': {'whole': _median_ms(whole_header, repeat), 'sharded': _median_ms(shard_header, repeat)},
+        'first_verse_ms': {'whole': _median_ms(whole_first_verse, repeat), 'sharded': _median_ms(shard_first_verse, repeat)},
+    }
+
+
+def load_first_paint(path: Path) -> Dict[str, Any]:
+    """Routes of a first-paint run, including xdist worker files (<stem>-gw*.json) not merged yet"""
+    path = Path(path)
+    routes: Dict[str, Any] = {}
+    for part in [path, *sorted(path.parent.glob(f'{path.stem}-gw*.json'))]:
+        if part.exists():
+            routes.update(json.loads(part.read_text(encoding='utf-8'))['routes'])
+    return routes
+
+
+def merge_first_paint(reports_dir: Path) -> List[Path]:
+    """Fold first-paint-<label>-<worker>.json files into first-paint-<label>.json"""
+    merged = []
+    workers = sorted(Path(reports_dir).glob('first-paint-*-gw*.json'))
+    for label in sorted({re.sub(r'-gw\d+$', '', path.stem)[len('first-paint-'):] for path in workers}):
+        target = Path(reports_dir) / f'first-paint-{label}.json'
+        routes: Dict[str, Any] = {}
+        for path in sorted(target.parent.glob(f'{target.stem}-gw*.json')):
+            routes.update(json.loads(path.read_text(encoding='utf-8'))['routes'])
+            path.unlink()
+        target.write_text(json.dumps({'label': label, 'routes': routes}, ensure_ascii=False, indent=2),
+                          encoding='utf-8')
+        merged.append(target)
+    return merged
+
+
+def compare_first_paint(before: Path, after: Path) -> List[Dict[str, Any]]:
+    """Per-route first-paint deltas between two runs of the parsha performance tests"""
+    runs = [load_first_paint(p) for p in (before, after)]
+    rows = []
+    for route in sorted(set(runs[0]) & set(runs[1])):
+        row = {'route': route}
+        for metric in ('first_contentful_paint_ms', 'first_verse_ms'):
+            old, new = runs[0][route].get(metric), runs[1][route].get(metric)
+            if old is not None and new is not None:
+                row[metric] = {'before': old, 'after': new, 'delta': round(new - old, 1)}
+        rows.append(row)
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-chapter parsha shards")
+    parser.add_argument('--content-dir', type=Path, default=CONTENT_DIR)
+    parser.add_argument('--shards-dir', type=Path, default=DEFAULT_SHARDS_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build')
+    build.add_argument('--full', action='store_true', help="Rewrite every parsha")
+    verses = sub.add_parser('verses')
+    verses.add_argument('parsha_id')
+    verses.add_argument('--chapter', type=int, action='append')
+    verses.add_argument('--limit', type=int, default=5)
+    sub.add_parser('report')
+    compare = sub.add_parser('compare')
+    compare.add_argument('before', type=Path)
+    compare.add_argument('after', type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        stats = build_parsha_shards(args.content_dir, args.shards_dir, incremental=not args.full)
+        print(f"{stats['parshiot']} parshiot, {len(stats['rebuilt'])} rebuilt -> {args.shards_dir}")
+    elif args.command == 'verses':
+        for count, (chapter, verse) in enumerate(ParshaShards(args.shards_dir).iter_verses(args.parsha_id, args.chapter)):
+            if count >= args.limit:
+                break
+            print(f"{chapter}:{verse['verseNum']} {verse['hebrew']}")
+    elif args.command == 'report':
+        print(json.dumps(report(args.content_dir, args.shards_dir), indent=2))
+    else:
+        print(json.dumps(compare_first_paint(args.before, args.after), indent=2))
+    return 0
+
+
+__all__ = [
+    'DEFAULT_SHARDS_DIR',
+    'ParshaShards',
+    'build_parsha_shards',
+    'compare_first_paint',
+    'load_first_paint',
+    'merge_first_paint',
+    'report',
+    'split_parsha',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
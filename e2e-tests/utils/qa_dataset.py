@@ -0,0 +1,418 @@
+"""
+Q&A Dataset
+Deterministic, seedable synthetic questions/answers at 1k-100k+ scale
+
+Records follow the Question type in kitzur/types/questions.ts (plus the
+`createdAt` field subscribeToQuestions() orders by) and are streamed as
+NDJSON. The same seed always produces the same bytes, so a dataset can be
+regenerated instead of committed.
+
+Two stand-in datastores:
+    QuestionStore                   SQLite, answers the subscribeToQuestions() query
+    load_into_firestore_emulator()  batched commits to a local Firestore emulator
+
+Usage:
+    python -m utils.qa_dataset generate --count 100000 --seed 7
+    python -m utils.qa_dataset load-sqlite build/qa-dataset/questions-100000-seed7.ndjson
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python -m utils.qa_dataset load-emulator <file.ndjson>
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import argparse
+import gzip
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+import urllib.request
+
+from utils.test_helpers import get_test_categories
+
+
+DEFAULT_DATASET_DIR = Path(__file__).resolve().parents[1] / 'build' / 'qa-dataset'
+
+# xdist_group for every test that clears or seeds the shared emulator; --dist loadgroup runs them on one worker
+EMULATOR_XDIST_GROUP = 'firestore-emulator'
+SCALES = (1_000, 10_000, 100_000)
+
+# Fixed epoch so output never depends on the wall clock
+DEFAULT_START_MS = int(datetime(2023, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+DEFAULT_SPAN_DAYS = 3 * 365
+
+# get_test_categories() labels -> QuestionCategory keys (types/questions.ts)
+CATEGORY_KEYS = {
+    'כללי': 'other',
+    'שבת': 'shabbat',
+    'כשרות': 'kashrut',
+    'תפילה': 'tefillah',
+    'חגים': 'holidays',
+    'משפחה': 'marriage',
+}
+
+TOPICS = {
+    'other': ['מזוזה', 'ציצית', 'כיבוד הורים', 'לשון הרע', 'מעשר כספים', 'ברית מילה'],
+    'shabbat': ['הדלקת נרות', 'בישול בשבת', 'טלטול מוקצה', 'עירוב', 'הבדלה', 'קידוש', 'שעון שבת'],
+    'kashrut': ['בשר וחלב', 'טבילת כלים', 'בדיקת תולעים', 'הכשרת כלים', 'פת עכו"ם', 'חלב ישראל'],
+    'tefillah': ['תפילת שחרית', 'קריאת שמע', 'תפילה במניין', 'חזרת הש"ץ', 'תפילין', 'ברכות השחר'],
+    'holidays': ['ספירת העומר', 'מצה שמורה', 'סוכה', 'ארבעת המינים', 'מגילה', 'נרות חנוכה'],
+    'marriage': ['שבע ברכות', 'כתובה', 'טהרת המשפחה', 'חינוך ילדים', 'שלום בית', 'פדיון הבן'],
+}
+QUESTION_TEMPLATES = [
+    'האם מותר {topic} {context}?',
+    'מה הדין לגבי {topic} {context}?',
+    'שאלה בעניין {topic}: מה עושים {context}?',
+    'האם צריך להקפיד על {topic} {context}?',
+    'מהו המנהג הנכון ב{topic} {context}?',
+    'שכחתי לגבי {topic} {context}, מה עלי לעשות?',
+]
+CONTEXTS = [
+    'כשאני בדרך', 'בבית חולים', 'כשיש אורחים', 'בחוץ לארץ', 'בזמן מלחמה', 'כשהילדים קטנים',
+    'בבית מלון', 'בעבודה', 'בשעת הדחק', 'לאחר שקיעה', 'קודם עלות השחר', 'בצבא',
+]
+ANSWER_TEMPLATES = [
+    'לפי {book} מותר {topic} {context}, אך טוב להחמיר.',
+    'יש לנהוג כמובא ב{book}; ב{topic} {context} הדין תלוי במנהג המקום.',
+    'אין להקל ב{topic} {context}. עיין ב{book}.',
+    'מעיקר הדין מותר, וכך פסק {book}. המחמיר בעניין {topic} תבוא עליו ברכה.',
+]
+BOOKS = ['קיצור שולחן ערוך', 'שולחן ערוך', 'משנה ברורה', 'ערוך השולחן', 'שמירת שבת כהלכתה']
+TAGS = ['שאלה דחופה', 'מנהג', 'חומרה', 'קולא', 'ספרדים', 'אשכנזים', 'ילדים', 'נשים', 'בריאות', 'נסיעה']
+QUESTION_STATUSES = ['approved'] * 6 + ['pending_review'] * 3 + ['locked', 'rejected']
+ANSWER_SOURCES = ['rabbi', 'rabbi', 'book', 'community']
+
+
+class QADatasetGenerator:
+    """Streams Question-shaped dicts; identical for identical arguments"""
+
+    def __init__(self, seed: int = 0, start_ms: int = DEFAULT_START_MS, span_days: int = DEFAULT_SPAN_DAYS,
+                 answered_ratio: float = 0.6, name_pool: int = 400):
+        self.seed = seed
+        self.start_ms = start_ms
+        self.span_ms = span_days * 86_400_000
+        self.answered_ratio = answered_ratio
+        self.categories = [CATEGORY_KEYS[label] for label in get_test_categories()]
+        self.names = self._names(seed, name_pool)
+
+    @staticmethod
+    def _names(seed: int, count: int) -> List[str]:
+        """Hebrew names from Faker, drawn once so per-record cost stays a random.choice()"""
+        try:
+            from faker import Faker
+        except ImportError:
+            rng = random.Random(seed)
+            first = ['יוסף', 'משה', 'אברהם', 'שרה', 'רחל', 'דוד', 'חנה', 'יעקב', 'מרים', 'אליהו']
+            last = ['כהן', 'לוי', 'מזרחי', 'פרץ', 'ביטון', 'אברהמי', 'פרידמן', 'שפירא']
+            return [f"{rng.choice(first)} {rng.choice(last)}" for _ in range(count)]
+        fake = Faker('he_IL')
+        fake.seed_instance(seed)
+        return [fake.name() for _ in range(count)]
+
+    def questions(self, count: int) -> Iterator[Dict[str, Any]]:
+        """Yield `count` questions, newest-first order not guaranteed (like inserts)"""
+        rng = random.Random(self.seed)
+        rand = rng.random
+
+        # random.choice/randint cost ~10x a bare random(); this loop runs 100k+ times
+        def pick(seq):
+            return seq[int(rand() * len(seq))]
+
+        def below(n):
+            return int(rand() * n)
+
+        categories, names, prefix = self.categories, self.names, f"qa-{self.seed}-"
+        for n in range(count):
+            category = pick(categories)
+            topic = pick(TOPICS[category])
+            context = pick(CONTEXTS)
+            created = self.start_ms + below(self.span_ms)
+            status = pick(QUESTION_STATUSES)
+            views = int(rand() ** 3 * 5000)
+            question: Dict[str, Any] = {
+                'id': f"{prefix}{n:07d}",
+                'question': pick(QUESTION_TEMPLATES).format(topic=topic, context=context),
+                'category': category,
+                'askedBy': f"user-{below(50_000) + 1}" if rand() < 0.7 else 'anonymous',
+                'askedByName': pick(names),
+                'timestamp': created,
+                'createdAt': created,
+                'status': status,
+                'moderationStatus': 'approved' if status in ('approved', 'locked') else pick(('pending', 'flagged')),
+                'minimumApprovalsRequired': 5,
+                'stats': {
+                    'views': views,
+                    'helpful': int(views * rand() * 0.2),
+                    'notHelpful': int(views * rand() * 0.03),
+                    'shares': int(views * rand() * 0.05),
+                },
+                'tags': [tag for tag in TAGS if rand() < 0.15],
+                'relatedQuestions': [f"{prefix}{below(count):07d}" for _ in range(below(3))],
+                'isPrivate': rand() < 0.05,
+                'visibility': 'public',
+            }
+            if status != 'rejected' and rand() < self.answered_ratio:
+                book = pick(BOOKS)
+                question['answer'] = {
+                    'text': pick(ANSWER_TEMPLATES).format(book=book, topic=topic, context=context),
+                    'source': pick(ANSWER_SOURCES),
+                    'status': 'locked' if status == 'locked' else 'approved',
+                    'authorName': pick(names),
+                    'answeredAt': created + 600_000 + below(14 * 86_400_000),
+                    'sources': [{'book': book, 'siman': str(below(221) + 1)}],
+                    'isVerified': rand() < 0.5,
+                    'totalApprovalWeight': below(31),
+                }
+            yield question
+
+
+# ==================== NDJSON ====================
+
+def _open(path: Path, mode: str):
+    path = Path(path)
+    if path.suffix == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=6)
+    return open(path, mode, encoding='utf-8')
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], path: Path, chunk: int = 2000) -> int:
+    """Stream records to NDJSON (gzip if the name ends in .gz); returns the count"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    count = 0
+    buffer: List[str] = []
+    with _open(path, 'w') as f:
+        for record in records:
+            buffer.append(dumps(record))
+            count += 1
+            if len(buffer) >= chunk:
+                f.write('\n'.join(buffer) + '\n')
+                buffer.clear()
+        if buffer:
+            f.write('\n'.join(buffer) + '\n')
+    return count
+
+
+def read_ndjson(path: Path) -> Iterator[Dict[str, Any]]:
+    with _open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def dataset_path(count: int, seed: int, directory: Path = DEFAULT_DATASET_DIR) -> Path:
+    return Path(directory) / f"questions-{count}-seed{seed}.ndjson"
+
+
+def ensure_dataset(count: int, seed: int = 0, directory: Path = DEFAULT_DATASET_DIR) -> Path:
+    """Generate the dataset file once; later calls reuse it"""
+    path = dataset_path(count, seed, directory)
+    if not path.exists():
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        write_ndjson(QADatasetGenerator(seed).questions(count), tmp)
+        os.replace(tmp, path)
+    return path
+
+
+# ==================== Stand-in Datastores ====================
+
+class QuestionStore:
+    """SQLite stand-in for the `questions` collection"""
+
+    def __init__(self, path: str = ':memory:'):
+        self.db = sqlite3.connect(str(path))
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS questions ('
+            ' id TEXT PRIMARY KEY, created_at INTEGER, category TEXT, status TEXT, answered INTEGER, doc TEXT)'
+        )
+        self.db.execute('CREATE INDEX IF NOT EXISTS questions_created ON questions (created_at DESC)')
+
+    def load(self, records: Iterable[Dict[str, Any]], batch: int = 5000) -> int:
+        """Upsert records in batched transactions; returns the count"""
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        total = 0
+        rows = []
+        for record in records:
+            rows.append((record['id'], record['createdAt'], record['category'], record['status'],
+                         int('answer' in record), dumps(record)))
+            if len(rows) >= batch:
+                total += self._insert(rows)
+        total += self._insert(rows)
+        return total
+
+    def _insert(self, rows: list) -> int:
+        count = len(rows)
+        if rows:
+            with self.db:
+                self.db.executemany('INSERT OR REPLACE INTO questions VALUES (?, ?, ?, ?, ?, ?)', rows)
+            rows.clear()
+        return count
+
+    def count(self) -> int:
+        return self.db.execute('SELECT COUNT(*) FROM questions').fetchone()[0]
+
+    def ordered(self, limit: Optional[int] = None, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """subscribeToQuestions(): orderBy('createdAt', 'desc'), no limit unless given"""
+        sql = 'SELECT doc FROM questions'
+        params: list = []
+        if category:
+            sql += ' WHERE category = ?'
+            params.append(category)
+        sql += ' ORDER BY created_at DESC, id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [json.loads(doc) for (doc,) in self.db.execute(sql, params)]
+
+    def close(self):
+        self.db.close()
+
+
+TIMESTAMP_FIELDS = ('createdAt', 'timestamp')
+
+# projectId in kitzur/src/firebase.ts; the app talks to the emulator under it when EXPO_PUBLIC_EMULATOR_HOST is set
+EMULATOR_PROJECT = 'hlacha-app'
+
+
+def emulator_host(host: Optional[str] = None) -> str:
+    return host or os.getenv('FIRESTORE_EMULATOR_HOST', 'localhost:8080')
+
+
+def emulator_reachable(host: Optional[str] = None) -> bool:
+    try:
+        urllib.request.urlopen(f"http://{emulator_host(host)}/", timeout=1).read()
+        return True
+    except Exception:
+        return False
+
+
+def to_firestore_value(value: Any) -> Dict[str, Any]:
+    """Encode a Python value as a Firestore REST Value"""
+    if value is None:
+        return {'nullValue': None}
+    if isinstance(value, bool):
+        return {'booleanValue': value}
+    if isinstance(value, int):
+        return {'integerValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, str):
+        return {'stringValue': value}
+    if isinstance(value, (list, tuple)):
+        return {'arrayValue': {'values': [to_firestore_value(v) for v in value]}}
+    if isinstance(value, dict):
+        return {'mapValue': {'fields': {k: to_firestore_value(v) for k, v in value.items()}}}
+    raise TypeError(f"Unsupported value: {type(value).__name__}")
+
+
+def to_firestore_fields(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Document fields; createdAt/timestamp become Timestamps like serverTimestamp() writes"""
+    fields = {}
+    for key, value in record.items():
+        if key == 'id':
+            continue
+        if key in TIMESTAMP_FIELDS and isinstance(value, int):
+            moment = datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+            fields[key] = {'timestampValue': moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')}
+        else:
+            fields[key] = to_firestore_value(value)
+    return fields
+
+
+def load_into_firestore_emulator(records: Iterable[Dict[str, Any]], host: Optional[str] = None,
+                                 project: str = EMULATOR_PROJECT, batch: int = 500) -> int:
+    """Write records to the Firestore emulator's `questions` collection in batched commits"""
+    host = emulator_host(host)
+    database = f"projects/{project}/databases/(default)"
+    url = f"http://{host}/v1/{database}/documents:commit"
+    total = 0
+    writes: List[Dict[str, Any]] = []
+
+    def _commit():
+        body = json.dumps({'writes': writes}, ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(url, data=body, headers={
+            'Content-Type': 'application/json',
+            'Authorization': 'Bearer owner',  # Emulator admin bypass of security rules
+        })
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+        writes.clear()
+
+    for record in records:
+        writes.append({'update': {
+            'name': f"{database}/documents/questions/{record['id']}",
+            'fields': to_firestore_fields(record),
+        }})
+        total += 1
+        if len(writes) >= batch:
+            _commit()
+    if writes:
+        _commit()
+    return total
+
+
+def clear_firestore_emulator(host: Optional[str] = None, project: str = EMULATOR_PROJECT):
+    """Drop every document in the emulator database (emulator-only endpoint)"""
+    url = f"http://{emulator_host(host)}/emulator/v1/projects/{project}/databases/(default)/documents"
+    with urllib.request.urlopen(urllib.request.Request(url, method='DELETE'), timeout=60) as response:
+        response.read()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetic Q&A dataset generator")
+    sub = parser.add_subparsers(dest='command', required=True)
+    generate = sub.add_parser('generate')
+    generate.add_argument('--count', type=int, default=SCALES[-1])
+    generate.add_argument('--seed', type=int, default=0)
+    generate.add_argument('-o', '--output', type=Path, help="NDJSON path (.gz to compress)")
+    load_sqlite = sub.add_parser('load-sqlite')
+    load_sqlite.add_argument('input', type=Path)
+    load_sqlite.add_argument('--db', default=str(DEFAULT_DATASET_DIR / 'questions.sqlite'))
+    load_emulator = sub.add_parser('load-emulator')
+    load_emulator.add_argument('input', type=Path)
+    load_emulator.add_argument('--host')
+    load_emulator.add_argument('--project', default=EMULATOR_PROJECT)
+    load_emulator.add_argument('--clear', action='store_true', help="Empty the emulator database first")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == 'generate':
+        output = args.output or dataset_path(args.count, args.seed)
+        count = write_ndjson(QADatasetGenerator(args.seed).questions(args.count), output)
+        target = output
+    elif args.command == 'load-sqlite':
+        Path(args.db).parent.mkdir(parents=True, exist_ok=True)
+        store = QuestionStore(args.db)
+        count = store.load(read_ndjson(args.input))
+        store.close()
+        target = args.db
+    else:
+        if args.clear:
+            clear_firestore_emulator(args.host, args.project)
+        count = load_into_firestore_emulator(read_ndjson(args.input), args.host, args.project)
+        target = f"emulator {emulator_host(args.host)}"
+    elapsed = time.perf_counter() - start
+    print(f"{count:,} questions -> {target} in {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f}/s)")
+    return 0
+
+
+__all__ = [
+    'CATEGORY_KEYS',
+    'EMULATOR_XDIST_GROUP',
+    'QADatasetGenerator',
+    'QuestionStore',
+    'SCALES',
+    'clear_firestore_emulator',
+    'emulator_reachable',
+    'ensure_dataset',
+    'load_into_firestore_emulator',
+    'read_ndjson',
+    'to_firestore_fields',
+    'write_ndjson',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
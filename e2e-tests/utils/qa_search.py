@@ -0,0 +1,348 @@
+"""
+Q&A Search Oracle
+Python port of fuzzySearchQuestions (kitzur/app/questions.tsx) with identical scoring
+
+fuzzy_search_naive() is a line-by-line port that re-normalizes every question per
+query word, like the app. QuestionSearchIndex gives the same scores and order from
+per-question token sets plus a shared vocabulary with a bigram lookup, so tests can
+predict the exact result list at 100k questions.
+
+Per query word (words of 2+ chars), scores are:
+    question  exact word 30 | a word contains it / is contained in it 20 | substring 15
+    tags      exact tag or tag word 25 | partial 18
+    answer    exact word 15 | partial 12 | substring 8
+Results need score >= 3 * len(words). More than one exact match adds 5 per exact match.
+
+App quirks the port keeps on purpose:
+- A question without an answer splits '' into [''], and ''.includes(word) is false
+  but word.includes('') is true. So every unanswered question gets the +12 answer
+  partial for every word and always passes the threshold.
+- A word has no whitespace, so "substring of the text" implies "substring of one
+  word". The substring branches (15/8) can therefore never fire.
+
+Usage:
+    python -m utils.qa_search bench --size 100000 --queries 20
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import argparse
+import random
+import re
+import sys
+import time
+import unicodedata
+
+
+_NIKUD = re.compile(r'[\u0591-\u05C7]')
+_FINALS = str.maketrans({'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'})
+# JS \s: ECMAScript WhiteSpace + LineTerminator
+_JS_WS = '\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff'
+_JS_SPLIT = re.compile(f'[{_JS_WS}]+')
+_JS_TRIM = re.compile(f'^[{_JS_WS}]+|[{_JS_WS}]+$')
+
+
+# ==================== App Primitives ====================
+
+def app_normalize(text: Optional[str]) -> str:
+    """normalizeHebrew(text).toLowerCase() from kitzur/utils/hebrewNormalize.ts"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFC', text)
+    text = _NIKUD.sub('', text)
+    text = re.sub(r'[״"]', '״', text)
+    text = re.sub(r"[׳']", '׳', text)
+    return js_trim(text.translate(_FINALS)).lower()
+
+
+def js_trim(text: str) -> str:
+    """String.prototype.trim"""
+    return _JS_TRIM.sub('', text)
+
+
+def js_split(text: str) -> List[str]:
+    """text.split(/\\s+/)"""
+    return _JS_SPLIT.split(text)
+
+
+def _js_length(text: str) -> int:
+    """String.length counts UTF-16 code units"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def query_words(query: str) -> List[str]:
+    return [w for w in js_split(app_normalize(query)) if _js_length(w) > 1]
+
+
+def _answered(question: Dict[str, Any]) -> bool:
+    """!q.answer is false (an empty object is truthy in JS)"""
+    return question.get('answer') is not None
+
+
+def _answer_text(question: Dict[str, Any]) -> str:
+    answer = question.get('answer')
+    return app_normalize(answer.get('text')) if answer else ''
+
+
+# ==================== Naive Port ====================
+
+def score_naive(question: Dict[str, Any], words: Sequence[str]) -> int:
+    """Score of one question, computed exactly like the app does"""
+    normalized_question = app_normalize(question.get('question'))
+    normalized_answer = _answer_text(question)
+    normalized_tags = [app_normalize(t) for t in question.get('tags') or []]
+    score = 0
+    exact_matches = 0
+    for word in words:
+        question_words = js_split(normalized_question)
+        if word in question_words:
+            score += 30
+            exact_matches += 1
+        elif any(word in qw or qw in word for qw in question_words):
+            score += 20
+        elif word in normalized_question:
+            score += 15
+
+        if any(tag == word or word in js_split(tag) for tag in normalized_tags):
+            score += 25
+            exact_matches += 1
+        elif any(word in tag or tag in word for tag in normalized_tags):
+            score += 18
+
+        answer_words = js_split(normalized_answer)
+        if word in answer_words:
+            score += 15
+            exact_matches += 1
+        elif any(word in aw or aw in word for aw in answer_words):
+            score += 12
+        elif word in normalized_answer:
+            score += 8
+    if exact_matches > 1:
+        score += exact_matches * 5
+    return score
+
+
+def fuzzy_search_naive(query: str, questions: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """fuzzySearchQuestions(query, questions)"""
+    if not js_trim(query):
+        return list(questions)
+    words = query_words(query)
+    threshold = len(words) * 3
+    scored = [(q, score_naive(q, words)) for q in questions]
+    # Array.prototype.sort is stable, as is sorted()
+    return [q for q, score in sorted((r for r in scored if r[1] >= threshold), key=lambda r: -r[1])]
+
+
+# ==================== Indexed Port ====================
+
+class QuestionSearchIndex:
+    """Pre-normalized token postings per field; same results as fuzzy_search_naive"""
+
+    # field: (exact score, partial score)
+    FIELDS = {'question': (30, 20), 'tag': (25, 18), 'answer': (15, 12)}
+
+    def __init__(self, questions: Iterable[Dict[str, Any]]):
+        self.questions: List[Dict[str, Any]] = list(questions)
+        # token -> ordinals, per field; tags have whole-tag exact postings and tag-word partial postings
+        self.words: Dict[str, Dict[str, Set[int]]] = {field: {} for field in self.FIELDS}
+        self.whole_tags: Dict[str, Set[int]] = {}
+        self.vocabulary: Set[str] = set()
+        for ordinal, question in enumerate(self.questions):
+            self._add(ordinal, question)
+        # An unanswered question's only answer token is '', a partial match for every word
+        self.unanswered: Set[int] = self.words['answer'].pop('', set())
+        self._bigrams: Dict[str, Set[str]] = {}
+        for token in self.vocabulary:
+            for i in range(len(token) - 1):
+                self._bigrams.setdefault(token[i:i + 2], set()).add(token)
+
+    def _post(self, field: str, token: str, ordinal: int):
+        self.words[field].setdefault(token, set()).add(ordinal)
+        self.vocabulary.add(token)
+
+    def _add(self, ordinal: int, question: Dict[str, Any]):
+        for token in js_split(app_normalize(question.get('question'))):
+            self._post('question', token, ordinal)
+        for token in js_split(_answer_text(question)):
+            self._post('answer', token, ordinal)
+        for tag in question.get('tags') or []:
+            tag = app_normalize(tag)
+            self.whole_tags.setdefault(tag, set()).add(ordinal)
+            self.vocabulary.add(tag)
+            for token in js_split(tag):
+                self._post('tag', token, ordinal)
+
+    def _related_tokens(self, word: str) -> Set[str]:
+        """Vocabulary tokens that contain `word` or are contained in it"""
+        grams = [word[i:i + 2] for i in range(len(word) - 1)]
+        candidates = set.intersection(*(self._bigrams.get(g, set()) for g in grams)) if grams else set(self.vocabulary)
+        related = {token for token in candidates if word in token}
+        related.update(
+            sub for sub in {word[i:j] for i in range(len(word)) for j in range(i, len(word) + 1)}
+            if sub in self.vocabulary
+        )
+        return related
+
+    def scores(self, words: Sequence[str]) -> Dict[int, int]:
+        """ordinal -> score for every question scoring above zero"""
+        totals: Dict[int, int] = {}
+        exact_counts: Dict[int, int] = {}
+        for word in words:
+            related = self._related_tokens(word)
+            for field, (exact_score, partial_score) in self.FIELDS.items():
+                postings = self.words[field]
+                if field == 'tag':
+                    exact = set(self.whole_tags.get(word, ())) | postings.get(word, set())
+                    # Partial tag match compares whole tags, but a space-free word is inside a tag iff it is inside one of its words
+                    partial = set().union(*(self.whole_tags.get(t, ()) for t in related),
+                                          *(postings.get(t, ()) for t in related if word in t))
+                else:
+                    exact = postings.get(word, set())
+                    partial = set().union(*(postings.get(t, ()) for t in related))
+                for ordinal in exact:
+                    totals[ordinal] = totals.get(ordinal, 0) + exact_score
+                    exact_counts[ordinal] = exact_counts.get(ordinal, 0) + 1
+                for ordinal in partial - exact:
+                    totals[ordinal] = totals.get(ordinal, 0) + partial_score
+        for ordinal, count in exact_counts.items():
+            if count > 1:
+                totals[ordinal] += count * 5
+        baseline = self.FIELDS['answer'][1] * len(words)
+        for ordinal in self.unanswered:
+            totals[ordinal] = totals.get(ordinal, 0) + baseline
+        return totals
+
+    def _hits(self, query: str) -> Tuple[List[int], Dict[int, int]]:
+        if not js_trim(query):
+            return list(range(len(self.questions))), {}
+        words = query_words(query)
+        if not words:
+            return list(range(len(self.questions))), {}
+        threshold = len(words) * 3
+        totals = self.scores(words)
+        hits = sorted(ordinal for ordinal, score in totals.items() if score >= threshold)
+        # Stable: equal scores keep the input order, like Array.prototype.sort
+        hits.sort(key=totals.__getitem__, reverse=True)
+        return hits, totals
+
+    def ranked(self, query: str) -> List[Tuple[Dict[str, Any], int]]:
+        """(question, score) in the app's result order"""
+        hits, totals = self._hits(query)
+        return [(self.questions[ordinal], totals.get(ordinal, 0)) for ordinal in hits]
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """fuzzySearchQuestions(query, questions)"""
+        hits, _ = self._hits(query)
+        questions = self.questions
+        return [questions[ordinal] for ordinal in hits]
+
+    def displayed(self, query: str = '', category: str = 'all', unanswered_only: bool = False) -> List[Dict[str, Any]]:
+        """What applyAllFilters renders: filtered search results, unanswered first, then newest first"""
+        # Scores are per question, so filtering after the search keeps the same set as filtering before it
+        results = [
+            q for q in self.search(query)
+            if (category == 'all' or q.get('category') == category) and not (unanswered_only and _answered(q))
+        ]
+        return sorted(results, key=lambda q: (_answered(q), -q.get('timestamp', 0)))
+
+
+# ==================== Benchmark ====================
+
+def sample_queries(questions: Sequence[Dict[str, Any]], count: int, seed: int = 0) -> List[str]:
+    """One- to three-word queries drawn from question text, tags and answers, some truncated to prefixes"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        question = rng.choice(questions)
+        pool = (question.get('question') or '').split() + list(question.get('tags') or [])
+        words = rng.sample(pool, min(len(pool), rng.randint(1, 3)))
+        words = [w[:max(2, len(w) - 1)] if rng.random() < 0.3 else w for w in words]
+        queries.append(' '.join(words))
+    return queries
+
+
+def benchmark(questions: Sequence[Dict[str, Any]], queries: Sequence[str], naive_queries: Optional[int] = None
+              ) -> Dict[str, Any]:
+    """Per-query ms of the naive port and the index (plus index build time); checks they agree"""
+    start = time.perf_counter()
+    index = QuestionSearchIndex(questions)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def _timed(fn, query):
+        start = time.perf_counter()
+        result = fn(query)
+        return (time.perf_counter() - start) * 1000, result
+
+    naive_ms, index_ms, mismatches = [], [], []
+    for position, query in enumerate(queries):
+        elapsed, indexed = _timed(index.search, query)
+        index_ms.append(elapsed)
+        if naive_queries is None or position < naive_queries:
+            elapsed, naive = _timed(lambda q: fuzzy_search_naive(q, questions), query)
+            naive_ms.append(elapsed)
+            if [q['id'] for q in naive] != [q['id'] for q in indexed]:
+                mismatches.append(query)
+
+    def _stats(values: List[float]) -> Dict[str, float]:
+        ordered = sorted(values)
+        return {
+            'queries': len(ordered),
+            'p50_ms': round(ordered[len(ordered) // 2], 2) if ordered else None,
+            'max_ms': round(ordered[-1], 2) if ordered else None,
+        }
+
+    return {
+        'questions': len(questions),
+        'index_build_ms': round(build_ms, 1),
+        'naive': _stats(naive_ms),
+        'index': _stats(index_ms),
+        'mismatches': mismatches,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Q&A search oracle")
+    sub = parser.add_subparsers(dest='command', required=True)
+    bench = sub.add_parser('bench', help="Naive port vs token index latency on generated questions")
+    bench.add_argument('--size', type=int, default=100_000)
+    bench.add_argument('--queries', type=int, default=20)
+    bench.add_argument('--naive-queries', type=int, default=5, help="Naive port is slow; time only the first N")
+    bench.add_argument('--seed', type=int, default=0)
+    search = sub.add_parser('search', help="Rank a generated dataset for one query")
+    search.add_argument('query')
+    search.add_argument('--size', type=int, default=1000)
+    search.add_argument('--seed', type=int, default=0)
+    search.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    from utils.qa_dataset import QADatasetGenerator
+
+    questions = list(QADatasetGenerator(args.seed).questions(args.size))
+    if args.command == 'search':
+        for question, score in QuestionSearchIndex(questions).ranked(args.query)[:args.limit]:
+            print(f"{score:4d}  {question['id']}  {question['question']}")
+        return 0
+
+    result = benchmark(questions, sample_queries(questions, args.queries, args.seed), args.naive_queries)
+    print(f"{result['questions']:,} questions, index built in {result['index_build_ms']:,.0f} ms")
+    for name in ('naive', 'index'):
+        stats = result[name]
+        print(f"  {name:<6} p50 {stats['p50_ms']:>10,.2f} ms   max {stats['max_ms']:>10,.2f} ms   ({stats['queries']} queries)")
+    if result['mismatches']:
+        print(f"❌ {len(result['mismatches'])} queries ranked differently: {result['mismatches'][:5]}")
+        return 1
+    return 0
+
+
+__all__ = [
+    'QuestionSearchIndex',
+    'app_normalize',
+    'benchmark',
+    'fuzzy_search_naive',
+    'js_split',
+    'query_words',
+    'sample_queries',
+    'score_naive',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Scale Benchmark
+Scaling curves and fitted complexity estimates for size-parametrized benchmarks
+
+Each measurement is one NDJSON line {"benchmark", "size", "metrics": {...}},
+appended as tests run so xdist workers can share a file. fit_complexity()
+regresses every metric against the usual growth models and reports the best
+fit, plus the log-log slope (empirical exponent).
+
+Usage:
+    python -m utils.scale_bench fit reports/questions-scale.ndjson
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+import argparse
+import json
+import math
+import os
+import sys
+
+
+MODELS: Dict[str, Callable[[float], float]] = {
+    'O(1)': lambda n: 1.0,
+    'O(log n)': lambda n: math.log(n),
+    'O(n)': lambda n: float(n),
+    'O(n log n)': lambda n: n * math.log(n),
+    'O(n^2)': lambda n: float(n) ** 2,
+}
+
+
+def _linear_fit(xs: Sequence[float], ys: Sequence[float]):
+    """Least squares y = a + b*x; returns (a, b)"""
+    count = len(xs)
+    mean_x, mean_y = sum(xs) / count, sum(ys) / count
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return mean_y, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    return mean_y - slope * mean_x, slope
+
+
+def fit_complexity(sizes: Sequence[float], values: Sequence[float]) -> Dict[str, Any]:
+    """
+    Fit y = a + b*f(n) for each model and pick the lowest relative error
+    A negative b (cost shrinking with size) disqualifies a model, so noise on flat curves lands on O(1)
+    """
+    points = sorted((float(n), float(y)) for n, y in zip(sizes, values) if n > 0 and y is not None)
+    if len(points) < 2:
+        return {'model': None, 'points': len(points)}
+    ns, ys = [p[0] for p in points], [p[1] for p in points]
+    scale = max(abs(y) for y in ys) or 1.0
+
+    fits = {}
+    for name, model in MODELS.items():
+        xs = [model(n) for n in ns]
+        if name == 'O(1)':
+            a, b = sum(ys) / len(ys), 0.0
+        else:
+            a, b = _linear_fit(xs, ys)
+            if b < 0:
+                continue
+        rms = math.sqrt(sum((a + b * x - y) ** 2 for x, y in zip(xs, ys)) / len(ys))
+        fits[name] = {'a': a, 'b': b, 'rel_error': round(rms / scale, 4)}
+
+    # Prefer the simpler model unless a more complex one is clearly better
+    best = 'O(1)'
+    for name in MODELS:
+        if name in fits and fits[name]['rel_error'] < fits[best]['rel_error'] * 0.8:
+            best = name
+
+    exponent = None
+    if all(y > 0 for y in ys) and len(set(ns)) > 1:
+        exponent = round(_linear_fit([math.log(n) for n in ns], [math.log(y) for y in ys])[1], 3)
+    return {'model': best, 'exponent': exponent, 'points': len(points), 'fits': fits}
+
+
+# ==================== Recording ====================
+
+def record(path: Path, benchmark: str, size: int, metrics: Dict[str, Any]):
+    """Append one measurement (a single write, so concurrent workers don't interleave lines)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps({'benchmark': benchmark, 'size': size, 'metrics': metrics, 'pid': os.getpid()}) + '\n'
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(line)
+
+
+def load(path: Path) -> List[Dict[str, Any]]:
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def scaling_curves(rows: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """benchmark -> metric -> {size: median value, fit}"""
+    samples: Dict[str, Dict[str, Dict[int, List[float]]]] = {}
+    for row in rows:
+        for metric, value in row['metrics'].items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                samples.setdefault(row['benchmark'], {}).setdefault(metric, {}).setdefault(row['size'], []).append(value)
+
+    curves: Dict[str, Dict[str, Any]] = {}
+    for benchmark, metrics in samples.items():
+        for metric, by_size in metrics.items():
+            medians = {size: sorted(vals)[len(vals) // 2] for size, vals in sorted(by_size.items())}
+            curves.setdefault(benchmark, {})[metric] = {
+                'points': medians,
+                'fit': fit_complexity(list(medians), list(medians.values())),
+            }
+    return curves
+
+
+def format_curves(curves: Dict[str, Dict[str, Any]]) -> str:
+    lines = []
+    for benchmark, metrics in curves.items():
+        sizes = sorted({size for m in metrics.values() for size in m['points']})
+        lines.append(f"{benchmark}")
+        lines.append(f"  {'metric':<24}" + ''.join(f"{size:>12,}" for size in sizes) + f"  {'fit':<11}exp")
+        for metric, curve in metrics.items():
+            cells = ''.join(
+                f"{curve['points'][size]:>12,.1f}" if size in curve['points'] else f"{'-':>12}" for size in sizes
+            )
+            fit = curve['fit']
+            lines.append(f"  {metric:<24}{cells}  {fit['model'] or '-':<11}{fit.get('exponent')}")
+    return '\n'.join(lines)
+
+
+def write_summary(ndjson_path: Path, output: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    """Fit every curve in an NDJSON log and write <name>.json next to it"""
+    curves = scaling_curves(load(ndjson_path))
+    output = Path(output) if output else Path(ndjson_path).with_suffix('.json')
+    output.write_text(json.dumps(curves, indent=2), encoding='utf-8')
+    return curves
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fit scaling curves from benchmark measurements")
+    sub = parser.add_subparsers(dest='command', required=True)
+    fit = sub.add_parser('fit')
+    fit.add_argument('input', type=Path)
+    fit.add_argument('-o', '--output', type=Path)
+    args = parser.parse_args(argv)
+
+    print(format_curves(write_summary(args.input, args.output)))
+    return 0
+
+
+__all__ = [
+    'MODELS',
+    'fit_complexity',
+    'format_curves',
+    'load',
+    'record',
+    'scaling_curves',
+    'write_summary',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""
+Scroll Probe
+List virtualization and scroll-smoothness measurements for long lists and pages
+
+For a row selector the probe reports how many rows are mounted in the DOM
+versus how many the list logically holds, runs a programmatic fling on the
+list's scroll container while sampling requestAnimationFrame, and (Chromium)
+captures a devtools.timeline trace to total Layout and Recalculate Style time.
+Results are checked against a per-list ListBudget.
+
+SmoothScroller drives real input instead: wheel steps or a synthesized touch
+gesture at a realistic velocity, while an in-page recorder collects rAF
+intervals and long tasks for FPS percentiles and the janky-frame ratio.
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+import json
+import time
+
+
+FRAME_MS = 1000 / 60
+# Intervals longer than this count as a missed vsync
+DROPPED_FRAME_FACTOR = 1.5
+LAYOUT_EVENTS = ('Layout',)
+STYLE_EVENTS = ('UpdateLayoutTree', 'RecalculateStyles', 'ScheduleStyleRecalculation')
+TRACE_CATEGORIES = ['devtools.timeline', 'disabled-by-default-devtools.timeline']
+
+
+# Row counts relative to the viewport of the row's scroll container
+ROW_COUNTS_JS = """
+selector => {
+  const rows = Array.from(document.querySelectorAll(selector));
+  const height = window.innerHeight;
+  const visible = rows.filter(r => { const b = r.getBoundingClientRect(); return b.bottom > 0 && b.top < height; });
+  return { mounted: rows.length, visible: visible.length };
+}
+"""
+
+# Nearest ancestor that actually scrolls; Expo Router web keeps body overflow hidden and
+# scrolls content inside a ScrollView div
+SCROLLABLE_JS = """el => {
+    for (let node = el; node; node = node.parentElement) {
+      const style = getComputedStyle(node);
+      if (/(auto|scroll)/.test(style.overflowY) && node.scrollHeight > node.clientHeight) return node;
+    }
+    return document.scrollingElement;
+  }"""
+
+# Decelerating fling on the nearest scrollable ancestor, sampling every rAF
+FLING_JS = """
+async ({ selector, velocity, friction, maxMs }) => {
+  const row = document.querySelector(selector);
+  const scrollable = %s;
+  const target = row ? scrollable(row) : document.scrollingElement;
+  const startTop = target.scrollTop;
+  const intervals = [];
+  let v = velocity, last = performance.now(), begin = last;
+  await new Promise(resolve => {
+    const step = now => {
+      const dt = now - last;
+      intervals.push(dt);
+      last = now;
+      target.scrollTop += v * dt / 1000;
+      v *= Math.pow(friction, dt / 16.67);
+      const atEnd = target.scrollTop + target.clientHeight >= target.scrollHeight - 1;
+      if (Math.abs(v) < 50 || atEnd || now - begin > maxMs) resolve(); else requestAnimationFrame(step);
+    };
+    requestAnimationFrame(now => { last = now; begin = now; requestAnimationFrame(step); });
+  });
+  return { intervals, distance: target.scrollTop - startTop, duration: last - begin };
+}
+""" % SCROLLABLE_JS
+
+# The element wheel/touch input should land on: the scrollable ancestor of `selector`, or else
+# whichever element (or the document) has the most scroll left. It is tagged so the distance
+# actually scrolled can be read back; x/y is the centre of its on-screen box.
+SCROLL_TARGET_JS = """
+(selector) => {
+  const scrollable = %s;
+  const remaining = el => el.scrollHeight - el.clientHeight - el.scrollTop;
+  const anchor = selector && document.querySelector(selector);
+  let target = anchor ? scrollable(anchor) : null;
+  if (!target || target === document.scrollingElement) {
+    const candidates = Array.from(document.querySelectorAll('*')).filter(node => {
+      const box = node.getBoundingClientRect();
+      return box.width > 0 && box.height > 0 && /(auto|scroll)/.test(getComputedStyle(node).overflowY);
+    });
+    target = [document.scrollingElement, ...candidates].reduce((a, b) => remaining(b) > remaining(a) ? b : a);
+  }
+  document.querySelectorAll('[data-kz-scroll-target]').forEach(el => el.removeAttribute('data-kz-scroll-target'));
+  target.setAttribute('data-kz-scroll-target', '');
+  const whole = target === document.scrollingElement;
+  const box = whole ? { left: 0, top: 0, right: innerWidth, bottom: innerHeight } : target.getBoundingClientRect();
+  const top = Math.max(0, box.top), bottom = Math.min(innerHeight, box.bottom);
+  const left = Math.max(0, box.left), right = Math.min(innerWidth, box.right);
+  return {
+    remaining: Math.max(0, Math.round(remaining(target))),
+    scroll_top: target.scrollTop,
+    x: (left + right) / 2,
+    y: (top + bottom) / 2,
+    touch_y: top + (bottom - top) * 0.75,
+  };
+}
+""" % SCROLLABLE_JS
+
+SCROLL_TOP_JS = "() => { const el = document.querySelector('[data-kz-scroll-target]'); return el ? el.scrollTop : 0; }"
+
+
+# Records every rAF interval and long task until collected
+FRAME_RECORDER_JS = """
+() => {
+  const rec = window.__kzFrameRecorder = { intervals: [], longTasks: [], running: true };
+  let last = null;
+  const tick = now => {
+    if (!rec.running) return;
+    if (last !== null) rec.intervals.push(now - last);
+    last = now;
+    requestAnimationFrame(tick);
+  };
+  requestAnimationFrame(tick);
+  try {
+    rec.observer = new PerformanceObserver(list => {
+      for (const e of list.getEntries()) rec.longTasks.push(e.duration);
+    });
+    rec.observer.observe({ type: 'longtask' });
+  } catch (e) {}
+}
+"""
+
+FRAME_COLLECT_JS = """
+() => {
+  const rec = window.__kzFrameRecorder;
+  if (!rec) return { intervals: [], longTasks: [] };
+  rec.running = false;
+  if (rec.observer) rec.observer.disconnect();
+  return { intervals: rec.intervals, longTasks: rec.longTasks };
+}
+"""
+
+
+@dataclass
+class ListBudget:
+    """Per-list thresholds; None disables a check"""
+    max_mounted_ratio: Optional[float] = None   # mounted / logical rows
+    max_dropped_pct: Optional[float] = None
+    max_layout_ms: Optional[float] = None
+    max_style_ms: Optional[float] = None
+
+
+@dataclass
+class ListProbeResult:
+    """One list's measurements"""
+    name: str
+    logical_rows: Optional[int]
+    mounted_rows: int
+    visible_rows: int
+    frames: Dict[str, Any] = field(default_factory=dict)
+    layout_ms: Optional[float] = None
+    style_ms: Optional[float] = None
+
+    @property
+    def mounted_ratio(self) -> Optional[float]:
+        if not self.logical_rows:
+            return None
+        return self.mounted_rows / self.logical_rows
+
+    def violations(self, budget: ListBudget) -> List[str]:
+        """Human-readable budget failures (empty when within budget)"""
+        checks = [
+            ('mounted/logical rows', self.mounted_ratio, budget.max_mounted_ratio),
+            ('dropped frames %', self.frames.get('dropped_pct'), budget.max_dropped_pct),
+            ('layout ms', self.layout_ms, budget.max_layout_ms),
+            ('recalc style ms', self.style_ms, budget.max_style_ms),
+        ]
+        return [
+            f"{self.name}: {label} {value:.2f} > {limit}"
+            for label, value, limit in checks
+            if limit is not None and value is not None and value > limit
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['mounted_ratio'] = self.mounted_ratio
+        return data
+
+
+def frame_stats(intervals: Sequence[float], frame_ms: float = FRAME_MS) -> Dict[str, Any]:
+    """Frame count, dropped frames (missed vsyncs) and their share of expected frames"""
+    intervals = [i for i in intervals if i > 0]
+    if not intervals:
+        return {'frames': 0, 'dropped': 0, 'dropped_pct': 0.0, 'max_ms': 0.0}
+    dropped = sum(max(0, round(i / frame_ms) - 1) for i in intervals if i > frame_ms * DROPPED_FRAME_FACTOR)
+    expected = len(intervals) + dropped
+    return {
+        'frames': len(intervals),
+        'dropped': dropped,
+        'dropped_pct': round(100 * dropped / expected, 2),
+        'max_ms': round(max(intervals), 2),
+        'mean_ms': round(sum(intervals) / len(intervals), 2),
+    }
+
+
+def _percentile(ordered: Sequence[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(pct / 100 * (len(ordered) - 1)))]
+
+
+def smoothness_stats(intervals: Sequence[float], long_tasks: Sequence[float] = (),
+                     frame_ms: float = FRAME_MS) -> Dict[str, Any]:
+    """
+    FPS percentiles (p50 typical, p5/p1 worst frames), janky-frame ratio and long tasks
+    A frame is janky when it took longer than DROPPED_FRAME_FACTOR x the frame budget
+    """
+    intervals = [i for i in intervals if i > 0]
+    if not intervals:
+        return {'frames': 0, 'fps_p50': None, 'fps_p5': None, 'fps_p1': None, 'jank_ratio': 0.0,
+                'long_tasks': len(long_tasks), 'long_task_ms': round(sum(long_tasks), 1)}
+    fps = sorted(1000 / i for i in intervals)
+    janky = sum(1 for i in intervals if i > frame_ms * DROPPED_FRAME_FACTOR)
+    return {
+        'frames': len(intervals),
+        'fps_mean': round(1000 * len(intervals) / sum(intervals), 1),
+        'fps_p50': round(_percentile(fps, 50), 1),
+        'fps_p5': round(_percentile(fps, 5), 1),
+        'fps_p1': round(_percentile(fps, 1), 1),
+        'jank_ratio': round(janky / len(intervals), 4),
+        'max_frame_ms': round(max(intervals), 1),
+        'long_tasks': len(long_tasks),
+        'long_task_ms': round(sum(long_tasks), 1),
+    }
+
+
+def trace_durations(trace: bytes) -> Dict[str, float]:
+    """Total Layout and style-recalc milliseconds in a Chromium trace"""
+    data = json.loads(trace)
+    events = data['traceEvents'] if isinstance(data, dict) else data
+    totals = {'layout_ms': 0.0, 'style_ms': 0.0}
+    for event in events:
+        if event.get('ph') != 'X':
+            continue
+        name = event.get('name')
+        if name in LAYOUT_EVENTS:
+            totals['layout_ms'] += event.get('dur', 0) / 1000
+        elif name in STYLE_EVENTS:
+            totals['style_ms'] += event.get('dur', 0) / 1000
+    return {k: round(v, 2) for k, v in totals.items()}
+
+
+class ScrollProbe:
+    """Measure one list on a Playwright page"""
+
+    def __init__(self, page):
+        self.page = page
+
+    def row_counts(self, row_selector: str) -> Dict[str, int]:
+        return self.page.evaluate(ROW_COUNTS_JS, row_selector)
+
+    def fling(self, row_selector: str, velocity: float = 4000, friction: float = 0.95,
+              max_ms: int = 4000) -> Dict[str, Any]:
+        """Fling the list's scroll container; returns rAF intervals and distance scrolled"""
+        return self.page.evaluate(FLING_JS, {
+            'selector': row_selector, 'velocity': velocity, 'friction': friction, 'maxMs': max_ms,
+        })
+
+    def _browser(self):
+        context = self.page.context
+        return getattr(context, 'browser', None)
+
+    def measure(self, name: str, row_selector: str, logical_rows: Optional[int] = None,
+                velocity: float = 4000, trace: bool = True) -> ListProbeResult:
+        """Row counts, then a traced fling (tracing is skipped outside Chromium)"""
+        counts = self.row_counts(row_selector)
+        browser = self._browser() if trace else None
+        tracing = browser is not None and browser.browser_type.name == 'chromium'
+        if tracing:
+            browser.start_tracing(page=self.page, categories=TRACE_CATEGORIES)
+        try:
+            fling = self.fling(row_selector, velocity=velocity)
+        finally:
+            raw = browser.stop_tracing() if tracing else None
+        durations = trace_durations(raw) if raw else {}
+        frames = frame_stats(fling['intervals'])
+        frames['distance_px'] = round(fling['distance'])
+        return ListProbeResult(
+            name=name,
+            logical_rows=logical_rows,
+            mounted_rows=counts['mounted'],
+            visible_rows=counts['visible'],
+            frames=frames,
+            layout_ms=durations.get('layout_ms'),
+            style_ms=durations.get('style_ms'),
+        )
+
+
+class SmoothScroller:
+    """Scroll with real input events at a given velocity while recording frames"""
+
+    # Wheel notch size and cadence of a trackpad/mouse at 60Hz
+    WHEEL_STEP_MS = 16
+
+    def __init__(self, page):
+        self.page = page
+
+    def _is_chromium(self) -> bool:
+        browser = getattr(self.page.context, 'browser', None)
+        return browser is not None and browser.browser_type.name == 'chromium'
+
+    def scroll_target(self, selector: Optional[str] = None) -> Dict[str, Any]:
+        """The element that scrolls (see SCROLL_TARGET_JS): remaining px, scrollTop, input point"""
+        return self.page.evaluate(SCROLL_TARGET_JS, selector)
+
+    def remaining_scroll(self, selector: Optional[str] = None) -> int:
+        return self.scroll_target(selector)['remaining']
+
+    def wheel(self, distance: int, velocity: float = 1500, at: Optional[Dict[str, float]] = None):
+        """Wheel events of velocity*16ms pixels every 16ms, with the pointer over `at` (default: viewport centre)"""
+        viewport = self.page.viewport_size or {'width': 400, 'height': 800}
+        at = at or {'x': viewport['width'] / 2, 'y': viewport['height'] / 2}
+        self.page.mouse.move(at['x'], at['y'])
+        step = max(1, int(velocity * self.WHEEL_STEP_MS / 1000))
+        scrolled = 0
+        next_at = time.perf_counter()
+        while scrolled < distance:
+            delta = min(step, distance - scrolled)
+            self.page.mouse.wheel(0, delta)
+            scrolled += delta
+            next_at += self.WHEEL_STEP_MS / 1000
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+
+    def touch(self, distance: int, velocity: float = 1500, at: Optional[Dict[str, float]] = None):
+        """Synthesized touch drag via CDP (Chromium); falls back to wheel steps elsewhere"""
+        if not self._is_chromium():
+            self.wheel(distance, velocity, at)
+            return
+        viewport = self.page.viewport_size or {'width': 400, 'height': 800}
+        at = at or {'x': viewport['width'] / 2, 'touch_y': viewport['height'] * 0.75}
+        cdp = self.page.context.new_cdp_session(self.page)
+        try:
+            cdp.send('Input.synthesizeScrollGesture', {
+                'x': at['x'],
+                'y': at['touch_y'],
+                'yDistance': -distance,
+                'speed': int(velocity),
+                'gestureSourceType': 'touch',
+                'preventFling': True,
+            })
+        finally:
+            cdp.detach()
+
+    def measure(self, distance: Optional[int] = None, velocity: float = 1500, source: str = 'wheel',
+                selector: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Scroll the scrolling element `distance` px (default: to its bottom) and return smoothness stats
+        distance_px is how far it actually moved; 0 means no input reached a scrollable element
+        """
+        target = self.scroll_target(selector)
+        if distance is None:
+            distance = target['remaining']
+        self.page.evaluate(FRAME_RECORDER_JS)
+        start = time.perf_counter()
+        (self.touch if source == 'touch' else self.wheel)(distance, velocity, target)
+        self.page.wait_for_timeout(100)  # Let the last frames land
+        recorded = self.page.evaluate(FRAME_COLLECT_JS)
+        stats = smoothness_stats(recorded['intervals'], recorded['longTasks'])
+        stats.update({
+            'source': source,
+            'requested_px': distance,
+            'distance_px': round(self.page.evaluate(SCROLL_TOP_JS) - target['scroll_top']),
+            'velocity_px_s': velocity,
+            'duration_ms': round((time.perf_counter() - start) * 1000),
+        })
+        return stats
+
+
+__all__ = [
+    'ListBudget',
+    'ListProbeResult',
+    'ScrollProbe',
+    'SmoothScroller',
+    'frame_stats',
+    'smoothness_stats',
+    'trace_durations',
+]
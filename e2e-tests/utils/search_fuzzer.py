@@ -0,0 +1,384 @@
+"""
+Hebrew Search Fuzzer
+Property-based search queries sampled from the question corpus, shrunk to a regression corpus
+
+QueryFuzzer draws words from the seeded questions and applies the input mutations that reach
+normalizeHebrew: nikud, cantillation, final letters, maqaf, geresh/gershayim, mixed Latin,
+odd whitespace and very long inputs. fuzz() runs each case through an `actual` and an
+`expected` search, records latency, and shrinks mismatches and the slowest inputs
+(delta debugging over words, then characters) into test_data/search_regressions.ndjson.
+
+Usage:
+    python -m utils.search_fuzzer run --cases 500 --seed 1    # token index vs naive port, no browser
+    python -m utils.search_fuzzer corpus                       # list the regression corpus
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+import argparse
+import json
+import random
+import re
+import sys
+import time
+
+
+REGRESSION_CORPUS = Path(__file__).resolve().parents[1] / 'test_data' / 'search_regressions.ndjson'
+
+NIKUD = [chr(c) for c in range(0x05B0, 0x05BD)] + ['\u05C1', '\u05C2', '\u05C7']
+CANTILLATION = [chr(c) for c in range(0x0591, 0x05B0)]
+MAQAF = '\u05BE'
+QUOTE_MARKS = ['׳', "'", '״', '"']
+FINAL_FORMS = {'כ': 'ך', 'מ': 'ם', 'נ': 'ן', 'פ': 'ף', 'צ': 'ץ'}
+LATIN_WORDS = ['shabbat', 'Shabbat', 'KASHRUT', 'tefillin', 'OK', 'pesach', 'a']
+WHITESPACE = [' ', '  ', '\t', '\u00a0', '\u2003', '\n']
+SYMBOLS = ['!@#$%', '?', '...', '(', ')', '-', '123', '5784']
+
+_HEBREW_WORD = re.compile(r'[\u05D0-\u05EA][\u0591-\u05EA\u05F3\u05F4"\']*')
+
+
+@dataclass
+class FuzzCase:
+    query: str
+    strategy: str
+
+
+@dataclass
+class FuzzResult:
+    case: FuzzCase
+    latency_ms: float
+    ok: bool
+    detail: str = ''
+    minimized: Optional[str] = None
+
+
+@dataclass
+class FuzzReport:
+    results: List[FuzzResult] = field(default_factory=list)
+    budget_ms: Optional[float] = None
+
+    @property
+    def failures(self) -> List[FuzzResult]:
+        return [r for r in self.results if not r.ok]
+
+    def slowest(self, count: int = 5) -> List[FuzzResult]:
+        return sorted(self.results, key=lambda r: r.latency_ms, reverse=True)[:count]
+
+    def by_strategy(self) -> Dict[str, Dict[str, float]]:
+        """p50/max latency and failure count per generator strategy"""
+        grouped: Dict[str, List[FuzzResult]] = {}
+        for result in self.results:
+            grouped.setdefault(result.case.strategy, []).append(result)
+        stats = {}
+        for strategy, results in sorted(grouped.items()):
+            latencies = sorted(r.latency_ms for r in results)
+            stats[strategy] = {
+                'cases': len(results),
+                'p50_ms': round(latencies[len(latencies) // 2], 2),
+                'max_ms': round(latencies[-1], 2),
+                'failures': sum(1 for r in results if not r.ok),
+            }
+        return stats
+
+    def format(self) -> str:
+        lines = [f"{len(self.results)} cases, {len(self.failures)} failure(s)"
+                 + (f", budget {self.budget_ms:.0f} ms" if self.budget_ms else '')]
+        for strategy, stats in self.by_strategy().items():
+            lines.append(f"  {strategy:<14} {stats['cases']:4d} cases  p50 {stats['p50_ms']:8.2f} ms  "
+                         f"max {stats['max_ms']:8.2f} ms  {stats['failures']} failed")
+        for result in self.failures[:10]:
+            shown = result.minimized if result.minimized is not None else result.case.query
+            lines.append(f"  ❌ [{result.case.strategy}] {shown[:80]!r}: {result.detail}")
+        return '\n'.join(lines)
+
+
+# ==================== Generation ====================
+
+def corpus_words(questions: Iterable[Dict[str, Any]], limit: int = 5000) -> List[str]:
+    """Distinct Hebrew words from question text, tags and answers, in first-seen order"""
+    seen: Dict[str, None] = {}
+    for question in questions:
+        answer = question.get('answer') or {}
+        for text in [question.get('question') or '', answer.get('text') or '', *(question.get('tags') or [])]:
+            for word in _HEBREW_WORD.findall(text):
+                seen.setdefault(word, None)
+                if len(seen) >= limit:
+                    return list(seen)
+    return list(seen)
+
+
+class QueryFuzzer:
+    """Seeded query generator; the same words and seed give the same cases"""
+
+    def __init__(self, words: Sequence[str], seed: int = 0):
+        if not words:
+            raise ValueError("QueryFuzzer needs at least one corpus word")
+        self.words = list(words)
+        self.rng = random.Random(seed)
+        self.strategies: Dict[str, Callable[[], str]] = {
+            'plain': self._plain,
+            'nikud': lambda: self._mutate_words(self._add_points, NIKUD),
+            'cantillation': lambda: self._mutate_words(self._add_points, CANTILLATION),
+            'final_letters': lambda: self._mutate_words(self._swap_finals),
+            'maqaf': self._maqaf,
+            'gershayim': lambda: self._mutate_words(self._add_quote),
+            'mixed_latin': self._mixed_latin,
+            'whitespace': self._whitespace,
+            'symbols': self._symbols,
+            'single_char': self._single_char,
+            'long': self._long,
+            'compound': self._compound,
+        }
+
+    def draw(self, strategy: Optional[str] = None) -> FuzzCase:
+        strategy = strategy or self.rng.choice(list(self.strategies))
+        return FuzzCase(self.strategies[strategy](), strategy)
+
+    def cases(self, count: int) -> Iterator[FuzzCase]:
+        """`count` cases cycling through every strategy so small runs still cover them all"""
+        names = list(self.strategies)
+        for n in range(count):
+            yield self.draw(names[n % len(names)])
+
+    # ---- word level ----
+
+    def _pick(self, count: int = 0) -> List[str]:
+        return [self.rng.choice(self.words) for _ in range(count or self.rng.randint(1, 3))]
+
+    def _plain(self) -> str:
+        words = self._pick()
+        if self.rng.random() < 0.3:
+            words = [w[:self.rng.randint(2, max(2, len(w)))] for w in words]
+        return ' '.join(words)
+
+    def _mutate_words(self, mutate: Callable[..., str], *args) -> str:
+        return ' '.join(mutate(word, *args) if self.rng.random() < 0.8 else word for word in self._pick())
+
+    def _maqaf(self) -> str:
+        return MAQAF.join(self._pick(self.rng.randint(2, 3)))
+
+    def _mixed_latin(self) -> str:
+        words = self._pick() + [self.rng.choice(LATIN_WORDS) for _ in range(self.rng.randint(1, 2))]
+        self.rng.shuffle(words)
+        return ' '.join(words)
+
+    def _whitespace(self) -> str:
+        words = self._pick(self.rng.randint(2, 3))
+        query = ''.join(w + self.rng.choice(WHITESPACE) for w in words)
+        return self.rng.choice(WHITESPACE) + query
+
+    def _symbols(self) -> str:
+        words = self._pick() + [self.rng.choice(SYMBOLS)]
+        self.rng.shuffle(words)
+        return ' '.join(words)
+
+    def _single_char(self) -> str:
+        letters = [self.rng.choice(self.rng.choice(self.words)) for _ in range(self.rng.randint(1, 4))]
+        return ' '.join(letters)
+
+    def _long(self) -> str:
+        if self.rng.random() < 0.5:
+            return (self.rng.choice(self.words) + ' ') * self.rng.choice((50, 100, 200))
+        return ' '.join(self._pick(self.rng.randint(40, 120)))
+
+    def _compound(self) -> str:
+        query = self._plain()
+        for mutate, args in self.rng.sample([
+            (self._add_points, (NIKUD,)), (self._add_points, (CANTILLATION,)),
+            (self._swap_finals, ()), (self._add_quote, ()),
+        ], 2):
+            query = ' '.join(mutate(word, *args) for word in query.split(' '))
+        return query
+
+    # ---- character level ----
+
+    def _add_points(self, word: str, points: Sequence[str]) -> str:
+        return ''.join(c + (self.rng.choice(points) if 'א' <= c <= 'ת' and self.rng.random() < 0.6 else '')
+                       for c in word)
+
+    def _swap_finals(self, word: str) -> str:
+        reverse = {final: base for base, final in FINAL_FORMS.items()}
+        chars = [FINAL_FORMS.get(c, reverse.get(c, c)) if self.rng.random() < 0.7 else c for c in word]
+        return ''.join(chars)
+
+    def _add_quote(self, word: str) -> str:
+        at = self.rng.randint(1, max(1, len(word)))
+        return word[:at] + self.rng.choice(QUOTE_MARKS) + word[at:]
+
+
+# ==================== Checking & Shrinking ====================
+
+def shrink(query: str, still_fails: Callable[[str], bool], max_attempts: int = 200) -> str:
+    """Smallest query (by ddmin over space-separated words, then characters) that still fails"""
+    attempts = 0
+
+    def _ddmin(parts: List[str], joiner: str) -> List[str]:
+        nonlocal attempts
+        chunk = max(1, len(parts) // 2)
+        while parts and attempts < max_attempts:
+            reduced = False
+            for start in range(0, len(parts), chunk):
+                candidate = parts[:start] + parts[start + chunk:]
+                if not candidate:
+                    continue
+                attempts += 1
+                if still_fails(joiner.join(candidate)):
+                    parts, reduced = candidate, True
+                    break
+                if attempts >= max_attempts:
+                    break
+            if not reduced:
+                if chunk == 1:
+                    break
+                chunk = max(1, chunk // 2)
+        return parts
+
+    words = _ddmin(query.split(' '), ' ')
+    return ''.join(_ddmin(list(' '.join(words)), ''))
+
+
+def fuzz(cases: Iterable[FuzzCase], actual: Callable[[str], Any], expected: Callable[[str], Any],
+         budget_ms: Optional[float] = None, timed: bool = False, minimize: bool = True,
+         minimize_slowest: int = 3, slow_ratio: float = 0.8) -> FuzzReport:
+    """
+    Run every case through both searches. A case fails if the results differ, actual() raises
+    or takes longer than budget_ms. With timed=True actual() returns (result, latency_ms) it
+    measured itself (e.g. BasePage.measure_settle); otherwise the call is timed here.
+    Failures and the slowest `minimize_slowest` passing cases are shrunk; a slow input stays
+    "slow" while it takes at least slow_ratio of its original time
+    """
+    report = FuzzReport(budget_ms=budget_ms)
+
+    def _timed(query: str):
+        start = time.perf_counter()
+        got = actual(query)
+        if timed:
+            got, latency_ms = got
+            return latency_ms, got
+        return (time.perf_counter() - start) * 1000, got
+
+    def _run(query: str):
+        try:
+            elapsed, got = _timed(query)
+        except Exception as e:  # any app-side error is a finding
+            return 0.0, False, f"{type(e).__name__}: {e}"
+        want = expected(query)
+        if got != want:
+            return elapsed, False, f"results differ: got {_brief(got)}, expected {_brief(want)}"
+        if budget_ms is not None and elapsed > budget_ms:
+            return elapsed, False, f"{elapsed:.1f} ms > budget {budget_ms:.0f} ms"
+        return elapsed, True, ''
+
+    for case in cases:
+        elapsed, ok, detail = _run(case.query)
+        report.results.append(FuzzResult(case, round(elapsed, 2), ok, detail))
+
+    if minimize:
+        for result in report.failures:
+            kind = result.detail.split(':')[0]
+            result.minimized = shrink(result.case.query, lambda q, kind=kind: _same_failure(_run(q), kind))
+        for result in [r for r in report.slowest(minimize_slowest) if r.ok]:
+            floor = result.latency_ms * slow_ratio
+            result.minimized = shrink(result.case.query, lambda q, floor=floor: _timed(q)[0] >= floor)
+    return report
+
+
+def _same_failure(run, kind: str) -> bool:
+    _, ok, detail = run
+    return not ok and detail.split(':')[0] == kind
+
+
+def _brief(value: Any) -> str:
+    text = repr(value)
+    return text if len(text) <= 120 else text[:117] + '...'
+
+
+# ==================== Regression Corpus ====================
+
+def load_corpus(path: Path = REGRESSION_CORPUS) -> List[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+
+def add_to_corpus(report: FuzzReport, path: Path = REGRESSION_CORPUS, slowest: int = 3) -> int:
+    """Append minimized failures and slowest inputs not already in the corpus; returns how many were added"""
+    path = Path(path)
+    known = {entry['query'] for entry in load_corpus(path)}
+    picked = report.failures + [r for r in report.slowest(slowest) if r.ok]
+    added = []
+    for result in picked:
+        query = result.minimized if result.minimized is not None else result.case.query
+        if query in known:
+            continue
+        known.add(query)
+        added.append({
+            'query': query,
+            'strategy': result.case.strategy,
+            'reason': 'slow' if result.ok else result.detail.split(':')[0],
+            'latency_ms': result.latency_ms,
+            'original': result.case.query if query != result.case.query else None,
+        })
+    if added:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            for entry in added:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    return len(added)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Hebrew search fuzzer")
+    sub = parser.add_subparsers(dest='command', required=True)
+    run = sub.add_parser('run', help="Fuzz the token index against the naive port of fuzzySearchQuestions")
+    run.add_argument('--cases', type=int, default=300)
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--size', type=int, default=2000, help="Generated questions to search")
+    run.add_argument('--budget-ms', type=float, default=None)
+    run.add_argument('--save', action='store_true', help="Append minimized findings to the regression corpus")
+    run.add_argument('--corpus', type=Path, default=REGRESSION_CORPUS)
+    corpus = sub.add_parser('corpus', help="List the regression corpus")
+    corpus.add_argument('--corpus', type=Path, default=REGRESSION_CORPUS)
+    args = parser.parse_args(argv)
+
+    if args.command == 'corpus':
+        for entry in load_corpus(args.corpus):
+            print(f"{entry['reason']:<14} {entry['strategy']:<14} {entry['query'][:80]!r}")
+        return 0
+
+    from utils.qa_dataset import QADatasetGenerator
+    from utils.qa_search import QuestionSearchIndex, fuzzy_search_naive
+
+    questions = list(QADatasetGenerator(args.seed).questions(args.size))
+    index = QuestionSearchIndex(questions)
+    report = fuzz(
+        QueryFuzzer(corpus_words(questions), args.seed).cases(args.cases),
+        actual=lambda q: [r['id'] for r in index.search(q)],
+        expected=lambda q: [r['id'] for r in fuzzy_search_naive(q, questions)],
+        budget_ms=args.budget_ms,
+    )
+    print(report.format())
+    if args.save:
+        print(f"Added {add_to_corpus(report, args.corpus)} case(s) to {args.corpus}")
+    return 1 if report.failures else 0
+
+
+__all__ = [
+    'FuzzCase',
+    'FuzzReport',
+    'FuzzResult',
+    'MAQAF',
+    'NIKUD',
+    'QueryFuzzer',
+    'REGRESSION_CORPUS',
+    'add_to_corpus',
+    'corpus_words',
+    'fuzz',
+    'load_corpus',
+    'shrink',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
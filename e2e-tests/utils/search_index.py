@@ -0,0 +1,507 @@
+"""
+Search Index
+Precomputed index artifact for contentLoader.ts searchContent()
+
+searchContent() lowercases every section on every query and scores
+    +10 if the section text contains the query
+    +5  if the chapter title contains it
+    +3  if the chapter label contains it
+then stable-sorts by score, in registry (chapter-ids-only.ts) order.
+
+The artifact keeps a sorted dictionary of lowercased whitespace tokens with
+delta-encoded varint posting lists of global section ordinals. A query with
+no whitespace matches a section exactly when some token contains it, so the
+dictionary alone answers it; longer queries intersect (suffix, exact...,
+prefix) postings and verify the few candidates against the text.
+
+File format (little-endian):
+    magic b'KZSI' | version u16 | reserved u16 | meta_len u32 | dict_len u32 | token_count u32
+    meta      - zlib JSON: chapters [{id, digest, title, label, sections: [ids]}]
+    dict      - zlib, '\\n'-joined sorted tokens
+    offsets   - (token_count + 1) x u32 into postings
+    postings  - varint deltas of section ordinals, per token
+
+Usage:
+    python -m utils.search_index build [--full]
+    python -m utils.search_index verify [--queries 300]
+"""
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import argparse
+import json
+import random
+import statistics
+import struct
+import sys
+import time
+import zlib
+
+from utils.content_cache import file_digest
+from utils.content_tree import CONTENT_DIR, chapter_paths_by_id, read_registry_ids
+
+
+INDEX_MAGIC = b'KZSI'
+INDEX_VERSION = 1
+_HEADER = struct.Struct('<4sHHIII')
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parents[1] / 'build' / 'search-index.bin'
+
+# Same weights as searchContent()
+TEXT_SCORE = 10
+TITLE_SCORE = 5
+LABEL_SCORE = 3
+
+
+class SearchIndexError(Exception):
+    """Raised for missing or malformed index artifacts"""
+
+
+# ==================== Encoding ====================
+
+def encode_postings(ordinals: List[int]) -> bytes:
+    """Delta + LEB128 varint encoding of a sorted ordinal list"""
+    deltas = [b - a for a, b in zip([0] + ordinals[:-1], ordinals)]
+    if not deltas or max(deltas) < 0x80:
+        return bytes(deltas)  # Common case: one byte per delta
+    out = bytearray()
+    for delta in deltas:
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> List[int]:
+    """Inverse of encode_postings"""
+    if not data or max(data) < 0x80:
+        return list(accumulate(data))
+    ordinals = []
+    value, shift, previous = 0, 0, 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        ordinals.append(previous)
+        value, shift = 0, 0
+    return ordinals
+
+
+def tokenize(text: str) -> List[str]:
+    """Sorted, unique lowercased whitespace tokens (JS toLowerCase equivalent for this corpus)"""
+    return sorted(set(text.lower().split()))
+
+
+# ==================== Building ====================
+
+def _load_chapters(content_dir: Path) -> List[Tuple[str, Path]]:
+    """(chapter_id, path) in the order listChapters() returns them"""
+    paths = chapter_paths_by_id(content_dir)
+    return [(chapter_id, paths[chapter_id]) for chapter_id in read_registry_ids(content_dir)
+            if chapter_id in paths]
+
+
+def tokens_path(index_path: Path) -> Path:
+    """Build-side cache of per-section tokens, kept next to the artifact (not shipped)"""
+    return Path(index_path).with_suffix('.tokens')
+
+
+def _load_tokens(index_path: Path) -> Dict[str, Any]:
+    path = tokens_path(index_path)
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(zlib.decompress(path.read_bytes()))
+    except (ValueError, zlib.error):
+        return {}
+    return data.get('chapters', {}) if data.get('version') == INDEX_VERSION else {}
+
+
+def _write_artifact(output: Path, chapters_meta: List[Dict[str, Any]], tokens: List[str],
+                    encoded: Callable[[str], bytes]):
+    offsets = array('I', [0])
+    blob = bytearray()
+    for token in tokens:
+        blob += encoded(token)
+        offsets.append(len(blob))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    meta_bytes = zlib.compress(json.dumps({'chapters': chapters_meta}, ensure_ascii=False,
+                                          separators=(',', ':')).encode('utf-8'))
+    dict_bytes = zlib.compress('\n'.join(tokens).encode('utf-8'))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(meta_bytes), len(dict_bytes), len(tokens)))
+        f.write(meta_bytes)
+        f.write(dict_bytes)
+        f.write(offsets.tobytes())
+        f.write(blob)
+
+
+def build_index(content_dir: Path = CONTENT_DIR, output: Path = DEFAULT_INDEX_PATH,
+                incremental: bool = True) -> Dict[str, Any]:
+    """
+    Write the index artifact
+
+    Incrementally, only chapters whose digest changed are re-read and
+    re-tokenized. When no chapter gained or lost sections, section ordinals
+    are stable, so postings of tokens the changed chapters never touched are
+    copied byte-for-byte from the previous artifact.
+    """
+    start = time.perf_counter()
+    content_dir, output = Path(content_dir), Path(output)
+    chapters = [(chapter_id, path, file_digest(path)) for chapter_id, path in _load_chapters(content_dir)]
+
+    previous: Optional[SearchIndex] = None
+    cached_tokens: Dict[str, Any] = {}
+    if incremental and output.exists():
+        try:
+            previous = SearchIndex(output)
+            cached_tokens = _load_tokens(output)
+        except SearchIndexError:
+            previous = None
+
+    # Per-chapter meta and per-section tokens, reusing the cache where digests match
+    chapters_meta: List[Dict[str, Any]] = []
+    section_tokens: Dict[str, List[List[str]]] = {}
+    changed: List[str] = []
+    for chapter_id, path, digest in chapters:
+        cached = cached_tokens.get(chapter_id)
+        if previous is not None and cached and cached[0] == digest and chapter_id in previous.chapter_ids:
+            chapters_meta.append(previous.chapter_meta(chapter_id))
+            section_tokens[chapter_id] = cached[1]
+            continue
+        chapter = json.loads(path.read_bytes())
+        chapters_meta.append({
+            'id': chapter_id,
+            'digest': digest,
+            'title': chapter['title'],
+            'label': chapter['chapterLabel'],
+            'sections': [s['id'] for s in chapter['sections']],
+        })
+        section_tokens[chapter_id] = [tokenize(s['text']) for s in chapter['sections']]
+        changed.append(chapter_id)
+
+    layout = [(c['id'], len(c['sections'])) for c in chapters_meta]
+    stable = previous is not None and layout == [(c['id'], len(c['sections'])) for c in previous.chapters]
+
+    if stable:
+        # Patch only tokens that appear (before or after) in changed chapters
+        first = {c['id']: previous.first_ordinal(c['id']) for c in chapters_meta}
+        changed_ordinals = set()
+        touched: Set[str] = set()
+        added: Dict[str, List[int]] = {}
+        for chapter_id in changed:
+            for local, tokens in enumerate(section_tokens[chapter_id]):
+                ordinal = first[chapter_id] + local
+                changed_ordinals.add(ordinal)
+                for token in tokens:
+                    added.setdefault(token, []).append(ordinal)
+            old = cached_tokens.get(chapter_id)
+            if old:
+                for tokens in old[1]:
+                    touched.update(tokens)
+            else:
+                touched.update(t for t in previous.tokens)  # No record of old tokens: patch all
+        touched.update(added)
+
+        patched: Dict[str, List[int]] = {}
+        for token in touched:
+            ordinals = [o for o in previous.postings_for(token) if o not in changed_ordinals]
+            ordinals = sorted(ordinals + added.get(token, []))
+            if ordinals:
+                patched[token] = ordinals
+        tokens = sorted((set(previous.tokens) - touched) | set(patched))
+        _write_artifact(output, chapters_meta, tokens,
+                        lambda t: encode_postings(patched[t]) if t in patched else previous.raw_postings(t))
+    else:
+        postings: Dict[str, List[int]] = {}
+        ordinal = 0
+        for chapter_id, _ in layout:
+            for tokens in section_tokens[chapter_id]:
+                for token in tokens:
+                    postings.setdefault(token, []).append(ordinal)
+                ordinal += 1
+        tokens = sorted(postings)
+        _write_artifact(output, chapters_meta, tokens, lambda t: encode_postings(postings[t]))
+
+    if changed or not stable:
+        tokens_path(output).write_bytes(zlib.compress(json.dumps({
+            'version': INDEX_VERSION,
+            'chapters': {c['id']: [c['digest'], section_tokens[c['id']]] for c in chapters_meta},
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 1))
+
+    return {
+        'chapters': len(chapters_meta),
+        'chapters_rebuilt': len(changed),
+        'patched': stable,
+        'sections': sum(count for _, count in layout),
+        'tokens': len(tokens),
+        'bytes': output.stat().st_size,
+        'build_ms': round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+# ==================== Querying ====================
+
+class SearchIndex:
+    """Loaded index artifact"""
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        data = Path(path).read_bytes()
+        if len(data) < _HEADER.size:
+            raise SearchIndexError(f"Truncated index: {path}")
+        magic, version, _, meta_len, dict_len, token_count = _HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise SearchIndexError(f"Unsupported index format: {path}")
+
+        pos = _HEADER.size
+        self.chapters: List[Dict[str, Any]] = json.loads(zlib.decompress(data[pos:pos + meta_len]))['chapters']
+        pos += meta_len
+        dictionary = zlib.decompress(data[pos:pos + dict_len]).decode('utf-8')
+        self.tokens: List[str] = dictionary.split('\n') if token_count else []
+        pos += dict_len
+        self.offsets = array('I')
+        self.offsets.frombytes(data[pos:pos + 4 * (token_count + 1)])
+        if sys.byteorder != 'little':
+            self.offsets.byteswap()
+        pos += 4 * (token_count + 1)
+        self.postings = data[pos:]
+
+        # Section ordinal -> (chapter index, section id)
+        self.sections: List[Tuple[int, str]] = [
+            (chapter_index, section_id)
+            for chapter_index, chapter in enumerate(self.chapters)
+            for section_id in chapter['sections']
+        ]
+        self._chapter_by_id = {c['id']: i for i, c in enumerate(self.chapters)}
+        self._first_ordinal = []
+        ordinal = 0
+        for chapter in self.chapters:
+            self._first_ordinal.append(ordinal)
+            ordinal += len(chapter['sections'])
+        self._token_index: Optional[Dict[str, int]] = None
+
+    @property
+    def chapter_ids(self) -> Dict[str, int]:
+        return self._chapter_by_id
+
+    def chapter_meta(self, chapter_id: str) -> Dict[str, Any]:
+        return self.chapters[self._chapter_by_id[chapter_id]]
+
+    def first_ordinal(self, chapter_id: str) -> int:
+        return self._first_ordinal[self._chapter_by_id[chapter_id]]
+
+    def raw_postings(self, token: str) -> bytes:
+        """Encoded posting bytes for a token (empty if absent)"""
+        if self._token_index is None:
+            self._token_index = {t: i for i, t in enumerate(self.tokens)}
+        i = self._token_index.get(token)
+        return b'' if i is None else self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def postings_for(self, token: str) -> List[int]:
+        return decode_postings(self.raw_postings(token))
+
+    def _postings(self, token_index: int) -> List[int]:
+        return decode_postings(self.postings[self.offsets[token_index]:self.offsets[token_index + 1]])
+
+    def _union(self, token_indexes: Iterable[int]) -> Set[int]:
+        result: Set[int] = set()
+        for token_index in token_indexes:
+            result.update(self._postings(token_index))
+        return result
+
+    def _prefix_range(self, prefix: str) -> range:
+        low = bisect_left(self.tokens, prefix)
+        high = low
+        while high < len(self.tokens) and self.tokens[high].startswith(prefix):
+            high += 1
+        return range(low, high)
+
+    def candidates(self, query: str) -> Tuple[Set[int], bool]:
+        """
+        Section ordinals whose text may contain the query
+        The flag is True when the set is exact (single-token queries)
+        """
+        words = query.split()
+        if len(words) == 1 and words[0] == query:
+            return self._union(i for i, token in enumerate(self.tokens) if query in token), True
+
+        # "a b c" inside text: a token ending with a, exact b, a token starting with c
+        sets = [self._union(i for i, token in enumerate(self.tokens) if token.endswith(words[0]))]
+        for word in words[1:-1]:
+            i = bisect_left(self.tokens, word)
+            sets.append(self._union([i]) if i < len(self.tokens) and self.tokens[i] == word else set())
+        sets.append(self._union(self._prefix_range(words[-1])))
+        return set.intersection(*sets), False
+
+    def search(self, query: str, text_for: Optional[Callable[[str, str], str]] = None
+               ) -> List[Tuple[str, str, int]]:
+        """
+        (section_id, chapter_id, score) in searchContent() order
+        text_for(chapter_id, section_id) is used to verify multi-word candidates;
+        without it those candidates are returned unverified
+        """
+        normalized = query.strip().lower()
+        if not normalized:
+            return []
+
+        matched, exact = self.candidates(normalized)
+        if not exact and text_for is not None:
+            matched = {
+                ordinal for ordinal in matched
+                if normalized in text_for(self.chapters[self.sections[ordinal][0]]['id'],
+                                          self.sections[ordinal][1]).lower()
+            }
+
+        chapter_scores = {}
+        for index, chapter in enumerate(self.chapters):
+            score = 0
+            if normalized in chapter['title'].lower():
+                score += TITLE_SCORE
+            if normalized in chapter['label'].lower():
+                score += LABEL_SCORE
+            if score:
+                chapter_scores[index] = score
+
+        ordinals = set(matched)
+        for index in chapter_scores:
+            first = self._first_ordinal[index]
+            ordinals.update(range(first, first + len(self.chapters[index]['sections'])))
+
+        results = []
+        for ordinal in sorted(ordinals):
+            chapter_index, section_id = self.sections[ordinal]
+            score = (TEXT_SCORE if ordinal in matched else 0) + chapter_scores.get(chapter_index, 0)
+            results.append((section_id, self.chapters[chapter_index]['id'], score))
+        results.sort(key=lambda r: -r[2])  # Stable, like Array.prototype.sort
+        return results
+
+
+# ==================== Verification ====================
+
+def brute_force_search(chapters: List[Dict[str, Any]], query: str) -> List[Tuple[str, str, int]]:
+    """Line-for-line port of searchContent()"""
+    normalized = query.strip().lower()
+    if not normalized:
+        return []
+    results = []
+    for chapter in chapters:
+        for section in chapter['sections']:
+            score = 0
+            if normalized in section['text'].lower():
+                score += TEXT_SCORE
+            if normalized in chapter['title'].lower():
+                score += TITLE_SCORE
+            if normalized in chapter['chapterLabel'].lower():
+                score += LABEL_SCORE
+            if score > 0:
+                results.append((section['id'], chapter['id'], score))
+    results.sort(key=lambda r: -r[2])
+    return results
+
+
+def sample_queries(chapters: List[Dict[str, Any]], count: int, seed: int = 0) -> List[str]:
+    """Corpus-derived queries: whole words, word fragments, phrases, titles"""
+    rng = random.Random(seed)
+    sections = [s for c in chapters for s in c['sections']]
+    queries = ['ש', 'שבת', 'הלכות', 'א׳']
+    while len(queries) < count:
+        text = rng.choice(sections)['text']
+        words = text.split()
+        if not words:
+            continue
+        kind = rng.randrange(4)
+        if kind == 0:
+            queries.append(rng.choice(words))
+        elif kind == 1:
+            word = rng.choice(words)
+            start = rng.randrange(len(word))
+            queries.append(word[start:start + rng.randint(1, 4)])
+        elif kind == 2:
+            start = rng.randrange(len(words))
+            queries.append(' '.join(words[start:start + rng.randint(2, 3)]))
+        else:
+            queries.append(rng.choice(chapters)['title'].split(',')[0])
+    return queries
+
+
+def verify_index(content_dir: Path = CONTENT_DIR, index_path: Path = DEFAULT_INDEX_PATH,
+                 queries: int = 300, seed: int = 0) -> Dict[str, Any]:
+    """Compare indexed search with a brute-force scan; report mismatches, size and latency"""
+    chapters = [json.loads(path.read_bytes()) for _, path in _load_chapters(Path(content_dir))]
+    texts = {(c['id'], s['id']): s['text'] for c in chapters for s in c['sections']}
+
+    start = time.perf_counter()
+    index = SearchIndex(index_path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    mismatches = []
+    index_ms, scan_ms = [], []
+    for query in sample_queries(chapters, queries, seed):
+        start = time.perf_counter()
+        expected = brute_force_search(chapters, query)
+        scan_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        actual = index.search(query, lambda chapter_id, section_id: texts[(chapter_id, section_id)])
+        index_ms.append((time.perf_counter() - start) * 1000)
+
+        if actual != expected:
+            mismatches.append({'query': query, 'expected': len(expected), 'actual': len(actual)})
+
+    corpus_bytes = sum(len(t.encode('utf-8')) for t in texts.values())
+    return {
+        'queries': len(index_ms),
+        'mismatches': mismatches,
+        'index_bytes': Path(index_path).stat().st_size,
+        'corpus_text_bytes': corpus_bytes,
+        'index_load_ms': round(load_ms, 1),
+        'index_query_ms': {'p50': round(statistics.median(index_ms), 3), 'max': round(max(index_ms), 3)},
+        'scan_query_ms': {'p50': round(statistics.median(scan_ms), 3), 'max': round(max(scan_ms), 3)},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and verify the content search index")
+    parser.add_argument('--content-dir', type=Path, default=CONTENT_DIR)
+    parser.add_argument('--index', type=Path, default=DEFAULT_INDEX_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="Build (incrementally when an index exists)")
+    build.add_argument('--full', action='store_true', help="Ignore the previous index")
+    verify = sub.add_parser('verify', help="Check against a brute-force scan")
+    verify.add_argument('--queries', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        print(json.dumps(build_index(args.content_dir, args.index, incremental=not args.full), indent=2))
+        return 0
+
+    report = verify_index(args.content_dir, args.index, args.queries)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if report['mismatches'] else 0
+
+
+__all__ = [
+    'DEFAULT_INDEX_PATH',
+    'SearchIndexError',
+    'SearchIndex',
+    'build_index',
+    'tokens_path',
+    'brute_force_search',
+    'sample_queries',
+    'verify_index',
+    'encode_postings',
+    'decode_postings',
+    'tokenize',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,422 @@
+"""
+Search Profiler
+CDP CPU profiles of the global /search screen, per query, with time attribution and flame graphs
+
+Every query is typed into /search while the V8 sampling profiler runs. Samples are
+attributed by call stack to registry load (dynamic import of chapters-index and module
+init), the searchContent() scan, lowercasing, sorting, React rendering and GC. V8 folds
+builtins like String.prototype.toLowerCase into their caller, so an init script also
+wraps toLowerCase and Array.prototype.sort while a query runs and times them directly.
+
+Output per query: <slug>.cpuprofile (Chrome DevTools / speedscope), <slug>.folded
+(flamegraph.pl) and <slug>.svg; plus search-profile.json with the ranked table.
+
+Usage:
+    python -m utils.search_profiler queries --count 30          # corpus-derived query set
+    python -m utils.search_profiler table reports/search-profile/search-profile.json
+    python -m utils.search_profiler flame some.cpuprofile -o some.svg
+"""
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import argparse
+import hashlib
+import html
+import json
+import re
+import sys
+import time
+
+
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parents[1] / 'reports' / 'search-profile'
+
+# (category, pattern on "functionName url"); the first rule matching any frame of the stack wins
+CATEGORY_RULES: List[Tuple[str, str]] = [
+    ('sort', r'^(sort|Array\.prototype\.sort|TimSort\w*|ArrayTimSort\w*) '),
+    ('lowercase', r'^(toLowerCase|toLocaleLowerCase|String\.prototype\.toLowerCase) '),
+    ('registry_load', r'^(getChapterRegistry|listChapters|metroRequire|loadModuleImplementation|guardedLoadModule|'
+                      r'metroImportDefault|asyncRequire|importAll|__r) |chapters-index|/content/'),
+    ('scan', r'^searchContent '),
+    ('render', r'^(performWorkOn\w*|workLoop\w*|renderWithHooks|commitRoot\w*|beginWork\w*|completeWork|'
+               r'reconcile\w*|flushPassiveEffects\w*|performSyncWorkOnRoot|performConcurrentWorkOnRoot) '),
+    ('gc', r'^\(garbage collector\) '),
+    ('idle', r'^\(idle\) '),
+    ('program', r'^\(program\) '),
+]
+CATEGORIES = [name for name, _ in CATEGORY_RULES] + ['other']
+
+# Times toLowerCase() and Array.prototype.sort() while window.__kzSearchProbe.active is set
+SEARCH_PROBE_JS = """
+(() => {
+  if (window.__kzSearchProbe) return;
+  const probe = window.__kzSearchProbe = { active: false, lowercase_ms: 0, lowercase_calls: 0, sort_ms: 0, sort_calls: 0 };
+  const lower = String.prototype.toLowerCase;
+  const sort = Array.prototype.sort;
+  String.prototype.toLowerCase = function () {
+    if (!probe.active) return lower.call(this);
+    const start = performance.now();
+    const result = lower.call(this);
+    probe.lowercase_ms += performance.now() - start;
+    probe.lowercase_calls++;
+    return result;
+  };
+  Array.prototype.sort = function (compare) {
+    if (!probe.active) return sort.call(this, compare);
+    const start = performance.now();
+    const result = sort.call(this, compare);
+    probe.sort_ms += performance.now() - start;
+    probe.sort_calls++;
+    return result;
+  };
+})();
+"""
+
+PROBE_RESET_JS = """() => Object.assign(window.__kzSearchProbe,
+  { active: true, lowercase_ms: 0, lowercase_calls: 0, sort_ms: 0, sort_calls: 0 })"""
+PROBE_READ_JS = """() => { const p = window.__kzSearchProbe; p.active = false;
+  return { lowercase_ms: p.lowercase_ms, lowercase_calls: p.lowercase_calls, sort_ms: p.sort_ms, sort_calls: p.sort_calls }; }"""
+
+
+@dataclass
+class QueryProfile:
+    """One profiled query"""
+    query: str
+    mode: str                               # cold (first search after load) | warm
+    settle_ms: float                        # fill -> result list settled, debounce included
+    busy_ms: float                          # non-idle sampled CPU time
+    results: int                            # rendered result cards
+    categories: Dict[str, float] = field(default_factory=dict)
+    probe: Dict[str, float] = field(default_factory=dict)
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+# ==================== Profile Analysis ====================
+
+def _frame_key(node: Dict[str, Any]) -> str:
+    frame = node['callFrame']
+    return f"{frame.get('functionName') or '(anonymous)'} {frame.get('url', '')}"
+
+
+def _stacks(profile: Dict[str, Any]) -> Dict[int, List[Dict[str, Any]]]:
+    """node id -> frames from root to that node (the synthetic (root) frame dropped)"""
+    nodes = {node['id']: node for node in profile['nodes']}
+    parents = {child: node['id'] for node in profile['nodes'] for child in node.get('children', [])}
+    stacks: Dict[int, List[Dict[str, Any]]] = {}
+
+    def _stack(node_id: int) -> List[Dict[str, Any]]:
+        if node_id in stacks:
+            return stacks[node_id]
+        chain = []
+        current: Optional[int] = node_id
+        while current is not None and current not in stacks:
+            chain.append(current)
+            current = parents.get(current)
+        stack = list(stacks[current]) if current is not None else []
+        for nid in reversed(chain):
+            if nodes[nid]['callFrame'].get('functionName') != '(root)':
+                stack = stack + [nodes[nid]]
+            stacks[nid] = stack
+        return stacks[node_id]
+
+    for node_id in nodes:
+        _stack(node_id)
+    return stacks
+
+
+def _sample_times(profile: Dict[str, Any]) -> List[Tuple[int, float]]:
+    """(node id, ms) per sample; a sample lasts until the next one"""
+    samples = profile.get('samples', [])
+    deltas = profile.get('timeDeltas', [])
+    times = []
+    for i, node_id in enumerate(samples):
+        nxt = deltas[i + 1] if i + 1 < len(deltas) else 0
+        times.append((node_id, max(nxt, 0) / 1000))
+    return times
+
+
+def categorize(profile: Dict[str, Any], rules: Sequence[Tuple[str, str]] = CATEGORY_RULES) -> Dict[str, float]:
+    """Sampled ms per category; a sample goes to the first rule that matches any frame of its stack"""
+    compiled = [(name, re.compile(pattern)) for name, pattern in rules]
+    stacks = _stacks(profile)
+    cache: Dict[int, str] = {}
+    totals = {name: 0.0 for name in CATEGORIES}
+    for node_id, ms in _sample_times(profile):
+        if node_id not in cache:
+            keys = [_frame_key(node) for node in stacks[node_id]]
+            cache[node_id] = next((name for name, pattern in compiled if any(pattern.search(k) for k in keys)), 'other')
+        totals[cache[node_id]] += ms
+    return {name: round(ms, 2) for name, ms in totals.items()}
+
+
+def folded_stacks(profile: Dict[str, Any]) -> Dict[str, float]:
+    """Brendan Gregg collapsed stacks ("a;b;c" -> ms), idle excluded"""
+    stacks = _stacks(profile)
+    folded: Dict[str, float] = {}
+    for node_id, ms in _sample_times(profile):
+        frames = [node['callFrame'].get('functionName') or '(anonymous)' for node in stacks[node_id]]
+        if not frames or frames == ['(idle)']:
+            continue
+        key = ';'.join(frames)
+        folded[key] = folded.get(key, 0.0) + ms
+    return folded
+
+
+def flame_svg(folded: Dict[str, float], title: str = '', width: int = 1200, row: int = 16) -> str:
+    """Self-contained flame graph (root at the bottom); hover a frame for its name and ms"""
+    tree: Dict[str, Any] = {'name': 'all', 'ms': 0.0, 'children': {}}
+    for stack, ms in folded.items():
+        tree['ms'] += ms
+        node = tree
+        for frame in stack.split(';'):
+            node = node['children'].setdefault(frame, {'name': frame, 'ms': 0.0, 'children': {}})
+            node['ms'] += ms
+
+    def _depth(node) -> int:
+        return 1 + max((_depth(child) for child in node['children'].values()), default=0)
+
+    depth = _depth(tree)
+    top = 30
+    height = top + depth * row + 10
+    scale = width / tree['ms'] if tree['ms'] else 0
+    rects: List[str] = []
+
+    def _draw(node, x: float, level: int):
+        w = node['ms'] * scale
+        if w < 0.3:
+            return
+        y = height - 10 - (level + 1) * row
+        digest = hashlib.md5(node['name'].encode('utf-8')).digest()
+        fill = f"rgb({200 + digest[0] % 55},{80 + digest[1] % 120},{40 + digest[2] % 40})"
+        label = html.escape(node['name'])
+        text = label if w > 7 * len(node['name']) else (label[:int(w / 7) - 2] + '..' if w > 35 else '')
+        rects.append(
+            f'<g><title>{label} ({node["ms"]:.1f} ms, {node["ms"] / tree["ms"] * 100:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" fill="{fill}"/>'
+            f'<text x="{x + 3:.1f}" y="{y + row - 4}">{text}</text></g>'
+        )
+        for child in sorted(node['children'].values(), key=lambda c: c['name']):
+            _draw(child, x, level + 1)
+            x += child['ms'] * scale
+
+    _draw(tree, 0.0, 0)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">'
+        f'<rect width="100%" height="100%" fill="#fafafa"/>'
+        f'<text x="5" y="18" font-size="14">{html.escape(title)} - {tree["ms"]:.1f} ms sampled</text>'
+        + ''.join(rects) + '</svg>'
+    )
+
+
+# ==================== Query Set ====================
+
+def profile_queries(chapters: List[Dict[str, Any]], count: int = 30, seed: int = 0, pathological: int = 5) -> List[str]:
+    """
+    Corpus-derived queries the screen actually searches (2+ chars after trim): the bigrams found in
+    the most sections first, then sampled words, fragments, phrases and titles, and one miss
+    """
+    from utils.search_index import sample_queries
+
+    coverage: Dict[str, int] = {}
+    for chapter in chapters:
+        for section in chapter['sections']:
+            text = section['text'].lower()
+            for gram in {text[i:i + 2] for i in range(len(text) - 1)}:
+                if not gram.isspace() and ' ' not in gram:
+                    coverage[gram] = coverage.get(gram, 0) + 1
+    queries = [gram for gram, _ in sorted(coverage.items(), key=lambda kv: (-kv[1], kv[0]))[:pathological]]
+    queries.append('קקקקקקקק')
+    for query in sample_queries(chapters, count * 2, seed):
+        if len(queries) >= count:
+            break
+        query = query.strip()
+        if len(query) >= 2 and query not in queries:
+            queries.append(query)
+    return queries[:count]
+
+
+# ==================== Browser Driver ====================
+
+class CpuProfiler:
+    """V8 sampling profiler on one page over CDP (Chromium only)"""
+
+    def __init__(self, page, interval_us: int = 200):
+        self.cdp = page.context.new_cdp_session(page)
+        self.cdp.send('Profiler.enable')
+        self.cdp.send('Profiler.setSamplingInterval', {'interval': interval_us})
+
+    def start(self):
+        self.cdp.send('Profiler.start')
+
+    def stop(self) -> Dict[str, Any]:
+        return self.cdp.send('Profiler.stop')['profile']
+
+    def detach(self):
+        try:
+            self.cdp.detach()
+        except Exception:
+            pass
+
+
+def _slug(query: str, index: int) -> str:
+    digest = hashlib.sha1(query.encode('utf-8')).hexdigest()[:8]
+    return f"{index:03d}-{digest}"
+
+
+class SearchProfiler:
+    """Drives /search through a SearchPage and profiles every query"""
+
+    def __init__(self, search_page, output_dir: Path = DEFAULT_OUTPUT_DIR, interval_us: int = 200):
+        self.search_page = search_page
+        self.output_dir = Path(output_dir)
+        self.interval_us = interval_us
+        self.results: List[QueryProfile] = []
+
+    def _open(self) -> CpuProfiler:
+        page = self.search_page.page
+        page.add_init_script(SEARCH_PROBE_JS)
+        self.search_page.goto_search()
+        return CpuProfiler(page, self.interval_us)
+
+    def profile(self, query: str, profiler: CpuProfiler, mode: str) -> QueryProfile:
+        page = self.search_page.page
+        page.evaluate(PROBE_RESET_JS)
+        profiler.start()
+        settle_ms = self.search_page.timed_search(query)
+        profile = profiler.stop()
+        probe = page.evaluate(PROBE_READ_JS)
+        categories = categorize(profile)
+        busy = sum(ms for name, ms in categories.items() if name != 'idle')
+
+        slug = _slug(query, len(self.results))
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        folded = folded_stacks(profile)
+        files = {
+            'cpuprofile': self.output_dir / f"{slug}.cpuprofile",
+            'folded': self.output_dir / f"{slug}.folded",
+            'svg': self.output_dir / f"{slug}.svg",
+        }
+        files['cpuprofile'].write_text(json.dumps(profile), encoding='utf-8')
+        files['folded'].write_text(''.join(f"{k} {round(v * 1000)}\n" for k, v in folded.items()), encoding='utf-8')
+        files['svg'].write_text(flame_svg(folded, f"{mode} {query!r}"), encoding='utf-8')
+
+        result = QueryProfile(
+            query=query, mode=mode, settle_ms=round(settle_ms, 1), busy_ms=round(busy, 1),
+            results=self.search_page.get_results_count(), categories=categories,
+            probe={k: round(v, 2) for k, v in probe.items()},
+            files={k: str(v) for k, v in files.items()},
+        )
+        self.results.append(result)
+        return result
+
+    def run(self, queries: Iterable[str], cold: int = 1) -> List[QueryProfile]:
+        """
+        Profile the first `cold` queries each on a fresh page load, so the registry import is part
+        of their profile, then every query warm on one loaded page
+        """
+        queries = list(queries)
+        for query in queries[:cold]:
+            profiler = self._open()
+            try:
+                self.profile(query, profiler, 'cold')
+            finally:
+                profiler.detach()
+        if queries:
+            profiler = self._open()
+            try:
+                self.search_page.search(queries[0])  # load the registry before the warm runs
+                for query in queries:
+                    self.search_page.search('')  # every query starts from the empty screen
+                    self.profile(query, profiler, 'warm')
+            finally:
+                profiler.detach()
+        return self.results
+
+    def write_report(self, path: Optional[Path] = None) -> Path:
+        path = Path(path or self.output_dir / 'search-profile.json')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'queries': [asdict(r) for r in rank(self.results)],
+        }, ensure_ascii=False, indent=2), encoding='utf-8')
+        return path
+
+
+# ==================== Reporting ====================
+
+def rank(results: Iterable[QueryProfile]) -> List[QueryProfile]:
+    """Slowest first, by busy CPU time"""
+    return sorted(results, key=lambda r: r.busy_ms, reverse=True)
+
+
+def ranked_table(results: Iterable[QueryProfile], limit: int = 20) -> str:
+    columns = ['registry_load', 'scan', 'lowercase', 'sort', 'render', 'gc']
+    header = (f"{'query':<22} {'mode':<5} {'results':>7} {'settle':>8} {'busy':>8} "
+              + ' '.join(f"{c[:8]:>8}" for c in columns) + f" {'lower*':>8} {'sort*':>8}")
+    lines = [header, '-' * len(header)]
+    for r in rank(results)[:limit]:
+        query = r.query if len(r.query) <= 20 else r.query[:19] + '…'
+        lines.append(
+            f"{query:<22} {r.mode:<5} {r.results:>7} {r.settle_ms:>8.1f} {r.busy_ms:>8.1f} "
+            + ' '.join(f"{r.categories.get(c, 0):>8.1f}" for c in columns)
+            + f" {r.probe.get('lowercase_ms', 0):>8.1f} {r.probe.get('sort_ms', 0):>8.1f}"
+        )
+    lines.append("ms; * = instrumented toLowerCase()/sort() time, the other columns are sampled")
+    return '\n'.join(lines)
+
+
+def load_report(path: Path) -> List[QueryProfile]:
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    return [QueryProfile(**entry) for entry in data['queries']]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="/search CPU profiler")
+    sub = parser.add_subparsers(dest='command', required=True)
+    queries = sub.add_parser('queries', help="Print the corpus-derived query set")
+    queries.add_argument('--count', type=int, default=30)
+    queries.add_argument('--seed', type=int, default=0)
+    table = sub.add_parser('table', help="Ranked table from a search-profile.json")
+    table.add_argument('report', type=Path, nargs='?', default=DEFAULT_OUTPUT_DIR / 'search-profile.json')
+    table.add_argument('--limit', type=int, default=20)
+    flame = sub.add_parser('flame', help="Render a .cpuprofile as an SVG flame graph")
+    flame.add_argument('profile', type=Path)
+    flame.add_argument('-o', '--output', type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == 'queries':
+        from utils.content_tree import chapter_paths_by_id, load_json, read_registry_ids
+
+        paths = chapter_paths_by_id()
+        chapters = [load_json(paths[cid]) for cid in read_registry_ids() if cid in paths]
+        for query in profile_queries(chapters, args.count, args.seed):
+            print(query)
+    elif args.command == 'table':
+        print(ranked_table(load_report(args.report), args.limit))
+    else:
+        profile = json.loads(args.profile.read_text(encoding='utf-8'))
+        output = args.output or args.profile.with_suffix('.svg')
+        output.write_text(flame_svg(folded_stacks(profile), args.profile.stem), encoding='utf-8')
+        print(f"Wrote {output}")
+    return 0
+
+
+__all__ = [
+    'CATEGORIES',
+    'CATEGORY_RULES',
+    'CpuProfiler',
+    'QueryProfile',
+    'SEARCH_PROBE_JS',
+    'SearchProfiler',
+    'categorize',
+    'flame_svg',
+    'folded_stacks',
+    'load_report',
+    'profile_queries',
+    'rank',
+    'ranked_table',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
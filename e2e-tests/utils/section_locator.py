@@ -0,0 +1,220 @@
+"""
+Section Locator
+Section ID -> (chapter ID, index) lookup table, replacing findSectionById's scan
+
+findSectionById() in contentLoader.ts awaits getChapter() for every
+registered chapter until one contains the section. The table here is built
+once (in registry order, so the first chapter wins exactly as in the app) and
+emitted as sorted parallel arrays:
+
+    {"version": 2, "chapters": [chapter ids],
+     "ids": [sorted section ids], "chapter": [chapter ordinal], "index": [position],
+     "duplicates": [[section id, chapter ordinal, position], ...]}
+
+`duplicates` lists the later occurrences of ids an earlier chapter already owns;
+they never resolve, but each chapter's section sequence (neighbours, deep links)
+needs them to keep its positions.
+
+JS can binary-search `ids`; the Python locator loads it into a dict for O(1)
+resolution of deep links across the whole corpus.
+
+Usage:
+    python -m utils.section_locator build [--no-cache]
+    python -m utils.section_locator resolve choshen_mishpat-427-5
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import argparse
+import json
+import re
+import sys
+
+from utils.content_tree import CONTENT_DIR, chapter_paths_by_id, load_json, read_registry_ids
+
+
+TABLE_VERSION = 2
+DEFAULT_TABLE_PATH = Path(__file__).resolve().parents[1] / 'build' / 'section-locations.json'
+
+_SECTION_URL = re.compile(r'/section/([^/?#]+)')
+
+
+@dataclass(frozen=True)
+class SectionLocation:
+    """Where a section lives"""
+    section_id: str
+    chapter_id: str
+    index: int
+
+    @property
+    def section_path(self) -> str:
+        return f"section/{self.section_id}"
+
+    @property
+    def chapter_path(self) -> str:
+        return f"chapter/{self.chapter_id}"
+
+
+def _chapter_sections(content_dir: Path, cache=None) -> Dict[str, List[str]]:
+    """
+    Chapter id -> ordered section ids, from the content cache when given
+    Both paths walk books in the same order, so a later duplicate wins as in chapters-index.ts
+    """
+    if cache is not None:
+        return {
+            Path(facts.path).stem: facts.section_ids
+            for facts in cache.refresh(content_dir) if facts.kind == 'chapter'
+        }
+    return {
+        chapter_id: [s['id'] for s in load_json(path).get('sections', [])]
+        for chapter_id, path in chapter_paths_by_id(content_dir).items()
+    }
+
+
+def build_section_table(content_dir: Path = CONTENT_DIR, cache=None) -> Dict[str, Any]:
+    """Build the sorted-array table in registry order (first occurrence wins)"""
+    content_dir = Path(content_dir)
+    sections = _chapter_sections(content_dir, cache)
+
+    chapters: List[str] = []
+    first: Dict[str, tuple] = {}
+    duplicates: List[list] = []
+    for chapter_id in read_registry_ids(content_dir):
+        if chapter_id not in sections:
+            continue
+        ordinal = len(chapters)
+        chapters.append(chapter_id)
+        for index, section_id in enumerate(sections[chapter_id]):
+            if section_id in first:
+                duplicates.append([section_id, ordinal, index])
+            else:
+                first[section_id] = (ordinal, index)
+
+    ids = sorted(first)
+    return {
+        'version': TABLE_VERSION,
+        'chapters': chapters,
+        'ids': ids,
+        'chapter': [first[section_id][0] for section_id in ids],
+        'index': [first[section_id][1] for section_id in ids],
+        'duplicates': duplicates,
+    }
+
+
+def write_section_table(table: Dict[str, Any], path: Path = DEFAULT_TABLE_PATH) -> Path:
+    """Write the table as compact JSON"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(table, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+    return path
+
+
+class SectionLocator:
+    """O(1) section resolution and deep-link helpers"""
+
+    def __init__(self, table: Dict[str, Any]):
+        if table.get('version') != TABLE_VERSION:
+            raise ValueError(f"Unsupported section table version: {table.get('version')}")
+        self.chapters: List[str] = table['chapters']
+        self._lookup = {
+            section_id: (chapter, index)
+            for section_id, chapter, index in zip(table['ids'], table['chapter'], table['index'])
+        }
+        self._duplicates = [tuple(entry) for entry in table['duplicates']]
+        self._by_chapter: Optional[Dict[str, List[str]]] = None
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_TABLE_PATH) -> 'SectionLocator':
+        return cls(json.loads(Path(path).read_text(encoding='utf-8')))
+
+    @classmethod
+    def from_content(cls, content_dir: Path = CONTENT_DIR, cache=None) -> 'SectionLocator':
+        return cls(build_section_table(content_dir, cache))
+
+    def __len__(self) -> int:
+        return len(self._lookup)
+
+    def __contains__(self, section_id: str) -> bool:
+        return section_id in self._lookup
+
+    def resolve(self, section_id: str) -> Optional[SectionLocation]:
+        """Same answer as findSectionById(), without the scan"""
+        entry = self._lookup.get(section_id)
+        if entry is None:
+            return None
+        return SectionLocation(section_id, self.chapters[entry[0]], entry[1])
+
+    def resolve_url(self, url: str) -> Optional[SectionLocation]:
+        """Resolve a /section/<id> URL or path; None if it is not a valid deep link"""
+        match = _SECTION_URL.search(url if url.startswith('/') or '://' in url else f"/{url}")
+        return self.resolve(match.group(1)) if match else None
+
+    def sections_of(self, chapter_id: str) -> List[str]:
+        """Ordered section ids of a chapter, including ids an earlier chapter owns"""
+        if self._by_chapter is None:
+            by_chapter: Dict[str, List[tuple]] = {}
+            entries = [(sid, chapter, index) for sid, (chapter, index) in self._lookup.items()]
+            for section_id, chapter, index in entries + self._duplicates:
+                by_chapter.setdefault(self.chapters[chapter], []).append((index, section_id))
+            self._by_chapter = {cid: [sid for _, sid in sorted(items)] for cid, items in by_chapter.items()}
+        return self._by_chapter.get(chapter_id, [])
+
+    def neighbours(self, section_id: str) -> tuple:
+        """(previous, next) section ids within the chapter, None at the edges"""
+        location = self.resolve(section_id)
+        if location is None:
+            return None, None
+        sections = self.sections_of(location.chapter_id)
+        previous = sections[location.index - 1] if location.index > 0 else None
+        following = sections[location.index + 1] if location.index + 1 < len(sections) else None
+        return previous, following
+
+    def deep_links(self, chapter_id: Optional[str] = None) -> Iterator[str]:
+        """section/<id> paths in registry order (for one chapter, or the whole corpus)"""
+        for cid in [chapter_id] if chapter_id else self.chapters:
+            for section_id in self.sections_of(cid):
+                yield f"section/{section_id}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and query the section location table")
+    parser.add_argument('--content-dir', type=Path, default=CONTENT_DIR)
+    parser.add_argument('--table', type=Path, default=DEFAULT_TABLE_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build')
+    build.add_argument('--no-cache', action='store_true', help="Read every chapter instead of the content cache")
+    resolve = sub.add_parser('resolve')
+    resolve.add_argument('section_id')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        cache = None
+        if not args.no_cache:
+            from utils.content_cache import ContentCache
+            cache = ContentCache()
+        table = build_section_table(args.content_dir, cache)
+        if cache is not None:
+            cache.save()
+        write_section_table(table, args.table)
+        print(f"{len(table['ids'])} sections in {len(table['chapters'])} chapters -> {args.table}")
+        return 0
+
+    location = SectionLocator.load(args.table).resolve(args.section_id)
+    if location is None:
+        print(f"Unknown section: {args.section_id}", file=sys.stderr)
+        return 1
+    print(json.dumps(location.__dict__))
+    return 0
+
+
+__all__ = [
+    'DEFAULT_TABLE_PATH',
+    'SectionLocation',
+    'SectionLocator',
+    'build_section_table',
+    'write_section_table',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
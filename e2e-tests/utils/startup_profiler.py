@@ -0,0 +1,386 @@
+"""
+Startup Profiler
+Cold-start waterfall per route: navigation to first Hebrew text, split into phases
+
+Each route is opened in a fresh browser context (empty cache) while a Chromium trace runs.
+Three sources are combined, all in ms since navigation start:
+    Resource Timing  document, bundle, chapters-index chunk and Firestore downloads
+    CDP trace        v8 parse/compile and script evaluation (per script URL)
+    User Timing      app marks plus kz:first-hebrew-text, set by a MutationObserver on the
+                     first text node with a Hebrew letter; the mark also aligns trace time
+Every run is appended to reports/startup-history.ndjson so phases can be tracked over time.
+
+Usage:
+    python -m utils.startup_profiler trend                    # latest run vs median of earlier runs
+    python -m utils.startup_profiler waterfall --route /browse
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parents[1] / 'reports' / 'startup-history.ndjson'
+
+FIRST_HEBREW_MARK = 'kz:first-hebrew-text'
+
+# Marks the first text node with a Hebrew letter; kept small so it does not shift what it measures
+FIRST_HEBREW_OBSERVER = """
+(() => {
+  const hebrew = /[\\u05D0-\\u05EA]/;
+  const hasHebrew = node => {
+    if (node.nodeType === Node.TEXT_NODE) return hebrew.test(node.data);
+    const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+    for (let text = walker.nextNode(); text; text = walker.nextNode()) if (hebrew.test(text.data)) return true;
+    return false;
+  };
+  const observer = new MutationObserver(records => {
+    for (const record of records) {
+      const nodes = record.type === 'characterData' ? [record.target] : record.addedNodes;
+      for (const node of nodes) {
+        if (hasHebrew(node)) {
+          performance.mark('""" + FIRST_HEBREW_MARK + """');
+          observer.disconnect();
+          return;
+        }
+      }
+    }
+  });
+  observer.observe(document, { childList: true, subtree: true, characterData: true });
+})();
+"""
+
+TRACE_CATEGORIES = [
+    'devtools.timeline', 'v8', 'v8.execute', 'blink.user_timing', 'loading',
+    'disabled-by-default-devtools.timeline', 'disabled-by-default-v8.compile',
+]
+COMPILE_EVENTS = {'v8.compile', 'v8.compileModule', 'v8.parseOnBackground', 'CompileScript', 'v8.produceCache'}
+EVALUATE_EVENTS = {'EvaluateScript', 'v8.evaluateModule'}
+
+REGISTRY_PATTERN = r'chapters-index'
+FIRESTORE_PATTERN = r'firestore\.googleapis\.com|googleapis\.com/google\.firestore|localhost:8080/'
+SCRIPT_PATTERN = r'\.bundle(\?|$)|\.js(\?|$)'
+
+PHASES = ['document', 'bundle_download', 'parse_compile', 'evaluate', 'registry_import', 'firestore_init',
+          'first_hebrew_text']
+
+COLLECT_JS = """() => ({
+  resources: performance.getEntriesByType('resource').map(e => ({
+    name: e.name, initiatorType: e.initiatorType, startTime: e.startTime,
+    responseEnd: e.responseEnd, transferSize: e.transferSize })),
+  navigation: (performance.getEntriesByType('navigation')[0] || {}).toJSON?.() || null,
+  marks: performance.getEntriesByType('mark').map(e => ({ name: e.name, startTime: e.startTime })),
+  measures: performance.getEntriesByType('measure').map(e => ({ name: e.name, startTime: e.startTime, duration: e.duration })),
+  fcp: (performance.getEntriesByName('first-contentful-paint')[0] || {}).startTime ?? null,
+})"""
+
+
+@dataclass
+class Phase:
+    name: str
+    start_ms: float
+    end_ms: float
+    busy_ms: Optional[float] = None     # summed work inside the span (background threads included)
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.end_ms - self.start_ms, 1)
+
+
+@dataclass
+class StartupProfile:
+    route: str
+    phases: List[Phase] = field(default_factory=list)
+    milestones: Dict[str, Optional[float]] = field(default_factory=dict)
+    marks: List[Dict[str, Any]] = field(default_factory=list)
+
+    def phase(self, name: str) -> Optional[Phase]:
+        return next((p for p in self.phases if p.name == name), None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'route': self.route,
+            'phases': {p.name: {'start_ms': p.start_ms, 'end_ms': p.end_ms, 'duration_ms': p.duration_ms,
+                                'busy_ms': p.busy_ms} for p in self.phases},
+            'milestones': self.milestones,
+            'marks': self.marks,
+        }
+
+
+# ==================== Phase Extraction ====================
+
+def _span(name: str, entries: List[Dict[str, Any]]) -> Optional[Phase]:
+    if not entries:
+        return None
+    return Phase(name, round(min(e['startTime'] for e in entries), 1), round(max(e['responseEnd'] for e in entries), 1))
+
+
+def _trace_events(trace: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return trace.get('traceEvents', trace) if isinstance(trace, dict) else trace
+
+
+def trace_origin_us(events: List[Dict[str, Any]], marks: List[Dict[str, Any]]) -> Optional[float]:
+    """Trace timestamp (µs) of performance.timeOrigin, from a user timing mark seen in both"""
+    by_name = {m['name']: m['startTime'] for m in marks}
+    for event in events:
+        if event.get('cat', '').startswith('blink.user_timing') and event.get('name') in by_name:
+            return event['ts'] - by_name[event['name']] * 1000
+    for event in events:
+        if event.get('name') == 'navigationStart':
+            return event['ts']
+    return None
+
+
+def _script_url(event: Dict[str, Any]) -> str:
+    # EvaluateScript / v8.compile carry args.data.url, v8.compileModule carries args.fileName
+    args = event.get('args') or {}
+    return (args.get('data') or {}).get('url') or args.get('fileName') or ''
+
+
+def _trace_phase(name: str, events: List[Dict[str, Any]], origin_us: float) -> Optional[Phase]:
+    spans = [(e['ts'], e['ts'] + e.get('dur', 0)) for e in events if e.get('ph') == 'X']
+    if not spans:
+        return None
+    return Phase(
+        name,
+        round((min(s for s, _ in spans) - origin_us) / 1000, 1),
+        round((max(e for _, e in spans) - origin_us) / 1000, 1),
+        busy_ms=round(sum(e - s for s, e in spans) / 1000, 1),
+    )
+
+
+def build_profile(route: str, timings: Dict[str, Any], trace: Optional[Any] = None) -> StartupProfile:
+    """StartupProfile from COLLECT_JS output and (optionally) a Chromium trace"""
+    resources = timings.get('resources') or []
+    registry = re.compile(REGISTRY_PATTERN)
+    firestore = re.compile(FIRESTORE_PATTERN)
+    script = re.compile(SCRIPT_PATTERN)
+    profile = StartupProfile(route, marks=timings.get('marks') or [])
+
+    navigation = timings.get('navigation') or {}
+    if navigation:
+        profile.phases.append(Phase('document', round(navigation.get('startTime', 0.0), 1),
+                                    round(navigation.get('responseEnd', 0.0), 1)))
+    bundles = [r for r in resources if script.search(r['name']) and not registry.search(r['name'])]
+    registry_downloads = [r for r in resources if registry.search(r['name'])]
+    bundle_phase = _span('bundle_download', bundles)
+    if bundle_phase:
+        profile.phases.append(bundle_phase)
+
+    events = _trace_events(trace) if trace is not None else []
+    origin = trace_origin_us(events, profile.marks) if events else None
+    registry_phase = _span('registry_import', registry_downloads)
+    if origin is not None:
+        for name, names in (('parse_compile', COMPILE_EVENTS), ('evaluate', EVALUATE_EVENTS)):
+            phase = _trace_phase(name, [e for e in events if e.get('name') in names
+                                        and not registry.search(_script_url(e))], origin)
+            if phase:
+                profile.phases.append(phase)
+        registry_work = _trace_phase('registry_import', [
+            e for e in events if e.get('name') in COMPILE_EVENTS | EVALUATE_EVENTS | {'FunctionCall'}
+            and registry.search(_script_url(e))
+        ], origin)
+        if registry_work:
+            start = min(registry_work.start_ms, registry_phase.start_ms) if registry_phase else registry_work.start_ms
+            end = max(registry_work.end_ms, registry_phase.end_ms) if registry_phase else registry_work.end_ms
+            registry_phase = Phase('registry_import', start, end, busy_ms=registry_work.busy_ms)
+    if registry_phase:
+        profile.phases.append(registry_phase)
+    firestore_phase = _span('firestore_init', [r for r in resources if firestore.search(r['name'])])
+    if firestore_phase:
+        profile.phases.append(firestore_phase)
+
+    first_hebrew = next((m['startTime'] for m in profile.marks if m['name'] == FIRST_HEBREW_MARK), None)
+    if first_hebrew is not None:
+        # From the end of the last phase that finished before it (the render itself)
+        before = [p.end_ms for p in profile.phases if p.end_ms <= first_hebrew]
+        profile.phases.append(Phase('first_hebrew_text', max(before, default=0.0), round(first_hebrew, 1)))
+    profile.phases.sort(key=lambda p: (p.start_ms, PHASES.index(p.name)))
+    profile.milestones = {
+        'first_contentful_paint_ms': round(timings['fcp'], 1) if timings.get('fcp') is not None else None,
+        'dom_content_loaded_ms': (round(navigation['domContentLoadedEventEnd'], 1)
+                                  if navigation.get('domContentLoadedEventEnd') else None),
+        'first_hebrew_text_ms': round(first_hebrew, 1) if first_hebrew is not None else None,
+    }
+    return profile
+
+
+# ==================== Browser Driver ====================
+
+class StartupProfiler:
+    """Opens each route cold in its own context and records its StartupProfile"""
+
+    def __init__(self, browser, context_args: Optional[Dict[str, Any]] = None,
+                 base_url: str = "http://localhost:8081", timeout: int = 60000):
+        self.browser = browser
+        self.context_args = dict(context_args or {})
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def profile(self, route: str, settle_ms: int = 500) -> StartupProfile:
+        context = self.browser.new_context(**self.context_args)
+        try:
+            page = context.new_page()
+            page.add_init_script(FIRST_HEBREW_OBSERVER)
+            tracing = self.browser.browser_type.name == 'chromium'
+            if tracing:
+                self.browser.start_tracing(page=page, categories=TRACE_CATEGORIES)
+            trace = None
+            try:
+                page.goto(f"{self.base_url}{route}", wait_until='commit')
+                page.wait_for_function(
+                    f"() => performance.getEntriesByName('{FIRST_HEBREW_MARK}').length > 0", timeout=self.timeout
+                )
+                # Let trailing requests (registry chunk, Firestore channel) land in Resource Timing
+                page.wait_for_timeout(settle_ms)
+            finally:
+                if tracing:
+                    trace = json.loads(self.browser.stop_tracing())
+            return build_profile(route, page.evaluate(COLLECT_JS), trace)
+        finally:
+            context.close()
+
+
+# ==================== Reporting & History ====================
+
+def waterfall(profile: StartupProfile, width: int = 60) -> str:
+    """Text waterfall, one bar per phase, scaled to the latest phase end"""
+    end = max((p.end_ms for p in profile.phases), default=0.0) or 1.0
+    lines = [f"{profile.route}  (first Hebrew text {profile.milestones.get('first_hebrew_text_ms')} ms)"]
+    for phase in profile.phases:
+        left = int(phase.start_ms / end * width)
+        bar = max(1, int(phase.duration_ms / end * width))
+        busy = f"  busy {phase.busy_ms:.1f}" if phase.busy_ms is not None else ''
+        lines.append(f"  {phase.name:<18} {' ' * left}{'█' * bar}{' ' * max(0, width - left - bar)} "
+                     f"{phase.start_ms:8.1f} → {phase.end_ms:8.1f} ms{busy}")
+    return '\n'.join(lines)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+                                cwd=Path(__file__).resolve().parent)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def append_history(profiles: Iterable[StartupProfile], path: Path = DEFAULT_HISTORY_PATH,
+                   label: Optional[str] = None) -> int:
+    """One NDJSON line per route, stamped with time, commit and label (STARTUP_LABEL)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stamp = {
+        'recorded': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _git_commit(),
+        'label': label or os.getenv('STARTUP_LABEL', 'local'),
+    }
+    count = 0
+    with open(path, 'a', encoding='utf-8') as f:
+        for profile in profiles:
+            f.write(json.dumps({**stamp, **profile.to_dict()}, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+def load_history(path: Path = DEFAULT_HISTORY_PATH) -> List[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+
+def trend(history: List[Dict[str, Any]], window: int = 5) -> List[Dict[str, Any]]:
+    """Per route and phase: latest duration vs the median of up to `window` earlier runs"""
+    by_route: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in history:
+        by_route.setdefault(entry['route'], []).append(entry)
+    rows = []
+    for route, entries in sorted(by_route.items()):
+        latest, earlier = entries[-1], entries[-1 - window:-1]
+        names = list(latest['phases']) + ['first_hebrew_text_ms']
+        for name in names:
+            def _value(entry):
+                if name == 'first_hebrew_text_ms':
+                    return entry['milestones'].get(name)
+                phase = entry['phases'].get(name)
+                return phase['duration_ms'] if phase else None
+            now = _value(latest)
+            before = [v for v in map(_value, earlier) if v is not None]
+            baseline = statistics.median(before) if before else None
+            rows.append({
+                'route': route, 'phase': name, 'latest_ms': now, 'baseline_ms': baseline,
+                'delta_ms': round(now - baseline, 1) if now is not None and baseline is not None else None,
+                'runs': len(before) + 1,
+            })
+    return rows
+
+
+def format_trend(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'route':<36} {'phase':<22} {'latest':>9} {'baseline':>9} {'delta':>8}  runs"]
+    for row in rows:
+        def _fmt(value):
+            return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+        delta = f"{row['delta_ms']:+8.1f}" if row['delta_ms'] is not None else f"{'-':>8}"
+        lines.append(f"{row['route']:<36} {row['phase']:<22} {_fmt(row['latest_ms'])} {_fmt(row['baseline_ms'])} "
+                     f"{delta}  {row['runs']}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start waterfall history")
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    trend_cmd = sub.add_parser('trend', help="Latest run vs median of earlier runs, per route and phase")
+    trend_cmd.add_argument('--window', type=int, default=5)
+    show = sub.add_parser('waterfall', help="Waterfall of the latest run of a route")
+    show.add_argument('--route', default='/')
+    args = parser.parse_args(argv)
+
+    history = load_history(args.history)
+    if not history:
+        print(f"No startup history at {args.history}")
+        return 1
+    if args.command == 'trend':
+        print(format_trend(trend(history, args.window)))
+        return 0
+    entries = [e for e in history if e['route'] == args.route]
+    if not entries:
+        print(f"No runs for {args.route}")
+        return 1
+    latest = entries[-1]
+    profile = StartupProfile(
+        latest['route'],
+        [Phase(name, p['start_ms'], p['end_ms'], p.get('busy_ms')) for name, p in latest['phases'].items()],
+        latest['milestones'], latest.get('marks', []),
+    )
+    print(waterfall(profile))
+    return 0
+
+
+__all__ = [
+    'FIRST_HEBREW_MARK',
+    'FIRST_HEBREW_OBSERVER',
+    'PHASES',
+    'Phase',
+    'StartupProfile',
+    'StartupProfiler',
+    'append_history',
+    'build_profile',
+    'format_trend',
+    'load_history',
+    'trace_origin_us',
+    'trend',
+    'waterfall',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
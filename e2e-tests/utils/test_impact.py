@@ -0,0 +1,483 @@
+"""
+Test Impact Analysis
+Selects the e2e tests a change can affect, from a recorded test -> app source/content index
+
+Recording (TEST_IMPACT_RECORD=1) gives every test a fresh precise-coverage collector and notes
+the routes it opened. Executed bundle ranges are resolved to app sources through the source
+maps. Routes are resolved to the content files they read. Each worker writes
+reports/impact-rows-<worker>.json, and the controller folds the rows into
+test_data/test-impact-index.json, stamped with the commit they were recorded at.
+
+Selection (`pytest --impact`) diffs the working tree against that commit and keeps:
+    smoke tests, and tests the index has never seen
+    tests whose recorded app sources or content paths changed
+    tests whose module (transitively) imports a changed page object / util, or changed itself
+It falls back to the full suite when the index is missing, older than TEST_IMPACT_MAX_AGE_DAYS,
+recorded at a commit git no longer knows, or when build/config files or more than
+TEST_IMPACT_MAX_CHANGED files changed. App files that did not exist at the indexed commit
+also trigger the fallback, as does any changed path the rules above do not map (a suite data
+file, a server or hosting config); only docs and the suite's own bookkeeping are ignored.
+
+Usage:
+    TEST_IMPACT_RECORD=1 pytest                 # (re)build the index, e.g. nightly
+    pytest --impact                             # run only what the diff can affect
+    python -m utils.test_impact select          # print the selection without running it
+"""
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from utils.bundle_analyzer import fetch_text, flatten_map, source_group, source_map_for
+from utils.js_coverage import APP_SOURCE, Interval
+
+
+E2E_DIR = Path(__file__).resolve().parents[1]
+REPO_DIR = E2E_DIR.parent
+APP_PREFIX = 'kitzur/'
+E2E_PREFIX = 'e2e-tests/'
+
+DEFAULT_INDEX_PATH = E2E_DIR / 'test_data' / 'test-impact-index.json'
+SELECTION_FILE = 'test-impact-selection.json'
+
+# Any change here can affect every test
+FULL_SUITE_FILES = (
+    'e2e-tests/conftest.py',
+    'e2e-tests/pytest.ini',
+    'e2e-tests/requirements.txt',
+    'kitzur/package.json',
+    'kitzur/package-lock.json',
+    'kitzur/app.json',
+    'kitzur/metro.config.js',
+    'kitzur/babel.config.js',
+    'kitzur/tsconfig.json',
+)
+
+# Paths outside kitzur/ that only reach the app through one module's backend
+MARKER_TRIGGERS = {
+    'firestore.rules': 'questions',
+    'firestore.indexes.json': 'questions',
+    'functions/*': 'questions',
+}
+
+# Changes no e2e test can observe: docs, the root unit tests, and files the suite writes itself
+IGNORED_PATHS = (
+    '*.md',
+    'docs/*',
+    'tests/*',
+    'vitest.config.js',
+    'e2e-tests/reports/*',
+    'e2e-tests/test_data/content_cache.json',
+    'e2e-tests/test_data/flaky-history.json',
+    'e2e-tests/test_data/test-impact-index.json',
+)
+
+# Suite data files -> the module that reads them; tests importing that module are selected
+DATA_READERS = {
+    'e2e-tests/test_data/search_regressions.ndjson': 'utils/search_fuzzer.py',
+}
+
+# Module-level content modules (chapters-index.ts, parshiot-index.ts) count as app sources
+CONTENT_MODULE = re.compile(r'^content/[^/]+\.ts$')
+
+# Route (first path segment) -> content files it reads; '*' means any content file
+ROUTE_CONTENT = {
+    '': 'content/*',            # home: daily halacha and continue-learning pick any section
+    'browse': 'content/*',
+    'search': 'content/*',
+    'explore': 'content/*',
+    'bookmarks': 'content/*',
+    'shnayim-mikra': 'content/parshiot/*',
+}
+
+
+# ==================== Recording ====================
+
+def is_app_source(path: str) -> bool:
+    return bool(APP_SOURCE.match(path) or CONTENT_MODULE.match(path))
+
+
+class SourceResolver:
+    """Executed generated ranges -> app sources, with one source map parse per script URL"""
+
+    def __init__(self, fetch: Callable[[str], str] = fetch_text):
+        self.fetch = fetch
+        self._scripts: Dict[str, Tuple[List[int], List[Optional[str]]]] = {}
+
+    def _segments(self, url: str) -> Tuple[List[int], List[Optional[str]]]:
+        if url not in self._scripts:
+            code = self.fetch(url)
+            source_map = source_map_for(code, url, self.fetch)
+            starts, owners, line_starts = [], [], [0]
+            for line in code.split('\n')[:-1]:
+                line_starts.append(line_starts[-1] + len(line) + 1)
+            names: Dict[str, Optional[str]] = {}
+            segments = sorted((line, column, source) for line, column, source, _ in flatten_map(source_map or {})
+                              if line < len(line_starts))
+            for line, column, source in segments:
+                if source is not None and source not in names:
+                    path = source_group(source)[0]
+                    names[source] = path if is_app_source(path) else None
+                starts.append(line_starts[line] + column)
+                owners.append(names.get(source) if source is not None else None)
+            self._scripts[url] = (starts, owners)
+        return self._scripts[url]
+
+    def sources(self, scripts: Dict[str, List[Interval]]) -> Set[str]:
+        found: Set[str] = set()
+        for url, intervals in scripts.items():
+            starts, owners = self._segments(url)
+            for start, end in intervals:
+                index = max(bisect_right(starts, start) - 1, 0)
+                while index < len(starts) and starts[index] < end:
+                    if owners[index]:
+                        found.add(owners[index])
+                    index += 1
+        return found
+
+
+def route_content(url: str, chapter_paths: Optional[Dict[str, str]] = None) -> Set[str]:
+    """Content paths (kitzur-relative, fnmatch patterns allowed) a visited URL reads"""
+    path = re.sub(r'^[a-z]+://[^/]+', '', url).split('?')[0].split('#')[0].strip('/')
+    parts = path.split('/') if path else ['']
+    head = parts[0].removeprefix('(tabs)')
+    if head in ROUTE_CONTENT:
+        return {ROUTE_CONTENT[head]}
+    if head in ('section', 'chapter') and len(parts) > 1:
+        chapter = parts[1].rsplit('-s', 1)[0] if head == 'section' else parts[1]
+        if chapter_paths and chapter in chapter_paths:
+            return {chapter_paths[chapter]}
+        return {f'content/*/{chapter}.json'}
+    if head == 'parsha' and len(parts) > 1:
+        return {f'content/parshiot/{parts[1]}.json'}
+    special = f"content/special/{head.replace('-', '_')}.json"
+    return {special} if (REPO_DIR / APP_PREFIX / special).exists() else set()
+
+
+def impact_row(nodeid: str, sources: Iterable[str], routes: Iterable[str], duration: float,
+               markers: Iterable[str] = (), chapter_paths: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    content: Set[str] = set()
+    for route in routes:
+        content |= route_content(route, chapter_paths)
+    return {'test': nodeid, 'sources': sorted(sources), 'content': sorted(content), 'duration': round(duration, 2),
+            'markers': sorted(markers)}
+
+
+def chapter_content_paths() -> Dict[str, str]:
+    """Chapter id -> kitzur-relative content path"""
+    from utils.content_tree import CONTENT_DIR, chapter_paths_by_id
+    return {cid: 'content/' + path.relative_to(CONTENT_DIR).as_posix() for cid, path in chapter_paths_by_id().items()}
+
+
+def write_worker_rows(rows: List[Dict[str, Any]], reports_dir: Path, worker: Optional[str] = None) -> Path:
+    path = Path(reports_dir) / f"impact-rows-{worker or 'main'}.json"
+    path.write_text(json.dumps(rows, ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+# ==================== Index ====================
+
+@dataclass
+class ImpactIndex:
+    commit: Optional[str] = None
+    created: float = 0.0
+    tests: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def save(self, path: Path = DEFAULT_INDEX_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'commit': self.commit, 'created': self.created, 'tests': self.tests},
+                                   ensure_ascii=False, indent=1), encoding='utf-8')
+        return path
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_INDEX_PATH) -> Optional["ImpactIndex"]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding='utf-8'))
+        return cls(data.get('commit'), data.get('created', 0.0), data.get('tests', {}))
+
+    def update(self, rows: Iterable[Dict[str, Any]], commit: Optional[str]):
+        """Replace the entries of recorded tests; others keep the commit they were recorded at"""
+        for row in rows:
+            self.tests[row['test']] = {**{k: v for k, v in row.items() if k != 'test'}, 'commit': commit}
+        self.commit = commit
+        self.created = time.time()
+
+    def commits(self) -> Set[str]:
+        return {entry['commit'] for entry in self.tests.values() if entry.get('commit')} or \
+            ({self.commit} if self.commit else set())
+
+
+def merge_worker_rows(reports_dir: Path, index_path: Path = DEFAULT_INDEX_PATH,
+                      commit: Optional[str] = None) -> Optional[ImpactIndex]:
+    """Fold every impact-rows-*.json into the index"""
+    rows: List[Dict[str, Any]] = []
+    for path in sorted(Path(reports_dir).glob('impact-rows-*.json')):
+        rows.extend(json.loads(path.read_text(encoding='utf-8')))
+    if not rows:
+        return None
+    index = ImpactIndex.load(index_path) or ImpactIndex()
+    index.update(rows, commit or git_head())
+    index.save(index_path)
+    return index
+
+
+# ==================== Git ====================
+
+def _git(*args: str, repo: Path = REPO_DIR) -> Optional[str]:
+    try:
+        result = subprocess.run(['git', *args], capture_output=True, text=True, timeout=60, cwd=repo)
+    except Exception:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def git_head(repo: Path = REPO_DIR) -> Optional[str]:
+    out = _git('rev-parse', 'HEAD', repo=repo)
+    return out.strip() if out else None
+
+
+def changed_files(since: str, repo: Path = REPO_DIR) -> Optional[List[str]]:
+    """Repo-relative paths changed between `since` and the working tree (untracked included)"""
+    diff = _git('diff', '--name-only', since, repo=repo)
+    untracked = _git('ls-files', '--others', '--exclude-standard', repo=repo)
+    if diff is None or untracked is None:
+        return None
+    return sorted({line for line in (diff + untracked).splitlines() if line})
+
+
+def existed_at(commit: str, path: str, repo: Path = REPO_DIR) -> bool:
+    return _git('cat-file', '-e', f'{commit}:{path}', repo=repo) is not None
+
+
+# ==================== Python Dependencies ====================
+
+def module_imports(path: Path, root: Path = E2E_DIR) -> Set[str]:
+    """Suite-local module files (root-relative) a Python file imports"""
+    tree = ast.parse(Path(path).read_text(encoding='utf-8'))
+    package = Path(path).parent.relative_to(root).as_posix()
+    found: Set[str] = set()
+    for node in ast.walk(tree):
+        names: List[str] = []
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ''
+            if node.level:
+                base = '.'.join(filter(None, [package.replace('/', '.'), base]))
+            names = [base] + [f"{base}.{alias.name}" for alias in node.names]
+        for name in names:
+            candidate = name.replace('.', '/') + '.py'
+            if (root / candidate).exists():
+                found.add(candidate)
+    return found
+
+
+def python_dependencies(test_files: Iterable[str], root: Path = E2E_DIR) -> Dict[str, Set[str]]:
+    """Test file -> every suite module it imports, transitively (itself included)"""
+    cache: Dict[str, Set[str]] = {}
+
+    def _direct(module: str) -> Set[str]:
+        if module not in cache:
+            cache[module] = module_imports(root / module, root) if (root / module).exists() else set()
+        return cache[module]
+
+    result = {}
+    for test_file in test_files:
+        seen, stack = {test_file}, [test_file]
+        while stack:
+            for dep in _direct(stack.pop()) - seen:
+                seen.add(dep)
+                stack.append(dep)
+        result[test_file] = seen
+    return result
+
+
+# ==================== Selection ====================
+
+@dataclass
+class Selection:
+    selected: List[str]
+    total: int
+    reasons: Dict[str, str] = field(default_factory=dict)
+    fallback: Optional[str] = None
+    changed: List[str] = field(default_factory=list)
+    selected_s: float = 0.0
+    total_s: float = 0.0
+
+    @property
+    def saved_s(self) -> float:
+        return round(self.total_s - self.selected_s, 1)
+
+    def format(self) -> str:
+        if self.fallback:
+            return f"Test impact: full suite ({self.total} tests) - {self.fallback}"
+        by_reason: Dict[str, int] = {}
+        for reason in self.reasons.values():
+            key = reason.split(':', 1)[0]
+            by_reason[key] = by_reason.get(key, 0) + 1
+        detail = ', '.join(f"{count} {reason}" for reason, count in sorted(by_reason.items()))
+        return (f"Test impact: {len(self.selected)}/{self.total} tests for {len(self.changed)} changed file(s) "
+                f"({detail or 'nothing affected'}); ~{self.saved_s:.0f}s of {self.total_s:.0f}s saved")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'selected': self.selected, 'total': self.total, 'reasons': self.reasons, 'fallback': self.fallback,
+                'changed': self.changed, 'selected_s': round(self.selected_s, 1),
+                'total_s': round(self.total_s, 1), 'saved_s': self.saved_s}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Selection":
+        return cls(**{k: v for k, v in data.items() if k != 'saved_s'})
+
+
+def staleness(index: Optional[ImpactIndex], max_age_days: float, now: Optional[float] = None) -> Optional[str]:
+    """Why the index cannot be trusted, or None"""
+    if index is None or not index.tests:
+        return "no impact index (record one with TEST_IMPACT_RECORD=1)"
+    if not index.commits():
+        return "index has no recorded commit"
+    age_days = ((now or time.time()) - index.created) / 86400
+    if age_days > max_age_days:
+        return f"index is {age_days:.1f} days old (max {max_age_days:g})"
+    return None
+
+
+def select(index: ImpactIndex, tests: Dict[str, Set[str]], changed: List[str],
+           python_deps: Dict[str, Set[str]], existed: Callable[[str], bool],
+           max_changed: int = 200) -> Selection:
+    """
+    tests: collected node id -> its marker names
+    changed: repo-relative paths changed since the indexed commit(s)
+    python_deps: test file (e2e-relative) -> suite modules it imports
+    existed: whether a changed app path existed when the index was recorded
+    """
+    durations = {nodeid: entry.get('duration', 0.0) for nodeid, entry in index.tests.items()}
+    fallback_s = (sum(durations.values()) / len(durations)) if durations else 0.0
+    total_s = sum(durations.get(nodeid, fallback_s) for nodeid in tests)
+
+    def _full(reason: str) -> Selection:
+        return Selection(sorted(tests), len(tests), fallback=reason, changed=changed, selected_s=total_s,
+                         total_s=total_s)
+
+    if len(changed) > max_changed:
+        return _full(f"{len(changed)} files changed (max {max_changed})")
+    reasons: Dict[str, str] = {}
+
+    def _pick(predicate: Callable[[str], bool], reason: str):
+        for nodeid in tests:
+            if nodeid not in reasons and predicate(nodeid):
+                reasons[nodeid] = reason
+
+    _pick(lambda n: 'smoke' in tests[n], 'smoke')
+    _pick(lambda n: n not in index.tests, 'new test')
+    for path in changed:
+        if path in FULL_SUITE_FILES:
+            return _full(f"{path} changed")
+        if any(fnmatch(path, pattern) for pattern in IGNORED_PATHS):
+            continue
+        if path in DATA_READERS:
+            reader = DATA_READERS[path]
+            _pick(lambda n: reader in python_deps.get(n.split('::')[0], ()), f"data: {path[len(E2E_PREFIX):]}")
+            continue
+        if path.startswith(E2E_PREFIX):
+            module = path[len(E2E_PREFIX):]
+            if not module.endswith('.py'):
+                return _full(f"{path} is not tracked by the index")
+            _pick(lambda n: module in python_deps.get(n.split('::')[0], ()), f"python: {module}")
+            continue
+        if path.startswith(APP_PREFIX):
+            app_path = path[len(APP_PREFIX):]
+            if app_path.startswith('content/') and app_path.endswith('.json'):
+                _pick(lambda n: any(fnmatch(app_path, p) for p in index.tests.get(n, {}).get('content', ())),
+                      f"content: {app_path}")
+            elif is_app_source(app_path):
+                if not existed(path):
+                    return _full(f"new app source {app_path} is not in the index")
+                _pick(lambda n: app_path in index.tests.get(n, {}).get('sources', ()), f"source: {app_path}")
+            else:
+                return _full(f"{path} is not tracked by the index")
+            continue
+        markers = [marker for pattern, marker in MARKER_TRIGGERS.items() if fnmatch(path, pattern)]
+        if not markers:
+            return _full(f"{path} is not tracked by the index")
+        _pick(lambda n: any(marker in tests[n] for marker in markers), f"backend: {path}")
+
+    selected = sorted(reasons)
+    return Selection(selected, len(tests), reasons, changed=changed,
+                     selected_s=sum(durations.get(n, fallback_s) for n in selected), total_s=total_s)
+
+
+def select_for_run(tests: Dict[str, Set[str]], index_path: Path = DEFAULT_INDEX_PATH,
+                   repo: Path = REPO_DIR) -> Selection:
+    """Selection for the current working tree, with every staleness fallback applied"""
+    index = ImpactIndex.load(index_path)
+    reason = staleness(index, float(os.getenv('TEST_IMPACT_MAX_AGE_DAYS', '7')))
+    if reason:
+        return Selection(sorted(tests), len(tests), fallback=reason)
+    changed: Set[str] = set()
+    for commit in index.commits():
+        files = changed_files(commit, repo)
+        if files is None:
+            return Selection(sorted(tests), len(tests), fallback=f"indexed commit {commit[:10]} is unknown to git")
+        changed.update(files)
+    commits = index.commits()
+    test_files = {nodeid.split('::')[0] for nodeid in tests}
+    return select(
+        index, tests, sorted(changed), python_dependencies(test_files),
+        existed=lambda path: all(existed_at(commit, path, repo) for commit in commits),
+        max_changed=int(os.getenv('TEST_IMPACT_MAX_CHANGED', '200')),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Select e2e tests affected by the working tree changes")
+    parser.add_argument('--index', type=Path, default=DEFAULT_INDEX_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('select', help="Print the selection for the indexed tests")
+    merge = sub.add_parser('merge', help="Fold reports/impact-rows-*.json into the index")
+    merge.add_argument('--reports-dir', type=Path, default=E2E_DIR / 'reports')
+    args = parser.parse_args(argv)
+
+    if args.command == 'merge':
+        index = merge_worker_rows(args.reports_dir, args.index)
+        print(f"Indexed {len(index.tests)} tests" if index else "No impact rows found")
+        return 0 if index else 1
+    index = ImpactIndex.load(args.index)
+    tests = {nodeid: set(entry.get('markers', ())) for nodeid, entry in (index.tests if index else {}).items()}
+    selection = select_for_run(tests, args.index)
+    print(selection.format())
+    for nodeid in selection.selected if not selection.fallback else []:
+        print(f"  {nodeid}  ({selection.reasons[nodeid]})")
+    return 0
+
+
+__all__ = [
+    'ImpactIndex',
+    'Selection',
+    'SourceResolver',
+    'chapter_content_paths',
+    'changed_files',
+    'impact_row',
+    'merge_worker_rows',
+    'python_dependencies',
+    'route_content',
+    'select',
+    'select_for_run',
+    'staleness',
+    'write_worker_rows',
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())